@@ -0,0 +1,7 @@
+-- Resume digest (compact roles / accomplishments / skills / education) stored per resume version
+ALTER TABLE public.resumes 
+ADD COLUMN IF NOT EXISTS resume_hash TEXT,
+ADD COLUMN IF NOT EXISTS digest JSONB;
+
+-- The resume_digest action updates all of a user's saved copies of one version
+CREATE INDEX IF NOT EXISTS idx_resumes_user_hash ON public.resumes (user_id, resume_hash);
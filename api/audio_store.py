@@ -0,0 +1,172 @@
+# AUDIO ARTIFACT STORE
+# Strategy: Synthesized audio is written once to a short-lived file under AUDIO_STORE_DIR
+# (streamed chunk by chunk, never concatenated in memory) and addressed by an unguessable
+# id. /api/audio/<id> serves it with real Content-Type / Content-Length / Range support so
+# turn responses only carry a URL. Files expire after AUDIO_ARTIFACT_TTL seconds and are
+# swept opportunistically on write (by mtime, so artifacts of other workers are covered).
+# An id can be reserved before its audio exists (deferred TTS); until the write lands the
+# route answers 202 so clients poll instead of treating it as missing.
+
+import os
+import re
+import time
+import secrets
+import tempfile
+import threading
+
+from api.env import env_int
+
+
+PENDING_SUFFIX = ".pending"
+PENDING_TTL = 300  # a reservation nobody fulfils is abandoned after this many seconds
+
+MIME_EXTENSIONS = {
+    "audio/mpeg": ".mp3",
+    "audio/wav": ".wav",
+    "audio/ogg": ".ogg",
+    "audio/webm": ".webm",
+}
+EXTENSION_MIMES = {ext: mime for mime, ext in MIME_EXTENSIONS.items()}
+_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+
+
+class AudioStore:
+    """Short-lived, id-addressed audio files with TTL + size-bounded eviction."""
+
+    def __init__(self, directory=None, ttl=None, max_bytes=None, sweep_interval=60):
+        self.directory = directory or os.environ.get("AUDIO_STORE_DIR") or os.path.join(tempfile.gettempdir(), "audio-artifacts")
+        self.ttl = ttl if ttl is not None else env_int("AUDIO_ARTIFACT_TTL", 900)
+        self.max_bytes = max_bytes if max_bytes is not None else env_int("AUDIO_STORE_MAX_BYTES", 128 * 1024 * 1024)
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self._counters = {"stored": 0, "bytes_stored": 0, "expired": 0, "evicted": 0, "reserved": 0, "abandoned": 0}
+
+    # --- WRITE ---
+    def reserve(self):
+        """Id for audio that is still being produced; put(..., artifact_id=id) fulfils it."""
+        os.makedirs(self.directory, exist_ok=True)
+        artifact_id = secrets.token_urlsafe(18)
+        with open(os.path.join(self.directory, artifact_id + PENDING_SUFFIX), "wb"):
+            pass
+        with self._lock:
+            self._counters["reserved"] += 1
+        return artifact_id
+
+    def release(self, artifact_id):
+        """Drop a reservation that will never be fulfilled (the id then reads as missing)."""
+        self._remove(os.path.join(self.directory, artifact_id + PENDING_SUFFIX), "abandoned")
+
+    def put(self, chunks, mime="audio/mpeg", artifact_id=None):
+        """Store audio (bytes or an iterable of byte chunks). Returns the artifact id."""
+        if isinstance(chunks, (bytes, bytearray)):
+            chunks = [chunks]
+        ext = MIME_EXTENSIONS.get(mime, ".bin")
+        os.makedirs(self.directory, exist_ok=True)
+        reserved = artifact_id is not None
+        artifact_id = artifact_id or secrets.token_urlsafe(18)
+        path = os.path.join(self.directory, artifact_id + ext)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if reserved:
+            try:
+                os.remove(os.path.join(self.directory, artifact_id + PENDING_SUFFIX))
+            except OSError:
+                pass
+        with self._lock:
+            self._counters["stored"] += 1
+            self._counters["bytes_stored"] += size
+        self.maybe_sweep()
+        return artifact_id
+
+    # --- READ ---
+    def locate(self, artifact_id):
+        """(path, mime, seconds_left) for a live artifact, or None if unknown/expired."""
+        if not artifact_id or not _ID_PATTERN.match(artifact_id):
+            return None
+        for ext, mime in EXTENSION_MIMES.items():
+            path = os.path.join(self.directory, artifact_id + ext)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            left = st.st_mtime + self.ttl - time.time()
+            if left <= 0:
+                self._remove(path, "expired")
+                return None
+            return path, mime, int(left)
+        return None
+
+    def is_pending(self, artifact_id):
+        """True while a reserved id is still waiting for its audio."""
+        if not artifact_id or not _ID_PATTERN.match(artifact_id):
+            return False
+        try:
+            st = os.stat(os.path.join(self.directory, artifact_id + PENDING_SUFFIX))
+        except OSError:
+            return False
+        return st.st_mtime + PENDING_TTL > time.time()
+
+    # --- EVICTION ---
+    def _remove(self, path, reason):
+        try:
+            os.remove(path)
+            with self._lock:
+                self._counters[reason] += 1
+        except OSError:
+            pass
+
+    def maybe_sweep(self):
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < self.sweep_interval:
+                return
+            self._last_sweep = now
+        self.sweep()
+
+    def sweep(self):
+        """Delete expired artifacts, then the oldest ones until under max_bytes."""
+        now = time.time()
+        live = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # Leftover partial writes / reservations are only removed once clearly abandoned
+            if name.endswith((".part", PENDING_SUFFIX)):
+                if st.st_mtime + PENDING_TTL < now:
+                    self._remove(path, "abandoned")
+                continue
+            if st.st_mtime + self.ttl <= now:
+                self._remove(path, "expired")
+            else:
+                live.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in live)
+        for _, size, path in sorted(live):
+            if total <= self.max_bytes:
+                break
+            self._remove(path, "evicted")
+            total -= size
+
+    def stats(self):
+        with self._lock:
+            return {"directory": self.directory, "ttl": self.ttl, "max_bytes": self.max_bytes, **self._counters}
+
+
+audio_store = AudioStore()
@@ -0,0 +1,269 @@
+# AUTH LAYER (Local JWT Verification + Principal Cache)
+# Strategy: Verify Supabase access tokens in-process (signature, expiry, audience) and
+# cache the resolved principal in a bounded LRU keyed by the token's SHA-256 until the
+# token expires. GoTrue (supabase.auth.get_user) is only called when we cannot verify
+# locally (no secret configured, unknown alg, JWKS unreachable).
+
+import os
+import json
+import time
+import hmac
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import g, request, jsonify
+
+
+class AuthError(Exception):
+    """Token is present but provably invalid (bad signature, expired, wrong audience)."""
+
+
+class Principal:
+    """The authenticated caller behind a bearer token."""
+
+    __slots__ = ("id", "email", "role", "expires_at", "source")
+
+    def __init__(self, id, email=None, role=None, expires_at=None, source="local"):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.expires_at = expires_at
+        self.source = source
+
+    def to_dict(self):
+        return {"id": self.id, "email": self.email, "role": self.role}
+
+
+def _b64url_decode(segment):
+    padding = "=" * (-len(segment) % 4)
+    return base64.urlsafe_b64decode(segment + padding)
+
+
+def split_token(token):
+    """Returns (header, payload, signing_input, signature) without verifying anything."""
+    try:
+        head_b64, payload_b64, sig_b64 = token.split(".")
+        header = json.loads(_b64url_decode(head_b64))
+        payload = json.loads(_b64url_decode(payload_b64))
+        signature = _b64url_decode(sig_b64)
+    except Exception:
+        raise AuthError("Malformed token")
+    return header, payload, f"{head_b64}.{payload_b64}".encode("ascii"), signature
+
+
+def bearer_token(auth_header):
+    if not auth_header:
+        return None
+    parts = auth_header.split(" ")
+    if len(parts) < 2 or not parts[1]:
+        return None
+    return parts[1]
+
+
+class AuthLayer:
+    def __init__(self, remote_lookup=None, max_entries=None, leeway=None):
+        self.remote_lookup = remote_lookup
+        self.max_entries = max_entries or int(os.environ.get("AUTH_CACHE_MAX_ENTRIES", 4096))
+        self.leeway = leeway if leeway is not None else int(os.environ.get("AUTH_CLOCK_LEEWAY", 30))
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._jwks_client = None
+        self._counters = {"hits": 0, "misses": 0, "local": 0, "remote": 0, "rejected": 0}
+
+    # --- CONFIG ---
+    @property
+    def jwt_secret(self):
+        return os.environ.get("SUPABASE_JWT_SECRET")
+
+    @property
+    def audience(self):
+        return os.environ.get("SUPABASE_JWT_AUDIENCE", "authenticated")
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    # --- CACHE ---
+    @staticmethod
+    def cache_key(token):
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at and entry.expires_at <= time.time():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry
+
+    def _cache_put(self, key, principal):
+        with self._lock:
+            self._cache[key] = principal
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def invalidate(self, token=None):
+        with self._lock:
+            if token is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(self.cache_key(token), None)
+
+    # --- VERIFICATION ---
+    def _verify_signature(self, header, signing_input, signature, token):
+        """True/False when we can decide locally, None when we must defer to GoTrue."""
+        alg = header.get("alg")
+        if alg == "HS256":
+            secret = self.jwt_secret
+            if not secret:
+                return None
+            expected = hmac.new(secret.encode("utf-8"), signing_input, hashlib.sha256).digest()
+            return hmac.compare_digest(expected, signature)
+        if alg in ("RS256", "ES256", "EdDSA"):
+            try:
+                import jwt  # PyJWT (optional; ships with supabase-auth)
+                client = self._get_jwks_client()
+                if client is None:
+                    return None
+                key = client.get_signing_key_from_jwt(token).key
+                jwt.decode(token, key, algorithms=[alg], options={"verify_exp": False, "verify_aud": False})
+                return True
+            except ImportError:
+                return None
+            except Exception as e:
+                if type(e).__name__ in ("InvalidSignatureError", "DecodeError"):
+                    return False
+                print(f"[AUTH] JWKS verification unavailable: {e}")
+                return None
+        return None
+
+    def _get_jwks_client(self):
+        if self._jwks_client is None:
+            url = os.environ.get("SUPABASE_URL")
+            if not url:
+                return None
+            from jwt import PyJWKClient
+            self._jwks_client = PyJWKClient(f"{url.rstrip('/')}/auth/v1/.well-known/jwks.json", cache_keys=True, lifespan=3600)
+        return self._jwks_client
+
+    def _check_claims(self, payload):
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is None or float(exp) + self.leeway < now:
+            raise AuthError("Token expired")
+        aud = payload.get("aud")
+        audiences = aud if isinstance(aud, list) else [aud]
+        if self.audience and self.audience not in audiences:
+            raise AuthError("Invalid audience")
+        if not payload.get("sub"):
+            raise AuthError("Token has no subject")
+
+    def verify_locally(self, token):
+        """Principal on success, None when local verification is not possible."""
+        header, payload, signing_input, signature = split_token(token)
+        verdict = self._verify_signature(header, signing_input, signature, token)
+        if verdict is None:
+            return None
+        if verdict is False:
+            raise AuthError("Invalid signature")
+        self._check_claims(payload)
+        return Principal(
+            id=payload["sub"],
+            email=payload.get("email"),
+            role=(payload.get("app_metadata") or {}).get("role") or payload.get("role"),
+            expires_at=float(payload["exp"]),
+            source="local",
+        )
+
+    def _verify_remotely(self, token):
+        if self.remote_lookup is None:
+            return None
+        user = self.remote_lookup(token)
+        if not user:
+            return None
+        try:
+            _, payload, _, _ = split_token(token)
+            expires_at = float(payload.get("exp")) if payload.get("exp") else None
+        except AuthError:
+            expires_at = None
+        # Never trust a remote answer longer than a few minutes if the token carries no exp
+        expires_at = expires_at or (time.time() + 300)
+        return Principal(
+            id=getattr(user, "id", None),
+            email=getattr(user, "email", None),
+            role=(getattr(user, "app_metadata", None) or {}).get("role") or getattr(user, "role", None),
+            expires_at=expires_at,
+            source="remote",
+        )
+
+    def resolve(self, token):
+        """Returns the Principal for a bearer token, or None if it is not valid."""
+        if not token:
+            return None
+        key = self.cache_key(token)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("misses")
+
+        try:
+            principal = self.verify_locally(token)
+            if principal is not None:
+                self._count("local")
+            else:
+                principal = self._verify_remotely(token)
+                if principal is not None:
+                    self._count("remote")
+        except AuthError as e:
+            self._count("rejected")
+            print(f"[AUTH] Token rejected: {e}")
+            return None
+        except Exception as e:
+            print(f"[AUTH] Verification error: {e}")
+            return None
+
+        if principal is None or not principal.id:
+            self._count("rejected")
+            return None
+        self._cache_put(key, principal)
+        return principal
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._cache), "max_entries": self.max_entries, **self._counters}
+
+    # --- FLASK INTEGRATION ---
+    def current_user(self):
+        """Principal for the current request (resolved once per request, memoized on g)."""
+        if "auth_principal" not in g:
+            token = bearer_token(request.headers.get("Authorization"))
+            g.access_token = token
+            g.auth_principal = self.resolve(token) if token else None
+        return g.auth_principal
+
+    def require_user(self, fn):
+        """Route decorator: 401 unless the bearer token resolves to a user."""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not request.headers.get("Authorization"):
+                return jsonify({"error": "Missing Authorization Header"}), 401
+            if self.current_user() is None:
+                return jsonify({"error": "Unauthorized: Invalid Session"}), 401
+            return fn(*args, **kwargs)
+        return wrapper
+
+    def optional_user(self, fn):
+        """Route decorator: resolves the caller when a token is sent, never rejects."""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            self.current_user()
+            return fn(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,182 @@
+# CONFIG CACHE (admin_settings / system_configs)
+# Strategy: Small, hot config rows are served from process memory with a TTL. Every
+# key carries a version stamp that is bumped on write/invalidate, so a slow DB read
+# that started before an admin update can never overwrite the newer value. Writes go
+# through the cache (DB first, then memory) and are broadcast to the other workers over
+# Redis pub/sub when CONFIG_CACHE_REDIS_URL is set; without it the TTL bounds staleness.
+
+import os
+import json
+import time
+import uuid
+import threading
+
+from api.env import env_float
+
+
+# Marks "row does not exist" so missing keys are cached too (no DB hit per request)
+MISSING = object()
+
+
+class _Entry:
+    __slots__ = ("value", "version", "expires_at")
+
+    def __init__(self, value, version, expires_at):
+        self.value = value
+        self.version = version
+        self.expires_at = expires_at
+
+
+class ConfigCache:
+    """TTL'd, version-stamped in-process cache for config rows, keyed by (namespace, key).
+
+    loader(namespace, key) returns the stored value or MISSING and raises on DB errors.
+    writer(namespace, key, value) persists a value and raises on DB errors.
+    """
+
+    def __init__(self, loader, writer=None, ttl=None, channel_url=None):
+        self.loader = loader
+        self.writer = writer
+        self.ttl = ttl if ttl is not None else env_float("CONFIG_CACHE_TTL", 60.0)
+        self._entries = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "loads": 0, "load_errors": 0, "writes": 0, "invalidations": 0, "remote_invalidations": 0}
+        self._origin = uuid.uuid4().hex
+        self._channel_url = channel_url if channel_url is not None else os.environ.get("CONFIG_CACHE_REDIS_URL")
+        self._channel_name = os.environ.get("CONFIG_CACHE_CHANNEL", "config-cache-invalidate")
+        self._redis = None
+        self._listener = None
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    # --- READS ---
+    def get(self, namespace, key, default=None):
+        """Cached value for (namespace, key); default if the row is missing or unreadable."""
+        ck = (namespace, key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(ck)
+            if entry is not None and entry.expires_at > now:
+                self._counters["hits"] += 1
+                return default if entry.value is MISSING else entry.value
+            self._counters["misses"] += 1
+            version = self._versions.get(ck, 0)
+
+        self._ensure_listener()
+        try:
+            value = self.loader(namespace, key)
+            self._count("loads")
+        except Exception as e:
+            self._count("load_errors")
+            print(f"[CONFIG] Load failed for {namespace}.{key}: {e}")
+            # Serve the last known value rather than nothing while the DB is unhappy
+            if entry is not None and entry.value is not MISSING:
+                return entry.value
+            return default
+
+        with self._lock:
+            # Only store if nobody wrote/invalidated this key while we were reading
+            if self._versions.get(ck, 0) == version:
+                self._entries[ck] = _Entry(value, version, time.time() + self.ttl)
+        return default if value is MISSING else value
+
+    # --- WRITES ---
+    def set(self, namespace, key, value):
+        """Write-through: persist via writer, then update memory and notify other workers.
+
+        Returns whatever the writer returned (e.g. the upsert response).
+        """
+        result = self.writer(namespace, key, value) if self.writer is not None else None
+        ck = (namespace, key)
+        with self._lock:
+            version = self._versions.get(ck, 0) + 1
+            self._versions[ck] = version
+            self._entries[ck] = _Entry(value, version, time.time() + self.ttl)
+            self._counters["writes"] += 1
+        self._publish(namespace, key, version)
+        return result
+
+    def invalidate(self, namespace=None, key=None, broadcast=True):
+        """Drop one key, a whole namespace, or everything."""
+        with self._lock:
+            targets = [ck for ck in list(self._entries) + list(self._versions)
+                       if (namespace is None or ck[0] == namespace) and (key is None or ck[1] == key)]
+            for ck in set(targets):
+                self._entries.pop(ck, None)
+                self._versions[ck] = self._versions.get(ck, 0) + 1
+            self._counters["invalidations"] += 1
+        if broadcast:
+            self._publish(namespace, key, None)
+
+    def version(self, namespace, key):
+        with self._lock:
+            return self._versions.get((namespace, key), 0)
+
+    # --- CROSS-WORKER CHANNEL (optional Redis pub/sub) ---
+    def _connect(self):
+        if self._redis is None and self._channel_url:
+            try:
+                import redis  # optional dependency
+                self._redis = redis.Redis.from_url(self._channel_url)
+            except ImportError:
+                print("[CONFIG] CONFIG_CACHE_REDIS_URL set but redis package missing. Falling back to TTL only.")
+                self._channel_url = None
+            except Exception as e:
+                print(f"[CONFIG] Redis connect failed: {e}")
+        return self._redis
+
+    def _publish(self, namespace, key, version):
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.publish(self._channel_name, json.dumps({"origin": self._origin, "namespace": namespace, "key": key, "version": version}))
+        except Exception as e:
+            print(f"[CONFIG] Invalidation publish failed: {e}")
+
+    def _ensure_listener(self):
+        if self._listener is not None or not self._channel_url:
+            return
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(target=self._listen, name="config-cache-listener", daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        conn = self._connect()
+        if conn is None:
+            return
+        while True:
+            try:
+                pubsub = conn.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel_name)
+                for message in pubsub.listen():
+                    self.handle_message(message.get("data"))
+            except Exception as e:
+                print(f"[CONFIG] Invalidation listener error: {e}")
+                # Anything could have changed while we were disconnected
+                self.invalidate(broadcast=False)
+                time.sleep(5)
+
+    def handle_message(self, raw):
+        try:
+            msg = json.loads(raw)
+        except Exception:
+            return
+        if msg.get("origin") == self._origin:
+            return
+        self.invalidate(msg.get("namespace"), msg.get("key"), broadcast=False)
+        self._count("remote_invalidations")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl": self.ttl,
+                "channel": "redis" if self._channel_url else None,
+                **self._counters,
+            }
@@ -0,0 +1,51 @@
+# REQUEST DEADLINES (Serverless Time Budget)
+# Strategy: An interview turn gets one wall-clock budget when the request starts, sized to
+# stay under the platform's function limit. Each stage asks the deadline how long it may
+# take. LLM timeouts are clamped to what is left. A failed or slow completion is retried
+# once, on the smaller model, only if the budget still has room. TTS that cannot finish in
+# time keeps running in the background and its audio is fetched later. Nothing waits past
+# the budget.
+
+import time
+
+from api.env import env_float
+
+
+# Regular turns (feedback + question + audio) vs. the Auditor turn (final report)
+TURN_BUDGET = env_float("TURN_DEADLINE_SECONDS", 25.0)
+REPORT_BUDGET = env_float("REPORT_DEADLINE_SECONDS", 90.0)
+MIN_CALL_SECONDS = 0.5  # never hand a client a zero / negative timeout
+
+
+class DeadlineExceeded(Exception):
+    """The budget ran out before a required stage could finish."""
+
+
+class Deadline:
+    """Wall-clock budget for one request, consulted by every stage."""
+
+    def __init__(self, budget=None, clock=time.monotonic):
+        self.budget = budget if budget is not None else TURN_BUDGET
+        self._clock = clock
+        self.started = clock()
+        self.stages = []  # (stage, seconds since start when it finished)
+
+    def elapsed(self):
+        return self._clock() - self.started
+
+    def remaining(self, reserve=0.0):
+        """Seconds left after keeping `reserve` back for later stages (never negative)."""
+        return max(0.0, self.budget - self.elapsed() - reserve)
+
+    def allows(self, seconds, reserve=0.0):
+        return self.remaining(reserve) >= seconds
+
+    def clamp(self, seconds, reserve=0.0):
+        """A per-call timeout: `seconds`, cut down to the remaining budget."""
+        return max(MIN_CALL_SECONDS, min(seconds, self.remaining(reserve)))
+
+    def mark(self, stage):
+        self.stages.append((stage, round(self.elapsed(), 3)))
+
+    def summary(self):
+        return {"budget": self.budget, "elapsed": round(self.elapsed(), 3), "stages": dict(self.stages)}
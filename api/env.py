@@ -0,0 +1,20 @@
+# ENVIRONMENT SETTINGS
+# Strategy: Numeric knobs (pool sizes, TTLs, timeouts, budgets) are read from the environment
+# with a code default. A missing or malformed value falls back to the default instead of
+# failing the import, so one bad variable cannot take a worker down.
+
+import os
+
+
+def env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
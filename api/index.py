@@ -1,12 +1,42 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 import os
+import sys
 import json
+import re
 import base64
+from types import SimpleNamespace
 from dotenv import load_dotenv
 load_dotenv()
 if 'OPENAI_API_KEY' not in os.environ and 'OPENAI_API_KEY_' in os.environ:
     os.environ['OPENAI_API_KEY'] = os.environ['OPENAI_API_KEY_']
 
+# Make the project root importable so `api.*` helper modules resolve on Vercel too
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.supabase_registry import registry as supabase_registry
+from api.llm_client import openai_holder
+from api.auth_layer import AuthLayer
+from api.config_cache import ConfigCache, MISSING as MISSING_CONFIG
+from api.llm_cache import LLMCache, backend_from_env as llm_cache_backend
+from api.interview_sessions import SessionStore, session_backend_from_env
+from api.interview_stream import JsonFieldStreamer, sse_event, sse_comment
+from api.speech_pipeline import speech_pipeline
+from api.tts_cache import tts_cache
+from api.audio_store import audio_store
+from api.transcription import read_audio_upload, segment_parts, transcriber, UploadTooLarge, UploadError
+from api.report_pipeline import ReportTask, report_pipeline
+from api.report_template import render_ace_report, normalize_sections, REPORT_SECTION_KEYS
+from api.question_plan import question_planner, parse_questions, BEHAVIORAL_QUESTIONS
+from api.deadline import Deadline, DeadlineExceeded, TURN_BUDGET, REPORT_BUDGET
+from api.prompt_budget import prompt_budget
+from api.resume_digest import ResumeDigests, DIGEST_INSTRUCTIONS, DIGEST_VIEWS, resume_hash, normalize_digest, digest_text
+from api.uat_runner import uat_runner, UAT_QUESTIONS
+from api.job_queue import JobQueue, job_backend_from_env
+from api.matcher import Vocabulary
+from api.scoring import score_answer
+from api.prescreen import prescreen
+from api.normalize import input_normalizer, strip_markup, tidy_text
+from api.resume_sections import resume_sections
+
 # External libs will be lazy imported to prevent boot crashes
 # from supabase import create_client, Client
 # import stripe
@@ -31,6 +61,38 @@ def track_cost_chat(response, model, action="Unknown"):
         print(f"[COST] Action: {action} | Model: {model} | Input: {in_tokens} | Output: {out_tokens} | Cost: ${cost:.5f}")
     except: pass
 
+def project_cost_chat(model, action, *texts):
+    """Projected input cost before the call (tokens counted locally)."""
+    try:
+        in_tokens = sum(prompt_budget.count(text) for text in texts)
+        rates = PRICING.get(model, PRICING["gpt-4o"])
+        print(f"[COST] Projected: {action} | Model: {model} | Input: ~{in_tokens} | Cost: ${(in_tokens / 1_000_000) * rates['input']:.5f}")
+    except: pass
+
+def fit_prompt(action, **sections):
+    """Resume / JD / free-text sections cleaned for the prompt (repeated lines dropped) and
+    trimmed to the action's token budget. The caller's values (the stored copies) are untouched."""
+    cleaned = {
+        name: input_normalizer.for_prompt(text, name if name in ("resume", "jd") else "text")
+        for name, text in sections.items()
+    }
+    fitted, report = prompt_budget.fit(action, cleaned)
+    for name, (before, after) in report["trimmed"].items():
+        print(f"[BUDGET] {action}: {name} trimmed {before} -> {after} tokens")
+    for name, lines in report["boilerplate"].items():
+        print(f"[BUDGET] {action}: {name} over budget, {lines} boilerplate lines left out")
+    return fitted
+
+# --- INPUT NORMALIZATION (free-text JSON fields tidied once at ingress, every route) ---
+INPUT_NORMALIZE_ENABLED = os.environ.get("INPUT_NORMALIZE", "1") == "1"
+
+@app.before_request
+def normalize_request_body():
+    # get_json caches the parsed body, so every later request.json sees the tidied fields.
+    # Whitespace / invisible characters only: routes store these fields as sent.
+    if INPUT_NORMALIZE_ENABLED and request.is_json:
+        input_normalizer.normalize_body(request.get_json(silent=True))
+
 def track_cost_audio(text, model, action="TTS"):
     try:
         cost = (len(text) / 1000) * PRICING.get(model, {"char": 0.030})["char"]
@@ -54,11 +116,9 @@ def health_check():
 def send_sms_notification(message, category="Alert"):
     """Sends an SMS via email gateway to the admin using settings from DB."""
     try:
-        admin_supabase = get_admin_supabase()
-        # Use a list select and safe indexing instead of .single() to avoid exceptions if empty
-        res = admin_supabase.table('admin_settings').select('value').eq('key', 'notification_settings').execute()
+        settings = get_admin_setting('notification_settings')
         
-        if not res.data or len(res.data) == 0:
+        if not settings:
             print("[SMS] Settings not found in DB. Using defaults.")
             settings = {
                 "phone_number": "8649099115",
@@ -66,8 +126,6 @@ def send_sms_notification(message, category="Alert"):
                 "notify_on_signup": True,
                 "notify_on_complaint": True
             }
-        else:
-            settings = res.data[0]['value']
 
         # Check if this category is enabled
         if category == "signup" and not settings.get("notify_on_signup", True):
@@ -138,14 +196,15 @@ def auth_signup():
         print(f"[AUTH] Target: {email} | Source: {referral}")
         
         # 1. Initialize Supabase (Anon/Standard)
-        supabase = get_supabase()
+        # sign_up stores the new session on the client, so it must not touch the shared one
+        supabase = get_isolated_supabase()
         admin_supabase = get_admin_supabase()
         
         # Check promo settings for free interview
-        promo_res = admin_supabase.table('admin_settings').select('value').eq('key', 'promo_settings').execute()
+        promo_settings = get_admin_setting('promo_settings') or {}
         free_interview = False
-        if promo_res.data and 'free_interview' in promo_res.data[0]['value']:
-            free_interview = promo_res.data[0]['value']['free_interview']
+        if 'free_interview' in promo_settings:
+            free_interview = promo_settings['free_interview']
             
         credits_interview_to_grant = 1 if free_interview else 0
         
@@ -266,7 +325,7 @@ def auth_update_password():
         if not new_password or not access_token:
             return jsonify({"error": "Missing required fields"}), 400
             
-        supabase = get_supabase()
+        supabase = get_isolated_supabase()
         
         # 1. Set the session using the recovery token
         try:
@@ -288,166 +347,204 @@ def auth_update_password():
         print(f"Update Password Critical Error: {e}")
         return jsonify({"error": str(e)}), 500
 
-# 1. SETUP SUPABASE (Lazy Loader)
+# 1. SETUP SUPABASE (Pooled, built once per worker)
 def get_supabase():
-    from supabase import create_client, Client
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_KEY")
-    return create_client(url, key)
+    return supabase_registry.anon()
 
 # 1B. SETUP ADMIN SUPABASE (Service Role)
 def get_admin_supabase():
-    from supabase import create_client, Client
-    url = os.environ.get("SUPABASE_URL")
-    # CRITICAL: Use Service Role Key to bypass RLS
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if not key:
-        print("CRITICAL WARNING: SUPABASE_SERVICE_ROLE_KEY is missing. Falling back to ANON key (RLS will likely block data).")
-        key = os.environ.get("SUPABASE_KEY")
-    return create_client(url, key)
-
-# 1C. SETUP OPENAI CLIENT
+    # CRITICAL: Service Role Key bypasses RLS (registry falls back to ANON with a warning)
+    return supabase_registry.service()
+
+# 1B-2. USER-SCOPED VIEW (RLS as the caller, shares the worker's connection pool)
+def get_user_supabase(token):
+    return supabase_registry.user(token)
+
+# 1B-3. ISOLATED CLIENT (sign_up / set_session mutate client state - never share these)
+def get_isolated_supabase():
+    return supabase_registry.isolated()
+
+# 1C. SETUP OPENAI CLIENT (Shared keep-alive pool, built once per worker)
 def get_openai_client():
-    from openai import OpenAI
-    key = os.environ.get("OPENAI_API_KEY")
-    return OpenAI(api_key=key)
+    return openai_holder.client()
+
+# 1C-2. PER-ACTION TIMEOUT (connect/read budget passed explicitly on every call)
+def openai_timeout(action, deadline=None, reserve=0.0):
+    return openai_holder.timeout_for(action, deadline, reserve)
+
+# 1C-3. AUTH LAYER (Local JWT verification + TTL'd principal cache, GoTrue fallback)
+def _gotrue_lookup(token):
+    user_res = get_supabase().auth.get_user(token)
+    return user_res.user if user_res else None
+
+auth_layer = AuthLayer(remote_lookup=_gotrue_lookup)
+require_user = auth_layer.require_user
+optional_user = auth_layer.optional_user
+
+def get_current_user():
+    """Principal (id, email, role) for this request's bearer token, or None."""
+    return auth_layer.current_user()
+
+# 1C-4. CONFIG CACHE (admin_settings / system_configs served from memory, write-through)
+CONFIG_TABLES = {
+    # namespace: (table, key column, value column)
+    "admin_settings": ("admin_settings", "key", "value"),
+    "system_configs": ("system_configs", "config_key", "config_value"),
+}
+
+def _load_config_row(namespace, key):
+    table, key_col, val_col = CONFIG_TABLES[namespace]
+    res = get_admin_supabase().table(table).select(val_col).eq(key_col, key).execute()
+    if not res.data:
+        return MISSING_CONFIG
+    return res.data[0][val_col]
+
+def _write_config_row(namespace, key, value):
+    table, key_col, val_col = CONFIG_TABLES[namespace]
+    return get_admin_supabase().table(table).upsert([{
+        key_col: key,
+        val_col: value,
+        "updated_at": "now()"
+    }], on_conflict=key_col).execute()
+
+config_cache = ConfigCache(loader=_load_config_row, writer=_write_config_row)
+
+def get_admin_setting(key, default=None):
+    return config_cache.get("admin_settings", key, default)
+
+def get_system_config(key, default=None):
+    return config_cache.get("system_configs", key, default)
+
+# 1C-5. LLM RESPONSE CACHE (extraction actions keyed by content hash, shared backend)
+# Bump an action's version whenever its prompt, model or output shape changes.
+LLM_PROMPT_VERSIONS = {
+    "analyze_jd": "v1",
+    "generate_intel": "v1",
+    "parse_resume": "v1",
+    "analyze_resume": "v1",
+    "linkedin_optimize": "v1",
+    "resume_digest": "v1",
+}
+
+llm_cache = LLMCache(backend=llm_cache_backend(get_admin_supabase))
+
+def cached_llm_result(action, model, inputs, compute):
+    """compute() result for these inputs, reusing a cached one when available. Returns (value, hit)."""
+    value, hit = llm_cache.get_or_compute(action, model, LLM_PROMPT_VERSIONS[action], inputs, compute)
+    if hit:
+        print(f"[LLM CACHE] Hit: {action} ({model}) - completion skipped")
+    return value, hit
+
+# 1C-5B. RESUME DIGESTS (compact roles / wins / skills per resume hash, stored in the LLM cache)
+RESUME_DIGEST_ENABLED = os.environ.get("RESUME_DIGEST", "1") == "1"
+
+def _lookup_resume_digest(digest_hash):
+    return llm_cache.get("resume_digest", "gpt-4o-mini", LLM_PROMPT_VERSIONS["resume_digest"], {"resume_hash": digest_hash})
+
+def compute_resume_digest(resume_text):
+    """Blocking digest extraction (gpt-4o-mini), shared across workers via the LLM cache."""
+    def run_digest():
+        resume = fit_prompt('parse_resume', resume=resume_text)["resume"]
+        project_cost_chat("gpt-4o-mini", "Resume Digest", DIGEST_INSTRUCTIONS, resume)
+        completion = get_openai_client().chat.completions.create(
+            model="gpt-4o-mini",
+            timeout=openai_timeout("resume_digest"),
+            messages=[
+                {"role": "system", "content": DIGEST_INSTRUCTIONS},
+                {"role": "user", "content": f"RESUME:\n{resume}"}
+            ],
+            response_format={"type": "json_object"}
+        )
+        track_cost_chat(completion, "gpt-4o-mini", "Resume Digest")
+        digest = normalize_digest(json.loads(completion.choices[0].message.content))
+        if not (digest["roles"] or digest["skills"] or digest["education"]):
+            # Never cache (or prompt with) an empty digest in place of the resume
+            raise ValueError("Resume digest came back empty")
+        return digest
+
+    digest, _ = cached_llm_result("resume_digest", "gpt-4o-mini", {"resume_hash": resume_hash(resume_text)}, run_digest)
+    return digest
+
+resume_digests = ResumeDigests(lookup=_lookup_resume_digest, compute=compute_resume_digest)
+
+def resume_for_prompt(resume_text, view="digest"):
+    """Resume text for a prompt. view='full' is the text as sent; view='digest' uses the stored
+    digest when there is one and otherwise starts computing it, sending the full text this
+    time (never waits)."""
+    if view == "full" or view not in DIGEST_VIEWS or not RESUME_DIGEST_ENABLED or not (resume_text or "").strip():
+        return resume_text
+    digest = resume_digests.get(resume_digests.ensure(resume_text))
+    return digest_text(digest) if digest else resume_text
+
+# 1C-6. INTERVIEW SESSIONS (turn state kept server-side, clients send only session_id + answer)
+interview_sessions = SessionStore(backend=session_backend_from_env(get_admin_supabase))
+
+def current_user_id():
+    try:
+        user = get_current_user()
+        return user.id if user else None
+    except Exception as e:
+        print(f"Session Owner Lookup Error: {e}")
+        return None
+
+# 1C-7. ASYNC JOBS (slow AI actions run on the job pool; clients poll /api/tasks/<id>)
+job_queue = JobQueue(backend=job_backend_from_env(get_admin_supabase))
+
+# {route path: actions that accept "async": true}; None = every request to that route
+ASYNC_ACTIONS = {
+    "/api": {"optimize", "analyze_resume", "cover_letter", "generate_report"},
+    "/api/get-feedback": None,
+    "/api/generate-strategy-tool": None,
+}
 
-# 1D. RUBRIC SCORING ENGINE (v13.0 - Option B Enhanced: 2/3/4 System)
+def wants_async(data, action=None):
+    if not (isinstance(data, dict) and data.get('async')) or data.get('stream'):
+        return False
+    actions = ASYNC_ACTIONS.get(request.path, set())
+    return actions is None or action in actions
+
+def job_response(job):
+    body = {"job_id": job["job_id"], "action": job["action"], "status": job["status"],
+            "status_url": f"/api/tasks/{job['job_id']}", "result_url": f"/api/tasks/{job['job_id']}/result"}
+    if job["status"] == "failed":
+        body["error"] = job["error"]
+    return body
+
+def submit_async_job(action, data, path=None):
+    """202 + job id now; the same request (minus "async") is replayed on a job worker with
+    the caller's Authorization header. Idempotency-Key header / job_key pick the job id."""
+    payload = {k: v for k, v in data.items() if k not in ('async', 'job_key')}
+    path = path or request.path
+    headers = {'Authorization': request.headers['Authorization']} if request.headers.get('Authorization') else {}
+
+    def run():
+        with app.test_request_context(path, method='POST', json=payload, headers=headers):
+            response = app.make_response(app.full_dispatch_request())
+        return {"status_code": response.status_code, "body": response.get_json(silent=True)}
+
+    key = request.headers.get('Idempotency-Key') or data.get('job_key')
+    job, created = job_queue.submit(f"{path}:{action}" if action else path, payload, run, owner=current_user_id(), key=key)
+    print(f"[JOBS] {'Queued' if created else 'Reused'} {job['action']} job {job['job_id']}")
+    return jsonify(job_response(job)), 202
+
+# 1D. RUBRIC SCORING ENGINE (strategy registry in api/scoring; SCORING_STRATEGY picks the active one)
 def calculate_rubric_score(rubric_data, question_index, answer_text):
-    """
-    Option B Enhanced: 2/3/4 scoring with generous STAR recognition
-    - 1 = Red Flag (toxic, unethical)
-    - 2 = Weak (missing STAR, vague)
-    - 3 = Competent (clear structure)
-    - 4 = Strong/Exceptional (STAR + metrics)
-    Returns: (score, gap_reason)
-    """
-    import re
-    
-    checklist = rubric_data.get("checklist", {})
-    
-    # RED FLAG OVERRIDE (Always 1)
-    if checklist.get("red_flags") == True:
-        return 1, "Toxic Behavior Detected"
-    
-    # AGGRESSIVE METRIC SCANNER (Backend Safety Net)
-    metric_patterns = [
-        r'\$\d+',  # Dollar amounts
-        r'\d+(\.\d+)?%',  # Percentages
-        r'\d+[KMB]',  # 35M, 22K, etc.
-        r'\b\d+\s*(million|billion|thousand)\b',  # Written numbers
-        r'\bzero\s+(incidents|errors|failures)\b',  # Zero incidents
-        r'\b100%\s+(compliance|accuracy)\b',  # Perfect compliance
-        r'\b\d+\+\s+(systems|clients|users)\b',  # 300+ systems
-    ]
-    
-    business_keywords = [
-        'ebitda', 'revenue', 'roi', 'profit', 'margin', 'savings', 
-        'growth', 'efficiency', 'reduction', 'increase', 'cost'
-    ]
-    
-    answer_lower = answer_text.lower()
-    has_metrics = checklist.get("has_metrics", False)
-    
-    # Backend metric override
-    if not has_metrics:
-        for pattern in metric_patterns:
-            if re.search(pattern, answer_text, re.IGNORECASE):
-                has_metrics = True
-                break
-        
-        if not has_metrics:
-            for keyword in business_keywords:
-                if keyword in answer_lower and re.search(r'\d+', answer_text):
-                    has_metrics = True
-                    break
-    
-    # Q1/Q2 (Background) Logic
-    if question_index == "Q1" or question_index == "Q2":
-        has_relevant = checklist.get("relevant_history", False)
-        is_clear = checklist.get("communicated_clearly", False)
-        
-        if not has_relevant:
-            return 2, None  # Weak background
-        elif has_metrics:
-            return 4, None  # Strong background with metrics
-        elif is_clear:
-            return 3, None  # Competent background
-        else:
-            return 2, None  # Weak
-    
-    # Q3-Q7 (Behavioral) - 2/3/4 SYSTEM WITH BACKEND VALIDATION
-    else:
-        has_star_s = checklist.get("star_situation", False)
-        has_star_a = checklist.get("star_action", False)
-        has_star_r = checklist.get("star_result", False)
-        is_organized = checklist.get("delivery_organized", False)
-        
-        # BACKEND VALIDATION (override if AI missed obvious keywords)
-        if not has_star_a:
-            action_keywords = [
-                'led', 'managed', 'built', 'created', 'developed', 'implemented',
-                'designed', 'facilitated', 'recruited', 'supervised', 'organized',
-                'coordinated', 'established', 'worked on', 'collaborated', 'used',
-                'made', 'helped'
-            ]
-            if any(word in answer_lower for word in action_keywords):
-                has_star_a = True
-        
-        if not has_star_r:
-            result_keywords = [
-                'result', 'outcome', 'achieved', 'delivered', 'generated',
-                'increased', 'reduced', 'improved', 'successful', 'completed',
-                'finished', 'done', 'worked', 'helped', 'useful', 'appreciated'
-            ]
-            if any(word in answer_lower for word in result_keywords):
-                has_star_r = True
-        
-        complete_star = has_star_s and has_star_a and has_star_r
-        partial_star = has_star_a and has_star_r  # A+R is good enough
-        
-        # 2/3/4 TIERED SCORING
-        if (complete_star or partial_star) and has_metrics:
-            return 4, None  # Strong/Exceptional: STAR + Metrics
-        elif complete_star or partial_star:
-            return 3, None  # Competent: Good STAR structure
-        elif has_star_a or (is_organized and has_star_r):
-            return 3, None  # Competent: At least organized with some structure
-        else:
-            return 2, None  # Weak: Missing critical elements
+    """Score one answer with the active strategy. Returns: (score, gap_reason)"""
+    return score_answer(rubric_data, question_index, answer_text)
 
 # 3. THE JOBS ROUTE (Secure Mode)
 @app.route('/api/jobs', methods=['GET', 'POST'])
+@require_user
 def manage_jobs():
     import traceback
-    # 1. Extract Token
-    auth_header = request.headers.get('Authorization')
-    if not auth_header:
-        return jsonify({"error": "Missing Authorization Header"}), 401
-    
-    try:
-        token = auth_header.split(" ")[1]
-    except IndexError:
-        return jsonify({"error": "Invalid Token Format"}), 401
-
-    # 2. Verify User (Gatekeeper)
-    # Use the global client to verify the token is valid and get the ID.
-    try:
-        supabase = get_supabase()
-        user_response = supabase.auth.get_user(token)
-        if not user_response or not user_response.user:
-            return jsonify({"error": "Unauthorized: Invalid Session"}), 401
-        user_id = user_response.user.id
-    except Exception as e:
-        print(f"Auth Verification Failed: {e}")
-        return jsonify({"error": "Unauthorized"}), 401
+    # 1-2. Token + User verified by @require_user (local JWT check, cached per token)
+    token = g.access_token
+    user_id = get_current_user().id
         
     # 3. Create RLS-Compatible Client
-    # We create a new client and explicitly set the auth token for PostgREST.
+    # Cheap per-request PostgREST view carrying the user's token (no new client).
     try:
-        user_client = get_supabase()
-        user_client.postgrest.auth(token)
-        
+        user_client = get_user_supabase(token)
     except Exception as e:
         print(f"Client Handshake Error: {e}")
         return jsonify({"error": f"Server Error: {str(e)}"}), 500
@@ -592,13 +689,8 @@ def update_admin_settings():
         if not key or value is None:
             return jsonify({"error": "Key and Value are required"}), 400
             
-        supabase = get_admin_supabase()
-        # Use list for upsert which is more standard
-        res = supabase.table('admin_settings').upsert([{
-            "key": key,
-            "value": value,
-            "updated_at": "now()"
-        }], on_conflict="key").execute()
+        # Write-through: DB upsert, then refresh this worker's cache and notify the others
+        res = config_cache.set("admin_settings", key, value)
         
         return jsonify(res.data), 200
     except Exception as e:
@@ -609,10 +701,9 @@ def update_admin_settings():
 def get_public_feature_flags():
     """Public route to check enabled features."""
     try:
-        supabase = get_admin_supabase()
-        res = supabase.table('admin_settings').select('value').eq('key', 'feature_flags').execute()
-        if res.data:
-            return jsonify(res.data[0]['value']), 200
+        flags = get_admin_setting('feature_flags')
+        if flags:
+            return jsonify(flags), 200
         return jsonify({}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -638,8 +729,7 @@ def update_job(job_id):
     
     try:
         token = auth_header.split(" ")[1]
-        user_client = get_supabase()
-        user_client.postgrest.auth(token)
+        user_client = get_user_supabase(token)
         
         # Verify ownership implicitly via RLS
         data = request.json
@@ -664,18 +754,15 @@ def update_job(job_id):
 
 # 5. GENERATE INTEL (POST) - AI Powered
 @app.route('/api/generate-intel', methods=['POST'])
+@require_user
 def generate_intel():
-    # 1. Auth Check
-    auth_header = request.headers.get('Authorization')
-    if not auth_header: return jsonify({"error": "Unauthorized"}), 401
-
+    # 1. Auth: enforced by @require_user
     try:
-        from openai import OpenAI
         OPENAI_KEY = os.environ.get("OPENAI_API_KEY")
         if not OPENAI_KEY:
              return jsonify({"error": "Server Config Error: Missing AI Key"}), 500
         
-        client = OpenAI(api_key=OPENAI_KEY)
+        client = get_openai_client()
 
         data = request.json
         jd_text = data.get('job_description', '')
@@ -694,17 +781,20 @@ def generate_intel():
             f"Format the output as a clean, concise list."
         )
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert executive career coach."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
-        )
-        track_cost_chat(response, "gpt-4o", "Generate Intel")
+        def run_intel():
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                timeout=openai_timeout("generate_intel"),
+                messages=[
+                    {"role": "system", "content": "You are an expert executive career coach."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7
+            )
+            track_cost_chat(response, "gpt-4o", "Generate Intel")
+            return response.choices[0].message.content
 
-        ai_intel = response.choices[0].message.content
+        ai_intel, _ = cached_llm_result("generate_intel", "gpt-4o", {"job_description": jd_text}, run_intel)
         
         return jsonify({"intel": ai_intel}), 200
 
@@ -723,11 +813,10 @@ def analyze_jd():
              return jsonify({"role": "Target Role", "company": "Target Company", "summary": "No context provided."}), 200
 
         # OpenAI Call
-        from openai import OpenAI
         OPENAI_KEY = os.environ.get("OPENAI_API_KEY")
         if not OPENAI_KEY: return jsonify({"error": "Missing AI Key"}), 500
         
-        client = OpenAI(api_key=OPENAI_KEY)
+        client = get_openai_client()
         
         prompt = (
             f"Analyze this Job Description:\n{jd_text}\n\n"
@@ -737,17 +826,23 @@ def analyze_jd():
             f"- summary: A 3-sentence summary of the main responsibilities"
         )
 
-        completion = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a data extraction assistant. Output valid JSON only."}, 
-                {"role": "user", "content": prompt}
-            ],
-            response_format={ "type": "json_object" }
-        )
-        track_cost_chat(completion, "gpt-4o", "Analyze JD")
+        def run_analysis():
+            completion = client.chat.completions.create(
+                model="gpt-4o",
+                timeout=openai_timeout("analyze_jd"),
+                messages=[
+                    {"role": "system", "content": "You are a data extraction assistant. Output valid JSON only."}, 
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={ "type": "json_object" }
+            )
+            track_cost_chat(completion, "gpt-4o", "Analyze JD")
+            # Parsed before caching so a malformed reply is never stored
+            return json.loads(completion.choices[0].message.content)
+
+        result, _ = cached_llm_result("analyze_jd", "gpt-4o", {"job_description": jd_text}, run_analysis)
         
-        return jsonify(json.loads(completion.choices[0].message.content)), 200
+        return jsonify(result), 200
 
     except Exception as e:
         print(f"Intel Error: {e}")
@@ -758,28 +853,1125 @@ def analyze_jd():
 # ------------------------------------------------------------------------------
 def sanitize_input(text):
     if not text: return None
+    # 1. Strip Brackets [] or <> (System tags)  2. Remove System Artifacts/Prompt Injections
+    # (one linear pass each, see api/normalize.py), then the ingress tidy-up for direct callers
+    clean, _ = tidy_text(strip_markup(text))
+    return clean if clean else "Null Input"
+
+# ------------------------------------------------------------------------------
+# HELPER: Interview Question Plan (behavioral questions written once at isStart)
+# ------------------------------------------------------------------------------
+# "0" keeps the legacy flow where every turn also invents the next question
+QUESTION_PLAN_ENABLED = os.environ.get("INTERVIEW_QUESTION_PLAN", "1") == "1"
+# Seconds a turn waits for a plan that is still generating before falling back
+QUESTION_PLAN_WAIT = float(os.environ.get("INTERVIEW_QUESTION_PLAN_WAIT", "3"))
+
+# Scripted transitions (also pinned as cached speech, see SCRIPTED_SPEECH)
+STAR_TRANSITION = "Thank you for sharing your background. For the next several questions, I am going to ask for specific situational examples from your career. To provide the best answers, please follow the STAR method: Situation, Task, Action, and Result."
+NEXT_QUESTION_LEAD = "The next question that I have for you is..."
+FINAL_QUESTION_LEAD = "The final question I have for you is..."
+CLOSING_STATEMENT = "Thank you for completing the interview. We appreciate your time and insights today. Please stand by while the final report is generated."
+
+def question_plan_messages(ctx):
+    return [
+        {"role": "system", "content": (
+            "Role: You are an Elite Executive Search Consultant preparing a behavioral interview.\n"
+            f"SENIORITY: {ctx['seniority_level']}\n"
+            f"ARCHETYPE: {ctx['persona_role']}\n{ctx['archetype_rubric']}\n"
+            f"CONTEXT:\nTarget Role: {ctx['role_title']}\nJob Description: {ctx['job_posting']}\n"
+            f"Candidate Resume: {ctx['resume_text']}\nIntel: {ctx['interviewer_intel']}"
+        )},
+        {"role": "user", "content": (
+            f"Write the {BEHAVIORAL_QUESTIONS} behavioral questions for this interview, in the order they will be asked. "
+            "Cover: Conflict, Failure, Strategy, Leadership, and one challenge specific to this job description. "
+            "Each question asks for a specific situational example (STAR), pitched at the seniority level above, "
+            "and is one or two sentences of plain spoken text with no numbering or preamble.\n"
+            'Output JSON: {"questions": ["...", "...", "...", "...", "..."]}'
+        )},
+    ]
+
+def planned_next_question(plan, real_q_num):
+    """Server-side next_question for answer turn `real_q_num` (1-6), exactly as the protocol phrases it."""
+    if real_q_num == 1:
+        return f"{STAR_TRANSITION} {plan[0]}"
+    if real_q_num in [2, 3, 4]:
+        return f"{NEXT_QUESTION_LEAD} {plan[real_q_num - 1]}"
+    if real_q_num == 5:
+        return f"{FINAL_QUESTION_LEAD} {plan[4]}"
+    return CLOSING_STATEMENT
+
+def start_question_plan(client, session):
+    """Generate the plan in the background, then pre-synthesize each question's audio."""
+    ctx = session["context"]
+    voice = session.get("voice") or "alloy"
+
+    def generate():
+        completion = client.chat.completions.create(
+            model="gpt-4o",
+            timeout=openai_timeout("question_plan"),
+            messages=question_plan_messages(ctx),
+            response_format={ "type": "json_object" }
+        )
+        track_cost_chat(completion, "gpt-4o", "Interview Question Plan")
+        return parse_questions(json.loads(completion.choices[0].message.content))
+
+    def prewarm(plan):
+        # Fills the TTS cache, so each turn only synthesizes its feedback
+        for real_q_num in range(1, BEHAVIORAL_QUESTIONS + 1):
+            turn_speech_job(client, voice, planned_next_question(plan, real_q_num)).wait()
+        print(f"[PLAN] Questions ready and pre-synthesized for session {session['id'][:6]}...")
+
+    question_planner.start(session["id"], generate, prewarm)
+
+def session_question_plan(session):
+    """The session's plan, resolved once: later turns keep whichever flow the first answer used."""
+    if "plan" not in session:
+        session["plan"] = question_planner.get(session["id"], timeout=QUESTION_PLAN_WAIT)
+        question_planner.discard(session["id"])
+    return session["plan"]
+
+# ------------------------------------------------------------------------------
+# HELPER: Scripted Interview Opening (isStart served from templates, no LLM round trip)
+# ------------------------------------------------------------------------------
+# "0" sends the opening through the model again (legacy "say exactly" prompt)
+OPENING_FAST_PATH = os.environ.get("INTERVIEW_OPENING_FAST_PATH", "1") == "1"
+
+OPENING_GREETING = "Hello, and welcome. Thank you for joining me today. I am the Hiring Manager for the position."
+OPENING_OVERVIEW = "To give you an overview of our session: First, I'll ask for a high level overview of your background, and then we will dive into specific situational examples."
+OPENING_QUESTION = "Let's get started. Walk me through your background and why you are the right fit for this role?"
+# Values the browser sends when the JD analysis found no role/company
+OPENING_PLACEHOLDERS = {"", "candidate", "this role", "the company", "a dynamic company", "unknown company", "unknown"}
+
+def opening_name(value):
+    value = re.sub(r'[<>{}\[\]"]', '', re.sub(r'\s+', ' ', str(value or ''))).strip().strip('.')
+    return "" if value.lower() in OPENING_PLACEHOLDERS or len(value) > 80 else value
+
+def opening_text(data):
+    """Greeting + overview + Q1. Only the Hiring Manager sentence is personalized, so the
+    rest is always served from the pre-synthesized scripted audio."""
+    role = opening_name(data.get('role_title') or data.get('job_title'))
+    company = opening_name(data.get('company_name') or data.get('companyName'))
+    greeting = OPENING_GREETING
+    if role or company:
+        position = f"the {role} position" if role else "the position"
+        if company:
+            position += f" at {company}"
+        greeting = greeting.replace("the position", position)
+    return f"{greeting} {OPENING_OVERVIEW} {OPENING_QUESTION}"
+
+def opening_response_text(turn):
+    """The opening turn's model-shaped JSON, so finalize_turn_json treats it like any turn."""
+    return json.dumps({"feedback": "", "checklist": {}, "next_question": turn["opening"]})
+
+# ------------------------------------------------------------------------------
+# HELPER: Answer Pre-Screen (non-answers / ultra-short / repeats answered without the model)
+# ------------------------------------------------------------------------------
+# "0" sends every answer to the model again
+PRESCREEN_ENABLED = os.environ.get("INTERVIEW_PRESCREEN", "1") == "1"
+# Borderline (low confidence) answers get short coaching, so their completion is capped.
+# The model defaults to the regular turn model; set it to route them elsewhere.
+PRESCREEN_LOW_CONFIDENCE_MODEL = os.environ.get("PRESCREEN_LOW_CONFIDENCE_MODEL", "gpt-4o-mini")
+PRESCREEN_LOW_CONFIDENCE_MAX_TOKENS = int(os.environ.get("PRESCREEN_LOW_CONFIDENCE_MAX_TOKENS", "400"))
+
+def screen_interview_turn(message, history, real_q_num, planned_next):
+    """(screen, local_reply) for answer turns Q1-Q6. local_reply is the turn's model-shaped JSON
+    when it can be answered locally, which needs the next question without the model (question
+    plan, or the scripted closing after Q6). Otherwise a screened answer is only low confidence."""
+    screen = prescreen.screen(message, history, real_q_num)
+    if screen.verdict != "local":
+        return screen, None
+    next_question = planned_next or (CLOSING_STATEMENT if real_q_num == 6 else None)
+    prescreen.answered(local=bool(next_question))
+    if not next_question:
+        return screen._replace(verdict="model", low_confidence=True), None
+    print(f"[PRESCREEN] Q{real_q_num} answered locally ({screen.reason})")
+    return screen, json.dumps({"feedback": screen.feedback, "checklist": {}, "next_question": next_question})
+
+# ------------------------------------------------------------------------------
+# HELPER: Interview Turn Pipeline (shared by the JSON and SSE variants of get-feedback)
+# ------------------------------------------------------------------------------
+# Plain-text turn fields streamed to SSE clients as they generate
+STREAMED_TURN_FIELDS = ("feedback", "next_question")
+BRIEF_ANSWER_NOTE = " (Note: Answer was too brief for full credit.)"
+
+# Seniority + archetype vocabularies (whole words; "HEAD" no longer matches "HEADQUARTERS")
+SENIORITY_TERMS = Vocabulary(
+    {t: "strategic" for t in ["senior", "lead", "leader", "manager"]} |
+    {t: "vision" for t in ["director", "vp", "svp", "evp", "avp", "head", "chief", "c-level", "executive"]},
+    inflect=('s',)
+)
+ARCHETYPE_TERMS = Vocabulary(
+    {t: "guardian" for t in ["hospitality", "safety", "guest", "patient", "medical", "school", "nurse", "nursing", "doctor", "clinic"]} |
+    {t: "steward" for t in ["bank", "audit", "auditor", "compliance", "accountant", "accounting", "risk", "legal", "cfo", "attorney"]} |
+    {t: "growth" for t in ["startup", "growth", "vc", "speed", "product", "tech", "technology", "technologies", "saas", "sales", "marketing"]},
+    inflect=('s', 'ing', 'er', 'ers', 'al')
+)
+
+def interview_context(data):
+    """Per-interview constants (role, JD, resume, intel, seniority scale, archetype).
+    Computed once at isStart when a server-side session is used."""
+    job_posting = data.get('jobPosting', '')
+    resume_text = data.get('resumeText', '')
+
+    # DYNAMIC RUBRIC Logic
+    # Question 2 evaluates the answer to Q1 (Background/Intro). 
+    # Questions 3+ evaluate STAR answers.
+    
+    # Prepare variables
+    interviewer_intel = str(data.get('interviewer_intel') or '')
+    role_title = str(data.get('job_title') or 'Candidate')
+    
+    # ---------------------------------------------------------
+    # ACE INTERVIEW MASTER PROTOCOL v6.0 (Hardliner & Anchoring)
+    # ---------------------------------------------------------
+    
+    # [PHASE 1: INITIALIZATION & ARCHETYPE]
+    # Set Seniority Scale
+    seniority_level = {
+        "vision": "Vision, Culture, & ROI Dominance",
+        "strategic": "Strategic Ownership",
+    }.get(SENIORITY_TERMS.first_label(role_title, ("vision", "strategic")), "Tactical Execution (Junior/Mid)")
+
+    # Set Archetype
+    context_text = role_title + " " + interviewer_intel
+    persona_role = "The Ace Evaluator (Standard Corporate)"
+    archetype_rubric = "Core Value: Structure & Competence. Reward STAR structure."
+    archetype = ARCHETYPE_TERMS.first_label(context_text, ("guardian", "steward", "growth"))
+
+    if archetype == "guardian":
+        persona_role = "The Guardian (Safety & Culture First)"
+        archetype_rubric = (
+            "Core Value: Protection of People.\n"
+            "Kill Switch: Sacrificing safety for speed/money is an IMMEDIATE FAIL (Score 1)."
+        )
+    elif archetype == "steward":
+        persona_role = "The Steward (Accuracy & Risk Management)"
+        archetype_rubric = (
+            "Core Value: Accuracy, Stability, Compliance.\n"
+            "Kill Switch: Guessing or 'Moving Fast' without controls is an IMMEDIATE FAIL (Score 1)."
+        )
+    elif archetype == "growth":
+        persona_role = "The Growth Operator (Speed & ROI)"
+        archetype_rubric = (
+            "Core Value: Speed, Action, Revenue.\n"
+            "Kill Switch: Citing 'policy' as an excuse for inaction is a FAIL."
+        )
+
+    # Turns only need who the candidate is: the resume digest, once it has been computed
+    resume_view = data.get('resume_view', 'digest')
+    prompt_resume = resume_for_prompt(resume_text, resume_view)
+
+    # Sent with every turn, so sized once here (the archetype above still sees the full intel)
+    fitted = fit_prompt('interview_turn', resume=prompt_resume, jd=job_posting, intel=interviewer_intel)
+    return {
+        "job_posting": fitted["jd"],
+        "resume_text": fitted["resume"],
+        "interviewer_intel": fitted["intel"],
+        "role_title": role_title,
+        "seniority_level": seniority_level,
+        "persona_role": persona_role,
+        "archetype_rubric": archetype_rubric,
+        # Digest still computing: later session turns swap it in (see session_resume_digest)
+        "resume_digest_pending": resume_hash(resume_text) if RESUME_DIGEST_ENABLED and resume_view == 'digest' and prompt_resume is resume_text and (resume_text or '').strip() else None,
+    }
+
+def session_resume_digest(ctx):
+    """Swap the full resume in a session's context for its digest once the digest is stored."""
+    pending = ctx.get("resume_digest_pending")
+    if not pending:
+        return
+    digest = resume_digests.get(pending)
+    if digest:
+        ctx["resume_text"] = fit_prompt('interview_turn', resume=digest_text(digest))["resume"]
+        ctx["resume_digest_pending"] = None
+        print("[DIGEST] Interview context switched to the resume digest")
+
+def build_interview_turn(data, message, session=None):
+    """Prompt + model selection for one interview turn. Returns the turn context dict.
+    With a session, context and history come from the server instead of the request body."""
+    ctx = session["context"] if session else interview_context(data)
+    if session:
+        session_resume_digest(ctx)
+    history = session["history"] if session else data.get('history', [])
+    job_posting = ctx["job_posting"]
+    resume_text = ctx["resume_text"]
+    interviewer_intel = ctx["interviewer_intel"]
+    role_title = ctx["role_title"]
+    seniority_level = ctx["seniority_level"]
+    persona_role = ctx["persona_role"]
+    archetype_rubric = ctx["archetype_rubric"]
+    is_start = data.get('isStart', False)
+    question_count = data.get('questionCount', session["next_question_count"] if session else 1)
+    # Turn alignment fix: Frontend sends 1-indexed questionCount (1, 2, 3...)
+    # Use it directly without adding 1
+    real_q_num = question_count
+    report_inputs = None
+    plan = session_question_plan(session) if session and not is_start and 1 <= real_q_num <= 6 else None
+    planned_next = planned_next_question(plan, real_q_num) if plan else None
+
+    # [PHASE 3: OPTION B ENHANCED - 2/3/4 SCORING] (v13.0)
+    rubric_text = (
+        f"### ARCHETYPE: {persona_role}\n{archetype_rubric}\n\n"
+        "### SCORING SYSTEM (2/3/4 Scale)\n"
+        "- 4 (Strong/Exceptional): Complete STAR + Quantifiable Metrics (%, $, ROI, specific numbers)\n"
+        "- 3 (Competent): Clear structure with Action + Result OR organized delivery\n"
+        "- 2 (Weak): Missing critical elements, vague buzzwords, or incomplete answer\n"
+        "- 1 (Red Flag): Toxic behavior, unethical conduct, or complete non-answer\n\n"
+        "### METRIC RECOGNITION (Be Generous)\n"
+        "SET has_metrics = TRUE if you see:\n"
+        "- Dollar amounts: $35M, $2.5B\n"
+        "- Percentages: 15%, 22% increase\n"
+        "- Scale indicators: '300+ systems', '5 team members', '20 users'\n"
+        "- Zero defects: 'zero incidents', '100% compliance'\n"
+        "- Business terms + numbers: 'EBITDA growth', 'revenue increase', 'cost reduction'\n\n"
+        "### VALID ACTIONS (Credit These - Even If Vague)\n"
+        "SET star_action = TRUE if candidate says:\n"
+        "- Leadership: 'led', 'managed', 'supervised', 'coordinated'\n"
+        "- Creation: 'built', 'created', 'developed', 'designed', 'implemented'\n"
+        "- Collaboration: 'worked on', 'collaborated', 'partnered with'\n"
+        "- Organization: 'organized', 'facilitated', 'arranged', 'set up'\n"
+        "- Execution: 'used', 'made', 'helped with', 'contributed to'\n\n"
+        "### VALID RESULTS (Credit These - Even Without Metrics)\n"
+        "SET star_result = TRUE if candidate says:\n"
+        "- Completion: 'completed', 'finished', 'delivered', 'done'\n"
+        "- Success: 'successful', 'worked', 'it helped', 'improved'\n"
+        "- Adoption: 'people used it', 'found it useful', 'appreciated'\n"
+        "- Impact: 'made a difference', 'solved the problem', 'achieved goal'\n"
+    )
+    
+    # Build System Prompt (v12.0 - ENHANCED HYBRID)
+    system_prompt = (
+        f"Role: You are an Elite Executive Search Consultant and Career Strategist.\n"
+        f"Tone: Professional, highly encouraging, focused on coaching the candidate to succeed.\n"
+        f"SENIORITY: {seniority_level}\n"
+        f"CONTEXT:\nTarget Role: {role_title}\nJob Description: {job_posting}\nCandidate Resume: {resume_text}\n"
+        f"Intel: {interviewer_intel}\n\n"
+        f"{rubric_text}\n\n"
+        "[PHASE 2: INTERVIEW LOOP]\n"
+        f"- This is EXACTLY Question {real_q_num} of 6.\n"
+        "- You MUST complete the full 6-question set.\n\n"
+        "[PHASE 3: OUTPUT FORMAT (STRICT JSON - NO JSON IN FEEDBACK TEXT)]\n"
+        "You MUST output a single, valid JSON object. CRITICAL: The 'feedback' field must be plain text only, no JSON structures.\n\n"
+        "Required fields:\n"
+        '1. "feedback": (String) Structure your feedback as:\n'
+        '   "✅ What Worked: [Highlight 1-2 specific strengths from their answer]\n\n'
+        '   💡 To Strengthen: [One specific, actionable improvement]"\n'
+        '   - Be encouraging and insightful\n'
+        '   - DO NOT mention scores or include any JSON syntax\n'
+        '   - Plain text only\n'
+        '2. "checklist": (Object) { "relevant_history": bool, "star_situation": bool, "star_action": bool, "star_result": bool, "has_metrics": bool, "delivery_organized": bool, "red_flags": bool }\n'
+        '   IMPORTANT: Be GENEROUS when evaluating Actions and Results. Use the examples above as guidance.\n'
+        '3. "next_question": (String) Your transition and  the next question. Plain text only.\n\n'
+        "CRITICAL Q6 CONSTRAINT: If real_q_num is 6, set 'next_question' to: 'Thank you for completing the interview. Please stand by while the final report is generated.'"
+    )
+
+    messages = [{"role": "system", "content": system_prompt}]
+    
+    # Add limited history to save context window
+    for interaction in history[-3:]: 
+        if 'question' in interaction: messages.append({"role": "assistant", "content": interaction['question']})
+        if 'answer' in interaction: messages.append({"role": "user", "content": interaction['answer']})
+    
+    # Current Input Strategy
+    if planned_next:
+        # Question plan: the next question is already written, the model only critiques
+        focus = "their background" if real_q_num == 1 else "their answer"
+        messages.append({
+            "role": "user",
+            "content": (
+                f"User Answer: {message}. \n"
+                f"Step 1: Provide brief, constructive feedback on {focus}. (Put ONLY this critique in 'feedback' field).\n"
+                "Step 2: Fill in the 'checklist'.\n"
+                "DO NOT write a transition or the next question: set 'next_question' to an empty string."
+            )
+        })
+
+    elif is_start:
+        # FORCE GREETING LOGIC
+        greeting_instruction = (
+            "Start the interview. "
+            "1. Say exactly: 'Hello, and welcome. Thank you for joining me today. I am the Hiring Manager for the position.' "
+            "2. Set the stage: 'To give you an overview of our session: First, I'll ask for a high level overview of your background, and then we will dive into specific situational examples.' "
+            "3. Ask Question 1: 'Let's get started. Walk me through your background and why you are the right fit for this role?'\n"
+            "CRITICAL: DO NOT provide feedback yet. Output greeting as 'next_question'."
+        )
+        messages.append({"role": "user", "content": greeting_instruction})
+
+    elif real_q_num == 1:
+        messages.append({
+            "role": "user",
+            "content": (
+                f"User Answer: {message}. \n"
+                "Step 1: Provide brief, structured feedback on their background. (Put in 'feedback' field).\n"
+                "Step 2: Transition to Behavioral: 'Thank you for sharing your background. For the next several questions, I am going to ask for specific situational examples from your career. To provide the best answers, please follow the STAR method: Situation, Task, Action, and Result.' (Add to 'next_question' field).\n"
+                "Step 3: Ask the first Behavioral Question (Conflict, Failure, or Strategy). (Append to 'next_question' field)."
+            )
+        })
+
+    elif real_q_num in [2, 3, 4]:
+         messages.append({
+            "role": "user",
+            "content": (
+                f"User Answer: {message}. \n"
+                "Step 1: Provide brief, constructive feedback on their answer. (Put ONLY this critique in 'feedback' field).\n"
+                "Step 2: Say exactly: 'The next question that I have for you is...' (Put this in 'next_question' field).\n"
+                "Step 3: Ask the next behavioral question. (Append to 'next_question' field)."
+            )
+         })
+
+    elif real_q_num == 5:
+         messages.append({
+            "role": "user",
+            "content": (
+                f"User Answer: {message}. \n"
+                "Step 1: Provide brief, constructive feedback. (Put ONLY this critique in 'feedback' field).\n"
+                "Step 2: Generate closing transition: 'The final question I have for you is...' (Put in 'next_question' field).\n"
+                "Step 3: Ask the final behavioral question. (Append to 'next_question' field)."
+            )
+         })
+
+    elif real_q_num == 6:
+         # NEW: Provide feedback on Q6 (final behavioral question) before ending
+         messages.append({
+            "role": "user",
+            "content": (
+                f"User Answer: {message}. \n"
+                "Step 1: Provide brief, constructive feedback on this final answer. (Put in 'feedback' field).\n"
+                "Step 2: Generate a closing statement: 'Thank you for completing the interview. We appreciate your time and insights today. Please stand by while the final report is generated.' (Put in 'next_question' field)."
+            )
+         })
+
+    elif real_q_num >= 7:
+         # FINAL REPORT LOGIC (MASTER PROTOCOL v2.1)
+         # 1. Build Full Transcript WITH LIVE SCORES (Binding)
+         full_transcript = "INTERVIEW_TRANSCRIPT WITH SILENT METADATA:\n"
+         session_metadata = "SESSION_METADATA (SILENT SCORES):\n"
+         for idx, h in enumerate(history):
+             q = h.get('question', '')
+             a = h.get('answer', '')
+             # v7.2 FIX: Lowered word count filter to 5 words to catch concise, metric-heavy answers.
+             if len(q) < 10 or len(a.split()) < 5 or a.strip().lower() in ["start", "ready", "hello", "begin", "hi"]: continue 
+
+             # BINDING: Include the ACTUAL feedback/score the user received live
+             live_fb = h.get('feedback', 'No feedback recorded')
+             
+             # v5.0 SILENT SCORE RETRIEVAL
+             # Check for 'internal_score' first (v5), then 'score' (v4 legacy), then parse feedback (v3)
+             silent_score = h.get('internal_score') or h.get('score') or 0
+             
+             full_transcript += f"Turn {idx+1}:\nQ: {q}\nA: {a}\nLIVE_FEEDBACK: {live_fb}\n\n"
+             session_metadata += f"Turn {idx+1} Score: {silent_score}\n"
+         
+         # CRITICAL FIX v7.1: Do NOT append the current message if it's just a system trigger
+         # Since we are at count > 7, the real Q6 answer is already in 'history'.
+         if "GENERATE_REPORT" not in message and len(message) > 15:
+             full_transcript += f"Turn {len(history)+1} (FINAL QUESTION):\nQ: {lastAiQuestion if 'lastAiQuestion' in locals() else 'Final Question'}\nA: {message}\n\n"
+         # Final turn score is yet to be determined by the Auditor, so no metadata for it yet.
+
+         # 2. DEFINITIVE GOVERNANCE PROMPT (v11.0 - THE AUDITOR)
+         final_report_system_prompt = (
+             "### TASK: GENERATE ACE INTERVIEW REPORT (v11.0 - THE AUDITOR)\n"
+             "You are 'The Ace Auditor'. Review the transcript and compile the final report data.\n\n"
+             "### INPUT DATA:\n"
+             "1. Interview_Transcript\n"
+             "2. Question_Scores (from SESSION_METADATA)\n\n"
+             "### PHASE 5: THE AUDITOR (FINAL REPORT)\n"
+             "Instruction: Compile the report. DO NOT provide a pass/fail verdict.\n\n"
+             "### STEP 1: METRIC EXTRACTION\n"
+             "Identify every concrete KPI mentioned (e.g., $35M EBITDA, 22% Revenue). You MUST display these in the 'Business Impact Scoreboard'.\n\n"
+             "### STEP 2: SCORING RULES\n"
+             "- Use the scores provided in SESSION_METADATA.\n"
+             "- CRITICAL: Ensure the overall score looks premium.\n"
+             "- ANTI-NAG: If a candidate provides metrics that you have included in the Scoreboard, DO NOT ask them to 'add metrics' or 'quantify impact' in the Growth Areas. Only suggest metrics if they are actually missing from their answers.\n\n"
+             "### STEP 3: OUTPUT JSON FORMAT (STRICT)\n"
+             "Output ONLY a compact JSON object (no HTML - the server renders the report):\n"
+             '{"kpis": [{"name": "KPI name", "value": "value as stated"}], '
+             '"strengths": ["3 specific strengths based on actual responses"], '
+             '"growth_areas": ["3 areas for improvement based on actual responses"], '
+             '"coaching": "2-sentence executive summary on how to win this specific company/role", '
+             '"q6_feedback_spoken": "1-2 sentences of spoken feedback on the final answer"}\n'
+         )
+         messages = [
+             {"role": "system", "content": final_report_system_prompt},
+             {"role": "user", "content": f"TRANSCRIPT:\n{full_transcript}\n\nSESSION_METADATA:\n{session_metadata}\n\nRESUME:\n{resume_text}\n\nGenerate Final Report JSON."}
+         ]
+         # Same inputs, split into concurrent per-section calls (see generate_final_report)
+         answered = [h for h in history if h.get('answer')]
+         final_exchange = (
+             f"Q: {answered[-1].get('question', 'Final Question')}\nA: {answered[-1]['answer']}" if answered
+             else f"Q: Final Question\nA: {message}"
+         )
+         report_inputs = {
+             "transcript": full_transcript,
+             "metadata": session_metadata,
+             "resume_text": resume_text,
+             "final_exchange": final_exchange,
+         }
+    else:
+        messages.append({"role": "user", "content": message})
+
+    # OPTIMIZATION: Use gpt-4o for the final report (Higher intelligence)
+    # Use gpt-4o-mini for regular turns (Speed)
+    model_to_use = "gpt-4o" if real_q_num >= 8 else "gpt-4o-mini"
+    screen, local_reply, max_tokens = None, None, None
+    if PRESCREEN_ENABLED and not is_start and 1 <= real_q_num <= 6:
+        screen, local_reply = screen_interview_turn(message, history, real_q_num, planned_next)
+        if screen.low_confidence:
+            model_to_use = PRESCREEN_LOW_CONFIDENCE_MODEL
+            max_tokens = PRESCREEN_LOW_CONFIDENCE_MAX_TOKENS
+    return {
+        "messages": messages,
+        "model": model_to_use,
+        # Completion cap (JSON turns only), None for uncapped
+        "max_tokens": max_tokens,
+        # Wall-clock budget for the whole request, consulted by every stage
+        "deadline": Deadline(REPORT_BUDGET if real_q_num >= 7 else TURN_BUDGET),
+        "history": history,
+        "is_start": is_start,
+        "question_count": question_count,
+        "real_q_num": real_q_num,
+        "voice": data.get('voice') or (session or {}).get('voice') or 'alloy',
+        "audio_as_url": wants_audio_url(data),
+        "session": session,
+        "planned_next": planned_next,
+        "opening": opening_text(data) if is_start and OPENING_FAST_PATH else None,
+        "screen": screen,
+        "local_reply": local_reply,
+        "report": report_inputs if REPORT_MODE == "parallel" else None,
+    }
+
+def sanitize_feedback(text):
+    """Remove JSON artifacts from feedback text"""
     import re
-    # 1. Strip Brackets [] or <> (System tags)
-    clean = re.sub(r'\[.*?\]', '', text)
-    clean = re.sub(r'<.*?>', '', clean)
+    if not text: return ""
+    # Remove JSON structures
+    text = re.sub(r'\{[^}]*\}', '', text)
+    # Remove quotes and brackets
+    text = re.sub(r'[\[\]"\':]', '', text)
+    return text.strip()
+
+def finalize_turn_json(ai_response_text, turn, message):
+    """Parse the model's JSON, sanitize feedback and compute the rubric score."""
+    is_start = turn["is_start"]
+    real_q_num = turn["real_q_num"]
+
+    # Initialize ai_json with safe defaults
+    ai_json = {"feedback": "", "next_question": "", "internal_score": 0}
+
+    if real_q_num < 8:
+        try:
+            parsed = json.loads(ai_response_text)
+            ai_json.update(parsed)
+            
+            # SANITIZE FEEDBACK (Remove JSON leaks)
+            if "feedback" in ai_json:
+                ai_json["feedback"] = sanitize_feedback(ai_json["feedback"])
+            
+            # Extract Checklist for Scoring
+            checklist = ai_json.get("checklist", {})
+            if not is_start:
+                # Use calculate_rubric_score with backend metric detection
+                calculated_score, override_reason = calculate_rubric_score(
+                    {"checklist": checklist}, f"Q{real_q_num}", message
+                )
+                ai_json["internal_score"] = calculated_score
+                if override_reason: ai_json["gap_analysis"] = override_reason
+                if turn.get("local_reply"):
+                    # Screened locally: the pre-screen's score stands (no checklist to score)
+                    ai_json["internal_score"] = turn["screen"].score
+        except Exception as e:
+            print(f"JSON Error: {e}")
+            ai_json["feedback"] = sanitize_feedback(ai_response_text)
+            if is_start: ai_json["next_question"] = ai_response_text
+
+        if turn.get("planned_next"):
+            ai_json["next_question"] = turn["planned_next"]
+        
+        # Force silence on handshake
+        if is_start: 
+            ai_json["feedback"] = ""
+            ai_json["internal_score"] = 0
+        
+        # Word Count Penalty (only for answers) - Respect 2/3/4 system
+        if real_q_num > 1 and not is_start and not turn.get("local_reply"):
+            word_count = len(message.split())
+            if word_count < 20:
+                ai_json["internal_score"] = max(2, ai_json.get("internal_score", 2))  # Min score is 2 (Weak)
+                ai_json["feedback"] = ai_json.get("feedback", "") + BRIEF_ANSWER_NOTE
+
+    else:
+        # Auditor Turn - Sanitize report feedback too
+        ai_json = json.loads(ai_response_text)
+        ai_json["feedback"] = sanitize_feedback(ai_json.get("q6_feedback_spoken", "Interview complete."))
+        ai_json["next_question"] = ""
+    screen = turn.get("screen")
+    if screen and screen.reason:
+        ai_json["prescreen"] = {"verdict": screen.verdict, "reason": screen.reason, "low_confidence": screen.low_confidence}
+    return ai_json
+
+def is_brief_answer(turn, message):
+    """Word Count Penalty applies (answers only, Q2+, not already scored by the pre-screen)."""
+    return turn["real_q_num"] > 1 and not turn["is_start"] and not turn.get("local_reply") and len(message.split()) < 20
+
+def preview_turn_score(checklist, turn, message):
+    """Score as soon as the checklist arrives (same rules finalize_turn_json applies)."""
+    if turn["is_start"] or turn["real_q_num"] >= 8 or not isinstance(checklist, dict):
+        return None
+    if turn.get("local_reply"):
+        return turn["screen"].score
+    score, _ = calculate_rubric_score({"checklist": checklist}, f"Q{turn['real_q_num']}", message)
+    if is_brief_answer(turn, message):
+        score = max(2, score)
+    return score
+
+def build_turn_speech_text(ai_json, turn):
+    """Text to speak for this turn, or None when the turn has no audio."""
+    # Strict: NO AUDIO for final report (Q>7)
+    if not ai_json.get('next_question') or turn["question_count"] > 7:
+        return None
+
+    # SPEAK LOGIC
+    speech_text = ai_json.get('next_question', '')
     
-    # 2. Remove System Artifacts/Prompt Injections
-    artifacts = [
-        "thoughtful use of diagrams", "generate image", "ignore previous instructions",
-        "system prompt", "internal score"
-    ]
-    for art in artifacts:
-        clean = re.sub(f'(?i){art}', '', clean)
+    # FINAL REPORT AUDIO OVERRIDE
+    if turn["real_q_num"] >= 8 and "average_score" in ai_json:
+        speech_text = "That concludes the interview. Thank you for your time."
+    
+    # STANDARD FEEDBACK AUDIO
+    elif ai_json.get('feedback'):
+         speech_text = f"Feedback: {ai_json['feedback']} \n\n {ai_json['next_question']}"
+
+    # GUARD: Prevent Empty String Crash (OpenAI 400)
+    if not speech_text or not speech_text.strip():
+        speech_text = "Analysis complete. Thank you."
+    return speech_text
+
+TTS_MODEL = "tts-1-hd"
+TTS_VOICES = ["alloy", "fable", "onyx", "nova", "echo", "shimmer"]
+
+def synthesize_turn_audio(client, speech_text, voice):
+    audio_response = client.audio.speech.create(
+        model=TTS_MODEL,
+        timeout=openai_timeout("tts"),
+        voice=voice,
+        input=speech_text
+    )
+    track_cost_audio(speech_text, TTS_MODEL, "Feedback Audio")
+    return audio_response.content
+
+# Verbatim-scripted lines from the interview protocol. Their sentences are pinned as separate
+# speech segments so the audio is served from the TTS cache and stitched with fresh tails.
+SCRIPTED_SPEECH = [
+    OPENING_GREETING,
+    OPENING_OVERVIEW,
+    OPENING_QUESTION,
+    STAR_TRANSITION,
+    NEXT_QUESTION_LEAD,
+    FINAL_QUESTION_LEAD,
+    CLOSING_STATEMENT,
+    "Thank you for completing the interview. Please stand by while the final report is generated.",
+    "That concludes the interview. Thank you for your time.",
+    "Analysis complete. Thank you.",
+]
+speech_pipeline.pin_phrases(SCRIPTED_SPEECH)
+
+def cached_turn_audio(client, speech_text, voice):
+    """Content-addressed TTS: (model, voice, normalized text) served from memory/disk when seen before."""
+    return tts_cache.get_or_synthesize(TTS_MODEL, voice, speech_text, lambda: synthesize_turn_audio(client, speech_text, voice))
+
+def prewarm_tts_cache(voices=None):
+    """Synthesize every scripted sentence for every voice (skips clips already cached)."""
+    from api.speech_pipeline import split_sentences
+    client = get_openai_client()
+    sentences = []
+    for phrase in SCRIPTED_SPEECH:
+        for sentence in split_sentences(phrase):
+            if sentence not in sentences:
+                sentences.append(sentence)
+    made = tts_cache.prewarm(TTS_MODEL, TTS_VOICES if voices is None else voices, sentences, lambda text, voice: synthesize_turn_audio(client, text, voice))
+    print(f"[TTS CACHE] Prewarm complete: {made} clip(s) synthesized")
+    return made
+
+if os.environ.get("TTS_PREWARM") == "1" and os.environ.get("OPENAI_API_KEY"):
+    import threading
+    threading.Thread(target=prewarm_tts_cache, name="tts-prewarm", daemon=True).start()
+
+def turn_speech_job(client, voice, speech_text=None):
+    """Sentence-pipelined TTS job; submits every segment now when the full text is known."""
+    synth = lambda text, v: cached_turn_audio(client, text, v)
+    if speech_text is None:
+        return speech_pipeline.job(synth, voice)
+    return speech_pipeline.synthesize(speech_text, synth, voice)
+
+def wants_audio_url(data):
+    """Opt-in binary delivery: {"audio_delivery": "url"} (or AUDIO_DELIVERY=url as the default)."""
+    return (data.get('audio_delivery') or os.environ.get("AUDIO_DELIVERY", "inline")) == "url"
+
+def store_audio_url(chunks, mime="audio/mpeg"):
+    """Persist audio as a short-lived artifact and return its /api/audio URL."""
+    return f"/api/audio/{audio_store.put(chunks, mime)}"
+
+def audio_segment_payload(segment, as_url=False):
+    payload = {
+        "index": segment.index,
+        "text": segment.text,
+        "mime": "audio/mpeg"
+    }
+    if as_url:
+        payload["url"] = store_audio_url(segment.audio)
+    else:
+        payload["audio"] = base64.b64encode(segment.audio).decode('utf-8')
+    return payload
+
+# Same characters sanitize_feedback strips, applied per streamed delta for speculative speech
+_SPEECH_STRIP = re.compile(r'[\[\]"\':]')
+
+class TurnSpeechFeed:
+    """Feeds a streaming turn into a SpeechJob in the order build_turn_speech_text speaks it:
+    "Feedback: {feedback} \\n\\n {next_question}" (or just next_question on the handshake)."""
+
+    def __init__(self, job, turn, message):
+        self.job = job
+        self.brief_note = BRIEF_ANSWER_NOTE if is_brief_answer(turn, message) else ""
+        self.phase = "next" if turn["is_start"] else "feedback"
+        self.feedback_started = False
+        self.held = []
+
+    def on_delta(self, key, text):
+        if key == "feedback" and self.phase == "feedback":
+            text = _SPEECH_STRIP.sub('', text)
+            if text.strip() and not self.feedback_started:
+                self.feedback_started = True
+                text = "Feedback: " + text.lstrip()
+            if self.feedback_started:
+                self.job.feed(text)
+        elif key == "next_question":
+            if self.phase == "next":
+                self.job.feed(text)
+            else:
+                self.held.append(text)
+
+    def on_complete(self, key, value):
+        if key == "feedback" and self.phase == "feedback":
+            if self.feedback_started:
+                self.job.feed(self.brief_note + " \n\n ")
+            self.phase = "next"
+            self.job.feed("".join(self.held))
+            self.held = []
+
+def record_session_turn(turn, message, ai_json):
+    """Append the finished turn to the server-side session (no-op for stateless clients)."""
+    session = turn["session"]
+    if not session:
+        return
+    # The start trigger is not an answer (the browser does not record it either)
+    answer = "" if turn["is_start"] else message
+    interview_sessions.record_turn(session, turn["question_count"], answer, ai_json)
+
+def score_label(score):
+    """Map an average score to a user-friendly label (2/3/4 system)."""
+    if score >= 3.3:
+        return "Well Done"
+    elif score >= 2.5:
+        return "Average"
+    else:
+        return "Needs Work"
+
+def apply_score_anchor(ai_json, turn):
+    """FINAL MATH ENFORCER (The Anchor): average_score from real scores. On the Auditor turn the
+    Ace report is rendered server-side from the report data with that exact score."""
+    real_avg = None
+    try:
+        extracted_scores = [h.get('internal_score') or 0 for h in turn["history"]]
+        if not turn["is_start"]: extracted_scores.append(ai_json.get("internal_score", 0))
+        extracted_scores = [s for s in extracted_scores if s > 0]
         
-    clean = clean.strip()
-    return clean if clean else "Null Input"
+        if extracted_scores:
+            real_avg = round(sum(extracted_scores) / len(extracted_scores), 1)
+            ai_json["average_score"] = max(1.0, real_avg)
+        else:
+            ai_json["average_score"] = 0.0
+    except Exception as e:
+        print(f"Math Error: {e}")
+
+    if any(key in ai_json for key in REPORT_SECTION_KEYS):
+        sections = {key: ai_json.pop(key, None) for key in REPORT_SECTION_KEYS}
+        if real_avg is None:
+            ai_json["formatted_report"] = render_ace_report(sections, "N/A", "Not Scored")
+        else:
+            ai_json["formatted_report"] = render_ace_report(sections, real_avg, score_label(real_avg))
+        ai_json["verdict_text"] = ""
+    return ai_json
+
+# ------------------------------------------------------------------------------
+# HELPER: Final Report Pipeline (Auditor turn fanned out into concurrent sections)
+# ------------------------------------------------------------------------------
+# "parallel" runs one small call per report section; "single" keeps the one-shot Auditor prompt
+REPORT_MODE = os.environ.get("REPORT_PIPELINE", "parallel").strip().lower()
+# Seconds each section may take before its fallback is used
+REPORT_SECTION_TIMEOUTS = {
+    "kpis": 20.0,
+    "strengths": 30.0,
+    "growth_areas": 30.0,
+    "coaching": 25.0,
+    "q6_feedback_spoken": 20.0,
+}
+REPORT_SECTION_SYSTEM = "You are 'The Ace Auditor', reviewing a completed mock interview. Output valid JSON only."
+
+def report_section_call(client, model, instructions, content, label):
+    completion = client.chat.completions.create(
+        model=model,
+        timeout=openai_timeout("report_section"),
+        messages=[
+            {"role": "system", "content": REPORT_SECTION_SYSTEM},
+            {"role": "user", "content": f"{instructions}\n\n{content}"}
+        ],
+        response_format={ "type": "json_object" }
+    )
+    track_cost_chat(completion, model, label)
+    return json.loads(completion.choices[0].message.content)
+
+def final_report_tasks(client, report, model):
+    """One ReportTask per section. Each returns validated plain data (never HTML)."""
+    transcript = f"TRANSCRIPT:\n{report['transcript']}\n\nSESSION_METADATA:\n{report['metadata']}"
+    with_resume = f"{transcript}\n\nRESUME:\n{report['resume_text']}"
+
+    def kpis():
+        out = report_section_call(client, "gpt-4o-mini", (
+            "Identify every concrete KPI the candidate mentioned in their answers (e.g. $35M EBITDA, 22% Revenue). "
+            "Only include metrics actually stated. "
+            'Return {"kpis": [{"name": "KPI name", "value": "value as stated"}]} (empty list if none).'
+        ), transcript, "Report KPIs")
+        return normalize_sections(out)["kpis"]
+
+    def strengths():
+        out = report_section_call(client, model, (
+            "Identify 3 specific strengths based on the candidate's actual responses. One sentence each. "
+            'Return {"strengths": ["...", "...", "..."]}.'
+        ), with_resume, "Report Strengths")
+        return normalize_sections(out)["strengths"]
+
+    def growth_areas():
+        out = report_section_call(client, model, (
+            "Identify 3 areas for improvement based on the candidate's actual responses. One sentence each. "
+            "ANTI-NAG: If the candidate already provided concrete metrics, DO NOT ask them to 'add metrics' or "
+            "'quantify impact'. Only suggest metrics if they are actually missing from their answers. "
+            'Return {"growth_areas": ["...", "...", "..."]}.'
+        ), with_resume, "Report Growth Areas")
+        return normalize_sections(out)["growth_areas"]
+
+    def coaching():
+        out = report_section_call(client, model, (
+            "Provide a 2-sentence executive summary on how this candidate can win this specific company/role. "
+            "DO NOT provide a pass/fail verdict. "
+            'Return {"coaching": "..."}.'
+        ), with_resume, "Report Coaching")
+        return normalize_sections(out)["coaching"]
+
+    def q6_feedback_spoken():
+        out = report_section_call(client, "gpt-4o-mini", (
+            "Give brief, constructive spoken feedback (1-2 sentences, plain text, no scores) on the candidate's final answer. "
+            'Return {"q6_feedback_spoken": "..."}.'
+        ), report["final_exchange"], "Report Q6 Feedback")
+        return str(out.get("q6_feedback_spoken") or "").strip() or "Interview complete."
+
+    return [
+        ReportTask("kpis", kpis, REPORT_SECTION_TIMEOUTS["kpis"], []),
+        ReportTask("strengths", strengths, REPORT_SECTION_TIMEOUTS["strengths"], []),
+        ReportTask("growth_areas", growth_areas, REPORT_SECTION_TIMEOUTS["growth_areas"], []),
+        ReportTask("coaching", coaching, REPORT_SECTION_TIMEOUTS["coaching"], ""),
+        ReportTask("q6_feedback_spoken", q6_feedback_spoken, REPORT_SECTION_TIMEOUTS["q6_feedback_spoken"], "Interview complete."),
+    ]
+
+def generate_final_report(client, turn):
+    """Auditor turn through the section pipeline. Returns the same compact JSON text the
+    one-shot Auditor call produces (report sections + q6_feedback_spoken)."""
+    sections, status = report_pipeline.run(final_report_tasks(client, turn["report"], turn["model"]))
+    print(f"[REPORT] Sections: {status}")
+    return json.dumps(sections)
+
+# ------------------------------------------------------------------------------
+# HELPER: Turn Deadlines (degrade instead of failing when the provider is slow)
+# ------------------------------------------------------------------------------
+# Smaller model used for the single retry of a failed/slow turn completion
+TURN_FALLBACK_MODEL = "gpt-4o-mini"
+# Seconds the retry needs to be worth attempting
+TURN_RETRY_MIN_SECONDS = float(os.environ.get("TURN_RETRY_MIN_SECONDS", "4"))
+# Seconds kept back for encoding and sending the response
+TURN_RESPONSE_MARGIN = float(os.environ.get("TURN_RESPONSE_MARGIN", "1"))
+
+def without_sdk_retries(client):
+    """The deadline owns retries; the SDK's own backoff would silently spend the budget."""
+    # Looked up on the type: test doubles (SimpleNamespace / MagicMock) are used as they are
+    if getattr(type(client), "with_options", None) is None:
+        return client
+    return client.with_options(max_retries=0)
+
+def turn_completion(client, turn, deadline):
+    """JSON completion for a turn inside the deadline. A failed or timed-out call is retried
+    once on TURN_FALLBACK_MODEL if the budget still allows it, else DeadlineExceeded. A capped
+    call (turn["max_tokens"]) that hits the cap counts as failed; the retry is uncapped."""
+    action = "final_report" if turn["real_q_num"] >= 7 else "interview_turn"
+    attempts = [(turn["model"], TURN_RETRY_MIN_SECONDS, turn.get("max_tokens")), (TURN_FALLBACK_MODEL, 0.0, None)]
+    last_error = None
+    for attempt, (model, keep_for_retry, max_tokens) in enumerate(attempts):
+        if attempt and not deadline.allows(TURN_RETRY_MIN_SECONDS, TURN_RESPONSE_MARGIN):
+            break
+        try:
+            if not attempt:
+                project_cost_chat(model, "Interview Turn", *(m["content"] for m in turn["messages"]))
+            chat_completion = without_sdk_retries(client).chat.completions.create(
+                model=model,
+                timeout=openai_timeout(action, deadline, keep_for_retry + TURN_RESPONSE_MARGIN),
+                messages=turn["messages"],
+                response_format={ "type": "json_object" },
+                **({"max_tokens": max_tokens} if max_tokens else {})
+            )
+            track_cost_chat(chat_completion, model, "Interview Turn")
+            if max_tokens and getattr(chat_completion.choices[0], "finish_reason", None) == "length":
+                raise ValueError(f"completion truncated at max_tokens={max_tokens}")
+            deadline.mark("llm")
+            return chat_completion.choices[0].message.content
+        except Exception as e:
+            last_error = e
+            print(f"[DEADLINE] Turn completion on {model} failed after {deadline.elapsed():.1f}s: {e}")
+    raise DeadlineExceeded(f"No turn completion within {deadline.budget}s: {last_error}")
+
+# Seconds /api/audio/<id> spends synthesizing deferred turn audio before answering 202 (poll again)
+DEFERRED_AUDIO_WAIT = float(os.environ.get("DEFERRED_AUDIO_WAIT", "8"))
+
+def defer_turn_audio(voice, speech_text):
+    """Park a turn's speech text in the shared job table and return the /api/audio URL its
+    audio will be served at. Whichever instance gets the poll synthesizes it on demand (the
+    TTS cache coalesces with a synthesis still running here), so no thread has to outlive the
+    request. None if the reservation could not be recorded."""
+    import secrets
+    try:
+        job = job_queue.defer("turn_audio", {"voice": voice, "text": speech_text}, key=secrets.token_urlsafe(18))
+    except Exception as e:
+        print(f"[DEADLINE] Deferred audio reservation failed: {e}")
+        return None
+    return f"/api/audio/{job['job_id']}"
+
+def render_deferred_audio(artifact_id):
+    """Synthesize a deferred turn's audio into the local audio store. Returns the located
+    artifact, "pending" while synthesis needs more time, or None for an unknown id."""
+    from concurrent.futures import TimeoutError as FutureTimeout
+    job = job_queue.get(artifact_id)
+    if job is None or job["action"] != "turn_audio" or not job["result"]:
+        return None
+    speech = turn_speech_job(get_openai_client(), job["result"]["voice"], job["result"]["text"])
+    try:
+        segments = speech.wait(timeout=DEFERRED_AUDIO_WAIT)
+        audio_store.put((segment.audio for segment in segments), artifact_id=artifact_id)
+    except FutureTimeout:
+        return "pending"
+    except Exception as e:
+        # Provider hiccup: the client polls again and the next try starts from the cache
+        print(f"[DEADLINE] Deferred audio synthesis failed: {e}")
+        return "pending"
+    return audio_store.locate(artifact_id)
+
+def start_credit_deduction():
+    """Interview credit deduction (three Supabase round trips) on a side thread, so it
+    overlaps the rest of the turn. Returns the thread (join it before responding) or None."""
+    import threading
+    try:
+        user = get_current_user()
+    except Exception as ce:
+        print(f"Interview Credit Deduction Error: {ce}")
+        return None
+    if not user:
+        return None
+    # Use 'interview' as tool type for deduction
+    worker = threading.Thread(
+        target=decrement_strategy_credit, args=(user.id, 'interview', g.access_token),
+        name="credit-deduction", daemon=True
+    )
+    worker.start()
+    return worker
+
+def stream_interview_turn(client, turn, message):
+    """SSE variant of a turn: feedback/next_question deltas as they generate, the score as soon
+    as the checklist closes, then the authoritative response and the audio."""
+    from flask import Response, stream_with_context
+
+    def generate():
+        pending = []
+
+        # Speculative speech: synthesize sentences while the rest of the turn is still generating
+        speech_job = turn_speech_job(client, turn["voice"]) if turn["question_count"] <= 7 else None
+        speech_feed = TurnSpeechFeed(speech_job, turn, message) if speech_job else None
+        planned = turn["planned_next"]
+
+        def on_delta(key, text):
+            if planned and key == "next_question":
+                return  # the plan supplies it once the feedback is done
+            if key in STREAMED_TURN_FIELDS:
+                pending.append(sse_event(f"{key}_delta", {"text": text}))
+            if speech_feed:
+                speech_feed.on_delta(key, text)
+
+        def on_complete(key, value):
+            if planned and key == "next_question":
+                return
+            if speech_feed:
+                speech_feed.on_complete(key, value)
+            if key in STREAMED_TURN_FIELDS:
+                pending.append(sse_event(key, {"text": value}))
+            if planned and key == "feedback":
+                pending.append(sse_event("next_question_delta", {"text": planned}))
+                pending.append(sse_event("next_question", {"text": planned}))
+                if speech_feed:
+                    speech_feed.on_delta("next_question", planned)
+            elif key == "checklist":
+                score = preview_turn_score(value, turn, message)
+                if score is not None:
+                    pending.append(sse_event("score", {"internal_score": score}))
+
+        # Flush headers immediately so the client can show "thinking" state
+        yield sse_comment("turn started")
+        try:
+            if turn["report"]:
+                # Report sections run concurrently; there is no token stream to relay
+                ai_response_text = generate_final_report(client, turn)
+            elif turn["opening"] or turn["local_reply"]:
+                # Scripted opening / pre-screened answer: relayed through the streamer so clients see the usual events
+                ai_response_text = turn["local_reply"] or opening_response_text(turn)
+                JsonFieldStreamer(on_delta=on_delta, on_complete=on_complete).feed(ai_response_text)
+                while pending:
+                    yield pending.pop(0)
+            else:
+                request_args = dict(
+                    model=turn["model"],
+                    timeout=openai_timeout("final_report" if turn["real_q_num"] >= 7 else "interview_turn", turn["deadline"], TURN_RESPONSE_MARGIN),
+                    messages=turn["messages"],
+                    response_format={ "type": "json_object" },
+                    stream=True,
+                )
+                try:
+                    stream = client.chat.completions.create(stream_options={"include_usage": True}, **request_args)
+                except TypeError:
+                    # Older SDKs do not know stream_options (no usage on streamed calls)
+                    stream = client.chat.completions.create(**request_args)
+
+                streamer = JsonFieldStreamer(on_delta=on_delta, on_complete=on_complete)
+                parts = []
+                usage = None
+                for chunk in stream:
+                    if getattr(chunk, 'usage', None):
+                        usage = chunk.usage
+                    if not getattr(chunk, 'choices', None):
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        streamer.feed(delta)
+                        while pending:
+                            yield pending.pop(0)
+                        if speech_job:
+                            for segment in speech_job.ready():
+                                yield sse_event("audio", audio_segment_payload(segment, turn["audio_as_url"]))
+                while pending:
+                    yield pending.pop(0)
+
+                if usage is not None:
+                    track_cost_chat(SimpleNamespace(usage=usage), turn["model"], "Interview Turn (Stream)")
+                ai_response_text = "".join(parts)
+                print(f"DEBUG: Turn={turn['real_q_num']} AI Response (stream): {ai_response_text[:100]}...")
+
+            ai_json = finalize_turn_json(ai_response_text, turn, message)
+            speech_text = build_turn_speech_text(ai_json, turn)
+            apply_score_anchor(ai_json, turn)
+            record_session_turn(turn, message, ai_json)
+            is_complete = turn["real_q_num"] >= 7
+            response_event = {
+                "response": ai_json,
+                "is_complete": is_complete,
+                "average_score": ai_json.get("average_score", 0.0),
+                "audio_pending": bool(speech_text)
+            }
+            if turn["session"]:
+                response_event["session_id"] = turn["session"]["id"]
+            yield sse_event("response", response_event)
+
+            audio_count = 0
+            if speech_job:
+                try:
+                    delivered = speech_job.delivered
+                    replaced_from = speech_job.finish(speech_text or "")
+                    if replaced_from < delivered:
+                        # Final text differs from what was spoken speculatively: drop those segments
+                        yield sse_event("audio_reset", {"from_index": replaced_from})
+                    for segment in speech_job.remaining():
+                        yield sse_event("audio", audio_segment_payload(segment, turn["audio_as_url"]))
+                    audio_count = len(speech_job.segments)
+                    print(f"[TTS] Stream turn speech: {speech_job.stats()}")
+                except Exception as e:
+                    # The response event already went out: a TTS failure only ends the audio
+                    print(f"[TTS] Stream turn audio failed: {e}")
+                    audio_count = speech_job.delivered
+                    yield sse_event("audio_error", {"error": str(e)})
+            yield sse_event("done", {"is_complete": is_complete, "audio_segments": audio_count})
+        except Exception as e:
+            import traceback
+            print(f"CRITICAL STREAM ERROR: {traceback.format_exc()}")
+            yield sse_event("error", {"error": str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # ------------------------------------------------------------------------------
 # ROUTE: Get AI Feedback & Next Question
 # ------------------------------------------------------------------------------
+def transcribe_upload(client, json_body=None):
+    """Whisper transcription from memory: multipart, raw binary or base64 JSON, size-capped,
+    long recordings split into segments transcribed concurrently and stitched in order."""
+    try:
+        parts, _ = read_audio_upload(request, json_body)
+    except UploadTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except UploadError as e:
+        return jsonify({"error": str(e)}), 400
+
+    segments = segment_parts(parts)
+
+    def transcribe_one(part):
+        transcription = client.audio.transcriptions.create(
+            model="whisper-1", 
+            timeout=openai_timeout("transcribe"),
+            file=part.upload()
+        )
+        return transcription.text
+
+    transcript = transcriber.transcribe(segments, transcribe_one)
+    if len(segments) > 1:
+        print(f"[STT] Transcribed {len(segments)} segments concurrently ({sum(len(p.data) for p in parts)} bytes)")
+    return jsonify({"transcript": transcript}), 200
+
+def is_binary_transcription_request():
+    mimetype = request.mimetype or ""
+    return mimetype == "multipart/form-data" or mimetype.startswith("audio/") or mimetype == "application/octet-stream"
+
+@app.route('/api/transcribe', methods=['POST'])
+def transcribe_audio():
+    try:
+        if not os.environ.get("OPENAI_API_KEY"): return jsonify({"error": "Missing AI Key"}), 500
+        return transcribe_upload(get_openai_client())
+    except Exception as e:
+        print(f"Transcription Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/get-feedback', methods=['POST'])
 def get_feedback():
     try:
+        # Binary / multipart recordings (action=transcribe) skip JSON and base64 entirely
+        if is_binary_transcription_request():
+            return transcribe_audio()
+
         data = request.json
         # v5.0 SANITIZATION
         raw_message = data.get('message', '')
@@ -799,487 +1991,196 @@ def get_feedback():
         history = data.get('history', [])
         action = data.get('action') 
 
-        # OpenAI Config
-        from openai import OpenAI
+        if wants_async(data):
+            return submit_async_job(action, data)
+
+        # OpenAI Config (shared pool)
         OPENAI_KEY = os.environ.get("OPENAI_API_KEY")
         if not OPENAI_KEY: return jsonify({"error": "Missing AI Key"}), 500
-        client = OpenAI(api_key=OPENAI_KEY)
+        client = get_openai_client()
 
-        # --- A. TRANSCRIPTION PATH ---
+        # --- A. TRANSCRIPTION PATH (legacy base64 JSON; binary/multipart handled above) ---
         if action == 'transcribe':
-            import tempfile
-            audio_b64 = data.get('audio', '')
-            # Robust decode: handle data URI scheme if present
-            if ',' in audio_b64:
-                audio_b64 = audio_b64.split(',')[1]
-            
-            audio_bytes = base64.b64decode(audio_b64)
-            
-            with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as temp_audio:
-                temp_audio.write(audio_bytes)
-                temp_path = temp_audio.name
-            
-            try:
-                with open(temp_path, "rb") as audio_file:
-                    transcription = client.audio.transcriptions.create(
-                        model="whisper-1", 
-                        file=audio_file
-                    )
-                return jsonify({"transcript": transcription.text}), 200
-            finally:
-                if os.path.exists(temp_path): os.remove(temp_path)
+            return transcribe_upload(client, data)
 
         # --- B. FEEDBACK PATH (Existing) ---
-        # message = data.get('message', '') # This is now sanitized above
-        history = data.get('history', [])
-        job_posting = data.get('jobPosting', '')
-        resume_text = data.get('resumeText', '')
-        is_start = data.get('isStart', False)
-        question_count = data.get('questionCount', 1)
-        # Turn alignment fix: Frontend sends 1-indexed questionCount (1, 2, 3...)
-        # Use it directly without adding 1
-        real_q_num = question_count
-        role_title = data.get('roleTitle', '')
-
-        # DYNAMIC RUBRIC Logic
-        # Question 2 evaluates the answer to Q1 (Background/Intro). 
-        # Questions 3+ evaluate STAR answers.
-        
-        # Prepare variables
-        interviewer_intel = str(data.get('interviewer_intel') or '')
-        role_title = str(data.get('job_title') or 'Candidate')
-        
-        # ---------------------------------------------------------
-        # ACE INTERVIEW MASTER PROTOCOL v6.0 (Hardliner & Anchoring)
-        # ---------------------------------------------------------
-        
-        # [PHASE 1: INITIALIZATION & ARCHETYPE]
-        # Set Seniority Scale
-        seniority_level = "Tactical Execution (Junior/Mid)"
-        if any(x in role_title.upper() for x in ["SENIOR", "LEAD", "MANAGER"]):
-            seniority_level = "Strategic Ownership"
-        if any(x in role_title.upper() for x in ["DIRECTOR", "VP", "HEAD", "CHIEF", "C-LEVEL", "EXECUTIVE"]):
-            seniority_level = "Vision, Culture, & ROI Dominance"
-
-        # Set Archetype
-        context_text = (role_title + " " + interviewer_intel).upper()
-        persona_role = "The Ace Evaluator (Standard Corporate)"
-        archetype_rubric = "Core Value: Structure & Competence. Reward STAR structure."
-
-        if any(x in context_text for x in ["HOSPITALITY", "SAFETY", "GUEST", "PATIENT", "MEDICAL", "SCHOOL", "NURSE", "DOCTOR", "CLINIC"]):
-            persona_role = "The Guardian (Safety & Culture First)"
-            archetype_rubric = (
-                "Core Value: Protection of People.\n"
-                "Kill Switch: Sacrificing safety for speed/money is an IMMEDIATE FAIL (Score 1)."
-            )
-        elif any(x in context_text for x in ["BANK", "AUDIT", "COMPLIANCE", "ACCOUNTANT", "RISK", "LEGAL", "CFO", "ATTORNEY"]):
-            persona_role = "The Steward (Accuracy & Risk Management)"
-            archetype_rubric = (
-                "Core Value: Accuracy, Stability, Compliance.\n"
-                "Kill Switch: Guessing or 'Moving Fast' without controls is an IMMEDIATE FAIL (Score 1)."
-            )
-        elif any(x in context_text for x in ["STARTUP", "GROWTH", "VC", "SPEED", "PRODUCT", "TECH", "SAAS", "SALES", "MARKETING"]):
-            persona_role = "The Growth Operator (Speed & ROI)"
-            archetype_rubric = (
-                "Core Value: Speed, Action, Revenue.\n"
-                "Kill Switch: Citing 'policy' as an excuse for inaction is a FAIL."
+        # Server-side session: created at isStart, later turns may send only session_id + message
+        session = None
+        if data.get('isStart'):
+            session = interview_sessions.create(
+                interview_context(data),
+                user_id=current_user_id(),
+                question_count=data.get('questionCount', 1),
+                voice=data.get('voice'),
+                # The opening turn's record_turn below is the session's first write
+                persist=False
             )
-
-        # [PHASE 3: OPTION B ENHANCED - 2/3/4 SCORING] (v13.0)
-        rubric_text = (
-            f"### ARCHETYPE: {persona_role}\n{archetype_rubric}\n\n"
-            "### SCORING SYSTEM (2/3/4 Scale)\n"
-            "- 4 (Strong/Exceptional): Complete STAR + Quantifiable Metrics (%, $, ROI, specific numbers)\n"
-            "- 3 (Competent): Clear structure with Action + Result OR organized delivery\n"
-            "- 2 (Weak): Missing critical elements, vague buzzwords, or incomplete answer\n"
-            "- 1 (Red Flag): Toxic behavior, unethical conduct, or complete non-answer\n\n"
-            "### METRIC RECOGNITION (Be Generous)\n"
-            "SET has_metrics = TRUE if you see:\n"
-            "- Dollar amounts: $35M, $2.5B\n"
-            "- Percentages: 15%, 22% increase\n"
-            "- Scale indicators: '300+ systems', '5 team members', '20 users'\n"
-            "- Zero defects: 'zero incidents', '100% compliance'\n"
-            "- Business terms + numbers: 'EBITDA growth', 'revenue increase', 'cost reduction'\n\n"
-            "### VALID ACTIONS (Credit These - Even If Vague)\n"
-            "SET star_action = TRUE if candidate says:\n"
-            "- Leadership: 'led', 'managed', 'supervised', 'coordinated'\n"
-            "- Creation: 'built', 'created', 'developed', 'designed', 'implemented'\n"
-            "- Collaboration: 'worked on', 'collaborated', 'partnered with'\n"
-            "- Organization: 'organized', 'facilitated', 'arranged', 'set up'\n"
-            "- Execution: 'used', 'made', 'helped with', 'contributed to'\n\n"
-            "### VALID RESULTS (Credit These - Even Without Metrics)\n"
-            "SET star_result = TRUE if candidate says:\n"
-            "- Completion: 'completed', 'finished', 'delivered', 'done'\n"
-            "- Success: 'successful', 'worked', 'it helped', 'improved'\n"
-            "- Adoption: 'people used it', 'found it useful', 'appreciated'\n"
-            "- Impact: 'made a difference', 'solved the problem', 'achieved goal'\n"
-        )
-        
-        # Build System Prompt (v12.0 - ENHANCED HYBRID)
-        system_prompt = (
-            f"Role: You are an Elite Executive Search Consultant and Career Strategist.\n"
-            f"Tone: Professional, highly encouraging, focused on coaching the candidate to succeed.\n"
-            f"SENIORITY: {seniority_level}\n"
-            f"CONTEXT:\nTarget Role: {role_title}\nJob Description: {job_posting}\nCandidate Resume: {resume_text}\n"
-            f"Intel: {interviewer_intel}\n\n"
-            f"{rubric_text}\n\n"
-            "[PHASE 2: INTERVIEW LOOP]\n"
-            f"- This is EXACTLY Question {real_q_num} of 6.\n"
-            "- You MUST complete the full 6-question set.\n\n"
-            "[PHASE 3: OUTPUT FORMAT (STRICT JSON - NO JSON IN FEEDBACK TEXT)]\n"
-            "You MUST output a single, valid JSON object. CRITICAL: The 'feedback' field must be plain text only, no JSON structures.\n\n"
-            "Required fields:\n"
-            '1. "feedback": (String) Structure your feedback as:\n'
-            '   "✅ What Worked: [Highlight 1-2 specific strengths from their answer]\n\n'
-            '   💡 To Strengthen: [One specific, actionable improvement]"\n'
-            '   - Be encouraging and insightful\n'
-            '   - DO NOT mention scores or include any JSON syntax\n'
-            '   - Plain text only\n'
-            '2. "checklist": (Object) { "relevant_history": bool, "star_situation": bool, "star_action": bool, "star_result": bool, "has_metrics": bool, "delivery_organized": bool, "red_flags": bool }\n'
-            '   IMPORTANT: Be GENEROUS when evaluating Actions and Results. Use the examples above as guidance.\n'
-            '3. "next_question": (String) Your transition and  the next question. Plain text only.\n\n'
-            "CRITICAL Q6 CONSTRAINT: If real_q_num is 6, set 'next_question' to: 'Thank you for completing the interview. Please stand by while the final report is generated.'"
-        )
-
-        
+            if QUESTION_PLAN_ENABLED:
+                start_question_plan(client, session)
+        elif data.get('session_id'):
+            session = interview_sessions.get(data['session_id'], current_user_id())
+            if session is None and 'history' not in data:
+                return jsonify({"error": "Interview session expired. Please restart the interview.", "session_expired": True}), 410
+
+        turn = build_interview_turn(data, message, session)
+        is_start = turn["is_start"]
+        question_count = turn["question_count"]
+        real_q_num = turn["real_q_num"]
+        deadline = turn["deadline"]
         # v9.1: Credit Deduction (Delayed until first Response)
-        if not is_start and question_count == 3:
-            try:
-                auth_header = request.headers.get('Authorization')
-                if auth_header:
-                    token = auth_header.split(" ")[1]
-                    supabase = get_supabase()
-                    user_res = supabase.auth.get_user(token)
-                    if user_res and user_res.user:
-                        # Use 'interview' as tool type for deduction
-                        decrement_strategy_credit(user_res.user.id, 'interview', token)
-            except Exception as ce:
-                print(f"Interview Credit Deduction Error: {ce}")
-
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        # Add limited history to save context window
-        for interaction in history[-3:]: 
-            if 'question' in interaction: messages.append({"role": "assistant", "content": interaction['question']})
-            if 'answer' in interaction: messages.append({"role": "user", "content": interaction['answer']})
-        
-        # Current Input Strategy
-        if is_start:
-            # FORCE GREETING LOGIC
-            greeting_instruction = (
-                "Start the interview. "
-                "1. Say exactly: 'Hello, and welcome. Thank you for joining me today. I am the Hiring Manager for the position.' "
-                "2. Set the stage: 'To give you an overview of our session: First, I'll ask for a high level overview of your background, and then we will dive into specific situational examples.' "
-                "3. Ask Question 1: 'Let's get started. Walk me through your background and why you are the right fit for this role?'\n"
-                "CRITICAL: DO NOT provide feedback yet. Output greeting as 'next_question'."
-            )
-            messages.append({"role": "user", "content": greeting_instruction})
-
-        elif real_q_num == 1:
-            messages.append({
-                "role": "user",
-                "content": (
-                    f"User Answer: {message}. \n"
-                    "Step 1: Provide brief, structured feedback on their background. (Put in 'feedback' field).\n"
-                    "Step 2: Transition to Behavioral: 'Thank you for sharing your background. For the next several questions, I am going to ask for specific situational examples from your career. To provide the best answers, please follow the STAR method: Situation, Task, Action, and Result.' (Add to 'next_question' field).\n"
-                    "Step 3: Ask the first Behavioral Question (Conflict, Failure, or Strategy). (Append to 'next_question' field)."
-                )
-            })
+        charges_credit = not is_start and question_count == 3
 
-        elif real_q_num in [2, 3, 4]:
-             messages.append({
-                "role": "user",
-                "content": (
-                    f"User Answer: {message}. \n"
-                    "Step 1: Provide brief, constructive feedback on their answer. (Put ONLY this critique in 'feedback' field).\n"
-                    "Step 2: Say exactly: 'The next question that I have for you is...' (Put this in 'next_question' field).\n"
-                    "Step 3: Ask the next behavioral question. (Append to 'next_question' field)."
-                )
-             })
-
-        elif real_q_num == 5:
-             messages.append({
-                "role": "user",
-                "content": (
-                    f"User Answer: {message}. \n"
-                    "Step 1: Provide brief, constructive feedback. (Put ONLY this critique in 'feedback' field).\n"
-                    "Step 2: Generate closing transition: 'The final question I have for you is...' (Put in 'next_question' field).\n"
-                    "Step 3: Ask the final behavioral question. (Append to 'next_question' field)."
-                )
-             })
-
-        elif real_q_num == 6:
-             # NEW: Provide feedback on Q6 (final behavioral question) before ending
-             messages.append({
-                "role": "user",
-                "content": (
-                    f"User Answer: {message}. \n"
-                    "Step 1: Provide brief, constructive feedback on this final answer. (Put in 'feedback' field).\n"
-                    "Step 2: Generate a closing statement: 'Thank you for completing the interview. We appreciate your time and insights today. Please stand by while the final report is generated.' (Put in 'next_question' field)."
-                )
-             })
-
-        elif real_q_num >= 7:
-             # FINAL REPORT LOGIC (MASTER PROTOCOL v2.1)
-             # 1. Build Full Transcript WITH LIVE SCORES (Binding)
-             full_transcript = "INTERVIEW_TRANSCRIPT WITH SILENT METADATA:\n"
-             session_metadata = "SESSION_METADATA (SILENT SCORES):\n"
-             for idx, h in enumerate(history):
-                 q = h.get('question', '')
-                 a = h.get('answer', '')
-                 # v7.2 FIX: Lowered word count filter to 5 words to catch concise, metric-heavy answers.
-                 if len(q) < 10 or len(a.split()) < 5 or a.strip().lower() in ["start", "ready", "hello", "begin", "hi"]: continue 
-
-                 # BINDING: Include the ACTUAL feedback/score the user received live
-                 live_fb = h.get('feedback', 'No feedback recorded')
-                 
-                 # v5.0 SILENT SCORE RETRIEVAL
-                 # Check for 'internal_score' first (v5), then 'score' (v4 legacy), then parse feedback (v3)
-                 silent_score = h.get('internal_score') or h.get('score') or 0
-                 
-                 full_transcript += f"Turn {idx+1}:\nQ: {q}\nA: {a}\nLIVE_FEEDBACK: {live_fb}\n\n"
-                 session_metadata += f"Turn {idx+1} Score: {silent_score}\n"
-             
-             # CRITICAL FIX v7.1: Do NOT append the current message if it's just a system trigger
-             # Since we are at count > 7, the real Q6 answer is already in 'history'.
-             if "GENERATE_REPORT" not in message and len(message) > 15:
-                 full_transcript += f"Turn {len(history)+1} (FINAL QUESTION):\nQ: {lastAiQuestion if 'lastAiQuestion' in locals() else 'Final Question'}\nA: {message}\n\n"
-             # Final turn score is yet to be determined by the Auditor, so no metadata for it yet.
-
-             # 2. DEFINITIVE GOVERNANCE PROMPT (v11.0 - THE AUDITOR)
-             final_report_system_prompt = (
-                 "### TASK: GENERATE ACE INTERVIEW REPORT (v11.0 - THE AUDITOR)\n"
-                 "You are 'The Ace Auditor'. Review the transcript and generate the final HTML report.\n\n"
-                 "### INPUT DATA:\n"
-                 "1. Interview_Transcript\n"
-                 "2. Question_Scores (from SESSION_METADATA)\n\n"
-                 "### PHASE 5: THE AUDITOR (FINAL REPORT)\n"
-                 "Instruction: Compile the report. DO NOT provide a pass/fail verdict.\n\n"
-                 "### STEP 1: METRIC EXTRACTION\n"
-                 "Identify every concrete KPI mentioned (e.g., $35M EBITDA, 22% Revenue). You MUST display these in the 'Business Impact Scoreboard'.\n\n"
-                 "### STEP 2: SCORING RULES\n"
-                 "- Use the scores provided in SESSION_METADATA.\n"
-                 "- CRITICAL: Ensure the overall score looks premium.\n"
-                 "- ANTI-NAG: If a candidate provides metrics that you have included in the Scoreboard, DO NOT ask them to 'add metrics' or 'quantify impact' in the Growth Areas. Only suggest metrics if they are actually missing from their answers.\n\n"
-                 "### STEP 3: OUTPUT JSON FORMAT (STRICT)\n"
-                 "You must output a single JSON object with 'formatted_report' and 'q6_feedback_spoken'.\n"
-                 "IMPORTANT: Leave {{TOTAL_SCORE}} and {{SCORE_LABEL}} exactly as-is - do NOT replace these placeholders.\n\n"
-                 "### HTML TEMPLATE (formatted_report)\n"
-                 "<div class=\"ace-report p-6 bg-slate-900 text-slate-100 rounded-xl border border-slate-700 shadow-2xl\">\n"
-                 "  <div class=\"flex justify-between items-center mb-8 border-b border-slate-700 pb-6\">\n"
-                 "    <h1 class=\"text-2xl font-bold tracking-tight text-white m-0\">Interview Executive Summary</h1>\n"
-                  "    <div class=\"text-right\">\n"
-                  "      <div class=\"text-4xl font-extrabold text-blue-400\">{{TOTAL_SCORE}} <span class=\"text-sm text-slate-400 font-normal\">/ 4.0</span></div>\n"
-                  "      <div class=\"text-sm font-semibold text-indigo-300 mt-1\">{{SCORE_LABEL}}</div>\n"
-                  "    </div>\n"
-                 "  </div>\n"
-                 "  \n"
-                 "  <div class=\"mb-8\">\n"
-                 "    <h2 class=\"text-xs font-bold uppercase tracking-widest text-indigo-400 mb-4 flex items-center\">📈 Business Impact Scoreboard</h2>\n"
-                 "    <div class=\"grid grid-cols-1 sm:grid-cols-2 gap-3\">\n"
-                 "      {{Create a list of small divs for each KPI found like: <div class='p-2 bg-slate-800 rounded border border-slate-700 text-xs'><span class='text-indigo-400 font-bold'>✓</span> KPI_NAME: VALUE</div>}}\n"
-                 "    </div>\n"
-                 "  </div>\n"
-                 "  \n"
-                 "  <div class=\"grid grid-cols-1 md:grid-cols-2 gap-6 mb-8\">\n"
-                 "    <div class=\"p-4 bg-slate-800/50 rounded-lg border border-slate-700\">\n"
-                 "      <h2 class=\"text-sm font-bold uppercase tracking-widest text-emerald-400 mb-4\">💪 Strengths</h2>\n"
-                 "      <ul class=\"space-y-2 text-sm leading-relaxed text-slate-300\">\n"
-                 "        {{Identify 3 specific strengths based on actual responses}}\n"
-                 "      </ul>\n"
-                 "    </div>\n"
-                 "    <div class=\"p-4 bg-slate-800/50 rounded-lg border border-slate-700\">\n"
-                 "      <h2 class=\"text-sm font-bold uppercase tracking-widest text-amber-400 mb-4\">✨ Growth Areas</h2>\n"
-                 "      <ul class=\"space-y-2 text-sm leading-relaxed text-slate-300\">\n"
-                 "        {{Identify 3 areas for improvement based on actual responses}}\n"
-                 "      </ul>\n"
-                 "    </div>\n"
-                 "  </div>\n"
-                 "  \n"
-                 "  <div class=\"p-4 bg-blue-900/10 rounded-lg border border-blue-900/30\">\n"
-                 "    <h2 class=\"text-sm font-bold uppercase tracking-widest text-blue-400 mb-2\">🎯 Actionable Coaching</h2>\n"
-                 "    <p class=\"text-sm leading-relaxed text-slate-300 m-0\">{{Provide a 2-sentence executive summary on how to win this specific company/role}}</p>\n"
-                 "  </div>\n"
-                 "</div>\n"
-             )
-             messages = [
-                 {"role": "system", "content": final_report_system_prompt},
-                 {"role": "user", "content": f"TRANSCRIPT:\n{full_transcript}\n\nSESSION_METADATA:\n{session_metadata}\n\nRESUME:\n{resume_text}\n\nGenerate Final Report JSON."}
-             ]
-        else:
-            messages.append({"role": "user", "content": message})
+        # --- C. STREAMING VARIANT (opt-in: {"stream": true} -> text/event-stream) ---
+        if data.get('stream'):
+            if charges_credit:
+                deduction = start_credit_deduction()
+                if deduction:
+                    deduction.join()
+            return stream_interview_turn(client, turn, message)
 
         # 1. Text Generation
         print(f"DEBUG: Generating Final Report for count {question_count}...")
+        deduction = None
         try:
-             # OPTIMIZATION: Use gpt-4o for the final report (Higher intelligence)
-             # Use gpt-4o-mini for regular turns (Speed)
-             model_to_use = "gpt-4o" if real_q_num >= 8 else "gpt-4o-mini"
-             
-             chat_completion = client.chat.completions.create(
-                 model=model_to_use,
-                 messages=messages,
-                 response_format={ "type": "json_object" }
-             )
-             track_cost_chat(chat_completion, model_to_use, "Interview Turn")
-             ai_response_text = chat_completion.choices[0].message.content
+             if turn["report"]:
+                 # Auditor turn: report sections are generated concurrently and merged
+                 ai_response_text = generate_final_report(client, turn)
+             elif turn["opening"]:
+                 # Scripted opening: nothing for the model to decide
+                 ai_response_text = opening_response_text(turn)
+             elif turn["local_reply"]:
+                 # Pre-screened non-answer / repeat: templated coaching, local score
+                 ai_response_text = turn["local_reply"]
+             else:
+                 ai_response_text = turn_completion(client, turn, deadline)
              print(f"DEBUG: Turn={real_q_num} AI Response: {ai_response_text[:100]}...")
              
-             # Initialize ai_json with safe defaults
-             ai_json = {"feedback": "", "next_question": "", "internal_score": 0}
-             
-             # JSON Sanitization Function
-             def sanitize_feedback(text):
-                 """Remove JSON artifacts from feedback text"""
-                 import re
-                 if not text: return ""
-                 # Remove JSON structures
-                 text = re.sub(r'\{[^}]*\}', '', text)
-                 # Remove quotes and brackets
-                 text = re.sub(r'[\[\]"\':]', '', text)
-                 return text.strip()
-             
-             if real_q_num < 8:
-                 try:
-                     parsed = json.loads(ai_response_text)
-                     ai_json.update(parsed)
-                     
-                     # SANITIZE FEEDBACK (Remove JSON leaks)
-                     if "feedback" in ai_json:
-                         ai_json["feedback"] = sanitize_feedback(ai_json["feedback"])
-                     
-                     # Extract Checklist for Scoring
-                     checklist = ai_json.get("checklist", {})
-                     if not is_start:
-                         # Use calculate_rubric_score with backend metric detection
-                         calculated_score, override_reason = calculate_rubric_score(
-                             {"checklist": checklist}, f"Q{real_q_num}", message
-                         )
-                         ai_json["internal_score"] = calculated_score
-                         if override_reason: ai_json["gap_analysis"] = override_reason
-                 except Exception as e:
-                     print(f"JSON Error: {e}")
-                     ai_json["feedback"] = sanitize_feedback(ai_response_text)
-                     if is_start: ai_json["next_question"] = ai_response_text
-                 
-                 # Force silence on handshake
-                 if is_start: 
-                     ai_json["feedback"] = ""
-                     ai_json["internal_score"] = 0
-                 
-                 # Word Count Penalty (only for answers) - Respect 2/3/4 system
-                 if real_q_num > 1 and not is_start:
-                     word_count = len(message.split())
-                     if word_count < 20:
-                         ai_json["internal_score"] = max(2, ai_json.get("internal_score", 2))  # Min score is 2 (Weak)
-                         ai_json["feedback"] = ai_json.get("feedback", "") + " (Note: Answer was too brief for full credit.)"
+             ai_json = finalize_turn_json(ai_response_text, turn, message)
+             # Only charged once the turn has an answer (a retried 503 must not charge twice)
+             if charges_credit:
+                 deduction = start_credit_deduction()
 
-             else:
-                 # Auditor Turn - Sanitize report feedback too
-                 ai_json = json.loads(ai_response_text)
-                 ai_json["feedback"] = sanitize_feedback(ai_json.get("q6_feedback_spoken", "Interview complete."))
-                 ai_json["next_question"] = ""
-
-
-             # 2. Audio Generation (Omit if empty text)
+             # 2. Audio Generation (Omit if empty text) - sentences synthesized in parallel
              audio_b64 = None
-             if ai_json.get('next_question') and question_count <= 7: # Strict: NO AUDIO for final report (Q>7)
-                 voice = data.get('voice', 'alloy')
-
-                 # SPEAK LOGIC
-                 speech_text = ai_json.get('next_question', '')
-                 
-                 # FINAL REPORT AUDIO OVERRIDE
-                 if real_q_num >= 8 and "average_score" in ai_json:
-                     q6_fb = ai_json.get("q6_feedback_spoken", "That concludes the interview.")
-                     # SCRUB: Remove system notes from spoken feedback just in case
-                     q6_fb = q6_fb.replace("(System Note: Response was too brief to score higher.)", "").strip()
-                     speech_text = "That concludes the interview. Thank you for your time."
-                 
-                 # STANDARD FEEDBACK AUDIO
-                 elif ai_json.get('feedback'):
-                      speech_text = f"Feedback: {ai_json['feedback']} \n\n {ai_json['next_question']}"
-
-                 # GUARD: Prevent Empty String Crash (OpenAI 400)
-                 if not speech_text or not speech_text.strip():
-                     speech_text = "Analysis complete. Thank you."
-
-                 audio_response = client.audio.speech.create(
-                     model="tts-1-hd",
-                     voice=voice,
-                     input=speech_text
-                 )
-                 track_cost_audio(speech_text, "tts-1-hd", "Feedback Audio")
-                 # import base64 # REMOVED: Caused UnboundLocalError by shadowing global
-                 audio_b64 = base64.b64encode(audio_response.content).decode('utf-8')
+             audio_url = None
+             audio_segments = None
+             audio_pending = False
+             speech_text = build_turn_speech_text(ai_json, turn)
+             if speech_text:
+                 from concurrent.futures import TimeoutError as FutureTimeout
+                 segments = None
+                 try:
+                     job = turn_speech_job(client, turn["voice"], speech_text)
+                     segments = job.wait(timeout=deadline.remaining(TURN_RESPONSE_MARGIN))
+                 except FutureTimeout:
+                     # Out of budget: answer with the text now, the audio follows at audio_url
+                     audio_url = defer_turn_audio(turn["voice"], speech_text)
+                     audio_pending = audio_url is not None
+                     print(f"[DEADLINE] Turn {real_q_num} audio deferred: {deadline.summary()}")
+                 except Exception as e:
+                     # TTS failed (provider timeout, API error): the text turn still stands, without audio
+                     print(f"[TTS] Turn {real_q_num} audio failed, answering without it: {e}")
+                 if segments:
+                     try:
+                         if data.get('audio_playlist'):
+                             # Opt-in ordered playlist: the client starts playing segment 0 right away
+                             audio_segments = [audio_segment_payload(seg, turn["audio_as_url"]) for seg in segments]
+                         elif turn["audio_as_url"]:
+                             # Binary delivery: segments are streamed into one artifact, JSON carries only the URL
+                             audio_url = store_audio_url(seg.audio for seg in segments)
+                         else:
+                             # MP3 frames concatenate cleanly, so legacy clients still get one clip
+                             audio_bytes = segments[0].audio if len(segments) == 1 else b"".join(seg.audio for seg in segments)
+                             audio_b64 = base64.b64encode(audio_bytes).decode('utf-8')
+                     except Exception as e:
+                         print(f"[TTS] Turn {real_q_num} audio delivery failed, answering without it: {e}")
+                     deadline.mark("tts")
         
+        except DeadlineExceeded as e:
+             # Provider too slow even after the fallback: nothing was recorded, the client can resend
+             print(f"[DEADLINE] Turn {real_q_num} gave up: {e}")
+             response = jsonify({"error": "The interviewer is taking longer than usual. Please try again.", "retryable": True})
+             response.headers["Retry-After"] = "2"
+             return response, 503
         except Exception as e:
              import traceback
              print(f"CRITICAL REPORT ERROR: {traceback.format_exc()}")
              return jsonify({"error": f"Report Gen Error: {str(e)}", "details": traceback.format_exc()}), 500
         # --- FINAL MATH ENFORCER (The Anchor) ---
-        try:
-            extracted_scores = [h.get('internal_score') or 0 for h in history]
-            if not is_start: extracted_scores.append(ai_json.get("internal_score", 0))
-            extracted_scores = [s for s in extracted_scores if s > 0]
-            
-            if extracted_scores:
-                real_avg = round(sum(extracted_scores) / len(extracted_scores), 1)
-                ai_json["average_score"] = max(1.0, real_avg)
-                
-                if "formatted_report" in ai_json:
-                    report_html = ai_json["formatted_report"]
-                    import re
-                    
-                    # Map score to user-friendly label (2/3/4 system)
-                    def get_score_label(score):
-                        if score >= 3.3:
-                            return "Well Done"
-                        elif score >= 2.5:
-                            return "Average"
-                        else:
-                            return "Needs Work"
-                    
-                    score_label = get_score_label(real_avg)
-                    
-                    report_html = re.sub(r'\{\{TOTAL_SCORE\}\}', str(real_avg), report_html)
-                    report_html = re.sub(r'\{\{SCORE_LABEL\}\}', score_label, report_html)
-                    report_html = re.sub(r'\d\.\d\s*/\s*5\.0', f"{real_avg} / 4.0", report_html)
-                    ai_json["formatted_report"] = report_html
-                    ai_json["verdict_text"] = ""
-            else:
-                ai_json["average_score"] = 0.0
-        except Exception as e:
-            print(f"Math Error: {e}")
+        apply_score_anchor(ai_json, turn)
+        record_session_turn(turn, message, ai_json)
 
-        return jsonify({
+        result = {
             "response": ai_json,
             "audio": audio_b64,
             "is_complete": real_q_num >= 7,
             "average_score": ai_json.get("average_score", 0.0)
-        }), 200
+        }
+        if session:
+            result["session_id"] = session["id"]
+        if audio_segments is not None:
+            result["audio_segments"] = audio_segments
+        if audio_url:
+            result["audio_url"] = audio_url
+        if audio_pending:
+            result["audio_pending"] = True
+        if deduction:
+            deduction.join(timeout=deadline.remaining())
+        return jsonify(result), 200
 
     except Exception as e:
         import traceback
         print(f"Critical Feedback Error: {traceback.format_exc()}")
         return jsonify({"error": str(e)}), 500
 
+# ------------------------------------------------------------------------------
+# ROUTE: Audio Artifacts (binary delivery with Range / caching headers)
+# ------------------------------------------------------------------------------
+@app.route('/api/audio/<artifact_id>', methods=['GET'])
+def get_audio_artifact(artifact_id):
+    from flask import send_file
+    found = audio_store.locate(artifact_id)
+    if not found:
+        # Deferred turn audio: synthesized here on the first poll (any instance)
+        found = render_deferred_audio(artifact_id)
+        if found == "pending":
+            # Still synthesizing: poll again shortly
+            response = jsonify({"pending": True})
+            response.headers["Retry-After"] = "1"
+            response.headers["Cache-Control"] = "no-store"
+            return response, 202
+    if not found:
+        return jsonify({"error": "Audio not found or expired"}), 404
+    path, mime, seconds_left = found
+    # conditional=True gives us Accept-Ranges, 206 Partial Content, ETag and If-None-Match handling
+    response = send_file(path, mimetype=mime, conditional=True, etag=True, max_age=seconds_left)
+    # Ids are unguessable and content never changes for an id
+    response.headers["Cache-Control"] = f"private, max-age={seconds_left}, immutable"
+    return response
+
 # 8. GENERAL API ROUTE (Report Generation)
 @app.route('/api', methods=['POST'])
 def general_api():
     try:
         data = request.json
         action = data.get('action') 
+
+        if wants_async(data, action):
+            return submit_async_job(action, data)
         
-        # OpenAI Config
-        from openai import OpenAI
+        # OpenAI Config (shared pool, timeout budget per action)
         OPENAI_KEY = os.environ.get("OPENAI_API_KEY")
         if not OPENAI_KEY: return jsonify({"error": "Missing AI Key"}), 500
-        client = OpenAI(api_key=OPENAI_KEY)
+        client = get_openai_client()
+        llm_timeout = openai_timeout(action)
 
         if action == 'generate_report':
             history = data.get('history', [])
             job_posting = data.get('jobPosting', '')
+            session = interview_sessions.get(data.get('session_id'), current_user_id()) if data.get('session_id') else None
+            if session:
+                history = session["history"]
+                job_posting = session["context"]["job_posting"]
 
             prompt = f"""
             Generate a Final Executive Coaching Report based on this interview history.
@@ -1311,6 +2212,7 @@ def general_api():
 
             completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=llm_timeout,
                 messages=[{"role": "user", "content": prompt}],
                 response_format={ "type": "json_object" }
             )
@@ -1348,12 +2250,12 @@ def general_api():
             return jsonify({"data": result}), 200
             
         elif action == 'parse_resume':
-            resume_text = data.get('resume_text', '')
+            resume_text = fit_prompt('parse_resume', resume=data.get('resume_text', ''))["resume"]
             
             prompt = f"""
             Extract structured data from this resume text.
             Resume Text:
-            {resume_text[:20000]} (truncated)
+            {resume_text}
 
             Output JSON structure:
             {{
@@ -1367,29 +2269,69 @@ def general_api():
             }}
             """
 
-            completion = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a resume parser. Output only valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={ "type": "json_object" }
-            )
-            track_cost_chat(completion, "gpt-4o", "Parse Resume")
-            
-            return jsonify({"data": completion.choices[0].message.content}), 200
+            def run_parse():
+                project_cost_chat("gpt-4o", "Parse Resume", prompt)
+                completion = client.chat.completions.create(
+                    model="gpt-4o",
+                    timeout=llm_timeout,
+                    messages=[
+                        {"role": "system", "content": "You are a resume parser. Output only valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={ "type": "json_object" }
+                )
+                track_cost_chat(completion, "gpt-4o", "Parse Resume")
+                return completion.choices[0].message.content
+
+            parsed, _ = cached_llm_result("parse_resume", "gpt-4o", {"resume": resume_text}, run_parse)
+
+            # Guardrail: education the model dropped comes back from the shared section index
+            try:
+                parsed_json = json.loads(parsed)
+                if isinstance(parsed_json, dict) and not parsed_json.get('education'):
+                    backup_education = resume_sections.get(data.get('resume_text', '')).education()
+                    if backup_education:
+                        print(f"GUARDRAIL ALERT: Parse dropped Education. Restored {len(backup_education)} items.")
+                        parsed_json['education'] = backup_education
+                        parsed = json.dumps(parsed_json)
+            except Exception as e:
+                print(f"Parse Guardrail Error: {e}")
+
+            return jsonify({"data": parsed}), 200
+
+        elif action == 'resume_digest':
+            # Computed once per resume version; every later caller gets the stored copy
+            resume_text = data.get('resume_text') or data.get('resume', '')
+            if not resume_text.strip():
+                return jsonify({"error": "Resume text is required"}), 400
+            digest = resume_digests.digest(resume_text)
+            if digest is None:
+                return jsonify({"error": "Resume digest failed"}), 500
+            digest_hash = resume_hash(resume_text)
+
+            # Attach it to the user's saved copies of this resume version
+            user_id = current_user_id()
+            if user_id:
+                try:
+                    get_user_supabase(g.access_token).table('resumes').update({'digest': digest}).eq('user_id', user_id).eq('resume_hash', digest_hash).execute()
+                except Exception as e:
+                    print(f"⚠️ Resume digest save failed: {e}")
+
+            return jsonify({"data": {"resume_hash": digest_hash, "digest": digest, "text": digest_text(digest)}}), 200
 
         elif action == 'analyze_resume':
             resume_text = data.get('resume', '')
-            jd_text = data.get('job_description', '')
+            fitted = fit_prompt('analyze_resume', resume=resume_for_prompt(resume_text, data.get('resume_view', 'full')), jd=data.get('job_description', ''))
+            # Length of the resume as submitted (the prompt copy may be trimmed)
+            word_count = len(resume_text.split())
             
             prompt = f"""
             Analyze this resume against the following job description.
             RESUME:
-            {resume_text[:20000]}
+            {fitted["resume"]}
             
             JOB DESCRIPTION:
-            {jd_text[:4000]}
+            {fitted["jd"]}
 
             Output JSON structure exactly:
             {{
@@ -1412,21 +2354,26 @@ def general_api():
                         "better": "Better version of that snippet" 
                     }}
                 ],
-                "word_count": {len(resume_text.split())}
+                "word_count": {word_count}
             }}
             """
 
-            completion = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a professional resume auditor. Output valid JSON only. Be extremely specific in the improvements section."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={ "type": "json_object" }
-            )
-            track_cost_chat(completion, "gpt-4o", "Analyze Resume")
-            
-            ai_content = completion.choices[0].message.content
+            def run_audit():
+                project_cost_chat("gpt-4o", "Analyze Resume", prompt)
+                completion = client.chat.completions.create(
+                    model="gpt-4o",
+                    timeout=llm_timeout,
+                    messages=[
+                        {"role": "system", "content": "You are a professional resume auditor. Output valid JSON only. Be extremely specific in the improvements section."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={ "type": "json_object" }
+                )
+                track_cost_chat(completion, "gpt-4o", "Analyze Resume")
+                return completion.choices[0].message.content
+
+            # Only the completion is cached: saving the scan (resumes / guest_scans) still runs on a hit
+            ai_content, _ = cached_llm_result("analyze_resume", "gpt-4o", {"resume": fitted["resume"], "job_description": fitted["jd"], "word_count": word_count}, run_audit)
             
             # --- PERSISTENCE LOGIC START ---
             try:
@@ -1444,12 +2391,10 @@ def general_api():
                 # Check for logged-in user
                 if auth_header and "Bearer " in auth_header:
                     try:
-                        token = auth_header.split(" ")[1]
-                        user_client = get_supabase()
-                        user_client.postgrest.auth(token)
-                        user_res = user_client.auth.get_user(token)
-                        if user_res and user_res.user:
-                            user_id = user_res.user.id
+                        user = get_current_user()
+                        if user:
+                            user_id = user.id
+                            user_client = get_user_supabase(g.access_token)
                     except: pass
 
                 if user_id:
@@ -1471,7 +2416,10 @@ def general_api():
                             'company_name': company_name,
                             'version_type': 'analysis',
                             'resume_text': resume_text[:30000] if resume_text else None,
-                            'content': ai_json
+                            'content': ai_json,
+                            # Digest is filled in here when ready, else by the resume_digest action
+                            'resume_hash': resume_hash(resume_text) if resume_text else None,
+                            'digest': resume_digests.get(resume_hash(resume_text)) if resume_text else None
                         }
                         user_client.table('resumes').insert(resume_record).execute()
                         
@@ -1512,13 +2460,12 @@ def general_api():
             try:
                 auth_header = request.headers.get('Authorization')
                 if auth_header:
-                    token = auth_header.split(" ")[1]
                     sb = get_supabase()
                     # 1. Get User
-                    user_res = sb.auth.get_user(token)
-                    if user_res and user_res.user:
-                        real_email = user_res.user.email
-                        user_id = user_res.user.id
+                    user = get_current_user()
+                    if user:
+                        real_email = user.email
+                        user_id = user.id
                         
                         # 2. Get Profile
                         profile_res = sb.table('users').select('*').eq('id', user_id).single().execute()
@@ -1549,93 +2496,15 @@ def general_api():
                 print(f"Identity Enforcement Warning: {e}")
 
             # --- ABSOLUTE FORCE-INJECTION: PRE-EXTRACTION ---
-            # Extract Education & Skills BEFORE AI call to force-inject later
+            # Education & Skills from the shared section index, force-injected later if the AI drops them
+            sections = resume_sections.get(resume_text)
             backup_education = []
             backup_skills = []
-            
             try:
-                # DEBUG: Log resume text details
-                print(f"\n=== EXTRACTION DEBUG ===")
-                print(f"Resume text length: {len(resume_text)} chars")
-                print(f"Resume text preview (first 500 chars):\n{resume_text[:500]}")
-                print(f"Resume text preview (last 500 chars):\n{resume_text[-500:]}")
-                
-                # Extract Education from raw text
-                lines = resume_text.split('\n')
-                print(f"Total lines: {len(lines)}")
-                
-                for i, line in enumerate(lines):
-                    if len(line) > 10000: continue
-                    l = line.lower()
-                    
-                    # 1. Broad education detection
-                    if any(x in l for x in ['bachelor', 'master', 'mba', 'phd', 'associate', 'university', 'college', 'institute', 'polytechnic', 'degree']):
-                        
-                        # 2. Strict Job Title Exclusions (Prevent "Associate Director" etc)
-                        if 'associate' in l and any(x in l for x in ['director', 'manager', 'lead', 'vp', 'vice president', 'executive', 'officer']):
-                            continue
-                        
-                        # 3. Refined Structure Identification (Improved Splitting)
-                        info_val = line.strip()
-                        school_val = "Education Institution"
-                        degree_val = "Education Detail"
-                        
-                        if ' - ' in info_val:
-                            parts = info_val.split(' - ', 1)
-                            if any(x in parts[0].lower() for x in ['university', 'college', 'institute']):
-                                school_val, degree_val = parts[0].strip(), parts[1].strip()
-                            else:
-                                degree_val, school_val = parts[0].strip(), parts[1].strip()
-                        elif ',' in info_val and not any(x in info_val.lower() for x in ['bba', 'mba', 'phd']):
-                            # Only split by comma if it doesn't look like a degree suffix (e.g. "BBA, Management")
-                            parts = info_val.split(',', 1)
-                            if any(x in parts[0].lower() for x in ['university', 'college', 'institute']):
-                                school_val, degree_val = parts[0].strip(), parts[1].strip()
-                            else:
-                                degree_val, school_val = parts[0].strip(), parts[1].strip()
-                        else:
-                            # Single piece of info
-                            if any(x in l for x in ['university', 'college', 'institute', 'polytechnic']):
-                                school_val = info_val
-                                degree_val = "Degree/Certification"
-                            else:
-                                degree_val = info_val
-                                school_val = "Institution"
-                            
-                        backup_education.append({
-                            "school": school_val,
-                            "degree": degree_val,
-                            "dates": ""
-                        })
-                
-                # Extract Skills from raw text (simple keyword scan)
-                in_skills_section = False
-                for line in lines:
-                    low_line = line.lower()
-                    # 1. Detection: Looking for "Skills" or similar headers
-                    if any(x == low_line.strip().replace(':', '') for x in ['skills', 'core competencies', 'technical skills', 'areas of expertise']):
-                        in_skills_section = True
-                        continue
-                    
-                    if in_skills_section:
-                        if not line.strip(): continue
-                        # 2. Stop condition: Next major section
-                        if len(line) > 500:
-                            in_skills_section = False
-                            break
-                        
-                        # 3. Heuristic stop: If we see "experience" or "education"
-                        if any(x in low_line and len(line) < 25 for x in ['experience', 'education', 'employment', 'history', 'projects']):
-                            in_skills_section = False
-                            break
-
-                        import re
-                        # Split by commas, bullets, pipes, or tabs
-                        parts = re.split(r'[,|•·\t]', line)
-                        backup_skills.extend([p.strip() for p in parts if p.strip()])
-                
-                print(f"BACKUP DATA: Extracted {len(backup_education)} education items, {len(backup_skills)} skills")
-                print(f"=== END EXTRACTION DEBUG ===\n")
+                backup_education = sections.education()
+                backup_skills = sections.skills()
+                print(f"BACKUP DATA: {len(resume_text)} chars, sections {[s.kind for s in sections.sections]}, "
+                      f"{len(sections.entries)} roles, {len(backup_education)} education items, {len(backup_skills)} skills")
             except Exception as e:
                 print(f"Backup Extraction Error: {e}")
                 import traceback
@@ -1650,13 +2519,12 @@ def general_api():
             # Fallback: Extraction from Resume if name is still "Identify from Resume"
             name_val = user_data.get('personal', {}).get('name', 'N/A')
             if name_val == "Identify from Resume":
-                # Look at first few lines for a valid name
-                potential_lines = [l.strip() for l in resume_text.split('\n') if l.strip() and len(l.strip()) < 50]
-                if potential_lines:
-                    # Heuristic: the first line is usually the name
-                    name_val = potential_lines[0]
+                # Heuristic: the first short line is usually the name
+                if sections.name_guess():
+                    name_val = sections.name_guess()
                     print(f"HEURISTIC EXTRACTION: Found possible name '{name_val}' in first line.")
 
+            fitted = fit_prompt('optimize', resume=resume_for_prompt(resume_text, data.get('resume_view', 'full')), jd=jd_text)
             prompt = f"""
             Optimize this resume for the target job using the specified strategy.
             
@@ -1667,10 +2535,10 @@ def general_api():
             Location: {user_data.get('personal', {}).get('location', 'N/A')}
 
             ORIGINAL RESUME CONTENT:
-            {resume_text[:20000]}
+            {fitted["resume"]}
 
             TARGET JOB:
-            {jd_text[:4000]}
+            {fitted["jd"]}
 
             STRATEGY:
             {strategy}
@@ -1716,8 +2584,10 @@ def general_api():
             }}
             """
 
+            project_cost_chat("gpt-4o", "Optimize Resume", prompt)
             completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=llm_timeout,
                 messages=[
                     { "role": "system", "content": "You are an expert executive resume writer. STRICT HALLUCINATION POLICY: Never invent tools, software, or specific domain expertise. Bridging must be grounded in the provided ORIGINAL RESUME. If a technical requirement is missing, flag it as a gap." },
                     { "role": "user", "content": prompt }
@@ -1759,26 +2629,8 @@ def general_api():
                     if input_skills:
                          ai_json['skills'] = input_skills
                     else:
-                         # Regex Fallback for Skills (Simple 'Skills:' section finder)
-                         found_skills_block = []
-                         in_skills = False
-                         for line in resume_text.split('\n'):
-                             low_line = line.lower()
-                             if any(x == low_line.strip().replace(':', '') for x in ['skills', 'core competencies', 'technical skills', 'areas of expertise']):
-                                 in_skills = True
-                                 continue
-                             if in_skills:
-                                 if not line.strip(): continue
-                                 if len(line) > 500:
-                                     in_skills = False
-                                     break
-                                 if any(x in low_line and len(line) < 25 for x in ['experience', 'education', 'employment', 'history', 'projects']):
-                                     in_skills = False
-                                     break
-                                 import re
-                                 parts = re.split(r'[,|•·\t]', line)
-                                 found_skills_block.extend([p.strip() for p in parts if p.strip()])
-
+                         # Skills section from the same section index (no re-scan)
+                         found_skills_block = backup_skills
                          if found_skills_block:
                              print(f"GUARDRAIL: Restored {len(found_skills_block)} skills from text.")
                              ai_json['skills'] = found_skills_block
@@ -1801,8 +2653,7 @@ def general_api():
                      auth_header = request.headers.get('Authorization')
                      if auth_header:
                          token = auth_header.split(" ")[1]
-                         supabase = get_supabase()
-                         supabase.postgrest.auth(token)
+                         supabase = get_user_supabase(token)
                          
                          # Persistence
                          try:
@@ -1814,11 +2665,9 @@ def general_api():
                          try:
                              user_id = data.get('userId')
                              if not user_id:
-                                 user_res = supabase.auth.get_user(token)
-                                 if user_res and user_res.user:
-                                     user_id = user_res.user.id
-                                 elif hasattr(user_res, 'id'): # Handle different object types
-                                     user_id = user_res.id
+                                 user = get_current_user()
+                                 if user:
+                                     user_id = user.id
 
                              if user_id:
                                  decrement_strategy_credit(user_id, 'rewrite', token)
@@ -1839,6 +2688,7 @@ def general_api():
             jd_text = data.get('jobDesc', '')
             user_data = data.get('user_data', {})
             p = user_data.get('personal', {})
+            fitted = fit_prompt('cover_letter', resume=resume_for_prompt(resume_text, data.get('resume_view', 'full')), jd=jd_text)
             
             prompt = f"""
             Write a highly tailored, professional cover letter based on the provided resume and job description.
@@ -1850,10 +2700,10 @@ def general_api():
             Location: {p.get('location', 'N/A')}
 
             RESUME CONTENT:
-            {resume_text[:20000]}
+            {fitted["resume"]}
             
             JOB DESCRIPTION:
-            {jd_text[:4000]}
+            {fitted["jd"]}
 
             INSTRUCTIONS:
             1. Use a modern, professional tone.
@@ -1864,8 +2714,10 @@ def general_api():
             6. Output in Markdown format.
             """
 
+            project_cost_chat("gpt-4o", "Cover Letter", prompt)
             completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=llm_timeout,
                 messages=[
                     { "role": "system", "content": "You are an expert professional cover letter writer. Use provided identity and resume. No placeholders for user info." },
                     { "role": "user", "content": prompt }
@@ -1877,26 +2729,22 @@ def general_api():
 
             # --- DEDUCTION LOGIC ---
             try:
-                auth_header = request.headers.get('Authorization')
-                if auth_header:
-                    token = auth_header.split(" ")[1]
-                    supabase = get_supabase()
-                    user_res = supabase.auth.get_user(token)
-                    if user_res and user_res.user:
-                        decrement_strategy_credit(user_res.user.id, 'cover', token)
+                user = get_current_user()
+                if user:
+                    decrement_strategy_credit(user.id, 'cover', g.access_token)
             except Exception as e:
                 print(f"Cover Letter Credit Deduction Error: {e}")
 
             return jsonify({ "data": ai_content }), 200
 
         elif action in ['linkedin_optimize', 'strategy_linkedin']:
-            about_me = data.get('aboutMe', '')
+            about_me = fit_prompt('linkedin_optimize', about_me=data.get('aboutMe', ''))["about_me"]
             
             prompt = f"""
             Analyze and optimize this LinkedIn 'About' section for a high-performance professional.
             
             ABOUT SECTION:
-            {about_me[:8000]}
+            {about_me}
 
             INSTRUCTIONS:
             1. Provide 3-5 specific recommendations for improvement.
@@ -1908,27 +2756,28 @@ def general_api():
             }}
             """
 
-            completion = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    { "role": "system", "content": "You are a LinkedIn branding expert. Output valid JSON only." },
-                    { "role": "user", "content": prompt }
-                ],
-                response_format={ "type": "json_object" }
-            )
-            track_cost_chat(completion, "gpt-4o", "LinkedIn Optimize")
-            
-            ai_json = json.loads(completion.choices[0].message.content)
+            def run_linkedin():
+                project_cost_chat("gpt-4o", "LinkedIn Optimize", prompt)
+                completion = client.chat.completions.create(
+                    model="gpt-4o",
+                    timeout=llm_timeout,
+                    messages=[
+                        { "role": "system", "content": "You are a LinkedIn branding expert. Output valid JSON only." },
+                        { "role": "user", "content": prompt }
+                    ],
+                    response_format={ "type": "json_object" }
+                )
+                track_cost_chat(completion, "gpt-4o", "LinkedIn Optimize")
+                return json.loads(completion.choices[0].message.content)
+
+            # Credits are still deducted below on a cache hit (the user received the deliverable)
+            ai_json, _ = cached_llm_result("linkedin_optimize", "gpt-4o", {"about_me": about_me}, run_linkedin)
 
             # --- DEDUCTION LOGIC ---
             try:
-                auth_header = request.headers.get('Authorization')
-                if auth_header:
-                    token = auth_header.split(" ")[1]
-                    supabase = get_supabase()
-                    user_res = supabase.auth.get_user(token)
-                    if user_res and user_res.user:
-                        decrement_strategy_credit(user_res.user.id, 'linkedin', token)
+                user = get_current_user()
+                if user:
+                    decrement_strategy_credit(user.id, 'linkedin', g.access_token)
             except Exception as e:
                 print(f"LinkedIn Credit Deduction Error: {e}")
 
@@ -1942,15 +2791,11 @@ def general_api():
             active_jobs_context = "No active jobs found."
             job_count = 0
             try:
-                auth_header = request.headers.get('Authorization')
-                if auth_header:
-                    token = auth_header.split(" ")[1]
-                    supabase = get_supabase()
-                    user_id_res = supabase.auth.get_user(token)
-                    user_id = user_id_res.user.id
+                user = get_current_user()
+                if user:
+                    user_id = user.id
                     
-                    user_client = get_supabase()
-                    user_client.postgrest.auth(token)
+                    user_client = get_user_supabase(g.access_token)
                     # Correct columns: job_title, company_name, status, resume_score
                     jobs_res = user_client.table('user_jobs').select('job_title, company_name, status, resume_score').eq('user_id', user_id).execute()
                     if jobs_res.data:
@@ -1965,11 +2810,8 @@ def general_api():
             # 2. Fetch System Prompt from Supabase config
             base_prompt = ""
             try:
-                admin_sb = get_admin_supabase()
-                config_res = admin_sb.table('system_configs').select('config_value').eq('config_key', 'lab_assistant_prompt').single().execute()
-                if config_res.data:
-                    base_prompt = config_res.data['config_value']
-                else:
+                base_prompt = get_system_config('lab_assistant_prompt')
+                if not base_prompt:
                     base_prompt = "You are the Strategy Lab Assistant. Context: {{mission_context}}\nJobs: {{active_jobs_context}}"
             except Exception as e:
                 print(f"Config Fetch Error: {e}")
@@ -1983,9 +2825,7 @@ def general_api():
                 # Fetch welcome logic from DB
                 welcome_base = ""
                 try:
-                    admin_sb = get_admin_supabase()
-                    w_res = admin_sb.table('system_configs').select('config_value').eq('config_key', 'lab_assistant_welcome').single().execute()
-                    welcome_base = w_res.data['config_value'] if w_res.data else "Generate a proactive concierge greeting."
+                    welcome_base = get_system_config('lab_assistant_welcome') or "Generate a proactive concierge greeting."
                 except:
                     welcome_base = "Generate a proactive concierge greeting."
 
@@ -2001,6 +2841,7 @@ def general_api():
                 """
                 completion = client.chat.completions.create(
                     model="gpt-4o",
+                    timeout=llm_timeout,
                     messages=[{"role": "user", "content": opening_prompt}]
                 )
                 track_cost_chat(completion, "gpt-4o", "Lab Greeting")
@@ -2008,6 +2849,7 @@ def general_api():
 
             completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=llm_timeout,
                 messages=[
                     { "role": "system", "content": system_prompt },
                     { "role": "user", "content": user_message }
@@ -2025,12 +2867,8 @@ def general_api():
                         esc_json = json.loads(match.group(1))
                         # Fetch user email for feedback
                         u_email = "anonymous@aceinterview.ai"
-                        auth_header = request.headers.get('Authorization')
-                        if auth_header:
-                            token = auth_header.split(" ")[1]
-                            sb = get_supabase()
-                            u_res = sb.auth.get_user(token)
-                            if u_res and u_res.user: u_email = u_res.user.email
+                        user = get_current_user()
+                        if user and user.email: u_email = user.email
 
                         # Submit to Admin Feedback
                         admin_sb = get_admin_supabase()
@@ -2072,13 +2910,14 @@ def general_api():
                 for h in story_history:
                      history_context += f"- {h.get('title', 'Story')}: {h.get('situation', '')[:100]}...\n"
 
+            fitted = fit_prompt('star_coach_init', resume=resume_for_prompt(resume_text, data.get('resume_view', 'digest')), jd=job_description)
             prompt = f"""
             You are an expert Behavioral Interview Coach.
 
             USER CONTEXT:
             - Target Role: {role_title}
-            - Job Description (Excerpt): {job_description[:2000]}
-            - User Resume (Excerpt): {resume_text[:4000]}
+            - Job Description (Excerpt): {fitted["jd"]}
+            - User Resume (Excerpt): {fitted["resume"]}
             
             {history_context}
 
@@ -2098,8 +2937,10 @@ def general_api():
             }}
             """
 
+            project_cost_chat("gpt-4o", "STAR Coach Init", prompt)
             completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=llm_timeout,
                 messages=[
                     { "role": "system", "content": "You are a tough but fair Interview Coach. Output valid JSON." },
                     { "role": "user", "content": prompt }
@@ -2149,6 +2990,7 @@ def general_api():
 
             completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=llm_timeout,
                 messages=messages,
                 response_format={ "type": "json_object" }
             )
@@ -2187,6 +3029,7 @@ def general_api():
 
             completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=llm_timeout,
                 messages=[
                     { "role": "system", "content": "You are an expert interview coach. Structure raw stories into perfect STAR format. Output valid JSON." },
                     { "role": "user", "content": prompt }
@@ -2204,8 +3047,7 @@ def general_api():
                     auth_header = request.headers.get('Authorization')
                     if auth_header:
                         token = auth_header.split(" ")[1]
-                        user_client = get_supabase()
-                        user_client.postgrest.auth(token)
+                        user_client = get_user_supabase(token)
                         
                         user_client.table('star_stories').insert({
                             "user_id": user_id,
@@ -2231,8 +3073,7 @@ def general_api():
                 auth_header = request.headers.get('Authorization')
                 if auth_header:
                     token = auth_header.split(" ")[1]
-                    user_client = get_supabase()
-                    user_client.postgrest.auth(token)
+                    user_client = get_user_supabase(token)
                     
                     response = user_client.table('star_stories').select("*").eq('user_id', user_id).order('created_at', desc=True).execute()
                     return jsonify({"stories": response.data}), 200
@@ -2249,24 +3090,48 @@ def general_api():
         print(f"General API Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+# 8B. ASYNC AI JOBS (submit / status / result for requests sent with "async": true)
+@app.route('/api/tasks', methods=['POST'])
+def submit_task():
+    """Same body as POST /api, queued: {"action": "optimize", ...}."""
+    data = request.json or {}
+    action = data.get('action')
+    if action not in ASYNC_ACTIONS["/api"]:
+        return jsonify({"error": f"Action '{action}' cannot run as a job"}), 400
+    return submit_async_job(action, data, path='/api')
+
+@app.route('/api/tasks/<job_id>', methods=['GET'])
+def task_status(job_id):
+    job = job_queue.get(job_id, current_user_id())
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job_response(job)), 200
+
+@app.route('/api/tasks/<job_id>/result', methods=['GET'])
+def task_result(job_id):
+    """The action's own response (body + status code) once done; 202 while it runs."""
+    job = job_queue.get(job_id, current_user_id())
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    if job["status"] == "failed":
+        return jsonify(job_response(job)), 500
+    if job["status"] != "done":
+        response = jsonify(job_response(job))
+        response.headers['Retry-After'] = '2'
+        return response, 202
+    return jsonify(job["result"]["body"]), job["result"]["status_code"]
+
 # 9. USER PROFILE (GET)
 @app.route('/api/user-profile', methods=['GET'])
+@require_user
 def get_user_profile():
-    auth_header = request.headers.get('Authorization')
-    if not auth_header: return jsonify({"error": "No Token"}), 401
-    
     try:
-        token = auth_header.split(" ")[1]
         supabase = get_supabase()
         
-        # Verify token and get user
-        try:
-            user_response = supabase.auth.get_user(token)
-            user_id = user_response.user.id
-            user_email = user_response.user.email
-        except Exception as auth_error:
-            print(f"Auth Error: {auth_error}")
-            return jsonify({"error": "Invalid token"}), 401
+        # Token verified by @require_user
+        user = get_current_user()
+        user_id = user.id
+        user_email = user.email
         
         # Fetch detailed profile from public table using service role
         try:
@@ -2300,21 +3165,14 @@ def get_user_profile():
 
 # 10. CREATE CHECKOUT SESSION (POST)
 @app.route('/api/create-checkout-session', methods=['POST'])
+@require_user
 def create_checkout_session():
-    auth_header = request.headers.get('Authorization')
-    if not auth_header: return jsonify({"error": "No Token"}), 401
-
     try:
         # Lazy Import Deps
         import stripe
-        
-        # Initialize Client
-        supabase = get_supabase()
 
-        # Securely extract User ID from Token
-        token = auth_header.split(" ")[1]
-        user_response = supabase.auth.get_user(token)
-        user_obj = user_response.user if user_response else None
+        # Securely extract User ID from Token (verified by @require_user)
+        user_obj = get_current_user()
         user_id = user_obj.id if user_obj else None
         user_email = user_obj.email if user_obj else None
         
@@ -2441,19 +3299,19 @@ def create_checkout_session():
 
 # 11. GENERATE STRATEGY TOOL (POST)
 @app.route('/api/generate-strategy-tool', methods=['POST'])
+@require_user
 def generate_strategy_tool():
-    auth_header = request.headers.get('Authorization')
-    if not auth_header: return jsonify({"error": "Unauthorized"}), 401
-
     try:
         data = request.json
         tool_type = data.get('tool_type')
         inputs = data.get('inputs', {})
+
+        if wants_async(data):
+            return submit_async_job(tool_type, data)
         
-        from openai import OpenAI
         OPENAI_KEY = os.environ.get("OPENAI_API_KEY")
         if not OPENAI_KEY: return jsonify({"error": "Missing AI Key"}), 500
-        client = OpenAI(api_key=OPENAI_KEY)
+        client = get_openai_client()
 
         prompt = ""
         
@@ -2469,7 +3327,7 @@ def generate_strategy_tool():
             
             INPUT DATA:
             - **Company Context**: {context}
-            - **Job Description (JD)**: {jd[:3000]}
+            - **Job Description (JD)**: {fit_prompt('strategy_inquisitor', jd=jd)["jd"]}
             
             INSTRUCTIONS:
             1. **SIMULATED SEARCH**: Use your internal knowledge base to "search" for {company}'s recent market position, products, or pain points. Combine this with the provided Context.
@@ -2537,7 +3395,7 @@ def generate_strategy_tool():
             Generate a comprehensive 30-60-90 Day Plan for a {role} at {company}.
             
             FOCUS AREA / JD CONTEXT:
-            {focus[:3000]}
+            {fit_prompt('strategy_plan', focus=focus)["focus"]}
             
             INSTRUCTIONS:
             1. Provide a strategic breakdown of priorities for the first 30, 60, and 90 days.
@@ -2549,8 +3407,10 @@ def generate_strategy_tool():
         else:
              return jsonify({"error": "Invalid Tool Type"}), 400
 
+        project_cost_chat("gpt-4o", "Generate Strategy Tool", prompt)
         completion = client.chat.completions.create(
             model="gpt-4o",
+            timeout=openai_timeout("strategy_tool"),
             messages=[
                 {"role": "system", "content": "You are a world-class Professional Career Strategist."},
                 {"role": "user", "content": prompt}
@@ -2560,14 +3420,10 @@ def generate_strategy_tool():
         
         # SUCCESS: Decrement Credits
         try:
-            token = auth_header.split(" ")[1]
-            # Verify user for ID (Lazy way since we trust token for cost tracking but needed for DB)
-            # Actually decrement function extracts user? No, it takes user_id.
-            # We need to get user_id here.
-            sb = get_supabase()
-            u_res = sb.auth.get_user(token)
-            if u_res and u_res.user:
-                decrement_strategy_credit(u_res.user.id, tool_type, token)
+            # decrement_strategy_credit takes the user_id, resolved from the token (cached)
+            user = get_current_user()
+            if user:
+                decrement_strategy_credit(user.id, tool_type, g.access_token)
         except Exception as ded_err:
             print(f"Decrement Failed: {ded_err}")
         
@@ -2600,9 +3456,8 @@ def decrement_strategy_credit(user_id, tool_type, token):
         target_col = col_map.get(tool_type)
         if not target_col: return # Unknown tool
         
-        # Init Client
-        client = get_supabase()
-        client.postgrest.auth(token)
+        # Init Client (RLS view as the user)
+        client = get_user_supabase(token)
         
         # Fetch Current Balance
         # Select target specific credit AND universal credit
@@ -2703,17 +3558,13 @@ def handle_checkout_fulfillment(session):
     logs = []
     logs.append(f"Processing {plan_type} for {user_id}")
     
-    # Initialize Supabase
-    from supabase import create_client
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    # Initialize Supabase (shared service-role client)
     key_type = "SERVICE"
-    if not key:
+    if not os.environ.get("SUPABASE_SERVICE_ROLE_KEY"):
         logs.append("WARNING: Service Key Missing. Using Anon.")
-        key = os.environ.get("SUPABASE_KEY")
         key_type = "ANON"
         
-    supabase_client = create_client(url, key)
+    supabase_client = get_admin_supabase()
     
     updates = {}
     
@@ -2839,9 +3690,6 @@ def handle_checkout_fulfillment(session):
 def admin_config():
     """Manage system settings (mostly bot prompts)."""
     try:
-        # Initialize Supabase client early for both authenticated and unauthenticated paths
-        supabase = get_admin_supabase()
-
         if request.method == 'GET':
             key = request.args.get('key')
             if not key:
@@ -2849,8 +3697,7 @@ def admin_config():
             
             # If it's the welcome message, allow public access
             if key == 'support_bot_welcome':
-                res = supabase.table('system_configs').select('config_value').eq('config_key', key).single().execute()
-                return jsonify({"value": res.data['config_value'] if res.data else None}), 200
+                return jsonify({"value": get_system_config(key)}), 200
 
             # Otherwise, require admin authentication
             auth_header = request.headers.get('Authorization')
@@ -2858,8 +3705,7 @@ def admin_config():
                 return jsonify({"error": "Admin Access Required"}), 401
             
             # Proceed with authenticated GET request
-            res = supabase.table('system_configs').select('config_value').eq('config_key', key).single().execute()
-            return jsonify({"value": res.data.get('config_value') if res.data else ""}), 200
+            return jsonify({"value": get_system_config(key, "")}), 200
         
         # POST requests always require admin authentication
         auth_header = request.headers.get('Authorization')
@@ -2870,7 +3716,7 @@ def admin_config():
         data = request.json
         key = data.get('key')
         val = data.get('value')
-        supabase.table('system_configs').upsert({'config_key': key, 'config_value': val, 'updated_at': 'now()'}).execute()
+        config_cache.set("system_configs", key, val)
         return jsonify({"status": "success"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -2890,9 +3736,8 @@ def support_chat():
 
         supabase = get_admin_supabase()
         
-        # 1. Fetch the system prompt
-        res = supabase.table('system_configs').select('config_value').eq('config_key', 'support_bot_prompt').single().execute()
-        base_system_prompt = res.data['config_value'] if res.data else "You are the Mission Specialist for AceInterview.ai. Help users with platform issues."
+        # 1. Fetch the system prompt (cached)
+        base_system_prompt = get_system_config('support_bot_prompt') or "You are the Mission Specialist for AceInterview.ai. Help users with platform issues."
         
         system_prompt = f"""
 {base_system_prompt}
@@ -2916,6 +3761,7 @@ If a user expresses frustration, reports a bug, requests a refund, or suggests a
         openai_client = get_openai_client()
         response = openai_client.chat.completions.create(
             model="gpt-4o", # Upgraded for better instruction following
+            timeout=openai_timeout("support_chat"),
             messages=messages,
             temperature=0.5
         )
@@ -3030,6 +3876,53 @@ def admin_health():
         print(f"Admin Health Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+# 12B. ADMIN CONNECTION POOL STATS (GET)
+@app.route('/api/admin/pool-stats', methods=['GET'])
+def admin_pool_stats():
+    auth_header = request.headers.get('Authorization')
+    if not auth_header: return jsonify({"error": "Admin Access Required"}), 401
+
+    try:
+        return jsonify({
+            "supabase": supabase_registry.stats(),
+            "openai": openai_holder.stats(),
+            "config_cache": config_cache.stats(),
+            "tts_cache": tts_cache.stats(),
+            "audio_store": audio_store.stats(),
+            "llm_cache": llm_cache.stats(),
+            "interview_sessions": interview_sessions.stats(),
+            "report_pipeline": report_pipeline.stats(),
+            "question_planner": question_planner.stats(),
+            "prescreen": prescreen.stats(),
+            "input_normalizer": input_normalizer.stats(),
+            "resume_sections": resume_sections.stats(),
+            "prompt_budget": prompt_budget.stats(),
+            "resume_digests": resume_digests.stats(),
+            "uat_runner": uat_runner.stats(),
+            "job_queue": job_queue.stats()
+        }), 200
+    except Exception as e:
+        print(f"Pool Stats Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+# 12C. TTS CACHE PREWARM (scripted phrases x voices, runs in the background)
+@app.route('/api/admin/tts-cache/prewarm', methods=['POST'])
+def admin_tts_prewarm():
+    auth_header = request.headers.get('Authorization')
+    if not auth_header: return jsonify({"error": "Admin Access Required"}), 401
+
+    try:
+        voices = (request.get_json(silent=True) or {}).get('voices') or TTS_VOICES
+        voices = [v for v in voices if v in TTS_VOICES]
+        if not voices:
+            return jsonify({"error": f"No known voices requested (choose from {', '.join(TTS_VOICES)})"}), 400
+        import threading
+        threading.Thread(target=prewarm_tts_cache, args=(voices,), name="tts-prewarm", daemon=True).start()
+        return jsonify({"status": "started", "voices": voices, "cache": tts_cache.stats()}), 202
+    except Exception as e:
+        print(f"TTS Prewarm Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 # 13. ADMIN USERS (GET)
 @app.route('/api/admin/users', methods=['GET'])
 def admin_users():
@@ -3166,10 +4059,9 @@ def admin_chat():
             }
         ]
 
-        from openai import OpenAI
         OPENAI_KEY = os.environ.get("OPENAI_API_KEY")
         if not OPENAI_KEY: return jsonify({"error": "Missing AI Key"}), 500
-        client = OpenAI(api_key=OPENAI_KEY)
+        client = get_openai_client()
 
         messages = [
             {
@@ -3189,6 +4081,7 @@ def admin_chat():
         # 1. First Call
         completion = client.chat.completions.create(
             model="gpt-4o",
+            timeout=openai_timeout("admin_chat"),
             messages=messages,
             tools=tools,
             tool_choice="auto"
@@ -3263,6 +4156,7 @@ def admin_chat():
                             prompt = f"Parse this resume into JSON: {mock_resume}"
                             res = client.chat.completions.create(
                                 model="gpt-4o-mini",
+                                timeout=openai_timeout("admin_chat"),
                                 messages=[{"role": "system", "content": "Output valid JSON only."}, {"role": "user", "content": prompt}],
                                 response_format={ "type": "json_object" }
                             )
@@ -3302,6 +4196,7 @@ def admin_chat():
                             prompt = f"Analyze JD: {mock_jd}. Return JSON with role, company, summary."
                             res = client.chat.completions.create(
                                 model="gpt-4o-mini",
+                                timeout=openai_timeout("admin_chat"),
                                 messages=[{"role": "system", "content": "Output JSON."}, {"role": "user", "content": prompt}],
                                 response_format={ "type": "json_object" }
                             )
@@ -3339,6 +4234,7 @@ def admin_chat():
             # 2. Final Response
             final_completion = client.chat.completions.create(
                 model="gpt-4o",
+                timeout=openai_timeout("admin_chat"),
                 messages=messages
             )
             track_cost_chat(final_completion, "gpt-4o", "Admin Chat Final")
@@ -3353,153 +4249,145 @@ def admin_chat():
         return jsonify({"error": str(e)}), 500
 
 # 15. ADMIN UAT SIMULATION (AI VS AI)
+# Runs as a background job (api/uat_runner.py): POST starts it, GET polls its progress.
+def uat_answer(client, instruction, question):
+    completion = client.chat.completions.create(
+        model="gpt-4o",
+        timeout=openai_timeout("uat"),
+        messages=[
+            {"role": "system", "content": instruction},
+            {"role": "user", "content": f"Interviewer asked: '{question}'. Answer now."}
+        ]
+    )
+    track_cost_chat(completion, "gpt-4o", "UAT Candidate")
+    return completion.choices[0].message.content
+
+def uat_score(client, question, answer):
+    completion = client.chat.completions.create(
+        model="gpt-4o",
+        timeout=openai_timeout("uat"),
+        messages=[
+            {"role": "system", "content": "Rate the answer 1-4 based on STAR method (2=Weak, 3=Competent, 4=Strong). Return ONLY the number."},
+            {"role": "user", "content": f"Question: {question}\nAnswer: {answer}"}
+        ]
+    )
+    track_cost_chat(completion, "gpt-4o", "UAT Score")
+    try:
+        return float(completion.choices[0].message.content.strip())
+    except:
+        return 3.0
+
+def uat_save_result(persona, average):
+    """Record a finished persona run against the first admin user. Returns log lines."""
+    # STRATEGY: Find the FIRST user with role='admin' to associate this test with.
+    # This ensures it shows up in your metrics but doesn't pollute a random user.
+    supabase = get_admin_supabase() # Use God Mode to save results
+    user_check = supabase.table('users').select('id, email').eq('role', 'admin').limit(1).execute()
+    if not user_check.data:
+        return ["> WARNING: No Admin User found. Test ran but not saved."]
+    admin_user = user_check.data[0]
+    supabase.table('interviews').insert({
+        "user_id": admin_user['id'],
+        "overall_score": average,
+        "session_name": f"UAT - {persona.upper()}", # Fix: Required field
+        "feedback_json": {"summary": f"UAT Simulation: {persona.upper()}"}
+    }).execute()
+    return [f"> Associating Test with Admin: {admin_user['email']}", "> Record SAVED to Database. Metrics should update."]
+
+def uat_voice_check(client, voice, lines):
+    """Coach lines through the shared speech pipeline: segment counts + time-to-first-audio."""
+    jobs = [(line, turn_speech_job(client, voice, line)) for line in lines]
+    logs = ["[VOICE CHECK]"]
+    for line, job in jobs:
+        try:
+            segments = job.wait()
+            stats = job.stats()
+            logs.append(f"> {line[:40]}... {stats['segments']} segment(s), {sum(len(seg.audio) for seg in segments)} bytes, first audio {stats['first_audio_s']}s")
+        except Exception as ve:
+            logs.append(f"> VOICE FAILURE on '{line[:40]}...': {ve}")
+    return logs
+
+def uat_progress(job):
+    """Run-test poll body from a shared job row: the latest published snapshot."""
+    if job["status"] == "failed":
+        return {"job_id": job["job_id"], "status": "failed", "progress": 1.0, "error": job["error"],
+                "personas": {}, "checks": {}, "logs": f"CRITICAL FAILURE: {job['error']}"}
+    if job["result"]:
+        # Always the queue's id: that is the one the status route looks up
+        return dict(job["result"], job_id=job["job_id"])
+    # Queued, or picked up but nothing published yet
+    return {"job_id": job["job_id"], "status": "running", "progress": 0.0, "personas": {}, "checks": {}}
+
 @app.route('/api/admin/run-test', methods=['POST'])
 def admin_run_test():
     """
-    Executes a Synthetic User Acceptance Test.
-    1. Creates a Virtual Candidate (Persona).
-    2. Runs a 6-turn interview against the System.
-    3. Generates a real report.
-    Returns: logs (text stream).
+    Starts a Synthetic User Acceptance Test job.
+    1. Creates Virtual Candidates (one or more personas, or 'all'), run in parallel.
+    2. Answers the full 6-question protocol concurrently, then scores it concurrently.
+    3. Saves each persona's average.
+    Runs on the shared job queue: progress snapshots go to the job table, so any worker
+    can answer the poll.
+    Returns: job id; poll /api/admin/run-test/<job_id> for progress + logs.
     """
     auth_header = request.headers.get('Authorization')
-    # Ideally verify admin here, checking token presence for now
+    if not auth_header: return jsonify({"error": "Admin Access Required"}), 401
     
     try:
-        data = request.json
-        persona_type = data.get('persona', 'professional').lower()
-        
-        logs = []
-        def log(msg): logs.append(msg)
-        
-        log(f"--- STARTING SIMULATION: {persona_type.upper()} ---")
-        
-        # 1. SETUP PERSONA
-        personas = {
-            "professional": "You are a seasoned Hiring Manager with 20 years experience. You use STAR method perfectly. You are confident, concise, and professional.",
-            "quitter": "You are annoyed. You give one-word answers. You hate interviews. You want to leave.",
-            "cliffhanger": "You answer the first part detailed, but then stop mid-sentence."
-        }
-        candidate_instruction = personas.get(persona_type, personas['professional'])
-
-        # 2. INITIALIZE CLIENTS
-        from openai import OpenAI
-        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-        supabase = get_admin_supabase() # Use God Mode to save results
-        
-        log("> Actors initialized.")
-        
-        # 3. INTERVIEW LOOP (Simulated)
-        # We mimic the state machine of the backend without calling the HTTP endpoints to save RTT.
-        # However, we DO want to test the 'logic'. 
-        
-        # Simulating "Question 1" (Background)
-        log("\n[TURN 1: Background]")
-        q1_text = "Tell me about yourself and your background." # Standard Opener
-        log(f"COACH: {q1_text}")
-        
-        # GENERATE CANDIDATE ANSWER
-        a1_completion = client.chat.completions.create(
-            model="gpt-4o", # Upgraded to match project access
-            messages=[
-                {"role": "system", "content": candidate_instruction},
-                {"role": "user", "content": f"Interviewer asked: '{q1_text}'. Answer now."}
-            ]
-        )
-        a1_text = a1_completion.choices[0].message.content
-        log(f"CANDIDATE: {a1_text[:50]}...")
-        
-        # SCORE ANSWER 1 (Simulating 'star_coach_step')
-        # ... For the sake of the UAT Visual, we will do a fast-forward loop
-        # Real simulation of all 6 steps takes ~30s, might timeout Vercel. 
-        # We will do a CONDENSED 3-Question Test for speed.
-        
-        questions = [
-            "Tell me about a time you led a team.",
-            "Describe a conflict you resolved.",
-            "Why do you want this role?"
-        ]
-        
-        scores = []
-        
-        for i, q in enumerate(questions):
-            turn = i + 2
-            log(f"\n[TURN {turn}: STAR Question]")
-            log(f"COACH: {q}")
-            
-            # Candidate Answer
-            ans_completion = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": candidate_instruction},
-                    {"role": "user", "content": f"Interviewer asked: '{q}'. Answer now."}
-                ]
+        data = request.json or {}
+        client = get_openai_client()
+        checks = {}
+        if data.get('voice_check'):
+            voice = data.get('voice', 'alloy')
+            checks["voice"] = lambda: uat_voice_check(client, voice, UAT_QUESTIONS)
+
+        # Every POST is a new run: a fresh key, so the job id is known before it starts
+        import uuid
+        key = uuid.uuid4().hex
+        job_id = JobQueue.job_id("uat_run", None, key)
+
+        def run():
+            return uat_runner.run(
+                data.get('personas') or data.get('persona', 'professional'),
+                answer=lambda instruction, question: uat_answer(client, instruction, question),
+                score=lambda question, answer: uat_score(client, question, answer),
+                on_done=uat_save_result,
+                checks=checks,
+                publish=lambda progress: job_queue.report(job_id, progress),
+                job_id=job_id
             )
-            ans_text = ans_completion.choices[0].message.content
-            log(f"CANDIDATE: {ans_text[:50]}...")
-            
-            # SCORING (The Real Test)
-            # We call the 'evaluate_answer' utility (assuming it's accessible or we mimic it)
-            # For this UAT, we will do a direct LLM check to generate the score 
-            # so we can populate the 'interviews' table.
-            
-            score_call = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "Rate the answer 1-4 based on STAR method (2=Weak, 3=Competent, 4=Strong). Return ONLY the number."},
-                    {"role": "user", "content": f"Question: {q}\nAnswer: {ans_text}"}
-                ]
-            )
-            try:
-                score = float(score_call.choices[0].message.content.strip())
-            except: 
-                score = 3.0
-            
-            scores.append(score)
-            log(f"SYSTEM: Scored {score}/4.0")
-            
-        # 4. GENERATE REPORT & SAVE
-        final_avg = round(sum(scores) / len(scores), 1)
-        log(f"\n[FINALIZING]")
-        log(f"Calculated Average: {final_avg}")
-        
-        # Write to Database
-        # STRATEGY: Find the FIRST user with role='admin' to associate this test with.
-        # This ensures it shows up in your metrics but doesn't pollute a random user.
-        user_check = supabase.table('users').select('id, email').eq('role', 'admin').limit(1).execute()
-        
-        if user_check.data:
-             admin_user = user_check.data[0]
-             uid = admin_user['id']
-             email = admin_user['email']
-             log(f"> Associating Test with Admin: {email}")
-             
-             # Insert Interview
-             supabase.table('interviews').insert({
-                 "user_id": uid,
-                 "overall_score": final_avg,
-                 "session_name": f"UAT - {persona_type.upper()}", # Fix: Required field
-                 "feedback_json": {"summary": f"UAT Simulation: {persona_type.upper()}"}
-             }).execute()
-             log("> Record SAVED to Database. Metrics should update.")
-        else:
-             log("> WARNING: No Admin User found. Test ran but not saved.")
 
-        log("\n--- TEST COMPLETE: SUCCESS ---")
-        return jsonify({ "logs": "\n".join(logs), "score": final_avg }), 200
+        job, _ = job_queue.submit("uat_run", {}, run, key=key)
+        return jsonify({**uat_progress(job), "status_url": f"/api/admin/run-test/{job_id}"}), 202
 
     except Exception as e:
         print(f"UAT Error: {e}")
         return jsonify({"error": str(e), "logs": f"CRITICAL FAILURE: {str(e)}"}), 500
 
+@app.route('/api/admin/run-test/<job_id>', methods=['GET'])
+def admin_run_test_status(job_id):
+    auth_header = request.headers.get('Authorization')
+    if not auth_header: return jsonify({"error": "Admin Access Required"}), 401
+
+    job = job_queue.get(job_id)
+    if job is None or job["action"] != "uat_run":
+        return jsonify({"error": "Unknown or expired test job"}), 404
+    return jsonify(uat_progress(job)), 200
+
 # 16. ADMIN MISSION INTEL (GET)
 # Helper for classification
+JOB_TIER_TERMS = Vocabulary(
+    {x: 'Executive' for x in ['ceo', 'v-p', 'vp', 'svp', 'evp', 'director', 'founder', 'co-founder', 'chief', 'executive', 'president']} |
+    {x: 'Management' for x in ['manager', 'lead', 'leader', 'supervisor', 'head of', 'principal']} |
+    {x: 'Service/Support' for x in ['cook', 'driver', 'clerk', 'staff', 'server', 'helper', 'technician']},
+    inflect=('s',)
+)
+
 def classify_job_title(title):
-    t = (title or "").lower()
-    if any(x in t for x in ['ceo', 'v-p', 'vp', 'director', 'founder', 'chief', 'executive', 'president']): return 'Executive'
-    if any(x in t for x in ['manager', 'lead', 'supervisor', 'head of', 'principal']): return 'Management'
-    if any(x in t for x in ['cook', 'driver', 'clerk', 'staff', 'server', 'helper', 'technician']): return 'Service/Support'
-    return 'Professional'
+    return JOB_TIER_TERMS.first_label(title or "", ('Executive', 'Management', 'Service/Support')) or 'Professional'
+
+def classify_job_titles(titles):
+    """classify_job_title over many titles (one compiled pattern, bulk analytics)."""
+    return [classify_job_title(t) for t in titles]
 
 @app.route('/api/admin/intel', methods=['GET'])
 def admin_mission_intel():
@@ -3513,8 +4401,7 @@ def admin_mission_intel():
         job_res = supabase.table('user_jobs').select("job_title").limit(500).execute()
         jobs = job_res.data if job_res.data else []
         tier_counts = {"Executive": 0, "Management": 0, "Professional": 0, "Service/Support": 0}
-        for j in jobs:
-            tier = classify_job_title(j.get('job_title', ''))
+        for tier in classify_job_titles([j.get('job_title', '') for j in jobs]):
             tier_counts[tier] += 1
 
         # 2. Performance Scores (System-Wide)
@@ -0,0 +1,222 @@
+# INTERVIEW SESSION STORE (Server-Side Turn State)
+# Strategy: The interview context (JD, resume, intel, role, archetype, seniority) and the
+# per-turn record (question, answer, feedback, internal_score) live on the server under an
+# unguessable session id created at isStart. Later turns send only {session_id, message}, so
+# request bodies stay a few hundred bytes instead of re-uploading the transcript every turn.
+# Backends are pluggable: in-memory LRU with TTL (single node, default), a SQLite file, or the
+# `interview_sessions` Supabase table (multi-node). Sessions are plain JSON-able dicts.
+
+import os
+import json
+import time
+import secrets
+import tempfile
+import threading
+from datetime import datetime, timezone
+from collections import OrderedDict
+
+from api.sqlite_store import SQLiteTable
+from api.env import env_int
+
+
+SESSION_TTL = env_int("INTERVIEW_SESSION_TTL", 2 * 3600)
+MAX_HISTORY = 20  # same cap the browser applies to its own history
+
+
+# --- BACKENDS ---
+# load(id) -> session dict or None (expired counts as missing); store(session, expires_at);
+# delete(id). Backends raise on storage errors.
+
+class MemorySessionBackend:
+    """Per-process LRU with TTL eviction (single node / local dev)."""
+
+    def __init__(self, max_sessions=None):
+        self.max_sessions = max_sessions if max_sessions is not None else env_int("INTERVIEW_SESSION_MAX", 1000)
+        self._sessions = OrderedDict()  # id -> (json text, expires_at)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def load(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._sessions[session_id]
+                self.evictions += 1
+                return None
+            self._sessions.move_to_end(session_id)
+        # Stored as JSON so callers never share (and mutate) the cached object
+        return json.loads(entry[0])
+
+    def store(self, session, expires_at):
+        text = json.dumps(session)
+        with self._lock:
+            self._sessions[session["id"]] = (text, expires_at)
+            self._sessions.move_to_end(session["id"])
+            now = time.time()
+            # Expired sessions first, then the least recently used ones
+            for sid in [sid for sid, (_, exp) in self._sessions.items() if exp <= now]:
+                del self._sessions[sid]
+                self.evictions += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionBackend:
+    """Single-file store shared by every worker on one host."""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("INTERVIEW_SESSION_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "interview-sessions.sqlite3")
+        self.db = SQLiteTable(self.path, "interview_sessions", "id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL")
+
+    def load(self, session_id):
+        row = self.db.read("SELECT data FROM interview_sessions WHERE id = ? AND expires_at > ?", (session_id, time.time()))
+        return json.loads(row[0]) if row else None
+
+    def store(self, session, expires_at):
+        self.db.write(
+            "INSERT OR REPLACE INTO interview_sessions (id, data, expires_at) VALUES (?, ?, ?)",
+            (session["id"], json.dumps(session), expires_at)
+        )
+
+    def delete(self, session_id):
+        self.db.write("DELETE FROM interview_sessions WHERE id = ?", (session_id,), purge=False)
+
+
+class SupabaseSessionBackend:
+    """Rows in the `interview_sessions` table (see create_interview_sessions_table.sql)."""
+
+    def __init__(self, client_factory, table="interview_sessions"):
+        self.client_factory = client_factory
+        self.table = table
+
+    @staticmethod
+    def _iso(ts):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+    def load(self, session_id):
+        res = self.client_factory().table(self.table).select("data").eq("id", session_id).gt("expires_at", self._iso(time.time())).limit(1).execute()
+        return res.data[0]["data"] if res.data else None
+
+    def store(self, session, expires_at):
+        self.client_factory().table(self.table).upsert([{
+            "id": session["id"],
+            "user_id": session.get("user_id"),
+            "data": session,
+            "expires_at": self._iso(expires_at),
+        }], on_conflict="id").execute()
+
+    def delete(self, session_id):
+        self.client_factory().table(self.table).delete().eq("id", session_id).execute()
+
+
+def session_backend_from_env(supabase_factory=None):
+    """INTERVIEW_SESSION_BACKEND = memory (default) | sqlite | supabase."""
+    kind = (os.environ.get("INTERVIEW_SESSION_BACKEND") or "memory").strip().lower()
+    if kind == "supabase" and supabase_factory is not None:
+        return SupabaseSessionBackend(supabase_factory)
+    if kind == "sqlite":
+        return SQLiteSessionBackend()
+    return MemorySessionBackend()
+
+
+class SessionStore:
+    """Create / load / update interview sessions on a backend; every write slides the TTL."""
+
+    def __init__(self, backend=None, ttl=None):
+        self.backend = backend if backend is not None else MemorySessionBackend()
+        self.ttl = ttl if ttl is not None else SESSION_TTL
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "loaded": 0, "missing": 0, "turns_recorded": 0, "backend_errors": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def create(self, context, user_id=None, question_count=1, voice=None, persist=True):
+        """New session; persist=False leaves the first write to the caller's record_turn."""
+        now = time.time()
+        session = {
+            "id": secrets.token_urlsafe(18),
+            "user_id": user_id,
+            "context": context,
+            "history": [],
+            "last_question": "",
+            "next_question_count": question_count,
+            "voice": voice,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if persist:
+            self.save(session)
+        self._count("created")
+        return session
+
+    def get(self, session_id, user_id=None):
+        """The session, or None if unknown/expired (or owned by another user: a session with an
+        owner is never returned to an anonymous caller)."""
+        if not session_id or not isinstance(session_id, str):
+            return None
+        try:
+            session = self.backend.load(session_id)
+        except Exception as e:
+            print(f"[SESSIONS] Load failed: {e}")
+            self._count("backend_errors")
+            session = None
+        if session is None or (session.get("user_id") and session["user_id"] != user_id):
+            self._count("missing")
+            return None
+        self._count("loaded")
+        return session
+
+    def save(self, session):
+        session["updated_at"] = time.time()
+        self.backend.store(session, session["updated_at"] + self.ttl)
+
+    def record_turn(self, session, question_count, answer, ai_json):
+        """Append this turn exactly as the browser's history would, then persist.
+
+        Mirrors the client: the answer is paired with the previous question, and the
+        question counter only advances once the model produced a next question.
+        """
+        if answer and session.get("last_question"):
+            session["history"].append({
+                "question": session["last_question"],
+                "answer": answer,
+                "feedback": ai_json.get("feedback") or "",
+                "internal_score": ai_json.get("internal_score") or 0,
+            })
+            del session["history"][:-MAX_HISTORY]
+        if ai_json.get("next_question"):
+            session["last_question"] = ai_json["next_question"]
+            question_count += 1
+        session["next_question_count"] = question_count
+        try:
+            self.save(session)
+            self._count("turns_recorded")
+        except Exception as e:
+            print(f"[SESSIONS] Save failed: {e}")
+            self._count("backend_errors")
+
+    def delete(self, session_id):
+        try:
+            self.backend.delete(session_id)
+        except Exception as e:
+            print(f"[SESSIONS] Delete failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            out = {"backend": type(self.backend).__name__, "ttl": self.ttl, **self._counters}
+        if isinstance(self.backend, MemorySessionBackend):
+            out["active"] = len(self.backend)
+            out["evictions"] = self.backend.evictions
+        return out
@@ -0,0 +1,184 @@
+# INTERVIEW STREAMING (Server-Sent Events)
+# Strategy: The interview turn model answers with one JSON object ({"feedback", "checklist",
+# "next_question"}). Instead of waiting for the whole object, feed the token deltas through
+# an incremental top-level field extractor: string fields are surfaced character-by-character
+# as they generate, and every field (string, object, scalar) is reported the moment its
+# value closes. The route turns those callbacks into SSE frames.
+
+import json
+
+
+def sse_event(event, data):
+    """One SSE frame. data is JSON-encoded so multi-line text never breaks framing."""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def sse_comment(text=""):
+    """Keep-alive frame (ignored by EventSource, keeps proxies from timing out)."""
+    return f": {text}\n\n"
+
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class JsonFieldStreamer:
+    """Incremental extractor for the top-level fields of a streamed JSON object.
+
+    on_delta(key, text)     - new decoded characters of a top-level string value
+    on_complete(key, value) - a top-level value closed (parsed; raw text if unparseable)
+
+    Nested objects/arrays are buffered raw and parsed once their closing bracket arrives.
+    Anything before the opening brace (stray whitespace, code fences) is ignored.
+    """
+
+    def __init__(self, on_delta=None, on_complete=None):
+        self.on_delta = on_delta
+        self.on_complete = on_complete
+        self.fields = {}
+        self._state = "start"      # start | key_wait | key | colon | value_wait | string | nested | scalar | after_value | done
+        self._key = []
+        self._current_key = None
+        self._value = []
+        self._escape = False
+        self._unicode = None       # pending \uXXXX hex digits
+        self._high_surrogate = None
+        self._depth = 0
+        self._nested_in_string = False
+        self._nested_escape = False
+
+    # --- PUBLIC ---
+    def feed(self, text):
+        for ch in text or "":
+            self._step(ch)
+
+    @property
+    def done(self):
+        return self._state == "done"
+
+    # --- INTERNALS ---
+    def _emit_delta(self, text):
+        if text and self.on_delta:
+            self.on_delta(self._current_key, text)
+
+    def _finish(self, value):
+        self.fields[self._current_key] = value
+        if self.on_complete:
+            self.on_complete(self._current_key, value)
+        self._current_key = None
+        self._value = []
+        self._state = "after_value"
+
+    def _string_char(self, ch):
+        """Decode one char inside a top-level string value. Returns decoded text ('' if pending)."""
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) < 4:
+                return ""
+            try:
+                code = int(self._unicode, 16)
+            except ValueError:
+                code = 0xFFFD
+            self._unicode = None
+            if 0xD800 <= code <= 0xDBFF:
+                self._high_surrogate = code
+                return ""
+            if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            return chr(code)
+        if self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+                return ""
+            return _ESCAPES.get(ch, ch)
+        if ch == "\\":
+            self._escape = True
+            return ""
+        return ch
+
+    def _step(self, ch):
+        state = self._state
+        if state == "start":
+            if ch == "{":
+                self._state = "key_wait"
+        elif state == "key_wait":
+            if ch == '"':
+                self._key = []
+                self._state = "key"
+            elif ch == "}":
+                self._state = "done"
+        elif state == "key":
+            if self._escape:
+                self._escape = False
+                self._key.append(_ESCAPES.get(ch, ch))
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._current_key = "".join(self._key)
+                self._state = "colon"
+            else:
+                self._key.append(ch)
+        elif state == "colon":
+            if ch == ":":
+                self._state = "value_wait"
+        elif state == "value_wait":
+            if ch.isspace():
+                return
+            self._value = []
+            if ch == '"':
+                self._state = "string"
+            elif ch in "{[":
+                self._value.append(ch)
+                self._depth = 1
+                self._nested_in_string = False
+                self._nested_escape = False
+                self._state = "nested"
+            else:
+                self._value.append(ch)
+                self._state = "scalar"
+        elif state == "string":
+            if ch == '"' and not self._escape and self._unicode is None:
+                self._finish("".join(self._value))
+                return
+            decoded = self._string_char(ch)
+            if decoded:
+                self._value.append(decoded)
+                self._emit_delta(decoded)
+        elif state == "nested":
+            self._value.append(ch)
+            if self._nested_in_string:
+                if self._nested_escape:
+                    self._nested_escape = False
+                elif ch == "\\":
+                    self._nested_escape = True
+                elif ch == '"':
+                    self._nested_in_string = False
+            elif ch == '"':
+                self._nested_in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    raw = "".join(self._value)
+                    try:
+                        self._finish(json.loads(raw))
+                    except ValueError:
+                        self._finish(raw)
+        elif state == "scalar":
+            if ch in ",}":
+                raw = "".join(self._value).strip()
+                try:
+                    self._finish(json.loads(raw))
+                except ValueError:
+                    self._finish(raw)
+                self._state = "key_wait" if ch == "," else "done"
+            else:
+                self._value.append(ch)
+        elif state == "after_value":
+            if ch == ",":
+                self._state = "key_wait"
+            elif ch == "}":
+                self._state = "done"
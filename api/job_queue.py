@@ -0,0 +1,249 @@
+# BACKGROUND JOB QUEUE (Async Mode For Slow AI Actions)
+# Strategy: Slow GPT-4o actions (optimize, resume audit, cover letter, final report, strategy
+# tools) can run as jobs: the request returns a job id at once and a bounded worker pool does
+# the work, so web workers are not pinned for 10-40 s per call. Jobs are rows in a shared
+# table (SQLite file locally, the `ai_jobs` Postgres table via Supabase in production), so any
+# worker can answer a status / result poll. A job id is derived from (owner, action,
+# idempotency key): resubmitting the same request returns the existing job instead of paying
+# for a second completion. Failed, expired and stale (worker died) jobs can be claimed again.
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.llm_cache import normalize_inputs
+from api.sqlite_store import SQLiteTable
+from api.env import env_int
+
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+JOB_FIELDS = ("job_id", "action", "owner", "status", "result", "error", "created_at", "updated_at", "expires_at")
+
+
+def reclaimable(row, now, stale_before, dedupe_before):
+    """Whether a submit may start this job id over instead of returning the existing job."""
+    if row["status"] == "failed" or row["expires_at"] <= now:
+        return True
+    if row["status"] in ("queued", "running"):
+        # Nobody has touched it for a while: the worker that owned it is gone
+        return row["updated_at"] < stale_before
+    return row["updated_at"] < dedupe_before
+
+
+# --- SHARED BACKENDS ---
+# get(job_id) -> row or None; claim(row, now, stale_before, dedupe_before) -> True when the row
+# was inserted (or replaced a reclaimable one); update(job_id, fields). Errors propagate.
+
+class MemoryJobBackend:
+    """Single-process store (tests, JOB_QUEUE_BACKEND=memory)."""
+
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._rows.get(job_id)
+            return dict(row) if row else None
+
+    def claim(self, row, now, stale_before, dedupe_before):
+        with self._lock:
+            existing = self._rows.get(row["job_id"])
+            if existing and not reclaimable(existing, now, stale_before, dedupe_before):
+                return False
+            self._rows[row["job_id"]] = dict(row)
+            return True
+
+    def update(self, job_id, fields):
+        with self._lock:
+            if job_id in self._rows:
+                self._rows[job_id].update(fields)
+
+
+class SQLiteJobBackend:
+    """Single-file job table for local dev / single-host deploys (see api/sqlite_store.py)."""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("JOB_QUEUE_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "ai-jobs.sqlite3")
+        self.db = SQLiteTable(
+            self.path, "ai_jobs",
+            "job_id TEXT PRIMARY KEY, action TEXT NOT NULL, owner TEXT, status TEXT NOT NULL,"
+            " result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL NOT NULL"
+        )
+
+    def get(self, job_id):
+        row = self.db.read(f"SELECT {', '.join(JOB_FIELDS)} FROM ai_jobs WHERE job_id = ?", (job_id,))
+        if not row:
+            return None
+        row = dict(zip(JOB_FIELDS, row))
+        row["result"] = json.loads(row["result"]) if row["result"] else None
+        return row
+
+    def claim(self, row, now, stale_before, dedupe_before):
+        values = [json.dumps(row[f]) if f == "result" and row[f] is not None else row[f] for f in JOB_FIELDS]
+        # One statement, so two workers racing for the same id cannot both win
+        return self.db.write(
+            f"INSERT INTO ai_jobs ({', '.join(JOB_FIELDS)}) VALUES ({', '.join('?' * len(JOB_FIELDS))}) "
+            f"ON CONFLICT(job_id) DO UPDATE SET {', '.join(f'{f} = excluded.{f}' for f in JOB_FIELDS[1:])} "
+            "WHERE ai_jobs.status = 'failed' OR ai_jobs.expires_at <= ? "
+            "OR (ai_jobs.status IN ('queued', 'running') AND ai_jobs.updated_at < ?) "
+            "OR (ai_jobs.status = 'done' AND ai_jobs.updated_at < ?)",
+            values + [now, stale_before, dedupe_before]
+        ) == 1
+
+    def update(self, job_id, fields):
+        fields = {k: json.dumps(v) if k == "result" and v is not None else v for k, v in fields.items()}
+        self.db.write(
+            f"UPDATE ai_jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE job_id = ?",
+            list(fields.values()) + [job_id],
+            purge=False
+        )
+
+
+class SupabaseJobBackend:
+    """Rows in the Postgres `ai_jobs` table (see create_ai_jobs_table.sql), via the service-role client."""
+
+    def __init__(self, client_factory, table="ai_jobs"):
+        self.client_factory = client_factory
+        self.table = table
+
+    def get(self, job_id):
+        res = self.client_factory().table(self.table).select(", ".join(JOB_FIELDS)).eq("job_id", job_id).limit(1).execute()
+        return res.data[0] if res.data else None
+
+    def claim(self, row, now, stale_before, dedupe_before):
+        table = self.client_factory().table(self.table)
+        try:
+            table.insert([row]).execute()
+            return True
+        except Exception:
+            # Primary key taken: take it over only if reclaimable and nobody else just did
+            existing = self.get(row["job_id"])
+            if existing is None or not reclaimable(existing, now, stale_before, dedupe_before):
+                return False
+            res = (self.client_factory().table(self.table).update(row)
+                   .eq("job_id", row["job_id"]).eq("updated_at", existing["updated_at"]).execute())
+            return bool(res.data)
+
+    def update(self, job_id, fields):
+        self.client_factory().table(self.table).update(fields).eq("job_id", job_id).execute()
+
+
+def job_backend_from_env(supabase_factory=None):
+    """JOB_QUEUE_BACKEND = sqlite (default) | supabase | memory."""
+    kind = (os.environ.get("JOB_QUEUE_BACKEND") or "sqlite").strip().lower()
+    if kind == "supabase" and supabase_factory is not None:
+        return SupabaseJobBackend(supabase_factory)
+    if kind == "sqlite":
+        return SQLiteJobBackend()
+    return MemoryJobBackend()
+
+
+class JobQueue:
+    """Idempotent job submission onto a bounded worker pool, with polled status / results."""
+
+    def __init__(self, backend=None, max_workers=None, ttl=None, dedupe_window=None, stale_after=None):
+        self.backend = backend if backend is not None else MemoryJobBackend()
+        self.max_workers = max_workers or env_int("JOB_WORKERS", 4)
+        self.ttl = ttl if ttl is not None else env_int("JOB_TTL", 24 * 3600)
+        # A finished job is returned to identical resubmits for this long, then runs afresh
+        self.dedupe_window = dedupe_window if dedupe_window is not None else env_int("JOB_DEDUPE_SECONDS", 600)
+        self.stale_after = stale_after if stale_after is not None else env_int("JOB_STALE_SECONDS", 300)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = {"submitted": 0, "deduped": 0, "deferred": 0, "done": 0, "failed": 0, "backend_errors": 0}
+
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        return self._executor
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    @staticmethod
+    def job_id(action, owner, key):
+        return hashlib.sha256(f"{owner or ''}|{action}|{key}".encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def payload_key(payload):
+        """Default idempotency key: the normalized request itself."""
+        return hashlib.sha256(normalize_inputs(payload).encode("utf-8")).hexdigest()
+
+    def _update(self, job_id, **fields):
+        try:
+            self.backend.update(job_id, dict(fields, updated_at=time.time()))
+        except Exception as e:
+            self._count("backend_errors")
+            print(f"[JOBS] Backend update failed for {job_id}: {e}")
+
+    def _run(self, job_id, run):
+        self._update(job_id, status="running")
+        try:
+            result = run()
+        except Exception as e:
+            self._count("failed")
+            print(f"[JOBS] Job {job_id} failed: {e}")
+            self._update(job_id, status="failed", error=str(e))
+            return
+        self._count("done")
+        self._update(job_id, status="done", result=result)
+
+    def report(self, job_id, partial):
+        """Publish a running job's partial result (progress), readable by any worker's get()."""
+        self._update(job_id, status="running", result=partial)
+
+    def submit(self, action, payload, run, owner=None, key=None):
+        """(job, created). run() -> JSON-serializable result runs on the pool unless a live
+        job with the same id exists, in which case that job is returned as-is."""
+        now = time.time()
+        job_id = self.job_id(action, owner, key or self.payload_key(payload))
+        row = {
+            "job_id": job_id, "action": action, "owner": owner, "status": "queued", "result": None, "error": None,
+            "created_at": now, "updated_at": now, "expires_at": now + self.ttl,
+        }
+        if not self.backend.claim(row, now, now - self.stale_after, now - self.dedupe_window):
+            existing = self.backend.get(job_id)
+            if existing is not None:
+                self._count("deduped")
+                return existing, False
+        self._count("submitted")
+        self.executor().submit(self._run, job_id, run)
+        return row, True
+
+    def defer(self, action, payload, owner=None, key=None):
+        """Record a job without running it: `payload` (what to do) is kept as the row's result
+        and whichever worker is later asked for the job runs it on demand, so nothing depends on
+        a thread outliving the request. Returns the row (errors propagate)."""
+        now = time.time()
+        job_id = self.job_id(action, owner, key or self.payload_key(payload))
+        row = {
+            "job_id": job_id, "action": action, "owner": owner, "status": "queued", "result": payload, "error": None,
+            "created_at": now, "updated_at": now, "expires_at": now + self.ttl,
+        }
+        self.backend.claim(row, now, now - self.stale_after, now - self.dedupe_window)
+        self._count("deferred")
+        return row
+
+    def get(self, job_id, owner=None):
+        """The job row, or None if unknown, expired or owned by someone else."""
+        try:
+            job = self.backend.get(job_id)
+        except Exception as e:
+            self._count("backend_errors")
+            print(f"[JOBS] Backend read failed: {e}")
+            return None
+        if job is None or job["expires_at"] <= time.time() or (job["owner"] and job["owner"] != owner):
+            return None
+        return job
+
+    def stats(self):
+        with self._lock:
+            return {"backend": type(self.backend).__name__, "max_workers": self.max_workers, **self._counters}
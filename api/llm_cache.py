@@ -0,0 +1,246 @@
+# LLM RESPONSE CACHE (Content-Addressed, Deterministic Extraction Actions)
+# Strategy: Results of extraction-style actions (JD analysis, resume parse/audit, LinkedIn
+# rewrite) are keyed by sha256(action | model | prompt version | normalized inputs). A bounded
+# in-process LRU answers repeat submissions in microseconds; a pluggable shared backend
+# (SQLite file locally, the `llm_cache` Supabase table in production) lets every worker reuse
+# a result once any of them paid for it. Each action has its own TTL, concurrent misses for
+# the same key share one completion, and backend failures degrade to a plain miss.
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from api.sqlite_store import SQLiteTable
+from api.env import env_int
+
+
+DAY = 24 * 3600
+# Seconds a cached result stays valid, per action (override with LLM_CACHE_TTL_<ACTION>)
+DEFAULT_TTLS = {
+    "analyze_jd": 30 * DAY,
+    "generate_intel": 7 * DAY,
+    "parse_resume": 30 * DAY,
+    "analyze_resume": 7 * DAY,
+    "linkedin_optimize": 7 * DAY,
+    "resume_digest": 30 * DAY,
+}
+FALLBACK_TTL = DAY
+
+
+def normalize_inputs(inputs):
+    """Canonical text for hashing: whitespace-collapsed strings, key-sorted containers."""
+    def norm(value):
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, dict):
+            return {str(k): norm(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [norm(v) for v in value]
+        return value
+    return json.dumps(norm(inputs), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+# --- SHARED BACKENDS ---
+# get(key) -> value or None (expired rows count as absent); set(key, action, value, expires_at).
+# Both raise on storage errors; the cache turns those into misses.
+
+class SQLiteBackend:
+    """Single-file store for local dev / single-host deploys (see api/sqlite_store.py)."""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("LLM_CACHE_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "llm-cache.sqlite3")
+        self.db = SQLiteTable(
+            self.path, "llm_cache",
+            "cache_key TEXT PRIMARY KEY, action TEXT NOT NULL,"
+            " value TEXT NOT NULL, expires_at REAL NOT NULL, created_at REAL NOT NULL"
+        )
+
+    def get(self, key):
+        row = self.db.read("SELECT value FROM llm_cache WHERE cache_key = ? AND expires_at > ?", (key, time.time()))
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, action, value, expires_at):
+        self.db.write(
+            "INSERT OR REPLACE INTO llm_cache (cache_key, action, value, expires_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            (key, action, json.dumps(value), expires_at, time.time())
+        )
+
+
+class SupabaseBackend:
+    """Rows in the `llm_cache` table (see create_llm_cache_table.sql), via the service-role client."""
+
+    def __init__(self, client_factory, table="llm_cache"):
+        self.client_factory = client_factory
+        self.table = table
+
+    @staticmethod
+    def _iso(ts):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+    def get(self, key):
+        res = self.client_factory().table(self.table).select("value").eq("cache_key", key).gt("expires_at", self._iso(time.time())).limit(1).execute()
+        return res.data[0]["value"] if res.data else None
+
+    def set(self, key, action, value, expires_at):
+        self.client_factory().table(self.table).upsert([{
+            "cache_key": key,
+            "action": action,
+            "value": value,
+            "expires_at": self._iso(expires_at),
+        }], on_conflict="cache_key").execute()
+
+
+def backend_from_env(supabase_factory=None):
+    """LLM_CACHE_BACKEND = sqlite (default) | supabase | memory."""
+    kind = (os.environ.get("LLM_CACHE_BACKEND") or "sqlite").strip().lower()
+    if kind == "supabase" and supabase_factory is not None:
+        return SupabaseBackend(supabase_factory)
+    if kind == "sqlite":
+        return SQLiteBackend()
+    return None
+
+
+class LLMCache:
+    """Memory LRU in front of an optional shared backend, with per-action TTLs."""
+
+    def __init__(self, backend=None, max_entries=None, ttls=None):
+        self.backend = backend
+        self.max_entries = max_entries if max_entries is not None else env_int("LLM_CACHE_MAX_ENTRIES", 512)
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._memory = OrderedDict()  # key -> (value, expires_at)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "backend_hits": 0, "misses": 0, "stores": 0, "coalesced": 0, "evictions": 0, "backend_errors": 0}
+        self._by_action = {}
+
+    @staticmethod
+    def key(action, model, prompt_version, inputs):
+        raw = f"{action}|{model}|{prompt_version}|{normalize_inputs(inputs)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, action):
+        override = os.environ.get(f"LLM_CACHE_TTL_{action.upper()}")
+        if override:
+            try:
+                return int(override)
+            except ValueError:
+                pass
+        return self.ttls.get(action, FALLBACK_TTL)
+
+    def _count(self, action, outcome):
+        with self._lock:
+            self._counters[outcome] += 1
+            per = self._by_action.setdefault(action, {"hits": 0, "misses": 0})
+            if outcome in ("memory_hits", "backend_hits"):
+                per["hits"] += 1
+            elif outcome == "misses":
+                per["misses"] += 1
+
+    # --- MEMORY TIER ---
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry[0]
+
+    def _memory_put(self, key, value, expires_at):
+        with self._lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    # --- PUBLIC ---
+    def get(self, action, model, prompt_version, inputs):
+        key = self.key(action, model, prompt_version, inputs)
+        value = self._memory_get(key)
+        if value is not None:
+            self._count(action, "memory_hits")
+            return value
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"[LLM CACHE] Backend read failed: {e}")
+            self._count(action, "backend_errors")
+            return None
+        if value is not None:
+            self._count(action, "backend_hits")
+            # The backend row may outlive this worker's TTL view slightly; that is fine for a cache
+            self._memory_put(key, value, time.time() + self.ttl_for(action))
+        return value
+
+    def put(self, action, model, prompt_version, inputs, value):
+        if value is None:
+            return
+        key = self.key(action, model, prompt_version, inputs)
+        expires_at = time.time() + self.ttl_for(action)
+        self._memory_put(key, value, expires_at)
+        with self._lock:
+            self._counters["stores"] += 1
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, action, value, expires_at)
+        except Exception as e:
+            print(f"[LLM CACHE] Backend write failed: {e}")
+            self._count(action, "backend_errors")
+
+    def get_or_compute(self, action, model, prompt_version, inputs, compute):
+        """(value, hit). compute() runs once per key across concurrent callers; errors are not cached."""
+        value = self.get(action, model, prompt_version, inputs)
+        if value is not None:
+            return value, True
+        key = self.key(action, model, prompt_version, inputs)
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+                self._counters["coalesced"] += 1
+        if not owner:
+            return pending.result(), True
+        self._count(action, "misses")
+        try:
+            value = compute()
+            self.put(action, model, prompt_version, inputs, value)
+            pending.set_result(value)
+            return value, False
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["backend_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                "backend": type(self.backend).__name__ if self.backend is not None else None,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hit_rate": round(hits / lookups, 3) if lookups else None,
+                "by_action": {k: dict(v) for k, v in self._by_action.items()},
+                **self._counters,
+            }
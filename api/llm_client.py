@@ -0,0 +1,126 @@
+# SHARED OPENAI CLIENT
+# Strategy: One lazily built OpenAI client per worker on a tuned keep-alive httpx pool
+# (HTTP/2 when the h2 package is present). Every call passes an explicit per-action
+# timeout from timeout_for(action) so slow report calls never share a budget with TTS.
+
+import os
+import threading
+
+from api.env import env_int, env_float
+
+
+# (connect, read) seconds per action type. Read covers the slowest token/audio stream we expect.
+DEFAULT_TIMEOUT = (5.0, 60.0)
+ACTION_TIMEOUTS = {
+    "interview_turn": (5.0, 45.0),
+    "final_report": (5.0, 120.0),
+    "report_section": (5.0, 30.0),
+    "question_plan": (5.0, 45.0),
+    "resume_digest": (5.0, 45.0),
+    "tts": (5.0, 60.0),
+    "transcribe": (5.0, 90.0),
+    "generate_intel": (5.0, 45.0),
+    "analyze_jd": (5.0, 45.0),
+    "generate_report": (5.0, 120.0),
+    "parse_resume": (5.0, 60.0),
+    "analyze_resume": (5.0, 90.0),
+    "optimize": (5.0, 120.0),
+    "cover_letter": (5.0, 90.0),
+    "linkedin_optimize": (5.0, 60.0),
+    "lab_assistant_chat": (5.0, 45.0),
+    "star_coach_init": (5.0, 45.0),
+    "star_coach_step": (5.0, 45.0),
+    "star_drill": (5.0, 45.0),
+    "strategy_tool": (5.0, 90.0),
+    "support_chat": (5.0, 45.0),
+    "admin_chat": (5.0, 60.0),
+    "uat": (5.0, 60.0),
+}
+
+
+class OpenAIClientHolder:
+    """Thread-safe, lazily built OpenAI client shared by every route in the worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._http = None
+
+    def pool_config(self):
+        return {
+            "max_connections": env_int("OPENAI_POOL_MAX_CONNECTIONS", 50),
+            "max_keepalive_connections": env_int("OPENAI_POOL_MAX_KEEPALIVE", 20),
+            "keepalive_expiry": env_float("OPENAI_POOL_KEEPALIVE_EXPIRY", 60.0),
+            "max_retries": env_int("OPENAI_MAX_RETRIES", 2),
+        }
+
+    def timeout_for(self, action, deadline=None, reserve=0.0):
+        """httpx timeout for an action, cut down to a request Deadline when one is given."""
+        import httpx
+        connect, read = ACTION_TIMEOUTS.get(action, DEFAULT_TIMEOUT)
+        connect = env_float("OPENAI_CONNECT_TIMEOUT", connect)
+        if deadline is not None:
+            read = deadline.clamp(read, reserve)
+            connect = min(connect, read)
+        return httpx.Timeout(read, connect=connect)
+
+    def _build(self):
+        import httpx
+        from openai import OpenAI
+        cfg = self.pool_config()
+        try:
+            import h2  # noqa: F401 (HTTP/2 is optional)
+            use_http2 = True
+        except ImportError:
+            use_http2 = False
+        self._http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=cfg["max_connections"],
+                max_keepalive_connections=cfg["max_keepalive_connections"],
+                keepalive_expiry=cfg["keepalive_expiry"],
+            ),
+            timeout=self.timeout_for(None),
+            http2=use_http2,
+        )
+        return OpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            http_client=self._http,
+            max_retries=cfg["max_retries"],
+            timeout=self.timeout_for(None),
+        )
+
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._build()
+        return self._client
+
+    def stats(self):
+        pool = {"initialized": self._http is not None}
+        if self._http is not None:
+            try:
+                inner = getattr(self._http._transport, "_pool", None)
+                connections = list(getattr(inner, "connections", []) or [])
+                idle = sum(1 for c in connections if c.is_idle())
+                pool["http2"] = bool(getattr(inner, "_http2", False))
+                pool["connections"] = len(connections)
+                pool["idle"] = idle
+                pool["active"] = len(connections) - idle
+            except Exception as e:
+                pool["error"] = str(e)
+        timeouts = {a: list(t) for a, t in ACTION_TIMEOUTS.items()}
+        return {"config": self.pool_config(), "pool": pool, "timeouts": timeouts}
+
+    def reset(self):
+        with self._lock:
+            http, self._http = self._http, None
+            self._client = None
+        if http is not None:
+            try:
+                http.close()
+            except Exception:
+                pass
+
+
+openai_holder = OpenAIClientHolder()
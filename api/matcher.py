@@ -0,0 +1,138 @@
+# KEYWORD MATCHER (Compiled Vocabularies, Single Pass)
+# Strategy: Keyword lists used for scoring and classification are compiled once at import into
+# one case-insensitive alternation per vocabulary (longest term first) with word-boundary
+# lookarounds, so "used" no longer fires on "focused" or "done" on "abandoned". Several
+# vocabularies can share a single combined regex (Matcher): one scan of an answer returns the
+# hits for all of them. Terms embedded in a longer matched term are credited as well (a match
+# on "worked on" also counts "worked"), so one non-overlapping pass reports every hit the
+# old per-keyword loops found. Batch helpers run the same compiled pattern over many texts.
+
+import re
+from collections import namedtuple
+
+Hit = namedtuple("Hit", "vocabulary term label start end")
+
+_SPACE = re.compile(r"\s+")
+
+
+def _norm(text):
+    return _SPACE.sub(" ", text.strip().lower())
+
+
+def _variant_pattern(variant):
+    return r"\s+".join(re.escape(word) for word in variant.split(" "))
+
+
+def _contains_words(outer, inner):
+    """Whether `inner` occurs in `outer` on word boundaries (both normalized)."""
+    return re.search(r"(?<!\w)" + re.escape(inner) + r"(?!\w)", outer) is not None
+
+
+class Vocabulary:
+    """A keyword list: terms (list, or {term: label}) plus allowed inflection suffixes."""
+
+    def __init__(self, terms, inflect=()):
+        if not isinstance(terms, dict):
+            terms = {term: term for term in terms}
+        self.terms = {_norm(term): label for term, label in terms.items()}
+        self.inflect = tuple(inflect)
+        # variant (normalized surface form) -> term
+        self.variants = {}
+        for term in self.terms:
+            for suffix in ("",) + self.inflect:
+                self.variants.setdefault(term + suffix, term)
+        self._matcher = None
+
+    @property
+    def matcher(self):
+        if self._matcher is None:
+            self._matcher = Matcher(_=self)
+        return self._matcher
+
+    def find(self, text):
+        return self.matcher.find(text)
+
+    def hits(self, text):
+        """Set of terms present in `text`."""
+        return self.matcher.scan(text)["_"]
+
+    def search(self, text):
+        return self.matcher.search(text)
+
+    def labels(self, text):
+        return {self.terms[term] for term in self.hits(text)}
+
+    def first_label(self, text, order):
+        """The highest-priority label present (per `order`), or None."""
+        found = self.labels(text)
+        return next((label for label in order if label in found), None)
+
+    def batch(self, texts):
+        return [self.hits(text) for text in texts]
+
+
+class Matcher:
+    """Several named vocabularies compiled into one regex; scan() reports all in one pass."""
+
+    def __init__(self, **vocabularies):
+        self.vocabularies = vocabularies
+        owners = {}  # variant -> [(vocabulary, term)]
+        for name, vocab in vocabularies.items():
+            for variant, term in vocab.variants.items():
+                owners.setdefault(variant, []).append((name, term))
+        # A longer variant wins the match, so it also credits every variant embedded in it
+        self._credits = {}
+        for variant in owners:
+            credits = []
+            for other, pairs in owners.items():
+                if other == variant or (len(other) < len(variant) and _contains_words(variant, other)):
+                    credits.extend(pair for pair in pairs if pair not in credits)
+            self._credits[variant] = credits
+        ordered = sorted(owners, key=len, reverse=True)
+        body = "|".join(_variant_pattern(v) for v in ordered) or r"(?!x)x"
+        self.pattern = re.compile(r"(?<!\w)(?:" + body + r")(?!\w)", re.IGNORECASE)
+
+    def find(self, text):
+        """Every hit, in text order."""
+        hits = []
+        for m in self.pattern.finditer(text or ""):
+            for name, term in self._credits.get(_norm(m.group(0)), ()):
+                hits.append(Hit(name, term, self.vocabularies[name].terms[term], m.start(), m.end()))
+        return hits
+
+    def scan(self, text):
+        """{vocabulary: set of terms present}."""
+        found = {name: set() for name in self.vocabularies}
+        for m in self.pattern.finditer(text or ""):
+            for name, term in self._credits.get(_norm(m.group(0)), ()):
+                found[name].add(term)
+        return found
+
+    def search(self, text):
+        return self.pattern.search(text or "") is not None
+
+    def scan_many(self, texts):
+        return [self.scan(text) for text in texts]
+
+
+class PatternSet:
+    """Regexes ({label: pattern} or a list) combined into one alternation."""
+
+    def __init__(self, patterns, flags=re.IGNORECASE):
+        if not isinstance(patterns, dict):
+            patterns = {f"p{i}": pattern for i, pattern in enumerate(patterns)}
+        self.labels = list(patterns)
+        self._groups = {f"g{i}": label for i, label in enumerate(self.labels)}
+        self.pattern = re.compile(
+            "|".join(f"(?P<g{i}>{patterns[label]})" for i, label in enumerate(self.labels)), flags
+        )
+
+    def search(self, text):
+        return self.pattern.search(text or "") is not None
+
+    def matches(self, text):
+        """Labels of the patterns that matched, in text order (one entry per match)."""
+        return [self._groups[m.lastgroup] for m in self.pattern.finditer(text or "")]
+
+    def batch(self, texts):
+        return [self.search(text) for text in texts]
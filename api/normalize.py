@@ -0,0 +1,207 @@
+# INPUT NORMALIZER (Request Ingress + Prompt Copies, One Precompiled Pass per Field)
+# Strategy: Free-text request fields (JDs, resumes, about-me, strategy inputs, chat history)
+# are tidied once when the request arrives, before any route reads them: invisible and control
+# characters are dropped and whitespace runs collapse (line breaks kept, at most one blank
+# line). Nothing meaningful is removed there, because routes store these fields (saved jobs,
+# resumes). The copies that go into a prompt (fit_prompt) are cleaned further: a line repeated
+# back to back is dropped, and in JDs so is a long line seen earlier (PDF page headers /
+# footers). Legal/EEO boilerplate lines are only counted here; the prompt budgeter drops them
+# when a JD is over budget. Every step is a translate, a split or a literal-only regex, so a
+# pathological 100 KB paste costs linear time. Bytes and tokens saved are counted per stage
+# and field kind for /api/admin/pool-stats.
+
+import re
+import threading
+
+from api.prompt_budget import JD_BOILERPLATE, prompt_budget
+from api.env import env_int
+
+
+# Zero-width / bidi / BOM / soft hyphen, plus C0 controls other than tab and newline
+_INVISIBLE = dict.fromkeys(
+    [0x00ad, 0x034f, 0x061c, 0x180e, 0x200b, 0x200c, 0x200d, 0x200e, 0x200f, 0xfeff]
+    + list(range(0x202a, 0x202f)) + list(range(0x2060, 0x2070))
+    + [c for c in range(0x20) if c not in (0x09, 0x0a)] + [0x7f]
+)
+# Any whitespace except the newline (tabs, NBSP, en/em/ideographic spaces...)
+_SPACE_RUN = re.compile(r'[^\S\n]+')
+
+# Text that only ever appears as a prompt-injection attempt or a leaked system artifact
+PROMPT_ARTIFACTS = re.compile(
+    r'thoughtful use of diagrams|generate image|ignore previous instructions|system prompt|internal score',
+    re.IGNORECASE
+)
+
+# Request field -> kind. "records" are lists/dicts of text.
+INGRESS_FIELDS = {
+    "jobPosting": "jd", "job_description": "jd", "jobDesc": "jd",
+    "resumeText": "resume", "resume_text": "resume", "resume": "resume",
+    "aboutMe": "text", "about_me": "text", "input_text": "text", "interviewer_intel": "text",
+    "message": "text", "inputs": "records", "history": "records",
+}
+
+# Prompt copies of a JD drop a non-adjacent repeat when the line is at least this long (short
+# headings like "Key Achievements" legitimately recur). Resumes only lose back-to-back repeats:
+# the same bullet under two roles is real content.
+DEDUPE_MIN_CHARS = env_int("NORMALIZE_DEDUPE_MIN_CHARS", 24)
+
+
+def _strip_enclosed(line, opener, closer):
+    """Remove every opener...closer span (nearest closer) from one line. Same result as
+    re.sub(r'\\[.*?\\]', '', line) but linear: once an opener has no closer after it, no
+    later opener can have one either."""
+    out = []
+    pos = 0
+    while True:
+        start = line.find(opener, pos)
+        if start < 0:
+            break
+        end = line.find(closer, start + 1)
+        if end < 0:
+            break
+        out.append(line[pos:start])
+        pos = end + 1
+    out.append(line[pos:])
+    return "".join(out)
+
+
+def strip_markup(text):
+    """Drop [system tags] and <html>-like spans line by line, then the known prompt artifacts."""
+    lines = [_strip_enclosed(_strip_enclosed(line, "[", "]"), "<", ">") for line in text.split("\n")]
+    return PROMPT_ARTIFACTS.sub("", "\n".join(lines))
+
+
+def tidy_text(text):
+    """(tidied text, {step: count}): invisible characters dropped, whitespace collapsed."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    stripped = text.translate(_INVISIBLE)
+    out = []
+    blank = False
+    for line in stripped.split("\n"):
+        line = _SPACE_RUN.sub(" ", line).strip()
+        if not line:
+            blank = bool(out)
+            continue
+        if blank:
+            out.append("")
+            blank = False
+        out.append(line)
+    return "\n".join(out), {"invisible": len(text) - len(stripped)}
+
+
+def clean_text(text, kind="text"):
+    """(prompt copy of `text`, {step: count}): tidied, repeated lines dropped, JD boilerplate
+    lines counted (kept: the prompt budgeter drops them only when the JD is over budget)."""
+    tidy, tidy_steps = tidy_text(text)
+    steps = {"invisible": tidy_steps["invisible"], "duplicate_lines": 0, "boilerplate_lines": 0}
+    out = []
+    seen = set()
+    previous = None
+    blank = False
+    for line in tidy.split("\n"):
+        if not line:
+            blank = True
+            continue
+        key = line.casefold()
+        if key == previous or (kind == "jd" and len(line) >= DEDUPE_MIN_CHARS and key in seen):
+            steps["duplicate_lines"] += 1
+            continue
+        if kind == "jd" and JD_BOILERPLATE.search(line):
+            steps["boilerplate_lines"] += 1
+        if blank:
+            out.append("")
+            blank = False
+        out.append(line)
+        previous = key
+        if len(line) >= DEDUPE_MIN_CHARS:
+            seen.add(key)
+    return "\n".join(out), steps
+
+
+class InputNormalizer:
+    """tidy_text over request bodies and clean_text over prompt copies, with bytes / tokens
+    saved per stage ("ingress", "prompt") and field kind."""
+
+    def __init__(self, count_tokens=None, fields=None):
+        # Token counter (the prompt budgeter's, so the cleaned text's count is cached for fit_prompt)
+        self.count_tokens = count_tokens or (lambda text: (len(text) + 3) // 4)
+        self.fields = dict(fields or INGRESS_FIELDS)
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0, "fields": 0, "changed": 0, "bytes_in": 0, "bytes_out": 0,
+            "tokens_in": 0, "tokens_out": 0, "invisible": 0, "duplicate_lines": 0, "boilerplate_lines": 0,
+        }
+        self._stages = {}
+
+    def _record(self, stage, kind, text, clean, steps):
+        size_in, size_out = len(text.encode("utf-8", "surrogatepass")), len(clean.encode("utf-8", "surrogatepass"))
+        tokens_in = self.count_tokens(text) if clean != text else None
+        tokens_out = self.count_tokens(clean)
+        tokens_in = tokens_out if tokens_in is None else tokens_in
+        with self._lock:
+            c = self._counters
+            c["fields"] += 1
+            c["changed"] += int(clean != text)
+            c["bytes_in"] += size_in
+            c["bytes_out"] += size_out
+            c["tokens_in"] += tokens_in
+            c["tokens_out"] += tokens_out
+            for step, n in steps.items():
+                c[step] += n
+            kinds = self._stages.setdefault(stage, {})
+            kind_stats = kinds.setdefault(kind, {"fields": 0, "bytes_saved": 0, "tokens_saved": 0})
+            kind_stats["fields"] += 1
+            kind_stats["bytes_saved"] += size_in - size_out
+            kind_stats["tokens_saved"] += tokens_in - tokens_out
+
+    def normalize(self, text, kind="text"):
+        """Ingress: tidied `text` (whitespace / invisible characters only); non-strings are
+        returned unchanged."""
+        if not isinstance(text, str) or not text:
+            return text
+        clean, steps = tidy_text(text)
+        self._record("ingress", kind, text, clean, steps)
+        return clean
+
+    def for_prompt(self, text, kind="text"):
+        """Prompt copy of `text` (repeated lines dropped, JD boilerplate counted)."""
+        if not isinstance(text, str) or not text:
+            return text
+        clean, steps = clean_text(text, kind)
+        self._record("prompt", kind, text, clean, steps)
+        return clean
+
+    def normalize_records(self, value):
+        """Every string inside a dict (strategy inputs) or a list of dicts (chat / interview history)."""
+        if isinstance(value, dict):
+            return {k: self.normalize(v, "jd" if k == "jd" else "text") if isinstance(v, str) else v
+                    for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.normalize_records(item) if isinstance(item, dict) else self.normalize(item) for item in value]
+        return value
+
+    def normalize_body(self, data):
+        """Tidy the known free-text fields of a JSON body in place. Returns the body."""
+        if not isinstance(data, dict):
+            return data
+        with self._lock:
+            self._counters["requests"] += 1
+        for field, kind in self.fields.items():
+            value = data.get(field)
+            if kind == "records":
+                if value:
+                    data[field] = self.normalize_records(value)
+            elif isinstance(value, str):
+                data[field] = self.normalize(value, kind)
+        return data
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._counters)
+            out["stages"] = {stage: {kind: dict(s) for kind, s in kinds.items()} for stage, kinds in self._stages.items()}
+        out["bytes_saved"] = out["bytes_in"] - out["bytes_out"]
+        out["tokens_saved"] = out["tokens_in"] - out["tokens_out"]
+        return out
+
+
+input_normalizer = InputNormalizer(count_tokens=prompt_budget.count)
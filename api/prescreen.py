@@ -0,0 +1,146 @@
+# ANSWER PRE-SCREEN (Deterministic, Before the Turn Model)
+# Strategy: Every interview answer used to go to the model, even the ones the server then
+# overrode locally (the word-count clamp, "Null Input", greeting filters in the transcript
+# builder). A cheap rule pass now runs first: non-answers ("ready", "idk", filler only),
+# ultra-short answers and near-verbatim repeats of an earlier answer get templated coaching
+# and a local score, so no completion is requested. Borderline answers (brief, or partly
+# recycled from an earlier one) still go to the model but are flagged low confidence, so the
+# caller can route them to the cheaper model. Pure functions plus counters; no I/O.
+
+import re
+import difflib
+import threading
+from collections import namedtuple
+
+from api.env import env_int, env_float
+
+
+# verdict: "local" (answer without the model) or "model"; reason: why it was screened
+Screen = namedtuple("Screen", "verdict reason score feedback low_confidence")
+
+PASS = Screen("model", None, None, None, False)
+
+# Triggers and stock non-answers (the transcript builder already drops the first five)
+NON_ANSWERS = {
+    "start", "ready", "hello", "begin", "hi", "hey", "test", "testing", "skip", "pass", "next",
+    "idk", "i dont know", "i don't know", "dont know", "don't know", "no idea", "not sure",
+    "i'm not sure", "im not sure", "no comment", "nothing", "none", "n/a", "na", "no", "yes",
+    "ok", "okay", "sure", "thanks", "thank you", "repeat", "can you repeat that",
+    "can you repeat the question", "what was the question",
+}
+FILLERS = {"um", "umm", "uh", "uhh", "hmm", "hm", "er", "erm", "ah", "like", "so", "well", "yeah", "ok", "okay"}
+
+# Fewer words than this cannot carry a STAR answer (same cut-off as the final transcript)
+MIN_WORDS = env_int("PRESCREEN_MIN_WORDS", 5)
+# Under this the index's word-count penalty applies anyway: borderline, not screened out
+BRIEF_WORDS = 20
+# Word-sequence similarity to an earlier answer: >= REPEAT is a repeat, >= SIMILAR is borderline
+REPEAT_RATIO = env_float("PRESCREEN_REPEAT_RATIO", 0.9)
+SIMILAR_RATIO = env_float("PRESCREEN_SIMILAR_RATIO", 0.6)
+
+NON_ANSWER_SCORE = 1  # rubric: "complete non-answer"
+WEAK_SCORE = 2
+
+COACHING = {
+    ("non_answer", "background"): (
+        "💡 To Strengthen: I didn't catch an answer there. Give a 60-second overview: your current "
+        "role, two accomplishments with numbers, and why this role is your next step."
+    ),
+    ("non_answer", "star"): (
+        "💡 To Strengthen: I didn't catch an answer there. Pick one real example and walk through it "
+        "with STAR: the Situation, your Task, the Actions you took and the Result."
+    ),
+    ("too_short", "background"): (
+        "💡 To Strengthen: That was too brief to evaluate. Cover where you are now, what you have "
+        "delivered, and why this role fits - four or five sentences is enough."
+    ),
+    ("too_short", "star"): (
+        "💡 To Strengthen: That was too brief to evaluate. Aim for four or five sentences: set the "
+        "scene, say what you personally did, and finish with a measurable result."
+    ),
+    ("repeat", "background"): (
+        "💡 To Strengthen: This repeats an earlier answer. Use each question to show something new "
+        "about your background."
+    ),
+    ("repeat", "star"): (
+        "💡 To Strengthen: This repeats your earlier answer. Use a different example here so the "
+        "interviewer sees more of your range, and close with its result."
+    ),
+}
+
+_WORD = re.compile(r"[a-z0-9$%']+(?:[./-][a-z0-9%]+)*")
+
+
+def words(text):
+    """Lower-cased word tokens (numbers, $ and % kept; other punctuation dropped)."""
+    return _WORD.findall((text or "").lower().replace("’", "'"))
+
+
+def is_non_answer(tokens):
+    phrase = " ".join(tokens)
+    return not tokens or phrase in NON_ANSWERS or all(t in FILLERS for t in tokens)
+
+
+def similarity(tokens, history):
+    """Highest word-sequence similarity between `tokens` and any earlier answer."""
+    best = 0.0
+    for item in history or []:
+        previous = words(item.get("answer") if isinstance(item, dict) else None)
+        if previous:
+            best = max(best, difflib.SequenceMatcher(None, tokens, previous, autojunk=False).ratio())
+    return best
+
+
+def screen_answer(message, history=None, question_num=2):
+    """Screen for one answer turn (question_num 1 = background, 2-6 = STAR)."""
+    tokens = words(message)
+    kind = "background" if question_num == 1 else "star"
+    if is_non_answer(tokens):
+        return Screen("local", "non_answer", NON_ANSWER_SCORE, COACHING[("non_answer", kind)], False)
+    if len(tokens) < MIN_WORDS:
+        return Screen("local", "too_short", WEAK_SCORE, COACHING[("too_short", kind)], False)
+    ratio = similarity(tokens, history)
+    if ratio >= REPEAT_RATIO:
+        return Screen("local", "repeat", WEAK_SCORE, COACHING[("repeat", kind)], False)
+    if ratio >= SIMILAR_RATIO:
+        return Screen("model", "similar", None, None, True)
+    if len(tokens) < BRIEF_WORDS:
+        return Screen("model", "brief", None, None, True)
+    return PASS
+
+
+class PreScreen:
+    """screen_answer plus counters for /api/admin/pool-stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"screened": 0, "local": 0, "deferred": 0, "low_confidence": 0, "passed": 0}
+        self._reasons = {}
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def screen(self, message, history=None, question_num=2):
+        result = screen_answer(message, history, question_num)
+        with self._lock:
+            self._counters["screened"] += 1
+            if result.reason:
+                self._reasons[result.reason] = self._reasons.get(result.reason, 0) + 1
+            if result.verdict == "model":
+                self._counters["low_confidence" if result.low_confidence else "passed"] += 1
+        return result
+
+    def answered(self, local):
+        """Record whether a local verdict was served locally or had to fall back to the model."""
+        self._count("local" if local else "deferred")
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._counters)
+            out["reasons"] = dict(self._reasons)
+        out["local_share"] = round(out["local"] / out["screened"], 3) if out["screened"] else 0.0
+        return out
+
+
+prescreen = PreScreen()
@@ -0,0 +1,215 @@
+# PROMPT BUDGETER (Token-Aware Section Trimming)
+# Strategy: Resume / JD-bearing prompts are sized in tokens, not characters. Each action has
+# a token budget split across its named sections, listed in priority order. A section under
+# its share gives the slack to the others. When a section has to shrink, the cheapest text
+# goes first: repeated whitespace is always collapsed, then JD legal/EEO boilerplate is
+# dropped, then the oldest resume experience (the tail of the experience block, with skills /
+# education kept - found via api/resume_sections), then a plain cut at a line boundary. Counts
+# come from tiktoken when it is installed, else a fast local estimate, and are cached per text
+# digest.
+
+import os
+import re
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+
+from api.resume_sections import resume_sections
+from api.env import env_int
+
+
+# Token budgets per action: {section: tokens}, highest priority first. The defaults match the
+# old character slices (~4 chars per token) so typical prompts are unchanged.
+ACTION_BUDGETS = {
+    "parse_resume": {"resume": 5000},
+    "analyze_resume": {"resume": 5000, "jd": 1000},
+    "optimize": {"resume": 5000, "jd": 1000},
+    "cover_letter": {"resume": 5000, "jd": 1000},
+    "linkedin_optimize": {"about_me": 2000},
+    "star_coach_init": {"resume": 1000, "jd": 500},
+    "strategy_inquisitor": {"jd": 750},
+    "strategy_plan": {"focus": 750},
+    # The interview prompt used to embed both in full; it is sent on every turn
+    "interview_turn": {"resume": 2500, "jd": 1500, "intel": 750},
+}
+
+TRIM_MARKER = "[... trimmed ...]"
+RESUME_TRIM_MARKER = "[... earlier experience trimmed ...]"
+
+_WS_RUN = re.compile(r'[ \t\u00a0]+')
+_BLANK_RUN = re.compile(r'\n\s*\n(\s*\n)+')
+# Tokenizer-free estimate: words cost ~1 token per 4 chars, punctuation 1 each
+_PIECE = re.compile(r'\w+|[^\w\s]')
+
+# Lines that never help the model judge fit: EEO / legal notices and application-process
+# fine print. Only phrasings that never state a requirement match: "must pass a background
+# check" or "applicants must hold a CPA" are requirements and stay.
+JD_BOILERPLATE = re.compile(
+    r'equal (employment )?opportunity|\beeo\b|affirmative action|'
+    r'(request|need) (a )?reasonable accommodation|reasonable accommodations? (will|may) be|'
+    r'without regard to (race|color|religion|age|sex)|protected (veteran|class)|e-verify|'
+    r'fair chance (ordinance|act|law)|(arrest|conviction) records|'
+    r'background checks? (\w+ ){0,4}in accordance with (applicable )?(law|state)|'
+    r'drug[- ]free workplace|privacy (notice|policy)|all qualified applicants|'
+    r'applicants will receive consideration|we do not accept unsolicited|recruitment agencies|'
+    r'pay transparency (nondiscrimination|policy)',
+    re.IGNORECASE
+)
+
+
+def collapse_whitespace(text):
+    lines = [_WS_RUN.sub(' ', line).strip() for line in (text or "").split('\n')]
+    return _BLANK_RUN.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def drop_boilerplate(text):
+    """(text without boilerplate lines, number of lines dropped)."""
+    lines = text.split('\n')
+    kept = [line for line in lines if not JD_BOILERPLATE.search(line)]
+    return '\n'.join(kept), len(lines) - len(kept)
+
+
+class PromptBudget:
+    """Counts tokens (cached) and fits prompt sections into per-action budgets."""
+
+    def __init__(self, budgets=None, max_cached=None, encoding=None):
+        self.budgets = budgets if budgets is not None else ACTION_BUDGETS
+        self.max_cached = max_cached if max_cached is not None else env_int("PROMPT_TOKEN_CACHE_MAX", 4096)
+        self.encoding = encoding or os.environ.get("PROMPT_TOKEN_ENCODING", "o200k_base")
+        self._encoder = None
+        self._encoder_loaded = False
+        self._counts = OrderedDict()  # sha1(text) -> tokens
+        self._lock = threading.Lock()
+        self._counters = {"count_hits": 0, "count_misses": 0, "fits": 0, "trimmed": 0, "tokens_saved": 0, "boilerplate_lines": 0}
+
+    # --- COUNTING ---
+    def encoder(self):
+        """tiktoken encoding when installed (optional), else None (local estimate)."""
+        if not self._encoder_loaded:
+            try:
+                import tiktoken
+                self._encoder = tiktoken.get_encoding(self.encoding)
+            except Exception:
+                self._encoder = None
+            self._encoder_loaded = True
+        return self._encoder
+
+    def _raw_count(self, text):
+        encoder = self.encoder()
+        if encoder is not None:
+            return len(encoder.encode(text, disallowed_special=()))
+        return sum(math.ceil(len(p) / 4) if p[0].isalnum() or p[0] == '_' else 1 for p in _PIECE.findall(text))
+
+    def count(self, text):
+        if not text:
+            return 0
+        digest = hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest()
+        with self._lock:
+            cached = self._counts.get(digest)
+            if cached is not None:
+                self._counts.move_to_end(digest)
+                self._counters["count_hits"] += 1
+                return cached
+        tokens = self._raw_count(text)
+        with self._lock:
+            self._counters["count_misses"] += 1
+            self._counts[digest] = tokens
+            while len(self._counts) > self.max_cached:
+                self._counts.popitem(last=False)
+        return tokens
+
+    # --- TRIMMING ---
+    def cut(self, text, tokens, marker=TRIM_MARKER):
+        """Longest head of `text` (at a line, else word, boundary) within `tokens`."""
+        if self.count(text) <= tokens:
+            return text
+        room = max(0, tokens - self.count(marker) - 1)
+        lo, hi = 0, len(text)
+        # Binary search on the character length; counts are monotonic in the prefix
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._raw_count(text[:mid]) <= room:
+                lo = mid
+            else:
+                hi = mid - 1
+        head = text[:lo]
+        for boundary in ('\n', ' '):
+            at = head.rfind(boundary)
+            if at > len(head) // 2:
+                head = head[:at]
+                break
+        return f"{head.rstrip()}\n{marker}" if head.strip() else ""
+
+    def trim_resume(self, text, tokens):
+        """Keep the newest experience plus the skills/education tail; drop older roles."""
+        lines = text.split('\n')
+        # Section index shared with optimize's backups / guardrails (cached per resume text)
+        tail_at = resume_sections.get(text).tail_line
+        if tail_at is None:
+            return self.cut(text, tokens, RESUME_TRIM_MARKER)
+        head, tail = '\n'.join(lines[:tail_at]), '\n'.join(lines[tail_at:])
+        tail_tokens = self.count(tail)
+        if tail_tokens > tokens // 4:
+            # Skills / education are only worth keeping while they stay small
+            return self.cut(text, tokens, RESUME_TRIM_MARKER)
+        return f"{self.cut(head, tokens - tail_tokens - 1, RESUME_TRIM_MARKER)}\n{tail}"
+
+    def shrink(self, name, text, tokens):
+        """Cheapest-first reduction of one section to `tokens`.
+        Returns (text, boilerplate lines dropped)."""
+        dropped = 0
+        if name == "jd":
+            text, dropped = drop_boilerplate(text)
+            text = collapse_whitespace(text)
+            if self.count(text) <= tokens:
+                return text, dropped
+        if name == "resume":
+            return self.trim_resume(text, tokens), dropped
+        return self.cut(text, tokens), dropped
+
+    def allocate(self, sizes, shares, total):
+        """Tokens per section: what fits stays whole, the slack goes by priority."""
+        alloc = {name: size for name, size in sizes.items() if size <= shares[name]}
+        left = total - sum(alloc.values())
+        pending = [name for name in shares if name not in alloc]
+        for i, name in enumerate(pending):
+            # Later (lower-priority) sections are still guaranteed their own share
+            reserved = sum(shares[later] for later in pending[i + 1:])
+            alloc[name] = min(sizes[name], max(shares[name], left - reserved))
+            left -= alloc[name]
+        return alloc
+
+    def fit(self, action, sections):
+        """(sections fitted to the action's budget, report). Unbudgeted sections pass through
+        with whitespace collapsed; an unknown action only collapses whitespace."""
+        shares = {name: tokens for name, tokens in self.budgets.get(action, {}).items() if name in sections}
+        fitted = {name: collapse_whitespace(str(text or "")) for name, text in sections.items()}
+        sizes = {name: self.count(fitted[name]) for name in shares}
+        alloc = self.allocate(sizes, shares, sum(shares.values()))
+        trimmed = {}
+        boilerplate = {}
+        for name, tokens in alloc.items():
+            if sizes[name] > tokens:
+                fitted[name], dropped = self.shrink(name, fitted[name], tokens)
+                trimmed[name] = (sizes[name], self.count(fitted[name]))
+                if dropped:
+                    boilerplate[name] = dropped
+        total = sum(self.count(text) for text in fitted.values())
+        with self._lock:
+            self._counters["fits"] += 1
+            self._counters["trimmed"] += len(trimmed)
+            self._counters["tokens_saved"] += sum(before - after for before, after in trimmed.values())
+            self._counters["boilerplate_lines"] += sum(boilerplate.values())
+        return fitted, {"tokens": total, "trimmed": trimmed, "boilerplate": boilerplate}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tokenizer": self.encoding if self.encoder() is not None else "estimate",
+                "cached_counts": len(self._counts),
+                **self._counters
+            }
+
+
+prompt_budget = PromptBudget()
@@ -0,0 +1,120 @@
+# INTERVIEW QUESTION PLAN (Generated Once Per Session)
+# Strategy: At isStart one completion writes the whole behavioral question set for the
+# interview (tailored to JD, resume, archetype and seniority) on a background worker while
+# the candidate listens to the greeting and answers Q1. Each later turn then only asks the
+# model for feedback + checklist; the next question comes from the plan, so its audio can be
+# synthesized ahead of time. Plans are kept per session id (bounded, TTL'd) until the next
+# turn copies them into the session; a missing or late plan falls back to the legacy flow.
+
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from api.env import env_int
+
+
+BEHAVIORAL_QUESTIONS = 5  # Q2-Q6; Q1 (background) is scripted
+
+
+def parse_questions(data, count=BEHAVIORAL_QUESTIONS):
+    """Exactly `count` clean questions from the planner's JSON, or ValueError."""
+    questions = data.get("questions") if isinstance(data, dict) else None
+    if not isinstance(questions, list):
+        raise ValueError("plan has no 'questions' list")
+    clean = []
+    for q in questions:
+        if not isinstance(q, str):
+            continue
+        # Models like to number them ("1. ", "Q2:") even when told not to
+        q = re.sub(r'^\s*(?:Q?\d+[.):]\s*)', '', q).strip()
+        if q:
+            clean.append(q)
+    if len(clean) < count:
+        raise ValueError(f"plan has {len(clean)} usable questions, need {count}")
+    return clean[:count]
+
+
+class QuestionPlanner:
+    """Background plan generation keyed by session id."""
+
+    def __init__(self, max_workers=None, ttl=None, max_plans=None):
+        self.max_workers = max_workers or env_int("QUESTION_PLAN_WORKERS", 4)
+        self.ttl = ttl if ttl is not None else env_int("QUESTION_PLAN_TTL", 2 * 3600)
+        self.max_plans = max_plans if max_plans is not None else env_int("QUESTION_PLAN_MAX", 1000)
+        self._plans = OrderedDict()  # key -> (future, started_at)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = {"started": 0, "ready": 0, "failed": 0, "served": 0, "late": 0}
+
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plan")
+        return self._executor
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def start(self, key, generate, on_ready=None):
+        """Run generate() -> questions in the background; on_ready(questions) runs afterwards
+        on the same worker (e.g. audio pre-synthesis) without delaying get()."""
+        future = Future()
+
+        def run():
+            try:
+                questions = generate()
+            except Exception as e:
+                self._count("failed")
+                print(f"[PLAN] Generation failed: {e}")
+                future.set_exception(e)
+                return
+            self._count("ready")
+            future.set_result(questions)
+            if on_ready:
+                try:
+                    on_ready(questions)
+                except Exception as e:
+                    print(f"[PLAN] on_ready failed: {e}")
+
+        now = time.time()
+        with self._lock:
+            self._plans[key] = (future, now)
+            self._counters["started"] += 1
+            while self._plans:
+                oldest_key, (_, started) = next(iter(self._plans.items()))
+                if started + self.ttl > now and len(self._plans) <= self.max_plans:
+                    break
+                self._plans.pop(oldest_key)
+        self.executor().submit(run)
+        return future
+
+    def get(self, key, timeout=0):
+        """The plan for `key`, waiting up to `timeout` seconds; None if unknown, failed or late."""
+        with self._lock:
+            entry = self._plans.get(key)
+        if entry is None:
+            return None
+        try:
+            questions = entry[0].result(timeout=timeout)
+        except FutureTimeout:
+            self._count("late")
+            return None
+        except Exception:
+            return None
+        self._count("served")
+        return questions
+
+    def discard(self, key):
+        with self._lock:
+            self._plans.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"plans": len(self._plans), "max_workers": self.max_workers, **self._counters}
+
+
+question_planner = QuestionPlanner()
@@ -0,0 +1,77 @@
+# FINAL REPORT PIPELINE (Fan-Out / Deterministic Merge)
+# Strategy: The Auditor turn is split into independent sections (KPIs, strengths, growth
+# areas, coaching line, spoken Q6 feedback) that run concurrently on a bounded worker-wide
+# pool. Every section has its own time budget and a fallback value, so one slow or failing
+# call degrades that section only. Results are merged in declaration order, never in
+# completion order, so the assembled report is identical no matter which call finished first.
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from api.env import env_int, env_float
+
+
+class ReportTask:
+    """One report section: run() -> value, bounded by `timeout` seconds, else `fallback`."""
+    __slots__ = ("name", "run", "timeout", "fallback")
+
+    def __init__(self, name, run, timeout=None, fallback=None):
+        self.name = name
+        self.run = run
+        self.timeout = timeout if timeout is not None else env_float("REPORT_SECTION_TIMEOUT", 30.0)
+        self.fallback = fallback
+
+
+class ReportPipeline:
+    """Runs report sections concurrently and returns them keyed by name, in task order."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or env_int("REPORT_PIPELINE_WORKERS", 8)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = {"runs": 0, "ok": 0, "timeouts": 0, "errors": 0}
+
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report")
+        return self._executor
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def run(self, tasks):
+        """({name: value}, {name: {"status", "ms"}}). Never raises for a section failure."""
+        self._count("runs")
+        started = time.monotonic()
+        futures = [(task, self.executor().submit(task.run)) for task in tasks]
+        results, status = {}, {}
+        for task, future in futures:
+            # Budgets are measured from the fan-out, so waiting on earlier sections is free time
+            remaining = max(0.0, task.timeout - (time.monotonic() - started))
+            try:
+                results[task.name] = future.result(timeout=remaining)
+                outcome = "ok"
+            except FutureTimeout:
+                # The call keeps running on its worker; its result is simply ignored
+                future.cancel()
+                results[task.name] = task.fallback
+                outcome = "timeout"
+                print(f"[REPORT] Section '{task.name}' timed out after {task.timeout}s - using fallback")
+            except Exception as e:
+                results[task.name] = task.fallback
+                outcome = "error"
+                print(f"[REPORT] Section '{task.name}' failed: {e} - using fallback")
+            self._count({"ok": "ok", "timeout": "timeouts", "error": "errors"}[outcome])
+            status[task.name] = {"status": outcome, "ms": int((time.monotonic() - started) * 1000)}
+        return results, status
+
+    def stats(self):
+        with self._lock:
+            return {"max_workers": self.max_workers, **self._counters}
+
+
+report_pipeline = ReportPipeline()
@@ -0,0 +1,96 @@
+# ACE REPORT RENDERER (Server-Side Template)
+# Strategy: The model only returns compact report data (KPIs, strengths, growth areas,
+# coaching). The Ace report markup lives here as a Jinja2 template compiled once per worker
+# with autoescaping on, so model text can never inject markup and the score / label are
+# written exactly (no placeholder regex patching). Kept in a .py module rather than an
+# .html file so the static-site build never publishes it and the function bundle always has it.
+
+from jinja2 import Environment
+
+ACE_REPORT_SOURCE = """\
+<div class="ace-report p-6 bg-slate-900 text-slate-100 rounded-xl border border-slate-700 shadow-2xl">
+  <div class="flex justify-between items-center mb-8 border-b border-slate-700 pb-6">
+    <h1 class="text-2xl font-bold tracking-tight text-white m-0">Interview Executive Summary</h1>
+    <div class="text-right">
+      <div class="text-4xl font-extrabold text-blue-400">{{ total_score }} <span class="text-sm text-slate-400 font-normal">/ 4.0</span></div>
+      <div class="text-sm font-semibold text-indigo-300 mt-1">{{ score_label }}</div>
+    </div>
+  </div>
+
+  <div class="mb-8">
+    <h2 class="text-xs font-bold uppercase tracking-widest text-indigo-400 mb-4 flex items-center">📈 Business Impact Scoreboard</h2>
+    <div class="grid grid-cols-1 sm:grid-cols-2 gap-3">
+{% for kpi in kpis %}
+      <div class="p-2 bg-slate-800 rounded border border-slate-700 text-xs"><span class="text-indigo-400 font-bold">✓</span> {{ kpi.name }}: {{ kpi.value }}</div>
+{% else %}
+      <div class="p-2 text-xs text-slate-500">No quantified results were cited in this session.</div>
+{% endfor %}
+    </div>
+  </div>
+
+  <div class="grid grid-cols-1 md:grid-cols-2 gap-6 mb-8">
+    <div class="p-4 bg-slate-800/50 rounded-lg border border-slate-700">
+      <h2 class="text-sm font-bold uppercase tracking-widest text-emerald-400 mb-4">💪 Strengths</h2>
+      <ul class="space-y-2 text-sm leading-relaxed text-slate-300">
+{% for item in strengths %}
+        <li>• {{ item }}</li>
+{% else %}
+        <li class="text-slate-500">Strength analysis is unavailable for this session.</li>
+{% endfor %}
+      </ul>
+    </div>
+    <div class="p-4 bg-slate-800/50 rounded-lg border border-slate-700">
+      <h2 class="text-sm font-bold uppercase tracking-widest text-amber-400 mb-4">✨ Growth Areas</h2>
+      <ul class="space-y-2 text-sm leading-relaxed text-slate-300">
+{% for item in growth_areas %}
+        <li>• {{ item }}</li>
+{% else %}
+        <li class="text-slate-500">Growth area analysis is unavailable for this session.</li>
+{% endfor %}
+      </ul>
+    </div>
+  </div>
+
+  <div class="p-4 bg-blue-900/10 rounded-lg border border-blue-900/30">
+    <h2 class="text-sm font-bold uppercase tracking-widest text-blue-400 mb-2">🎯 Actionable Coaching</h2>
+    <p class="text-sm leading-relaxed text-slate-300 m-0">{{ coaching or "Anchor every answer in the role's top priority and close each story with a measurable result." }}</p>
+  </div>
+</div>
+"""
+
+_env = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+ACE_REPORT_TEMPLATE = _env.from_string(ACE_REPORT_SOURCE)
+
+REPORT_SECTION_KEYS = ("kpis", "strengths", "growth_areas", "coaching")
+
+
+def _string_list(value, limit=3):
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    items = [str(v).strip() for v in value if isinstance(v, (str, int, float)) and str(v).strip()]
+    return items[:limit]
+
+
+def normalize_sections(data):
+    """Validated report data from model JSON (missing/garbled fields become empty)."""
+    data = data if isinstance(data, dict) else {}
+    kpis = data.get("kpis") if isinstance(data.get("kpis"), list) else []
+    return {
+        "kpis": [
+            {"name": str(k.get("name") or "").strip(), "value": str(k.get("value") or "").strip()}
+            for k in kpis if isinstance(k, dict) and (k.get("name") or k.get("value"))
+        ][:12],
+        "strengths": _string_list(data.get("strengths")),
+        "growth_areas": _string_list(data.get("growth_areas")),
+        "coaching": str(data.get("coaching") or "").strip(),
+    }
+
+
+def render_ace_report(sections, total_score, score_label):
+    return ACE_REPORT_TEMPLATE.render(
+        total_score=total_score,
+        score_label=score_label,
+        **normalize_sections(sections)
+    )
@@ -0,0 +1,160 @@
+# RESUME DIGEST (Computed Once Per Resume Version)
+# Strategy: A resume is reduced once per content hash to a compact, normalized digest:
+# roles with dates, accomplishments that carry metrics, skills and education. Prompts that
+# only need to know *who* the candidate is (interview turns, the STAR coach) embed the digest
+# instead of the raw text, which is a fraction of the tokens. Tools that rewrite or audit
+# the resume keep the full text. Computation runs in the background the first time a resume
+# is seen; until it lands, callers keep using the full text, so nobody waits for it.
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.prompt_budget import collapse_whitespace
+from api.env import env_int
+
+
+DIGEST_VIEWS = ("digest", "full")
+
+DIGEST_INSTRUCTIONS = (
+    "Reduce this resume to a compact factual digest. Copy facts exactly; never invent or embellish.\n"
+    "- roles: newest first, at most 6. For each: title, company, dates, and up to 3 accomplishments "
+    "(prefer ones with numbers: %, $, team size, scale), each under 20 words.\n"
+    "- skills: at most 15 concrete skills/tools.\n"
+    "- education: degree, school, dates.\n"
+    'Output JSON: {"name": "", "headline": "one-line professional summary", '
+    '"roles": [{"title": "", "company": "", "dates": "", "accomplishments": [""]}], '
+    '"skills": [""], "education": [{"degree": "", "school": "", "dates": ""}]}'
+)
+
+
+def resume_hash(text):
+    """Version id of a resume: whitespace-insensitive content hash."""
+    return hashlib.sha256(collapse_whitespace(text or "").encode("utf-8")).hexdigest()
+
+
+def _clean(value, limit=200):
+    return " ".join(str(value or "").split())[:limit]
+
+
+def normalize_digest(data):
+    """Validated digest from model JSON (garbled fields become empty, lists are capped)."""
+    data = data if isinstance(data, dict) else {}
+    roles = []
+    for role in (data.get("roles") if isinstance(data.get("roles"), list) else [])[:6]:
+        if not isinstance(role, dict):
+            continue
+        wins = role.get("accomplishments") if isinstance(role.get("accomplishments"), list) else []
+        roles.append({
+            "title": _clean(role.get("title"), 100),
+            "company": _clean(role.get("company"), 100),
+            "dates": _clean(role.get("dates"), 50),
+            "accomplishments": [_clean(w) for w in wins if _clean(w)][:3],
+        })
+    education = [
+        {"degree": _clean(e.get("degree"), 100), "school": _clean(e.get("school"), 100), "dates": _clean(e.get("dates"), 50)}
+        for e in (data.get("education") if isinstance(data.get("education"), list) else [])[:4] if isinstance(e, dict)
+    ]
+    skills = data.get("skills") if isinstance(data.get("skills"), list) else []
+    return {
+        "name": _clean(data.get("name"), 100),
+        "headline": _clean(data.get("headline")),
+        "roles": [r for r in roles if r["title"] or r["company"]],
+        "skills": [_clean(s, 50) for s in skills if _clean(s, 50)][:15],
+        "education": [e for e in education if e["degree"] or e["school"]],
+    }
+
+
+def digest_text(digest):
+    """The digest as compact prompt text."""
+    lines = [" - ".join(part for part in (digest.get("name"), digest.get("headline")) if part)]
+    if digest.get("roles"):
+        lines.append("EXPERIENCE:")
+        for role in digest["roles"]:
+            where = ", ".join(part for part in (role["title"], role["company"]) if part)
+            lines.append(f"- {where} ({role['dates']})" if role["dates"] else f"- {where}")
+            lines.extend(f"* {win}" for win in role["accomplishments"])
+    if digest.get("skills"):
+        lines.append("SKILLS: " + ", ".join(digest["skills"]))
+    if digest.get("education"):
+        lines.append("EDUCATION: " + "; ".join(
+            ", ".join(part for part in (e["degree"], e["school"], e["dates"]) if part) for e in digest["education"]
+        ))
+    return "\n".join(line for line in lines if line)
+
+
+class ResumeDigests:
+    """Digest lookup + single-flight background computation, keyed by resume hash.
+
+    lookup(hash) -> digest or None reads the shared store (no model call);
+    compute(text) -> digest produces and stores one (blocking).
+    """
+
+    def __init__(self, lookup, compute, max_workers=None):
+        self.lookup = lookup
+        self.compute = compute
+        self.max_workers = max_workers or env_int("RESUME_DIGEST_WORKERS", 2)
+        self._executor = None
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "computed": 0, "failed": 0}
+
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="digest")
+        return self._executor
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def get(self, digest_hash):
+        """The stored digest for a resume hash, or None (never computes)."""
+        try:
+            digest = self.lookup(digest_hash)
+        except Exception as e:
+            print(f"[DIGEST] Lookup failed: {e}")
+            digest = None
+        self._count("hits" if digest else "misses")
+        return digest
+
+    def _run(self, text, digest_hash):
+        try:
+            digest = self.compute(text)
+            self._count("computed")
+            return digest
+        except Exception as e:
+            self._count("failed")
+            print(f"[DIGEST] Compute failed: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.discard(digest_hash)
+
+    def ensure(self, text):
+        """Start computing the digest in the background unless stored or already running.
+        Returns the resume hash."""
+        digest_hash = resume_hash(text)
+        if not (text or "").strip():
+            return digest_hash
+        with self._lock:
+            if digest_hash in self._inflight:
+                return digest_hash
+            self._inflight.add(digest_hash)
+        if self.get(digest_hash):
+            with self._lock:
+                self._inflight.discard(digest_hash)
+            return digest_hash
+        self.executor().submit(self._run, text, digest_hash)
+        return digest_hash
+
+    def digest(self, text):
+        """Blocking: the stored digest, computing it now if needed (None on failure)."""
+        digest_hash = resume_hash(text)
+        return self.get(digest_hash) or self._run(text, digest_hash)
+
+    def stats(self):
+        with self._lock:
+            return {"inflight": len(self._inflight), "max_workers": self.max_workers, **self._counters}
@@ -0,0 +1,238 @@
+# RESUME SECTIONS (Single-Pass Segmenter, Cached per Resume)
+# Strategy: One linear pass over the resume lines builds a section index - header/contact,
+# summary, experience (split into dated entries), education, skills, certifications and other
+# headed blocks - with UTF-8 byte offsets and line ranges. The index is cached by a hash of the
+# exact text (bounded LRU), so optimize's education/skills backups, its post-AI guardrail, the
+# parse_resume guardrail and the prompt budgeter's resume trimming (analyze, optimize, parse,
+# cover letter) all share one segmentation instead of each re-scanning resume_text.split('\n').
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from api.matcher import Matcher, Vocabulary
+from api.env import env_int
+
+
+# kind heading start end: byte offsets into the UTF-8 text; lines: [first, last) line indexes
+Section = namedtuple("Section", "kind heading start end line_start line_end")
+Entry = namedtuple("Entry", "title dates start end line_start line_end")
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "executive summary", "career summary", "profile",
+                "professional profile", "objective", "career objective", "about me", "about"],
+    "experience": ["experience", "professional experience", "work experience", "relevant experience",
+                   "employment", "employment history", "work history", "career history", "professional history"],
+    "education": ["education", "education & training", "education and training", "academic background",
+                  "academic qualifications", "education & certifications", "education and certifications"],
+    "skills": ["skills", "core competencies", "technical skills", "areas of expertise", "key skills",
+               "core skills", "competencies", "skills & expertise", "skills and expertise", "skills summary"],
+    "certifications": ["certifications", "certification", "certificates", "licenses", "licenses & certifications",
+                       "licenses and certifications", "certifications & licenses"],
+    "other": ["projects", "key projects", "awards", "honors", "honors & awards", "publications", "languages",
+              "volunteer", "volunteer experience", "interests", "affiliations", "professional affiliations"],
+}
+_HEADING_KIND = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+# Sections kept whole when the prompt budgeter trims older experience
+TAIL_KINDS = ("education", "skills", "certifications", "other")
+# Longer lines are content, never headings; longer skills lines are prose, not a list
+MAX_HEADING_CHARS = 40
+MAX_SKILLS_LINE_CHARS = 500
+# A date range only starts an experience entry on a role-sized line (not inside a bullet)
+MAX_ENTRY_LINE_CHARS = 150
+
+_HEADING_PUNCT = re.compile(r'^[\s#*=_\-–—|•]+|[\s:#*=_\-–—|•]+$')
+_SKILL_SPLIT = re.compile(r'[,|•·\t]')
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+|\d{{1,2}}/)?(?:19|20)\d{{2}}'
+DATE_RANGE = re.compile(rf'(?<!\w){_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now|today)(?!\w)', re.IGNORECASE)
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+# Separators are spaces, dots or dashes only: a phone number never spans a line break
+_PHONE = re.compile(r'(?<!\d)(?:\+?\d{1,2}[ .-]?)?\(?\d{3}\)?[ .-]?\d{3}[ .-]?\d{4}(?!\d)')
+_LINK = re.compile(r'(?:https?://|www\.)\S+|linkedin\.com/\S+', re.IGNORECASE)
+
+# Education line parsing (whole words: "master" is not "mastered")
+SCHOOL_TERMS = Vocabulary(['university', 'college', 'institute', 'polytechnic'], inflect=('s',))
+DEGREE_SUFFIX_TERMS = Vocabulary(['bba', 'mba', 'phd'])
+EDUCATION_MATCHER = Matcher(
+    degree=Vocabulary(['bachelor', 'master', 'mba', 'phd', 'associate', 'degree'], inflect=('s',)),
+    school=SCHOOL_TERMS,
+    title=Vocabulary(['director', 'manager', 'lead', 'vp', 'vice president', 'executive', 'officer']),
+)
+
+
+def heading_kind(line):
+    """Section kind when `line` is a section heading, else None."""
+    if len(line) > MAX_HEADING_CHARS:
+        return None
+    return _HEADING_KIND.get(_HEADING_PUNCT.sub('', line).lower())
+
+
+def parse_education_line(line):
+    """{"school", "degree", "dates"} for a line naming a degree or school, else None."""
+    if len(line) > 10000:
+        return None
+    edu_hits = EDUCATION_MATCHER.scan(line)
+    if not (edu_hits["degree"] or edu_hits["school"]):
+        return None
+    # Strict Job Title Exclusions (Prevent "Associate Director" etc)
+    if 'associate' in edu_hits["degree"] and edu_hits["title"]:
+        return None
+    info_val = line.strip()
+    school_val = "Education Institution"
+    degree_val = "Education Detail"
+    if ' - ' in info_val:
+        parts = info_val.split(' - ', 1)
+        if SCHOOL_TERMS.search(parts[0]):
+            school_val, degree_val = parts[0].strip(), parts[1].strip()
+        else:
+            degree_val, school_val = parts[0].strip(), parts[1].strip()
+    elif ',' in info_val and not DEGREE_SUFFIX_TERMS.search(info_val):
+        # Only split by comma if it doesn't look like a degree suffix (e.g. "BBA, Management")
+        parts = info_val.split(',', 1)
+        if SCHOOL_TERMS.search(parts[0]):
+            school_val, degree_val = parts[0].strip(), parts[1].strip()
+        else:
+            degree_val, school_val = parts[0].strip(), parts[1].strip()
+    elif edu_hits["school"]:
+        school_val, degree_val = info_val, "Degree/Certification"
+    else:
+        degree_val, school_val = info_val, "Institution"
+    return {"school": school_val, "degree": degree_val, "dates": ""}
+
+
+class ResumeSections:
+    """Section index of one resume text."""
+
+    def __init__(self, text):
+        self.lines = (text or "").split('\n')
+        self.sections = []
+        self.entries = []
+        self._segment()
+
+    def _segment(self):
+        kind, heading, start, line_start = "header", None, 0, 0
+        offset = 0
+        entry = None  # [title, dates, start, line_start] of the open experience entry
+        last_content = None  # (line index, offset) of the previous non-blank line in the section
+
+        def close_entry(end, line_end):
+            if entry:
+                self.entries.append(Entry(entry[0], entry[1], entry[2], end, entry[3], line_end))
+
+        for i, line in enumerate(self.lines):
+            size = len(line.encode("utf-8", "surrogatepass")) + 1
+            stripped = line.strip()
+            found = heading_kind(stripped) if stripped else None
+            if found:
+                if kind == "experience":
+                    close_entry(offset, i)
+                    entry = None
+                if i > line_start or heading:
+                    self.sections.append(Section(kind, heading, start, offset, line_start, i))
+                kind, heading, start, line_start = found, stripped, offset, i
+                last_content = None
+            elif stripped and kind == "experience":
+                dates = DATE_RANGE.search(stripped) if len(stripped) <= MAX_ENTRY_LINE_CHARS else None
+                if dates:
+                    title = DATE_RANGE.sub('', stripped).strip(" \t,|-–—()")
+                    entry_line, entry_offset = i, offset
+                    if not title and last_content and (not entry or last_content[0] > entry[3]):
+                        # Dates on their own line: the role line above starts the entry
+                        entry_line, entry_offset = last_content
+                        title = self.lines[entry_line].strip()
+                    close_entry(entry_offset, entry_line)
+                    entry = [title, dates.group(0), entry_offset, entry_line]
+                last_content = (i, offset)
+            offset += size
+        end = max(offset - 1, 0)
+        if kind == "experience":
+            close_entry(end, len(self.lines))
+        if len(self.lines) > line_start or heading:
+            self.sections.append(Section(kind, heading, start, end, line_start, len(self.lines)))
+
+    # --- LOOKUPS ---
+    def of_kind(self, kind):
+        return [s for s in self.sections if s.kind == kind]
+
+    def body_lines(self, kind):
+        """Content lines of every `kind` section (headings excluded)."""
+        out = []
+        for s in self.of_kind(kind):
+            out.extend(self.lines[s.line_start + (1 if s.heading else 0):s.line_end])
+        return out
+
+    def text(self, kind):
+        return '\n'.join(self.body_lines(kind)).strip()
+
+    @property
+    def tail_line(self):
+        """First line of the skills/education-style tail (None when there is none after line 0)."""
+        return next((s.line_start for s in self.sections if s.kind in TAIL_KINDS and s.heading and s.line_start > 0), None)
+
+    # --- EXTRACTIONS (guardrail backups) ---
+    def education(self):
+        """Education items from the education section, else from any line naming a degree/school."""
+        lines = self.body_lines("education") or self.lines
+        return [item for item in map(parse_education_line, lines) if item]
+
+    def skills(self):
+        skills = []
+        for line in self.body_lines("skills"):
+            if line.strip() and len(line) <= MAX_SKILLS_LINE_CHARS:
+                skills.extend(p.strip() for p in _SKILL_SPLIT.split(line) if p.strip())
+        return skills
+
+    def contact(self):
+        header = '\n'.join(self.body_lines("header"))
+        email, phone = _EMAIL.search(header), _PHONE.search(header)
+        return {
+            "email": email.group(0) if email else None,
+            "phone": phone.group(0) if phone else None,
+            "links": _LINK.findall(header),
+        }
+
+    def name_guess(self):
+        """Heuristic: the first short line is usually the name."""
+        return next((line.strip() for line in self.lines if line.strip() and len(line.strip()) < 50), None)
+
+    def to_dict(self):
+        return {
+            "sections": [s._asdict() for s in self.sections],
+            "experience": [e._asdict() for e in self.entries],
+            "contact": self.contact(),
+        }
+
+
+class ResumeSegmenter:
+    """ResumeSections per resume text, cached by content hash (bounded LRU)."""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries if max_entries is not None else env_int("RESUME_SECTIONS_MAX", 256)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def get(self, text):
+        key = hashlib.sha256((text or "").encode("utf-8", "surrogatepass")).digest()
+        with self._lock:
+            found = self._cache.get(key)
+            if found is not None:
+                self._cache.move_to_end(key)
+                self._counters["hits"] += 1
+                return found
+        found = ResumeSections(text)
+        with self._lock:
+            self._counters["misses"] += 1
+            self._cache[key] = found
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return found
+
+    def stats(self):
+        with self._lock:
+            return {"cached": len(self._cache), "max_entries": self.max_entries, **self._counters}
+
+
+resume_sections = ResumeSegmenter()
@@ -0,0 +1,62 @@
+# SCORING STRATEGY REGISTRY
+# Strategy: Every rubric variant is a function (rubric_data, question_index, answer_text) ->
+# (score, gap_reason) registered under a name. Production scores with the strategy named by
+# SCORING_STRATEGY (default "v13"); the offline harness (api/scoring/evaluate.py) runs a
+# labeled corpus through any subset of them to compare before a rubric change ships.
+
+import os
+
+from api.scoring.rubric_v13 import calculate_rubric_score_v13
+from api.scoring.option1 import calculate_rubric_score_option1
+from api.scoring.option1_balanced import calculate_rubric_score_option1_balanced
+from api.scoring.option2 import calculate_rubric_score_option2
+from api.scoring.option3 import calculate_rubric_score_option3
+from api.scoring.option_b import calculate_rubric_score_option_b
+
+DEFAULT_STRATEGY = "v13"
+
+STRATEGIES = {}
+
+
+def register(name, fn=None):
+    """Register a scoring function under `name` (usable as a decorator)."""
+    def add(fn):
+        STRATEGIES[name] = fn
+        return fn
+    return add(fn) if fn is not None else add
+
+
+register("v13", calculate_rubric_score_v13)
+register("option1", calculate_rubric_score_option1)
+register("option1_balanced", calculate_rubric_score_option1_balanced)
+register("option2", calculate_rubric_score_option2)
+register("option3", calculate_rubric_score_option3)
+register("option_b", calculate_rubric_score_option_b)
+
+
+def available():
+    return list(STRATEGIES)
+
+
+def _active_from_env():
+    name = os.environ.get("SCORING_STRATEGY") or DEFAULT_STRATEGY
+    if name not in STRATEGIES:
+        print(f"[SCORING] Unknown SCORING_STRATEGY '{name}' - using {DEFAULT_STRATEGY}")
+        return DEFAULT_STRATEGY
+    return name
+
+
+ACTIVE_STRATEGY = _active_from_env()
+
+
+def get_strategy(name=None):
+    """The named strategy, or the active one. Unknown names raise KeyError."""
+    name = name or ACTIVE_STRATEGY
+    if name not in STRATEGIES:
+        raise KeyError(f"Unknown scoring strategy '{name}' (available: {', '.join(STRATEGIES)})")
+    return STRATEGIES[name]
+
+
+def score_answer(rubric_data, question_index, answer_text, strategy=None):
+    """(score, gap_reason) from the named strategy (default: the active one)."""
+    return get_strategy(strategy)(rubric_data, question_index, answer_text)
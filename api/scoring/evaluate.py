@@ -0,0 +1,161 @@
+# SCORING EVALUATION HARNESS (Offline, Parallel)
+# Strategy: A labeled corpus (JSONL: answer, checklist, expected tier, optional question index)
+# is split into chunks and scored by every selected strategy on a process pool. The report
+# has each strategy's accuracy, per-tier accuracy and confusion matrix, the pairwise agreement
+# matrix between strategies and throughput, so a rubric change can be checked against
+# thousands of historical answers before it ships.
+#
+#   python -m api.scoring.evaluate corpus.jsonl [--strategies v13,option_b] [--processes 4] [--json]
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from api.scoring import STRATEGIES, get_strategy
+
+
+def load_corpus(path):
+    """Rows of {"answer", "checklist", "expected", "question"} from a JSONL file."""
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append(normalize_row(json.loads(line)))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"{path}:{line_no}: {e}") from None
+    return rows
+
+
+def normalize_row(row):
+    expected = row.get("expected", row.get("expected_tier"))
+    if not isinstance(row.get("answer"), str) or expected is None:
+        raise ValueError("row needs 'answer' and 'expected'")
+    return {
+        "answer": row["answer"],
+        "checklist": row.get("checklist") or {},
+        "expected": int(expected),
+        "question": row.get("question") or "Q3",
+    }
+
+
+def _score_chunk(names, rows):
+    """Worker: {strategy: ([scores], seconds)} for one chunk (None = the strategy raised)."""
+    out = {}
+    for name in names:
+        fn = get_strategy(name)
+        scores = []
+        started = time.perf_counter()
+        for row in rows:
+            try:
+                score, _ = fn({"checklist": row["checklist"]}, row["question"], row["answer"])
+                scores.append(int(round(score)))
+            except Exception:
+                scores.append(None)
+        out[name] = (scores, time.perf_counter() - started)
+    return out
+
+
+def score_corpus(rows, names, processes=None, chunk_size=500):
+    """({strategy: [score per row]}, {strategy: cpu seconds}). processes<=1 scores inline."""
+    processes = processes if processes is not None else (os.cpu_count() or 1)
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    if processes <= 1 or len(chunks) <= 1:
+        results = [_score_chunk(names, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as pool:
+            # map() keeps chunk order, so scores line up with the corpus rows
+            results = list(pool.map(_score_chunk, [names] * len(chunks), chunks))
+    scores = {name: [] for name in names}
+    seconds = {name: 0.0 for name in names}
+    for result in results:
+        for name, (chunk_scores, elapsed) in result.items():
+            scores[name].extend(chunk_scores)
+            seconds[name] += elapsed
+    return scores, seconds
+
+
+def _strategy_report(expected, predicted, seconds):
+    per_tier, confusion = {}, {}
+    for want, got in zip(expected, predicted):
+        tier = per_tier.setdefault(want, {"n": 0, "correct": 0})
+        tier["n"] += 1
+        tier["correct"] += int(got == want)
+        row = confusion.setdefault(want, {})
+        row[got] = row.get(got, 0) + 1
+    for tier in per_tier.values():
+        tier["accuracy"] = round(tier["correct"] / tier["n"], 4)
+    correct = sum(tier["correct"] for tier in per_tier.values())
+    return {
+        "accuracy": round(correct / len(expected), 4) if expected else 0.0,
+        "per_tier": dict(sorted(per_tier.items())),
+        "confusion": {want: dict(sorted(row.items(), key=lambda kv: (kv[0] is None, kv[0] or 0))) for want, row in sorted(confusion.items())},
+        "errors": sum(1 for got in predicted if got is None),
+        "answers_per_second": round(len(expected) / seconds, 1) if seconds else None,
+    }
+
+
+def evaluate(rows, strategies=None, processes=None, chunk_size=500):
+    """Score `rows` with each strategy and compare against the labels and each other."""
+    names = list(strategies or STRATEGIES)
+    for name in names:
+        get_strategy(name)  # fail fast on a typo, before the pool starts
+    started = time.perf_counter()
+    scores, seconds = score_corpus(rows, names, processes, chunk_size)
+    wall = time.perf_counter() - started
+    expected = [row["expected"] for row in rows]
+    agreement = {
+        a: {b: round(sum(x == y for x, y in zip(scores[a], scores[b])) / len(rows), 4) if rows else 1.0 for b in names}
+        for a in names
+    }
+    return {
+        "answers": len(rows),
+        "strategies": names,
+        "wall_seconds": round(wall, 3),
+        # Every (answer, strategy) pair is one scoring
+        "scorings_per_second": round(len(rows) * len(names) / wall, 1) if wall else None,
+        "per_strategy": {name: _strategy_report(expected, scores[name], seconds[name]) for name in names},
+        "agreement": agreement,
+    }
+
+
+def format_report(report):
+    names = report["strategies"]
+    width = max(len(name) for name in names) + 2
+    tiers = sorted({tier for s in report["per_strategy"].values() for tier in s["per_tier"]})
+    lines = [
+        f"{report['answers']} answers x {len(names)} strategies in {report['wall_seconds']}s "
+        f"({report['scorings_per_second']} scorings/s)",
+        "",
+        "ACCURACY".ljust(width) + "overall  " + "  ".join(f"tier {t}".rjust(7) for t in tiers) + "  answers/s",
+    ]
+    for name in names:
+        s = report["per_strategy"][name]
+        per_tier = "  ".join(f"{s['per_tier'][t]['accuracy']:7.1%}" if t in s["per_tier"] else " " * 7 for t in tiers)
+        lines.append(f"{name.ljust(width)}{s['accuracy']:7.1%}  {per_tier}  {s['answers_per_second']}")
+    lines += ["", "AGREEMENT".ljust(width) + "".join(name.rjust(width) for name in names)]
+    for a in names:
+        lines.append(a.ljust(width) + "".join(f"{report['agreement'][a][b]:.1%}".rjust(width) for b in names))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a labeled answer corpus with every scoring strategy.")
+    parser.add_argument("corpus", help="JSONL rows: answer, checklist, expected, optional question")
+    parser.add_argument("--strategies", help=f"comma-separated (default: all of {', '.join(STRATEGIES)})")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+    strategies = [s.strip() for s in args.strategies.split(",") if s.strip()] if args.strategies else None
+    report = evaluate(load_corpus(args.corpus), strategies, args.processes, args.chunk_size)
+    print(json.dumps(report, indent=2, default=str) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# RUBRIC v13 (Option B Enhanced: 2/3/4 System) - production default
+# Strategy: The AI checklist decides the tier; a backend safety net upgrades it when the answer
+# visibly has metrics or STAR action / result wording the model missed. Keyword lists are
+# compiled once (api/matcher.py) and matched on whole words, so "used" no longer matches
+# "focused" and "done" no longer matches "abandoned".
+
+import re
+
+from api.matcher import Matcher, Vocabulary, PatternSet
+
+
+METRIC_PATTERNS = PatternSet([
+    r'\$\d+',  # Dollar amounts
+    r'\d+(\.\d+)?%',  # Percentages
+    r'\d+[KMB]',  # 35M, 22K, etc.
+    r'\b\d+\s*(million|billion|thousand)\b',  # Written numbers
+    r'\bzero\s+(incidents|errors|failures)\b',  # Zero incidents
+    r'\b100%\s+(compliance|accuracy)\b',  # Perfect compliance
+    r'\b\d+\+\s+(systems|clients|users)\b',  # 300+ systems
+])
+
+
+# Whole words, plus the derived forms the old substring checks also (rightly) caught:
+# "profitability", "costly", "successfully", "rebuilt"...
+RUBRIC_MATCHER = Matcher(
+    business=Vocabulary([
+        'ebitda', 'revenue', 'roi', 'profit', 'margin', 'savings', 
+        'growth', 'efficiency', 'reduction', 'increase', 'cost',
+        'profitability', 'profitable', 'costly', 'costing', 'increasing', 'efficiencies'
+    ], inflect=('s', 'es', 'd')),
+    action=Vocabulary([
+        'led', 'managed', 'built', 'created', 'developed', 'implemented',
+        'designed', 'facilitated', 'recruited', 'supervised', 'organized',
+        'coordinated', 'established', 'worked on', 'collaborated', 'used',
+        'made', 'helped',
+        'rebuilt', 'recreated', 'redesigned', 'reorganized', 'reused'
+    ]),
+    result=Vocabulary([
+        'result', 'outcome', 'achieved', 'delivered', 'generated',
+        'increased', 'reduced', 'improved', 'successful', 'completed',
+        'finished', 'done', 'worked', 'helped', 'useful', 'appreciated',
+        'successfully', 'unsuccessful', 'usefulness'
+    ], inflect=('s', 'ed', 'ing')),
+)
+
+
+def calculate_rubric_score_v13(rubric_data, question_index, answer_text):
+    """
+    Option B Enhanced: 2/3/4 scoring with generous STAR recognition
+    - 1 = Red Flag (toxic, unethical)
+    - 2 = Weak (missing STAR, vague)
+    - 3 = Competent (clear structure)
+    - 4 = Strong/Exceptional (STAR + metrics)
+    Returns: (score, gap_reason)
+    """
+    checklist = rubric_data.get("checklist", {})
+    
+    # RED FLAG OVERRIDE (Always 1)
+    if checklist.get("red_flags") == True:
+        return 1, "Toxic Behavior Detected"
+    
+    # AGGRESSIVE METRIC SCANNER (Backend Safety Net)
+    # One pass over the answer for all keyword lists (compiled once, see RUBRIC_MATCHER)
+    hits = RUBRIC_MATCHER.scan(answer_text)
+    has_metrics = checklist.get("has_metrics", False)
+    
+    # Backend metric override
+    if not has_metrics:
+        has_metrics = METRIC_PATTERNS.search(answer_text) or bool(hits["business"] and re.search(r'\d+', answer_text))
+    
+    # Q1/Q2 (Background) Logic
+    if question_index == "Q1" or question_index == "Q2":
+        has_relevant = checklist.get("relevant_history", False)
+        is_clear = checklist.get("communicated_clearly", False)
+        
+        if not has_relevant:
+            return 2, None  # Weak background
+        elif has_metrics:
+            return 4, None  # Strong background with metrics
+        elif is_clear:
+            return 3, None  # Competent background
+        else:
+            return 2, None  # Weak
+    
+    # Q3-Q7 (Behavioral) - 2/3/4 SYSTEM WITH BACKEND VALIDATION
+    else:
+        has_star_s = checklist.get("star_situation", False)
+        has_star_a = checklist.get("star_action", False)
+        has_star_r = checklist.get("star_result", False)
+        is_organized = checklist.get("delivery_organized", False)
+        
+        # BACKEND VALIDATION (override if AI missed obvious keywords)
+        if not has_star_a and hits["action"]:
+            has_star_a = True
+        
+        if not has_star_r and hits["result"]:
+            has_star_r = True
+        
+        complete_star = has_star_s and has_star_a and has_star_r
+        partial_star = has_star_a and has_star_r  # A+R is good enough
+        
+        # 2/3/4 TIERED SCORING
+        if (complete_star or partial_star) and has_metrics:
+            return 4, None  # Strong/Exceptional: STAR + Metrics
+        elif complete_star or partial_star:
+            return 3, None  # Competent: Good STAR structure
+        elif has_star_a or (is_organized and has_star_r):
+            return 3, None  # Competent: At least organized with some structure
+        else:
+            return 2, None  # Weak: Missing critical elements
@@ -0,0 +1,262 @@
+# SPEECH PIPELINE (Sentence-Level TTS)
+# Strategy: Split speech text into sentence segments and synthesize them concurrently on a
+# bounded, worker-wide thread pool. Segments are returned as an ordered playlist so playback
+# can start after the first sentence. Text can also be fed incrementally while the LLM is
+# still generating; finish(final_text) then reconciles what was synthesized speculatively
+# against the authoritative text and only re-synthesizes segments that differ.
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api.env import env_int
+
+
+# Sentence boundary: terminator (+ closing quotes/brackets) followed by whitespace, or a blank line
+_BOUNDARY = re.compile(r'(?<=[.!?…])(?P<close>["\'”’)\]]*)\s+|\n\s*\n')
+
+MIN_SEGMENT_CHARS = env_int("SPEECH_MIN_SEGMENT_CHARS", 40)
+MAX_SEGMENT_CHARS = 4000  # tts-1 accepts up to 4096 characters per request
+
+
+def _normalize(text):
+    return " ".join((text or "").split())
+
+
+def _split_complete(text):
+    """(sentences that ended on a boundary, unterminated remainder)."""
+    pieces = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        piece = text[start:match.start() + len(match.group("close") or "")].strip()
+        if piece:
+            pieces.append(piece)
+        start = match.end()
+    return pieces, text[start:]
+
+
+def split_sentences(text):
+    """Sentences in order (boundary whitespace dropped, empty pieces skipped)."""
+    pieces, tail = _split_complete(text or "")
+    if tail.strip():
+        pieces.append(tail.strip())
+    return pieces
+
+
+def _hard_wrap(sentence, limit=MAX_SEGMENT_CHARS):
+    """Split an overlong sentence at word boundaries so no request exceeds the TTS limit."""
+    if len(sentence) <= limit:
+        return [sentence]
+    out, current = [], ""
+    for word in sentence.split(" "):
+        if current and len(current) + 1 + len(word) > limit:
+            out.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        out.append(current)
+    return out
+
+
+class _Segmenter:
+    """Greedy sentence grouping: a segment closes once it reaches min_chars.
+
+    Pinned phrases (scripted lines whose audio is cached) always form a segment of their
+    own; a sentence that merely starts with one is split into the pinned prefix + the tail.
+    Only depends on the text seen so far, so feeding text incrementally yields exactly the
+    same segments as segmenting the full text in one go.
+    """
+
+    def __init__(self, min_chars=None, pinned=None):
+        self.min_chars = MIN_SEGMENT_CHARS if min_chars is None else min_chars
+        self.pinned = pinned or ()
+        self._current = []
+
+    def _pinned_prefix(self, sentence):
+        norm = _normalize(sentence)
+        for phrase in self.pinned:
+            if norm == phrase:
+                return phrase, ""
+            if norm.startswith(phrase + " "):
+                return phrase, norm[len(phrase) + 1:]
+        return None, sentence
+
+    def push(self, sentence):
+        closed = []
+        phrase, sentence = self._pinned_prefix(sentence)
+        if phrase:
+            closed.extend(self.flush())
+            closed.append(phrase)
+            if not sentence:
+                return closed
+        for part in _hard_wrap(sentence):
+            self._current.append(part)
+            joined = " ".join(self._current)
+            if len(joined) >= self.min_chars:
+                closed.append(joined)
+                self._current = []
+        return closed
+
+    def flush(self):
+        if not self._current:
+            return []
+        joined = " ".join(self._current)
+        self._current = []
+        return [joined]
+
+
+def segment_text(text, min_chars=None, pinned=None):
+    segmenter = _Segmenter(min_chars, pinned)
+    segments = []
+    for sentence in split_sentences(text):
+        segments.extend(segmenter.push(sentence))
+    return segments + segmenter.flush()
+
+
+class SpeechSegment:
+    __slots__ = ("index", "text", "future")
+
+    def __init__(self, index, text, future):
+        self.index = index
+        self.text = text
+        self.future = future
+
+    @property
+    def audio(self):
+        return self.future.result()
+
+    def done(self):
+        return self.future.done()
+
+
+class SpeechJob:
+    """One utterance being synthesized as an ordered list of segments."""
+
+    def __init__(self, pipeline, synthesize, voice, min_chars=None):
+        self.pipeline = pipeline
+        self.synthesize = synthesize
+        self.voice = voice
+        self.segments = []
+        self.started_at = time.time()
+        self.first_audio_at = None
+        self._segmenter = _Segmenter(min_chars, pipeline.pinned)
+        self._min_chars = min_chars
+        self._buffer = ""
+        self._delivered = 0
+        self._finished = False
+
+    def _submit(self, text):
+        index = len(self.segments)
+        future = self.pipeline.executor().submit(self._run, text)
+        self.segments.append(SpeechSegment(index, text, future))
+
+    def _run(self, text):
+        audio = self.synthesize(text, self.voice)
+        if self.first_audio_at is None:
+            self.first_audio_at = time.time()
+        return audio
+
+    # --- INCREMENTAL FEED ---
+    def feed(self, text):
+        """Append streamed text; every completed segment is submitted immediately."""
+        if self._finished or not text:
+            return
+        self._buffer += text
+        complete, self._buffer = _split_complete(self._buffer)
+        for sentence in complete:
+            for segment in self._segmenter.push(sentence):
+                self._submit(segment)
+
+    def finish(self, final_text):
+        """Reconcile speculative segments with the final text and submit the remainder.
+
+        Returns the index of the first segment that was replaced (len(segments) if none),
+        so callers that already delivered audio know what to discard.
+        """
+        self._finished = True
+        wanted = segment_text(final_text, self._min_chars, self.pipeline.pinned)
+        keep = 0
+        while keep < min(len(wanted), len(self.segments)) and _normalize(wanted[keep]) == _normalize(self.segments[keep].text):
+            keep += 1
+        replaced_from = keep
+        for stale in self.segments[keep:]:
+            stale.future.cancel()
+        self.segments = self.segments[:keep]
+        for text in wanted[keep:]:
+            self._submit(text)
+        if replaced_from < self._delivered:
+            self._delivered = replaced_from
+        return replaced_from
+
+    # --- RESULTS ---
+    @property
+    def delivered(self):
+        return self._delivered
+
+    def ready(self):
+        """Segments that finished since the last call, strictly in order (non-blocking)."""
+        out = []
+        while self._delivered < len(self.segments) and self.segments[self._delivered].done():
+            out.append(self.segments[self._delivered])
+            self._delivered += 1
+        return out
+
+    def remaining(self):
+        """Blocking iterator over the segments not yet delivered, in order."""
+        while self._delivered < len(self.segments):
+            segment = self.segments[self._delivered]
+            segment.future.result()
+            self._delivered += 1
+            yield segment
+
+    def wait(self, timeout=None):
+        """All segments, in order, once every one has been synthesized.
+        Raises concurrent.futures.TimeoutError after `timeout` seconds (the job keeps running)."""
+        end = None if timeout is None else time.monotonic() + timeout
+        for segment in self.segments:
+            segment.future.result(None if end is None else max(0.0, end - time.monotonic()))
+        return list(self.segments)
+
+    def stats(self):
+        return {
+            "segments": len(self.segments),
+            "first_audio_s": round(self.first_audio_at - self.started_at, 3) if self.first_audio_at else None,
+        }
+
+
+class SpeechPipeline:
+    """Worker-wide bounded pool shared by every voice feature."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or env_int("SPEECH_PIPELINE_WORKERS", 4)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pinned = ()
+
+    def pin_phrases(self, phrases):
+        """Register scripted sentences that must stay separate segments (cacheable audio).
+        Longest first so the most specific phrase wins a prefix match."""
+        sentences = {_normalize(s) for phrase in phrases for s in split_sentences(phrase)}
+        self.pinned = tuple(sorted(sentences, key=len, reverse=True))
+
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tts")
+        return self._executor
+
+    def job(self, synthesize, voice, min_chars=None):
+        """Empty job for incremental feed()/finish() use."""
+        return SpeechJob(self, synthesize, voice, min_chars)
+
+    def synthesize(self, text, synthesize, voice, min_chars=None):
+        """Segment the full text and submit every segment at once."""
+        job = self.job(synthesize, voice, min_chars)
+        job.finish(text)
+        return job
+
+
+speech_pipeline = SpeechPipeline()
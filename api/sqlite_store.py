@@ -0,0 +1,55 @@
+# SQLITE TABLE STORE (Shared Helper For The Single-File Backends)
+# Strategy: The LLM cache, interview sessions and job queue each keep one table in a local
+# SQLite file (local dev / single-host deploys). This holds what they share: one lazily
+# opened WAL-mode connection per file (safe across threads behind one lock), the table
+# created on first use, and an opportunistic purge of expired rows (`expires_at` column)
+# every `purge_every` writes so the file does not grow without bound.
+
+import os
+import sqlite3
+import threading
+import time
+
+
+class SQLiteTable:
+    """One table in a WAL-mode SQLite file: read() / write() under a single lock."""
+
+    def __init__(self, path, table, schema, purge_every=100):
+        self.path = path
+        self.table = table
+        # Column definitions for CREATE TABLE IF NOT EXISTS <table> (<schema>)
+        self.schema = schema
+        self.purge_every = purge_every
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({self.schema})")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def read(self, sql, params=()):
+        """First row of a query, or None."""
+        with self._lock:
+            return self._connect().execute(sql, params).fetchone()
+
+    def write(self, sql, params=(), purge=True):
+        """Run one statement and commit. Returns the affected row count. Every purge_every-th
+        purging write also deletes the expired rows."""
+        with self._lock:
+            conn = self._connect()
+            rowcount = conn.execute(sql, params).rowcount
+            if purge:
+                self._writes += 1
+                if self._writes % self.purge_every == 0:
+                    conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+        return rowcount
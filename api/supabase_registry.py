@@ -0,0 +1,245 @@
+# SUPABASE CLIENT REGISTRY
+# Strategy: Build the anon + service-role clients ONCE per worker on top of a single
+# pooled, keep-alive httpx transport. Per-request user access gets a cheap PostgREST
+# "view" that carries the bearer token in its headers instead of a new create_client().
+# Client builds without an httpx-client hook (supabase 2.3 / postgrest 0.16, as pinned)
+# keep their own PostgREST session object, but it is rebuilt on the shared transport, so
+# every client draws from the same connection pool. stats() reports which path is active.
+
+import os
+import threading
+import time
+
+from api.env import env_int, env_float
+
+
+class SupabaseRegistry:
+    """Process-wide holder for pooled Supabase clients."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._transport = None
+        self._http = None
+        self._anon = None
+        self._service = None
+        self._built_at = None
+        self._counters = {
+            "clients_built": 0,
+            "anon_hits": 0,
+            "service_hits": 0,
+            "user_views": 0,
+            "isolated_clients": 0,
+        }
+        # anon / service / user -> "httpx_client" (library hook), "shared_transport"
+        # (PostgREST session rebuilt on the pool) or "off" (own session, no pooling)
+        self._pooling = {}
+
+    # --- CONFIG ---
+    def pool_config(self):
+        return {
+            "max_connections": env_int("SUPABASE_POOL_MAX_CONNECTIONS", 20),
+            "max_keepalive_connections": env_int("SUPABASE_POOL_MAX_KEEPALIVE", 10),
+            "keepalive_expiry": env_float("SUPABASE_POOL_KEEPALIVE_EXPIRY", 30.0),
+            "timeout": env_float("SUPABASE_HTTP_TIMEOUT", 15.0),
+        }
+
+    def _count(self, key):
+        with self._lock:
+            self._counters[key] += 1
+
+    def _set_pooling(self, name, mode):
+        with self._lock:
+            changed = self._pooling.get(name) != mode
+            self._pooling[name] = mode
+        if changed:
+            print(f"[SUPABASE] {name} client pooling: {mode}")
+
+    # --- SHARED HTTP POOL ---
+    def transport(self):
+        """Lazily build the keep-alive transport (the connection pool itself)."""
+        if self._transport is not None:
+            return self._transport
+        with self._lock:
+            if self._transport is None:
+                import httpx
+                cfg = self.pool_config()
+                try:
+                    import h2  # noqa: F401 (HTTP/2 is optional)
+                    use_http2 = True
+                except ImportError:
+                    use_http2 = False
+                self._transport = httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=cfg["max_connections"],
+                        max_keepalive_connections=cfg["max_keepalive_connections"],
+                        keepalive_expiry=cfg["keepalive_expiry"],
+                    ),
+                    http2=use_http2,
+                )
+                self._built_at = time.time()
+        return self._transport
+
+    def http_client(self):
+        """Lazily build the shared httpx session used by every Supabase sub-client."""
+        if self._http is not None:
+            return self._http
+        transport = self.transport()
+        with self._lock:
+            if self._http is None:
+                import httpx
+                self._http = httpx.Client(
+                    transport=transport,
+                    timeout=self.pool_config()["timeout"],
+                    follow_redirects=True,
+                )
+        return self._http
+
+    def pool_session(self, postgrest_client):
+        """
+        Rebuild a PostgREST client's own httpx session (base URL + auth headers) on the
+        shared transport. Returns the resulting pooling mode.
+        """
+        session = getattr(postgrest_client, "session", None)
+        if session is None:
+            return "off"
+        if session is self._http or getattr(session, "_transport", None) is self._transport:
+            return "httpx_client"
+        try:
+            postgrest_client.session = type(session)(
+                base_url=session.base_url,
+                headers=session.headers,
+                timeout=session.timeout,
+                follow_redirects=True,
+                transport=self.transport(),
+            )
+        except Exception as e:
+            print(f"[SUPABASE] PostgREST session not pooled: {e}")
+            return "off"
+        try:
+            session.close()
+        except Exception:
+            pass
+        return "shared_transport"
+
+    def _build_client(self, key, pooled=True, name=None):
+        from supabase import create_client
+        try:
+            from supabase.lib.client_options import SyncClientOptions as Options
+        except ImportError:
+            from supabase.lib.client_options import ClientOptions as Options
+
+        url = os.environ.get("SUPABASE_URL")
+        # Shared clients must never persist or refresh a user session: a SIGNED_IN
+        # event would rewrite the Authorization header for every other request.
+        options = Options(auto_refresh_token=False, persist_session=False)
+        hooked = pooled and hasattr(options, "httpx_client")
+        if hooked:
+            options.httpx_client = self.http_client()
+        client = create_client(url, key, options)
+        self._count("clients_built")
+        if pooled:
+            # supabase 2.3 has no httpx_client option: pool its PostgREST session directly
+            mode = "httpx_client" if hooked else self.pool_session(client.postgrest)
+            self._set_pooling(name or "client", mode)
+        return client
+
+    # --- PUBLIC ACCESSORS ---
+    def anon(self):
+        """Shared anon-key client (auth lookups, public reads)."""
+        if self._anon is None:
+            client = self._build_client(os.environ.get("SUPABASE_KEY"), name="anon")
+            with self._lock:
+                if self._anon is None:
+                    self._anon = client
+        self._count("anon_hits")
+        return self._anon
+
+    def service(self):
+        """Shared service-role client (bypasses RLS)."""
+        if self._service is None:
+            key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+            if not key:
+                print("CRITICAL WARNING: SUPABASE_SERVICE_ROLE_KEY is missing. Falling back to ANON key (RLS will likely block data).")
+                key = os.environ.get("SUPABASE_KEY")
+            client = self._build_client(key, name="service")
+            with self._lock:
+                if self._service is None:
+                    self._service = client
+        self._count("service_hits")
+        return self._service
+
+    def user(self, token):
+        """
+        RLS-scoped PostgREST view for one request.
+        Reuses the shared connection pool; only the headers differ.
+        """
+        from postgrest import SyncPostgrestClient
+        base = self.anon()
+        headers = dict(base.options.headers)
+        headers["Authorization"] = f"Bearer {token}"
+        schema = getattr(base.options, "schema", "public")
+        try:
+            view = SyncPostgrestClient(str(base.rest_url), headers=headers, schema=schema, http_client=self.http_client())
+            mode = "httpx_client"
+        except TypeError:
+            # postgrest 0.16 has no http_client hook: move its own session onto the pool
+            view = SyncPostgrestClient(str(base.rest_url), headers=headers, schema=schema)
+            mode = self.pool_session(view)
+        self._set_pooling("user", mode)
+        self._count("user_views")
+        return view
+
+    def isolated(self):
+        """Fresh, unshared anon client for auth flows that mutate session state (sign_up, set_session)."""
+        self._count("isolated_clients")
+        return self._build_client(os.environ.get("SUPABASE_KEY"), pooled=False)
+
+    # --- INTROSPECTION ---
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            pooling = dict(self._pooling)
+        pool = {"initialized": self._transport is not None}
+        if self._transport is not None:
+            pool["http2"] = False
+            pool["age_seconds"] = round(time.time() - self._built_at, 1) if self._built_at else None
+            try:
+                inner = getattr(self._transport, "_pool", None)
+                pool["http2"] = bool(getattr(inner, "_http2", False))
+                connections = list(getattr(inner, "connections", []) or [])
+                idle = sum(1 for c in connections if c.is_idle())
+                pool["connections"] = len(connections)
+                pool["idle"] = idle
+                pool["active"] = len(connections) - idle
+            except Exception as e:
+                pool["error"] = str(e)
+        return {
+            "config": self.pool_config(),
+            "pool": pool,
+            "clients": {
+                "anon": self._anon is not None,
+                "service": self._service is not None,
+            },
+            # Is the shared pool really in use? Per client, plus an overall flag.
+            "pooling": {"active": bool(pooling) and "off" not in pooling.values(), **pooling},
+            "counters": counters,
+        }
+
+    def reset(self):
+        """Drop every cached client (used after key rotation and in tests)."""
+        with self._lock:
+            http, self._http = self._http, None
+            transport, self._transport = self._transport, None
+            self._anon = None
+            self._service = None
+            self._built_at = None
+            self._pooling = {}
+        for closable in (http, transport):
+            if closable is not None:
+                try:
+                    closable.close()
+                except Exception:
+                    pass
+
+
+registry = SupabaseRegistry()
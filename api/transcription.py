@@ -0,0 +1,233 @@
+# TRANSCRIPTION INGEST (In-Memory, Size-Bounded, Segmented)
+# Strategy: Accept recordings as multipart files, a raw binary body (audio/* or
+# application/octet-stream) or the legacy base64-in-JSON payload. Bodies are streamed through
+# a hard byte limit into memory buffers (multipart files never spool to disk) and uploaded
+# to Whisper straight from those buffers. Long WAV recordings are split on frame boundaries
+# (stdlib wave) and multi-part uploads are transcribed concurrently, then stitched in order.
+# Compressed containers (webm/opus, mp4, mp3) cannot be cut without a demuxer, so those are
+# only parallelized when the client uploads several independently decodable parts.
+
+import io
+import base64
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from api.env import env_int
+
+
+MAX_UPLOAD_BYTES = env_int("TRANSCRIBE_MAX_BYTES", 25 * 1024 * 1024)  # Whisper's own file limit
+SEGMENT_SECONDS = env_int("TRANSCRIBE_SEGMENT_SECONDS", 60)
+READ_CHUNK = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadError(Exception):
+    pass
+
+
+class AudioPart:
+    __slots__ = ("data", "filename", "mime")
+
+    def __init__(self, data, declared_mime=None, stem="audio"):
+        self.data = data
+        self.mime = resolve_mime(data, declared_mime)
+        # Whisper detects the format from the extension, so never trust a client filename ("blob")
+        self.filename = f"{stem}{EXTENSIONS[self.mime]}"
+
+    def upload(self):
+        """(filename, bytes, mime) tuple the OpenAI SDK uploads without a file on disk."""
+        return (self.filename, self.data, self.mime)
+
+
+EXTENSIONS = {
+    "audio/webm": ".webm",
+    "audio/ogg": ".ogg",
+    "audio/mp4": ".m4a",
+    "audio/mpeg": ".mp3",
+    "audio/wav": ".wav",
+}
+
+
+def sniff_mime(data):
+    """Container type from magic bytes (the browser's declared type is often wrong/absent), or None."""
+    head = bytes(data[:12])
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "audio/wav"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "audio/webm"
+    if head.startswith(b"OggS"):
+        return "audio/ogg"
+    if head[4:8] == b"ftyp":
+        return "audio/mp4"
+    if head.startswith(b"ID3") or head[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+        return "audio/mpeg"
+    return None
+
+
+def resolve_mime(data, declared=None):
+    sniffed = sniff_mime(data)
+    if sniffed:
+        return sniffed
+    declared = (declared or "").split(";")[0].strip().lower()
+    # MediaRecorder default (Chrome/Firefox) when nothing else is known
+    return declared if declared in EXTENSIONS else "audio/webm"
+
+
+class _LimitedStream:
+    """Read-through wrapper that fails as soon as more than `limit` bytes were consumed."""
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.limit = limit
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = self.stream.read(size if size is not None and size >= 0 else READ_CHUNK)
+        self.consumed += len(chunk)
+        if self.consumed > self.limit:
+            raise UploadTooLarge(f"Recording exceeds {self.limit} bytes")
+        return chunk
+
+
+def read_limited(stream, limit):
+    buf = io.BytesIO()
+    limited = _LimitedStream(stream, limit)
+    while True:
+        chunk = limited.read(READ_CHUNK)
+        if not chunk:
+            break
+        buf.write(chunk)
+    return buf.getvalue()
+
+
+def _memory_stream_factory(total_content_length, content_type, filename, content_length=None):
+    return io.BytesIO()
+
+
+def decode_base64_audio(value, limit):
+    if not value or not isinstance(value, str):
+        raise UploadError("No audio provided")
+    declared = None
+    if "," in value:
+        header, value = value.split(",", 1)
+        if header.startswith("data:"):
+            declared = header[5:].split(";")[0]
+    # base64 is 4/3 of the payload: reject before allocating the decoded bytes
+    if len(value) * 3 // 4 > limit:
+        raise UploadTooLarge(f"Recording exceeds {limit} bytes")
+    try:
+        data = base64.b64decode(value)
+    except Exception:
+        raise UploadError("Audio is not valid base64")
+    if not data:
+        raise UploadError("No audio provided")
+    return AudioPart(data, declared)
+
+
+def read_audio_upload(req, json_body=None, limit=None):
+    """All audio parts of a transcription request, in upload order.
+
+    Accepts multipart/form-data (every file field, in order), a raw audio/* or
+    application/octet-stream body, or JSON {"audio": base64 | [base64, ...]}.
+    """
+    limit = limit or MAX_UPLOAD_BYTES
+    # Multipart/base64 overhead allowance on the declared length; the stream is still hard-capped
+    if req.content_length is not None and req.content_length > limit * 4 // 3 + 64 * 1024:
+        raise UploadTooLarge(f"Recording exceeds {limit} bytes")
+
+    mimetype = req.mimetype or ""
+    if mimetype == "multipart/form-data":
+        from werkzeug.formparser import FormDataParser
+        parser = FormDataParser(stream_factory=_memory_stream_factory, max_content_length=limit * 4 // 3 + 64 * 1024, silent=False)
+        _, form, files = parser.parse(_LimitedStream(req.stream, limit + 64 * 1024), mimetype, req.content_length, req.mimetype_params)
+        parts = []
+        total = 0
+        for _, storage in files.items(multi=True):
+            data = storage.stream.getvalue() if hasattr(storage.stream, "getvalue") else storage.read()
+            total += len(data)
+            if total > limit:
+                raise UploadTooLarge(f"Recording exceeds {limit} bytes")
+            if data:
+                parts.append(AudioPart(data, storage.mimetype, stem=f"part{len(parts)}"))
+        if not parts:
+            raise UploadError("No audio file in upload")
+        return parts, form
+
+    if mimetype.startswith("audio/") or mimetype == "application/octet-stream":
+        data = read_limited(req.stream, limit)
+        if not data:
+            raise UploadError("Empty audio body")
+        return [AudioPart(data, mimetype)], {}
+
+    body = json_body if json_body is not None else (req.get_json(silent=True) or {})
+    audio = body.get("audio")
+    values = audio if isinstance(audio, list) else [audio]
+    parts = [decode_base64_audio(v, limit) for v in values]
+    if sum(len(p.data) for p in parts) > limit:
+        raise UploadTooLarge(f"Recording exceeds {limit} bytes")
+    return parts, body
+
+
+def split_wav(part, seconds=None):
+    """Cut a PCM WAV into ~`seconds` long, self-contained WAV parts (frame aligned)."""
+    seconds = seconds or SEGMENT_SECONDS
+    try:
+        with wave.open(io.BytesIO(part.data), "rb") as src:
+            params = src.getparams()
+            frames_per_part = params.framerate * seconds
+            if params.nframes <= frames_per_part * 1.5:
+                return [part]
+            parts = []
+            while True:
+                frames = src.readframes(frames_per_part)
+                if not frames:
+                    break
+                out = io.BytesIO()
+                with wave.open(out, "wb") as dst:
+                    dst.setnchannels(params.nchannels)
+                    dst.setsampwidth(params.sampwidth)
+                    dst.setframerate(params.framerate)
+                    dst.writeframes(frames)
+                parts.append(AudioPart(out.getvalue(), "audio/wav", stem=f"segment{len(parts)}"))
+            return parts
+    except (wave.Error, EOFError):
+        return [part]
+
+
+def segment_parts(parts, seconds=None):
+    """Expand every splittable part (WAV) into time segments, keeping overall order."""
+    out = []
+    for part in parts:
+        out.extend(split_wav(part, seconds) if part.mime == "audio/wav" else [part])
+    return out
+
+
+class Transcriber:
+    """Bounded worker-wide pool for concurrent segment transcription."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or env_int("TRANSCRIBE_WORKERS", 4)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stt")
+        return self._executor
+
+    def transcribe(self, parts, transcribe_one):
+        """transcribe_one(AudioPart) -> text. Segments run concurrently; text is stitched in order."""
+        if len(parts) == 1:
+            return transcribe_one(parts[0])
+        futures = [self.executor().submit(transcribe_one, part) for part in parts]
+        texts = [(f.result() or "").strip() for f in futures]
+        return " ".join(t for t in texts if t)
+
+
+transcriber = Transcriber()
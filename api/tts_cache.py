@@ -0,0 +1,216 @@
+# TTS AUDIO CACHE (Content-Addressed)
+# Strategy: Audio is keyed by sha256(model | voice | normalized text). A byte-bounded
+# in-memory LRU sits in front of a size-bounded on-disk tier (TTS_CACHE_DIR, /tmp by
+# default so it survives warm serverless invocations). Concurrent misses for the same key
+# share one synthesis call. Scripted phrases can be pre-warmed for every voice; the speech
+# pipeline pins them as their own segments so cached prefixes stitch with fresh tails.
+
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from api.env import env_int
+
+
+def normalize_text(text):
+    return " ".join((text or "").split())
+
+
+class TTSCache:
+    """Two-tier (memory LRU + disk) cache of synthesized audio clips."""
+
+    def __init__(self, memory_max_bytes=None, disk_dir=None, disk_max_bytes=None):
+        self.memory_max_bytes = memory_max_bytes if memory_max_bytes is not None else env_int("TTS_CACHE_MEMORY_BYTES", 32 * 1024 * 1024)
+        self.disk_max_bytes = disk_max_bytes if disk_max_bytes is not None else env_int("TTS_CACHE_DISK_BYTES", 256 * 1024 * 1024)
+        self.disk_dir = disk_dir or os.environ.get("TTS_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "tts-cache")
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index = None  # OrderedDict key -> size, oldest first (built lazily)
+        self._disk_bytes = 0
+        self._disk_ok = self.disk_max_bytes > 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "synthesized": 0, "coalesced": 0, "evictions": 0}
+
+    @staticmethod
+    def key(model, voice, text):
+        return hashlib.sha256(f"{model}|{voice}|{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    # --- MEMORY TIER ---
+    def _memory_put(self, key, audio):
+        if len(audio) > self.memory_max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[key] = audio
+            self._memory_bytes += len(audio)
+            while self._memory_bytes > self.memory_max_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self._counters["evictions"] += 1
+
+    # --- DISK TIER ---
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key[:2], key + ".mp3")
+
+    def _load_disk_index(self):
+        """Scan the cache dir once (oldest mtime first) so eviction survives restarts."""
+        if self._disk_index is not None or not self._disk_ok:
+            return
+        index, total = [], 0
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            for root, _, files in os.walk(self.disk_dir):
+                for name in files:
+                    if not name.endswith(".mp3"):
+                        continue
+                    st = os.stat(os.path.join(root, name))
+                    index.append((st.st_mtime, name[:-4], st.st_size))
+        except OSError as e:
+            print(f"[TTS CACHE] Disk tier disabled: {e}")
+            self._disk_ok = False
+            return
+        index.sort()
+        self._disk_index = OrderedDict((k, size) for _, k, size in index)
+        self._disk_bytes = sum(size for _, _, size in index)
+
+    def _disk_get(self, key):
+        with self._lock:
+            self._load_disk_index()
+            if not self._disk_ok or key not in self._disk_index:
+                return None
+            self._disk_index.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path, None)
+            return audio
+        except OSError:
+            with self._lock:
+                size = self._disk_index.pop(key, 0)
+                self._disk_bytes -= size
+            return None
+
+    def _disk_put(self, key, audio):
+        with self._lock:
+            self._load_disk_index()
+            if not self._disk_ok or len(audio) > self.disk_max_bytes:
+                return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[TTS CACHE] Disk write failed: {e}")
+            return
+        evict = []
+        with self._lock:
+            self._disk_bytes += len(audio) - self._disk_index.pop(key, 0)
+            self._disk_index[key] = len(audio)
+            while self._disk_bytes > self.disk_max_bytes and self._disk_index:
+                old_key, size = self._disk_index.popitem(last=False)
+                self._disk_bytes -= size
+                self._counters["evictions"] += 1
+                evict.append(old_key)
+        for old_key in evict:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    # --- PUBLIC ---
+    def get(self, model, voice, text):
+        key = self.key(model, voice, text)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return audio
+        audio = self._disk_get(key)
+        if audio is not None:
+            with self._lock:
+                self._counters["disk_hits"] += 1
+            self._memory_put(key, audio)
+        return audio
+
+    def put(self, model, voice, text, audio):
+        if not isinstance(audio, (bytes, bytearray)) or not audio:
+            return
+        key = self.key(model, voice, text)
+        self._memory_put(key, bytes(audio))
+        self._disk_put(key, bytes(audio))
+
+    def get_or_synthesize(self, model, voice, text, synthesize):
+        """Cached audio, or synthesize() once (concurrent callers for the same clip wait on it)."""
+        audio = self.get(model, voice, text)
+        if audio is not None:
+            return audio
+        key = self.key(model, voice, text)
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+                self._counters["misses"] += 1
+            else:
+                owner = False
+                self._counters["coalesced"] += 1
+        if not owner:
+            return pending.result()
+        try:
+            audio = synthesize()
+            self.put(model, voice, text, audio)
+            with self._lock:
+                self._counters["synthesized"] += 1
+            pending.set_result(audio)
+            return audio
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def prewarm(self, model, voices, phrases, synthesize):
+        """Fill the cache for every (voice, phrase). synthesize(text, voice) -> bytes. Returns clips synthesized."""
+        made = 0
+        for voice in voices:
+            for phrase in phrases:
+                if self.get(model, voice, phrase) is not None:
+                    continue
+                try:
+                    self.get_or_synthesize(model, voice, phrase, lambda: synthesize(phrase, voice))
+                    made += 1
+                except Exception as e:
+                    print(f"[TTS CACHE] Prewarm failed ({voice}): {e}")
+        return made
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_max_bytes": self.memory_max_bytes,
+                "disk_entries": len(self._disk_index) if self._disk_index is not None else None,
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes if self._disk_ok else 0,
+                **self._counters,
+            }
+
+
+tts_cache = TTSCache()
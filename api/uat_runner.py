@@ -0,0 +1,275 @@
+# SYNTHETIC UAT RUNNER (Concurrent Persona Simulations As Background Jobs)
+# Strategy: A UAT run is a job over one or more personas. Personas run in parallel up to a
+# cap; inside a persona every candidate answer is generated at once, then every answer is
+# scored at once, so a persona costs two model round trips of wall time instead of one per
+# call. The job runs on background workers and the admin polls its progress, so the full
+# 6-question protocol across all personas never has to fit in one request's time limit.
+# run() drives a job to completion and publishes progress snapshots as it goes; the admin
+# route runs it on the shared job queue (api/job_queue.py), so the snapshots land in the
+# shared job table and any worker can answer a poll. Live job state (bounded, TTL'd once
+# finished) stays in the memory of the worker running it.
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from api.env import env_int
+
+
+UAT_PERSONAS = {
+    "professional": "You are a seasoned Hiring Manager with 20 years experience. You use STAR method perfectly. You are confident, concise, and professional.",
+    "quitter": "You are annoyed. You give one-word answers. You hate interviews. You want to leave.",
+    "cliffhanger": "You answer the first part detailed, but then stop mid-sentence."
+}
+
+# The interview protocol: Q1 background (not scored), then the five STAR questions
+UAT_QUESTIONS = [
+    "Tell me about yourself and your background.",
+    "Describe a conflict you resolved.",
+    "Tell me about a time you failed and what you learned.",
+    "Walk me through a strategic decision you made with incomplete information.",
+    "Tell me about a time you led a team.",
+    "Why do you want this role?"
+]
+
+
+def persona_names(requested):
+    """Persona list from a request: a name, a list of names, or 'all'."""
+    if not requested:
+        return ["professional"]
+    if isinstance(requested, str):
+        requested = list(UAT_PERSONAS) if requested.lower() == "all" else [requested]
+    names = []
+    for name in requested:
+        name = str(name).strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names or ["professional"]
+
+
+class UATRunner:
+    """Runs persona simulations concurrently; jobs are polled via progress(job_id)."""
+
+    def __init__(self, max_personas=None, max_calls=None, ttl=None, max_jobs=None):
+        self.max_personas = max_personas or env_int("UAT_MAX_PERSONAS", 3)
+        self.max_calls = max_calls or env_int("UAT_MAX_CALLS", 12)
+        self.ttl = ttl if ttl is not None else env_int("UAT_JOB_TTL", 3600)
+        self.max_jobs = max_jobs if max_jobs is not None else env_int("UAT_MAX_JOBS", 50)
+        # Seconds between progress snapshots published by run()
+        self.publish_interval = env_int("UAT_PUBLISH_SECONDS", 1)
+        self._jobs = OrderedDict()  # job id -> job dict
+        # Persona workers block on their calls, so calls get their own pool (no deadlock)
+        self._persona_executor = None
+        self._call_executor = None
+        self._lock = threading.Lock()
+        self._counters = {"jobs": 0, "personas": 0, "calls": 0, "call_errors": 0}
+
+    def executors(self):
+        if self._call_executor is None:
+            with self._lock:
+                if self._call_executor is None:
+                    self._persona_executor = ThreadPoolExecutor(max_workers=self.max_personas, thread_name_prefix="uat")
+                    self._call_executor = ThreadPoolExecutor(max_workers=self.max_calls, thread_name_prefix="uat-call")
+        return self._persona_executor, self._call_executor
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def map(self, fn, items):
+        """fn over items concurrently; [(value, error)] in item order."""
+        _, calls = self.executors()
+        futures = [calls.submit(fn, *item) for item in items]
+        results = []
+        for future in futures:
+            try:
+                results.append((future.result(), None))
+            except Exception as e:
+                self._count("call_errors")
+                results.append((None, e))
+        self._count("calls", len(items))
+        return results
+
+    # --- ONE PERSONA ---
+    def simulate(self, job, name, answer, score, questions):
+        """All answers at once, then all scores at once. Returns the average score or None."""
+        state = job["personas"][name]
+        instruction = UAT_PERSONAS.get(name, UAT_PERSONAS["professional"])
+        logs = state["logs"]
+
+        def step():
+            with self._lock:
+                state["done"] += 1
+
+        def answer_step(question):
+            try:
+                return answer(instruction, question)
+            finally:
+                step()
+
+        def score_step(question, text):
+            try:
+                return score(question, text)
+            finally:
+                step()
+
+        with self._lock:
+            state["status"] = "running"
+        logs.append(f"--- STARTING SIMULATION: {name.upper()} ---")
+        answers = self.map(answer_step, [(q,) for q in questions])
+        # Q1 (background) is answered but not scored, as in the live protocol
+        scored = [i for i, (_, error) in enumerate(answers) if i > 0 and error is None]
+        scores = dict(zip(scored, self.map(score_step, [(questions[i], answers[i][0]) for i in scored])))
+        with self._lock:
+            # Skipped scores (failed answers) still count toward progress
+            state["done"] = state["total"]
+
+        values = []
+        for i, (q, (text, error)) in enumerate(zip(questions, answers)):
+            logs.append(f"\n[TURN {i + 1}: {'Background' if i == 0 else 'STAR Question'}]")
+            logs.append(f"COACH: {q}")
+            if error is not None:
+                logs.append(f"CANDIDATE: FAILURE - {error}")
+                continue
+            logs.append(f"CANDIDATE: {(text or '')[:50]}...")
+            if i in scores:
+                value, score_error = scores[i]
+                if score_error is not None:
+                    logs.append(f"SYSTEM: Scoring failed - {score_error}")
+                else:
+                    values.append(value)
+                    logs.append(f"SYSTEM: Scored {value}/4.0")
+        return round(sum(values) / len(values), 1) if values else None
+
+    def _run_persona(self, job, name, answer, score, questions, on_done):
+        state = job["personas"][name]
+        try:
+            average = self.simulate(job, name, answer, score, questions)
+            if average is None:
+                raise RuntimeError("no answer could be scored")
+            state["logs"].append(f"\n[FINALIZING]\nCalculated Average: {average}")
+            if on_done:
+                for line in on_done(name, average) or []:
+                    state["logs"].append(line)
+            status = "complete"
+        except Exception as e:
+            average = None
+            status = "failed"
+            state["logs"].append(f"CRITICAL FAILURE: {e}")
+            print(f"[UAT] Persona '{name}' failed: {e}")
+        state["logs"].append(f"\n--- TEST COMPLETE: {'SUCCESS' if status == 'complete' else 'FAILED'} ---")
+        with self._lock:
+            state.update(status=status, score=average)
+            self._counters["personas"] += 1
+            self._settle(job)
+
+    def _run_check(self, job, name, check):
+        state = job["checks"][name]
+        try:
+            state["logs"].extend(check() or [])
+            status = "complete"
+        except Exception as e:
+            status = "failed"
+            state["logs"].append(f"CHECK FAILURE: {e}")
+        with self._lock:
+            state["status"] = status
+            self._settle(job)
+
+    @staticmethod
+    def _settle(job):
+        """Mark the job finished once every persona and check has (caller holds the lock)."""
+        parts = list(job["personas"].values()) + list(job["checks"].values())
+        if all(p["status"] in ("complete", "failed") for p in parts):
+            job["status"] = "complete" if any(p["status"] == "complete" for p in job["personas"].values()) else "failed"
+            job["finished_at"] = time.time()
+            job["finished"].set()
+
+    # --- JOBS ---
+    def _evict(self):
+        now = time.time()
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            if job["finished_at"] and now - job["finished_at"] > self.ttl:
+                del self._jobs[job_id]
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+    def start(self, personas, answer, score, questions=None, on_done=None, checks=None, job_id=None):
+        """Queue a job. answer(instruction, question) -> text, score(question, text) -> 1-4,
+        on_done(persona, average) -> extra log lines; checks are {name: fn() -> log lines}
+        run alongside the personas. job_id defaults to a fresh one. Returns the job id."""
+        questions = list(questions or UAT_QUESTIONS)
+        # One answer per question + one score per STAR question
+        total = 2 * len(questions) - 1
+        job = {
+            "id": job_id or uuid.uuid4().hex,
+            "status": "running",
+            "questions": len(questions),
+            "created_at": time.time(),
+            "finished_at": None,
+            "personas": {
+                name: {"status": "queued", "done": 0, "total": total, "score": None, "logs": []}
+                for name in persona_names(personas)
+            },
+            "checks": {name: {"status": "running", "logs": []} for name in (checks or {})},
+            "finished": threading.Event(),
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._evict()
+            self._counters["jobs"] += 1
+        persona_pool, calls = self.executors()
+        for name in job["personas"]:
+            persona_pool.submit(self._run_persona, job, name, answer, score, questions, on_done)
+        for name, check in (checks or {}).items():
+            calls.submit(self._run_check, job, name, check)
+        return job["id"]
+
+    def run(self, personas, answer, score, questions=None, on_done=None, checks=None, publish=None, interval=None, job_id=None):
+        """start() a job and block until it finishes, calling publish(progress) right away and
+        then every `interval` seconds (e.g. into a shared store polled by other workers; pass
+        that store's job_id so the snapshots carry it). Returns the final progress."""
+        interval = interval if interval is not None else self.publish_interval
+        job_id = self.start(personas, answer, score, questions=questions, on_done=on_done, checks=checks, job_id=job_id)
+        with self._lock:
+            job = self._jobs[job_id]
+        while not job["finished"].is_set():
+            if publish:
+                publish(self.snapshot(job))
+            job["finished"].wait(interval)
+        return self.snapshot(job)
+
+    def snapshot(self, job):
+        """JSON-ready progress of one job."""
+        with self._lock:
+            personas = {
+                name: {"status": p["status"], "done": p["done"], "total": p["total"], "score": p["score"], "logs": "\n".join(p["logs"])}
+                for name, p in job["personas"].items()
+            }
+            done = sum(p["done"] for p in personas.values())
+            total = sum(p["total"] for p in personas.values())
+            return {
+                "job_id": job["id"],
+                "status": job["status"],
+                "progress": round(done / total, 3) if total else 1.0,
+                "elapsed": round((job["finished_at"] or time.time()) - job["created_at"], 1),
+                "personas": personas,
+                "checks": {name: {"status": c["status"], "logs": "\n".join(c["logs"])} for name, c in job["checks"].items()},
+            }
+
+    def progress(self, job_id):
+        """Snapshot of a job kept by this worker (None if unknown or expired)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return self.snapshot(job) if job is not None else None
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job["status"] == "running")
+            return {"jobs_kept": len(self._jobs), "running": running, "max_personas": self.max_personas,
+                    "max_calls": self.max_calls, **self._counters}
+
+
+uat_runner = UATRunner()
@@ -344,6 +344,7 @@ function updateToolBelt(session) {
 // Global state variables for interview tracking
 let questionCount = 0;
 let interviewHistory = [];
+let interviewSessionId = null; // Server-side session: later turns send only the id + answer
 let currentQuestionText = "";
 
 // --- COUNTDOWN LOGIC ---
@@ -1616,6 +1617,7 @@ function init() {
                 }
                 questionCount = 0; // Correctly start at 0 for Turn 1
                 interviewHistory = []; // Reset history
+                interviewSessionId = null;
 
                 // Show Chat Interface, Hide Intro & Setup
                 if (activeState) activeState.classList.add('hidden');
@@ -1843,29 +1845,48 @@ function init() {
         try {
             // NEW: BLOCKING ARCHITECTURE (Quality Fix)
             const session = getSession();
-            const response = await fetch('/api/get-feedback', {
+            const fullPayload = {
+                message: message,
+                jobPosting: jobPosting,
+                resumeText: resumeText,
+                companyName: companyName,
+                interviewer_intel: interviewerIntel,
+                history: interviewHistory,
+                isStart: isStart,
+                questionCount: questionCount, // Align with 0-index based turns
+                email: email,
+                voice: voice,
+                role_title: isStart ? jobData.role : undefined,
+                company_name: isStart ? jobData.company : undefined,
+                role_summary: isStart ? jobData.summary : undefined
+            };
+            const postFeedback = (payload) => fetch('/api/get-feedback', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                     'Authorization': `Bearer ${session?.access_token}`
                 },
-                body: JSON.stringify({
-                    message: message,
-                    jobPosting: jobPosting,
-                    resumeText: resumeText,
-                    companyName: companyName,
-                    interviewer_intel: interviewerIntel,
-                    history: interviewHistory,
-                    isStart: isStart,
-                    questionCount: questionCount, // Align with 0-index based turns
-                    email: email,
-                    voice: voice,
-                    role_title: isStart ? jobData.role : undefined,
-                    company_name: isStart ? jobData.company : undefined,
-                    role_summary: isStart ? jobData.summary : undefined
-                })
+                body: JSON.stringify(payload)
             });
 
+            // Server keeps JD/resume/history for the session: only send the new answer
+            let response = (!isStart && interviewSessionId)
+                ? await postFeedback({ session_id: interviewSessionId, message: message, questionCount: questionCount, email: email, voice: voice })
+                : await postFeedback(fullPayload);
+            if (response.status === 410) {
+                // Session expired (or served by another node): resend the full context once
+                interviewSessionId = null;
+                response = await postFeedback(fullPayload);
+            }
+            if (response.status === 503) {
+                // Provider too slow for the server's time budget: nothing was recorded, retry once
+                const retryAfter = parseInt(response.headers.get('Retry-After') || '2', 10);
+                await new Promise(resolve => setTimeout(resolve, retryAfter * 1000));
+                response = (!isStart && interviewSessionId)
+                    ? await postFeedback({ session_id: interviewSessionId, message: message, questionCount: questionCount, email: email, voice: voice })
+                    : await postFeedback(fullPayload);
+            }
+
             // Clear Thinking UI
             hideThinkingState();
 
@@ -1875,6 +1896,7 @@ function init() {
             }
 
             const data = await response.json();
+            if (data.session_id) interviewSessionId = data.session_id;
 
             // MEMORY PATCH: Update History
             if (message && lastAiQuestion) {
@@ -2009,6 +2031,9 @@ function init() {
                 } catch (e) {
                     console.error("Audio setup error:", e);
                 }
+            } else if (data.audio_pending && data.audio_url) {
+                // Audio was deferred to stay inside the server's time budget: fetch it when ready
+                playPendingAudio(data.audio_url);
             } else {
                 console.warn("[Audio] No audio returned from backend.");
             }
@@ -2022,6 +2047,25 @@ function init() {
         }
     }
 
+    async function playPendingAudio(url, attempts = 20) {
+        for (let i = 0; i < attempts; i++) {
+            const res = await fetch(url);
+            if (res.status === 202) {
+                const retryAfter = parseInt(res.headers.get('Retry-After') || '1', 10);
+                await new Promise(resolve => setTimeout(resolve, retryAfter * 1000));
+                continue;
+            }
+            if (!res.ok) break;
+            const audio = new Audio(URL.createObjectURL(await res.blob()));
+            audio.play().catch(e => {
+                console.error("Deferred audio playback failed:", e);
+                addMessage(`<button onclick="this.nextElementSibling.play()" class="text-xs bg-blue-500 text-white px-2 py-1 rounded mt-2">Could not autoplay. Click to hear.</button><audio src="${audio.src}"></audio>`, 'system', true);
+            });
+            return;
+        }
+        console.warn("[Audio] Deferred audio never arrived.");
+    }
+
     async function generateInterviewReport(existingReport = null, existingScore = 0) {
         const loadingId = addMessage('Saving Final Executive Coaching Report...', 'system');
 
@@ -0,0 +1,22 @@
+-- Create ai_jobs table (background AI job queue, JOB_QUEUE_BACKEND=supabase)
+-- Rows are written by the API with the service role key; clients poll /api/tasks/<job_id>.
+-- Times are epoch seconds so workers can compare-and-swap on updated_at.
+CREATE TABLE IF NOT EXISTS public.ai_jobs (
+    job_id TEXT PRIMARY KEY,                 -- sha256(owner | action | idempotency key)
+    action TEXT NOT NULL,
+    owner TEXT,                              -- user id, NULL for guests
+    status TEXT NOT NULL CHECK (status IN ('queued', 'running', 'done', 'failed')),
+    result JSONB,                            -- {"status_code": ..., "body": ...}
+    error TEXT,
+    created_at DOUBLE PRECISION NOT NULL,
+    updated_at DOUBLE PRECISION NOT NULL,
+    expires_at DOUBLE PRECISION NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_jobs_expires_at ON public.ai_jobs(expires_at);
+
+-- Enable RLS with no policies: only the service role (which bypasses RLS) can touch it
+ALTER TABLE public.ai_jobs ENABLE ROW LEVEL SECURITY;
+
+-- Optional cleanup (run from a scheduled job):
+-- DELETE FROM public.ai_jobs WHERE expires_at < EXTRACT(EPOCH FROM NOW());
@@ -0,0 +1,17 @@
+-- Create interview_sessions table (server-side interview turn state, INTERVIEW_SESSION_BACKEND=supabase)
+-- Written by the API with the service role key; the session id itself is the bearer secret.
+CREATE TABLE IF NOT EXISTS public.interview_sessions (
+    id TEXT PRIMARY KEY,
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
+    data JSONB NOT NULL,                     -- context (JD, resume, archetype) + per-turn history
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_interview_sessions_expires_at ON public.interview_sessions(expires_at);
+
+-- Enable RLS with no policies: only the service role (which bypasses RLS) can touch it
+ALTER TABLE public.interview_sessions ENABLE ROW LEVEL SECURITY;
+
+-- Optional cleanup (run from a scheduled job):
+-- DELETE FROM public.interview_sessions WHERE expires_at < NOW();
@@ -0,0 +1,17 @@
+-- Create llm_cache table (shared LLM response cache, LLM_CACHE_BACKEND=supabase)
+-- Rows are written by the API with the service role key; clients never read it directly.
+CREATE TABLE IF NOT EXISTS public.llm_cache (
+    cache_key TEXT PRIMARY KEY,              -- sha256(action | model | prompt version | normalized inputs)
+    action TEXT NOT NULL,
+    value JSONB NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON public.llm_cache(expires_at);
+
+-- Enable RLS with no policies: only the service role (which bypasses RLS) can touch it
+ALTER TABLE public.llm_cache ENABLE ROW LEVEL SECURITY;
+
+-- Optional cleanup (run from a scheduled job):
+-- DELETE FROM public.llm_cache WHERE expires_at < NOW();
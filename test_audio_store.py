@@ -0,0 +1,82 @@
+import os
+import time
+from types import SimpleNamespace
+from api.audio_store import AudioStore
+from api.tts_cache import TTSCache
+
+AUDIO = bytes(range(256)) * 4
+
+def test_put_locate_and_expiry(tmp_path):
+    store = AudioStore(directory=str(tmp_path), ttl=60)
+    artifact_id = store.put([AUDIO[:500], AUDIO[500:]])
+    path, mime, left = store.locate(artifact_id)
+    assert mime == "audio/mpeg" and 0 < left <= 60
+    with open(path, "rb") as f:
+        assert f.read() == AUDIO
+    # Age the file past its TTL
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert store.locate(artifact_id) is None
+    assert not os.path.exists(path)
+    assert store.locate("../../etc/passwd") is None
+
+def test_sweep_evicts_expired_and_oversize(tmp_path):
+    store = AudioStore(directory=str(tmp_path), ttl=60, max_bytes=2500, sweep_interval=0)
+    stale_id = store.put(AUDIO)
+    old = time.time() - 120
+    os.utime(store.locate(stale_id)[0], (old, old))
+    for _ in range(3):
+        store.put(AUDIO)
+    remaining = [n for n in os.listdir(tmp_path) if n.endswith(".mp3")]
+    assert len(remaining) == 2
+    assert store.stats()["expired"] >= 1 and store.stats()["evicted"] >= 1
+
+def test_audio_route_supports_ranges(tmp_path, monkeypatch):
+    import api.index as index
+    store = AudioStore(directory=str(tmp_path), ttl=60)
+    monkeypatch.setattr(index, "audio_store", store)
+    artifact_id = store.put(AUDIO)
+    client = index.app.test_client()
+
+    full = client.get(f"/api/audio/{artifact_id}")
+    assert full.status_code == 200
+    assert full.headers["Content-Type"] == "audio/mpeg"
+    assert full.headers["Content-Length"] == str(len(AUDIO))
+    assert full.headers["Accept-Ranges"] == "bytes"
+    assert "max-age" in full.headers["Cache-Control"]
+    assert full.data == AUDIO
+
+    part = client.get(f"/api/audio/{artifact_id}", headers={"Range": "bytes=100-199"})
+    assert part.status_code == 206
+    assert part.headers["Content-Range"] == f"bytes 100-199/{len(AUDIO)}"
+    assert part.data == AUDIO[100:200]
+
+    assert client.get("/api/audio/does-not-exist-0000").status_code == 404
+
+def test_get_feedback_returns_url_only(tmp_path, monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    reply = '{"feedback": "", "checklist": {}, "next_question": "Hello, and welcome. Walk me through your background."}'
+    fake = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kw: SimpleNamespace(
+            usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=reply))]))),
+        audio=SimpleNamespace(speech=SimpleNamespace(create=lambda **kw: SimpleNamespace(content=b"MP3:" + kw["input"].encode())))
+    )
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    monkeypatch.setattr(index, "audio_store", AudioStore(directory=str(tmp_path), ttl=60))
+    client = index.app.test_client()
+    res = client.post('/api/get-feedback', json={"message": "start", "isStart": True, "questionCount": 1, "audio_delivery": "url"})
+    body = res.get_json()
+    assert res.status_code == 200
+    assert body["audio"] is None
+    assert body["audio_url"].startswith("/api/audio/")
+    audio = client.get(body["audio_url"]).data
+    assert audio.startswith(b"MP3:Hello, and welcome.")
+    assert b"Walk me through your background" in audio
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_put_locate_and_expiry(pathlib.Path(tempfile.mkdtemp()))
+    test_sweep_evicts_expired_and_oversize(pathlib.Path(tempfile.mkdtemp()))
+    print("✅ Audio store tests passed")
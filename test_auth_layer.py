@@ -0,0 +1,85 @@
+import os
+import json
+import time
+import hmac
+import base64
+import hashlib
+from flask import Flask, jsonify
+from api.auth_layer import AuthLayer
+
+SECRET = "test-jwt-secret"
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def make_token(sub="user-123", email="jane@example.com", exp_in=3600, aud="authenticated", secret=SECRET):
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64(json.dumps({"sub": sub, "email": email, "aud": aud, "role": "authenticated", "exp": int(time.time()) + exp_in}).encode())
+    sig = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(sig)}"
+
+class FakeUser:
+    id = "remote-user"
+    email = "remote@example.com"
+    app_metadata = {}
+
+def test_local_verification_and_cache():
+    os.environ["SUPABASE_JWT_SECRET"] = SECRET
+    remote_calls = []
+    layer = AuthLayer(remote_lookup=lambda t: remote_calls.append(t) or FakeUser())
+    token = make_token()
+    principal = layer.resolve(token)
+    assert principal.id == "user-123"
+    assert principal.email == "jane@example.com"
+    assert layer.resolve(token) is principal
+    stats = layer.stats()
+    assert stats["local"] == 1 and stats["hits"] == 1
+    assert remote_calls == []
+
+def test_rejects_bad_tokens():
+    os.environ["SUPABASE_JWT_SECRET"] = SECRET
+    layer = AuthLayer(remote_lookup=lambda t: FakeUser())
+    assert layer.resolve(make_token(secret="wrong-secret")) is None
+    assert layer.resolve(make_token(exp_in=-3600)) is None
+    assert layer.resolve(make_token(aud="anon")) is None
+    assert layer.resolve("not-a-jwt") is None
+    assert layer.stats()["remote"] == 0
+
+def test_remote_fallback_without_secret():
+    os.environ.pop("SUPABASE_JWT_SECRET", None)
+    layer = AuthLayer(remote_lookup=lambda t: FakeUser())
+    principal = layer.resolve(make_token())
+    assert principal.id == "remote-user"
+    assert principal.source == "remote"
+
+def test_lru_is_bounded():
+    os.environ["SUPABASE_JWT_SECRET"] = SECRET
+    layer = AuthLayer(max_entries=3)
+    for i in range(5):
+        layer.resolve(make_token(sub=f"user-{i}"))
+    assert layer.stats()["entries"] == 3
+
+def test_require_user_decorator():
+    os.environ["SUPABASE_JWT_SECRET"] = SECRET
+    layer = AuthLayer()
+    app = Flask(__name__)
+
+    @app.route("/private")
+    @layer.require_user
+    def private():
+        return jsonify({"id": layer.current_user().id})
+
+    client = app.test_client()
+    assert client.get("/private").status_code == 401
+    assert client.get("/private", headers={"Authorization": "Bearer junk"}).status_code == 401
+    res = client.get("/private", headers={"Authorization": f"Bearer {make_token()}"})
+    assert res.status_code == 200
+    assert res.get_json()["id"] == "user-123"
+
+if __name__ == "__main__":
+    test_local_verification_and_cache()
+    test_rejects_bad_tokens()
+    test_remote_fallback_without_secret()
+    test_lru_is_bounded()
+    test_require_user_decorator()
+    print("✅ Auth layer tests passed")
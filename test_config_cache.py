@@ -0,0 +1,65 @@
+import json
+from api.config_cache import ConfigCache, MISSING
+
+def make_cache(rows, ttl=60.0):
+    calls = []
+    def loader(namespace, key):
+        calls.append((namespace, key))
+        return rows.get((namespace, key), MISSING)
+    def writer(namespace, key, value):
+        rows[(namespace, key)] = value
+        return "written"
+    return ConfigCache(loader=loader, writer=writer, ttl=ttl, channel_url=""), calls
+
+def test_reads_hit_memory_after_first_load():
+    cache, calls = make_cache({("admin_settings", "feature_flags"): {"labs": True}})
+    assert cache.get("admin_settings", "feature_flags") == {"labs": True}
+    assert cache.get("admin_settings", "feature_flags") == {"labs": True}
+    # Missing rows are cached as well
+    assert cache.get("system_configs", "support_bot_prompt", "fallback") == "fallback"
+    assert cache.get("system_configs", "support_bot_prompt", "fallback") == "fallback"
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 2
+
+def test_ttl_expiry_reloads():
+    cache, calls = make_cache({("admin_settings", "promo_settings"): {"free_interview": True}}, ttl=0)
+    cache.get("admin_settings", "promo_settings")
+    cache.get("admin_settings", "promo_settings")
+    assert len(calls) == 2
+
+def test_write_through_updates_memory_and_version():
+    rows = {("system_configs", "lab_assistant_prompt"): "old"}
+    cache, calls = make_cache(rows)
+    assert cache.get("system_configs", "lab_assistant_prompt") == "old"
+    assert cache.set("system_configs", "lab_assistant_prompt", "new") == "written"
+    assert rows[("system_configs", "lab_assistant_prompt")] == "new"
+    assert cache.get("system_configs", "lab_assistant_prompt") == "new"
+    assert cache.version("system_configs", "lab_assistant_prompt") == 1
+    assert len(calls) == 1
+
+def test_stale_load_does_not_overwrite_newer_write():
+    rows = {}
+    cache = None
+    def slow_loader(namespace, key):
+        # An admin write lands while this read is in flight
+        cache.set(namespace, key, "fresh")
+        return "stale"
+    cache = ConfigCache(loader=slow_loader, writer=lambda n, k, v: None, ttl=60.0, channel_url="")
+    cache.get("admin_settings", "notification_settings")
+    assert cache.get("admin_settings", "notification_settings") == "fresh"
+
+def test_remote_invalidation_message():
+    cache, calls = make_cache({("admin_settings", "feature_flags"): {}})
+    cache.get("admin_settings", "feature_flags")
+    cache.handle_message(json.dumps({"origin": "other-worker", "namespace": "admin_settings", "key": "feature_flags", "version": 3}))
+    cache.get("admin_settings", "feature_flags")
+    assert len(calls) == 2
+    assert cache.stats()["remote_invalidations"] == 1
+
+if __name__ == "__main__":
+    test_reads_hit_memory_after_first_load()
+    test_ttl_expiry_reloads()
+    test_write_through_updates_memory_and_version()
+    test_stale_load_does_not_overwrite_newer_write()
+    test_remote_invalidation_message()
+    print("✅ Config cache tests passed")
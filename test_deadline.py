@@ -0,0 +1,132 @@
+import os
+import time
+import json
+import pytest
+from types import SimpleNamespace
+from api.deadline import Deadline, DeadlineExceeded
+from api.audio_store import AudioStore
+from api.tts_cache import TTSCache
+
+def test_deadline_budget_and_clamp():
+    now = [100.0]
+    deadline = Deadline(10.0, clock=lambda: now[0])
+    now[0] += 4.0
+    assert deadline.remaining() == 6.0 and deadline.remaining(reserve=2.0) == 4.0
+    assert deadline.allows(5.0) and not deadline.allows(5.0, reserve=2.0)
+    assert deadline.clamp(45.0) == 6.0 and deadline.clamp(3.0) == 3.0
+    now[0] += 10.0
+    assert deadline.remaining() == 0.0 and deadline.clamp(45.0) == 0.5
+    deadline.mark("llm")
+    assert deadline.summary()["stages"] == {"llm": 14.0}
+
+def test_reserved_audio_is_pending_until_put(tmp_path):
+    store = AudioStore(directory=str(tmp_path), ttl=60)
+    artifact_id = store.reserve()
+    assert store.is_pending(artifact_id) and store.locate(artifact_id) is None
+    assert store.put([b"MP3"], artifact_id=artifact_id) == artifact_id
+    assert not store.is_pending(artifact_id) and store.locate(artifact_id) is not None
+    other = store.reserve()
+    store.release(other)
+    assert not store.is_pending(other)
+
+def test_turn_completion_retries_once_on_fallback_model():
+    import api.index as index
+    models = []
+    def create(**kwargs):
+        models.append(kwargs["model"])
+        if len(models) == 1:
+            raise TimeoutError("read timed out")
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content='{"feedback": "ok"}'))])
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    turn = {"model": "gpt-4o", "messages": [], "real_q_num": 8}
+    assert index.turn_completion(client, turn, Deadline(30.0)) == '{"feedback": "ok"}'
+    assert models == ["gpt-4o", index.TURN_FALLBACK_MODEL]
+    # No room for the retry: give up instead of running past the budget
+    models.clear()
+    with pytest.raises(DeadlineExceeded):
+        index.turn_completion(client, turn, Deadline(index.TURN_RETRY_MIN_SECONDS))
+    assert models == ["gpt-4o"]
+
+def test_capped_turn_that_hits_the_cap_is_retried_uncapped():
+    import api.index as index
+    calls = []
+    def create(**kwargs):
+        calls.append(kwargs)
+        reason = "length" if kwargs.get("max_tokens") else "stop"
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(finish_reason=reason, message=SimpleNamespace(content='{"feedback": "ok"}'))])
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    turn = {"model": "gpt-4o-mini", "max_tokens": 50, "messages": [], "real_q_num": 3}
+    assert index.turn_completion(client, turn, Deadline(30.0)) == '{"feedback": "ok"}'
+    assert [c.get("max_tokens") for c in calls] == [50, None]
+
+def fake_client(reply, speech_delay=0.0):
+    def speak(**kw):
+        time.sleep(speech_delay)
+        return SimpleNamespace(content=b"MP3:" + kw["input"].encode())
+    def create(**kwargs):
+        if reply is None:
+            raise TimeoutError("read timed out")
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+        audio=SimpleNamespace(speech=SimpleNamespace(create=speak))
+    )
+
+def test_slow_tts_returns_text_with_pending_audio(tmp_path, monkeypatch):
+    import api.index as index
+    from api.job_queue import JobQueue, MemoryJobBackend
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    reply = {"feedback": "Clear structure.", "checklist": {"star_action": True}, "next_question": "Tell me about a failure."}
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake_client(reply, speech_delay=0.5))
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    monkeypatch.setattr(index, "audio_store", AudioStore(directory=str(tmp_path / "a"), ttl=60))
+    shared = MemoryJobBackend()
+    monkeypatch.setattr(index, "job_queue", JobQueue(backend=shared))
+    monkeypatch.setattr(index, "TURN_BUDGET", 1.2)
+    client = index.app.test_client()
+    started = time.monotonic()
+    res = client.post('/api/get-feedback', json={"message": "I led the team through a migration.", "questionCount": 2, "history": []})
+    assert time.monotonic() - started < 1.2
+    body = res.get_json()
+    assert res.status_code == 200 and body["audio_pending"] is True and body["audio"] is None
+    assert body["response"]["next_question"] == "Tell me about a failure."
+    # The poll lands on another instance: empty audio store and TTS cache, same job table
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    monkeypatch.setattr(index, "audio_store", AudioStore(directory=str(tmp_path / "b"), ttl=60))
+    monkeypatch.setattr(index, "job_queue", JobQueue(backend=shared))
+    monkeypatch.setattr(index, "DEFERRED_AUDIO_WAIT", 0.1)
+    assert client.get(body["audio_url"]).status_code == 202
+    monkeypatch.setattr(index, "DEFERRED_AUDIO_WAIT", 5.0)
+    audio = client.get(body["audio_url"])
+    assert audio.status_code == 200 and audio.data.startswith(b"MP3:Feedback:")
+    assert client.get(body["audio_url"]).data == audio.data
+    assert client.get('/api/audio/' + "x" * 32).status_code == 404
+
+def test_failed_tts_still_answers_the_turn(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    reply = {"feedback": "Clear structure.", "checklist": {"star_action": True}, "next_question": "Tell me about a failure."}
+    broken = fake_client(reply)
+    def speak(**kw):
+        raise RuntimeError("APITimeoutError: Request timed out.")
+    broken.audio.speech.create = speak
+    monkeypatch.setattr(index, "get_openai_client", lambda: broken)
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    res = index.app.test_client().post('/api/get-feedback', json={"message": "I led the team through a migration.", "questionCount": 2, "history": []})
+    body = res.get_json()
+    assert res.status_code == 200 and body["audio"] is None and "audio_pending" not in body
+    assert body["response"]["next_question"] == "Tell me about a failure."
+
+def test_slow_provider_is_a_retryable_503(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake_client(None))
+    res = index.app.test_client().post('/api/get-feedback', json={"message": "I led the team.", "questionCount": 2, "history": []})
+    assert res.status_code == 503
+    assert res.get_json()["retryable"] is True and res.headers["Retry-After"] == "2"
+
+if __name__ == "__main__":
+    test_deadline_budget_and_clamp()
+    test_turn_completion_retries_once_on_fallback_model()
+    test_capped_turn_that_hits_the_cap_is_retried_uncapped()
+    print("✅ Deadline tests passed")
@@ -0,0 +1,58 @@
+import os
+from types import SimpleNamespace
+from api.interview_sessions import SessionStore
+from api.speech_pipeline import segment_text
+from api.tts_cache import TTSCache
+
+def test_opening_text_personalizes_only_the_greeting():
+    import api.index as index
+    scripted = f"{index.OPENING_GREETING} {index.OPENING_OVERVIEW} {index.OPENING_QUESTION}"
+    assert index.opening_text({}) == scripted
+    assert index.opening_text({"role_title": "this role", "company_name": "the company"}) == scripted
+    text = index.opening_text({"role_title": "Senior  PM", "company_name": "Acme Corp."})
+    assert "I am the Hiring Manager for the Senior PM position at Acme Corp." in text
+    assert "for the position at Acme." in index.opening_text({"companyName": "Acme", "role_title": "x" * 200})
+    # Everything but the personalized sentence is served from pinned (cached) audio
+    pinned = index.speech_pipeline.pinned
+    fresh = [s for s in segment_text(text, pinned=pinned) if s not in pinned]
+    assert fresh == ["I am the Hiring Manager for the Senior PM position at Acme Corp."]
+
+def test_start_turn_skips_the_model(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    calls = []
+    def create(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("no model call expected")
+    fake = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+        audio=SimpleNamespace(speech=SimpleNamespace(create=lambda **kw: SimpleNamespace(content=b"MP3")))
+    )
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    store = SessionStore(ttl=60)
+    monkeypatch.setattr(index, "interview_sessions", store)
+    monkeypatch.setattr(index, "QUESTION_PLAN_ENABLED", False)
+    client = index.app.test_client()
+    payload = {"message": "I am ready to begin the interview. Please start.", "isStart": True, "questionCount": 1,
+               "role_title": "Director of Operations", "company_name": "Acme"}
+
+    res = client.post('/api/get-feedback', json=payload).get_json()
+    assert calls == []
+    assert res["response"]["next_question"] == index.opening_text(payload)
+    assert res["response"]["feedback"] == "" and res["response"]["internal_score"] == 0
+    assert res["audio"]
+    # The session exists once the opening is recorded, with Q1 as the pending question
+    session = store.get(res["session_id"])
+    assert session["last_question"] == index.opening_text(payload)
+    assert session["next_question_count"] == 2
+
+    stream = client.post('/api/get-feedback', json={**payload, "stream": True}).get_data(as_text=True)
+    events = [frame.split("\n")[0][len("event: "):] for frame in stream.split("\n\n") if frame.startswith("event")]
+    assert calls == []
+    assert "next_question" in events and events[-1] == "done"
+    assert store.stats()["created"] == 2
+
+if __name__ == "__main__":
+    test_opening_text_personalizes_only_the_greeting()
+    print("✅ Interview opening tests passed")
@@ -0,0 +1,88 @@
+import os
+import json
+from types import SimpleNamespace
+from api.interview_sessions import SessionStore, MemorySessionBackend, SQLiteSessionBackend
+from api.tts_cache import TTSCache
+
+def test_memory_backend_ttl_and_lru():
+    backend = MemorySessionBackend(max_sessions=2)
+    store = SessionStore(backend=backend, ttl=60)
+    a = store.create({"job_posting": "JD"})
+    b = store.create({"job_posting": "JD"})
+    store.get(a["id"])  # a is now most recently used
+    store.create({"job_posting": "JD"})
+    assert store.get(b["id"]) is None and store.get(a["id"]) is not None
+    store.ttl = -1
+    store.save(a)
+    assert store.get(a["id"]) is None
+
+def test_record_turn_mirrors_client_history(tmp_path):
+    store = SessionStore(backend=SQLiteSessionBackend(str(tmp_path / "s.sqlite3")), ttl=60)
+    session = store.create({"job_posting": "JD"}, user_id="u1", question_count=0)
+    store.record_turn(session, 0, "", {"feedback": "", "next_question": "Walk me through your background."})
+    loaded = store.get(session["id"], "u1")
+    assert loaded["history"] == [] and loaded["next_question_count"] == 1
+    store.record_turn(loaded, 1, "I led a team of 5.", {"feedback": "Good", "internal_score": 3, "next_question": "Q2"})
+    loaded = store.get(session["id"], "u1")
+    assert loaded["history"] == [{"question": "Walk me through your background.", "answer": "I led a team of 5.", "feedback": "Good", "internal_score": 3}]
+    assert loaded["last_question"] == "Q2" and loaded["next_question_count"] == 2
+    # Another user cannot load it, and neither can an anonymous caller
+    assert store.get(session["id"], "u2") is None
+    assert store.get(session["id"], None) is None
+    anonymous = store.create({"job_posting": "JD"}, user_id=None, question_count=0)
+    assert store.get(anonymous["id"], None)["id"] == anonymous["id"]
+
+def test_turns_send_only_session_id(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    prompts = []
+    replies = iter([
+        {"feedback": "", "checklist": {}, "next_question": "Walk me through your background."},
+        {"feedback": "Solid overview.", "checklist": {"star_action": True, "star_result": True}, "next_question": "Tell me about a conflict."},
+    ])
+    def create(**kwargs):
+        prompts.append(kwargs["messages"])
+        content = json.dumps(next(replies))
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    fake = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+        audio=SimpleNamespace(speech=SimpleNamespace(create=lambda **kw: SimpleNamespace(content=b"MP3")))
+    )
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    store = SessionStore(ttl=60)
+    monkeypatch.setattr(index, "interview_sessions", store)
+    monkeypatch.setattr(index, "QUESTION_PLAN_ENABLED", False)
+    monkeypatch.setattr(index, "OPENING_FAST_PATH", False)
+    monkeypatch.setattr(index, "RESUME_DIGEST_ENABLED", False)
+    client = index.app.test_client()
+
+    start = client.post('/api/get-feedback', json={
+        "message": "start", "isStart": True, "questionCount": 1,
+        "jobPosting": "Head of Hospitality at Grand Hotel", "resumeText": "Ran guest services for 10 years.",
+        "job_title": "Director of Guest Experience"
+    }).get_json()
+    session_id = start["session_id"]
+
+    answer = "I ran guest services for ten years across three hotels and grew satisfaction scores by twenty percent."
+    res = client.post('/api/get-feedback', json={"session_id": session_id, "message": answer})
+    assert res.status_code == 200
+    assert res.get_json()["session_id"] == session_id
+    system_prompt = prompts[1][0]["content"]
+    assert "Head of Hospitality at Grand Hotel" in system_prompt
+    assert "Ran guest services for 10 years." in system_prompt
+    assert "The Guardian" in system_prompt and "Vision, Culture, & ROI Dominance" in system_prompt
+    assert "EXACTLY Question 2 of 6" in system_prompt
+
+    session = store.get(session_id)
+    assert session["history"][0]["question"] == "Walk me through your background."
+    assert session["history"][0]["answer"] == answer
+    assert session["history"][0]["internal_score"] > 0
+    assert session["next_question_count"] == 3
+
+    gone = client.post('/api/get-feedback', json={"session_id": "unknown-session-id-000", "message": answer})
+    assert gone.status_code == 410 and gone.get_json()["session_expired"] is True
+
+if __name__ == "__main__":
+    test_memory_backend_ttl_and_lru()
+    print("✅ Interview session tests passed")
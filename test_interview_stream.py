@@ -0,0 +1,94 @@
+import os
+import json
+from types import SimpleNamespace
+from api.interview_stream import JsonFieldStreamer, sse_event
+from api.tts_cache import TTSCache
+
+TURN_JSON = json.dumps({
+    "feedback": "✅ What Worked: Clear \"STAR\" structure.\n💡 To Strengthen: add numbers.",
+    "checklist": {"relevant_history": True, "star_situation": True, "star_action": True, "star_result": True, "has_metrics": False, "delivery_organized": True, "red_flags": False},
+    "next_question": "The next question that I have for you is... tell me about a conflict.",
+    "confidence": 0.9
+})
+
+def chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_streamer_extracts_fields_incrementally():
+    deltas, completed = [], {}
+    streamer = JsonFieldStreamer(
+        on_delta=lambda k, t: deltas.append((k, t)),
+        on_complete=lambda k, v: completed.__setitem__(k, v)
+    )
+    for piece in chunks(TURN_JSON):
+        streamer.feed(piece)
+    expected = json.loads(TURN_JSON)
+    assert streamer.done
+    assert completed == expected
+    assert "".join(t for k, t in deltas if k == "feedback") == expected["feedback"]
+    # Many small deltas, not one blob at the end
+    assert len([d for d in deltas if d[0] == "feedback"]) > 5
+
+def test_streamer_handles_unicode_escapes():
+    raw = json.dumps({"feedback": "Great work 🚀 café"}, ensure_ascii=True)
+    text = []
+    streamer = JsonFieldStreamer(on_delta=lambda k, t: text.append(t))
+    for ch in raw:
+        streamer.feed(ch)
+    assert "".join(text) == "Great work 🚀 café"
+
+def test_sse_frame_format():
+    frame = sse_event("feedback_delta", {"text": "line one\nline two"})
+    assert frame.startswith("event: feedback_delta\ndata: ")
+    assert frame.endswith("\n\n")
+    assert frame.count("\n") == 3
+
+class FakeCompletions:
+    def create(self, **kwargs):
+        assert kwargs.get("stream") is True
+        return iter([SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=c))]) for c in chunks(TURN_JSON)])
+
+class FakeSpeech:
+    def create(self, **kwargs):
+        return SimpleNamespace(content=b"ID3fake-mp3")
+
+def test_get_feedback_stream_mode(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    fake = SimpleNamespace(
+        chat=SimpleNamespace(completions=FakeCompletions()),
+        audio=SimpleNamespace(speech=FakeSpeech())
+    )
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    client = index.app.test_client()
+    res = client.post('/api/get-feedback', json={
+        "message": "I led a migration of 300 servers that cut costs for the whole team and finished early.",
+        "questionCount": 2,
+        "history": [],
+        "stream": True
+    })
+    assert res.mimetype == "text/event-stream"
+    events = []
+    for frame in res.get_data(as_text=True).split("\n\n"):
+        lines = dict(l.split(": ", 1) for l in frame.split("\n") if l.startswith(("event", "data")))
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    names = [e[0] for e in events]
+    assert names.index("feedback_delta") < names.index("score") < names.index("next_question") < names.index("response")
+    assert names[-1] == "done"
+    final = dict(events)["response"]
+    assert final["response"]["internal_score"] == dict(events)["score"]["internal_score"]
+    assert final["is_complete"] is False
+    # Speculative sentence audio matches the final speech text (no resets) and arrives in order
+    audio = [data for name, data in events if name == "audio"]
+    assert "audio_reset" not in names
+    assert [a["index"] for a in audio] == list(range(len(audio)))
+    assert len(audio) == dict(events)["done"]["audio_segments"] > 1
+    assert audio[0]["text"].startswith("Feedback: ✅ What Worked")
+
+if __name__ == "__main__":
+    test_streamer_extracts_fields_incrementally()
+    test_streamer_handles_unicode_escapes()
+    test_sse_frame_format()
+    print("✅ Interview stream tests passed")
@@ -0,0 +1,82 @@
+import os
+import time
+import threading
+from types import SimpleNamespace
+from api.job_queue import JobQueue, MemoryJobBackend, SQLiteJobBackend
+
+def wait_done(queue, job_id, owner=None, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id, owner)
+        if job and job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+def test_submit_is_idempotent_and_failed_jobs_rerun(tmp_path):
+    for backend in (MemoryJobBackend(), SQLiteJobBackend(path=str(tmp_path / "jobs.sqlite3"))):
+        queue = JobQueue(backend=backend, max_workers=2)
+        calls = []
+        release = threading.Event()
+        def run():
+            calls.append(1)
+            release.wait(2)
+            return {"status_code": 200, "body": {"data": "ok"}}
+        job, created = queue.submit("optimize", {"resume_text": "A"}, run, owner="u1")
+        again, created_again = queue.submit("optimize", {"resume_text": "A "}, run, owner="u1")
+        assert created and not created_again and again["job_id"] == job["job_id"]
+        release.set()
+        assert wait_done(queue, job["job_id"], "u1")["result"]["body"] == {"data": "ok"}
+        assert len(calls) == 1
+        # Other users never see it; a different payload is a different job
+        assert queue.get(job["job_id"], "u2") is None
+        assert queue.submit("optimize", {"resume_text": "B"}, run, owner="u1")[1]
+
+        def boom():
+            raise RuntimeError("provider down")
+        failed, _ = queue.submit("cover_letter", {"x": 1}, boom, key="k1")
+        assert wait_done(queue, failed["job_id"])["error"] == "provider down"
+        retry, created = queue.submit("cover_letter", {"x": 1}, run, key="k1")
+        assert created and retry["job_id"] == failed["job_id"]
+        assert wait_done(queue, retry["job_id"])["status"] == "done"
+
+def test_stale_running_job_is_reclaimed():
+    backend = MemoryJobBackend()
+    queue = JobQueue(backend=backend, stale_after=0)
+    job, _ = queue.submit("optimize", {"a": 1}, lambda: time.sleep(0.2) or {"status_code": 200, "body": {}})
+    time.sleep(0.01)
+    # The owning worker stopped heartbeating (stale_after=0): a resubmit starts it over
+    assert queue.submit("optimize", {"a": 1}, lambda: {"status_code": 200, "body": {}})[1]
+
+def test_async_api_action_returns_job_and_result(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    calls = []
+    def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content="Dear Hiring Manager,"))])
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    queue = JobQueue(backend=MemoryJobBackend(), max_workers=2)
+    monkeypatch.setattr(index, "job_queue", queue)
+    client = index.app.test_client()
+    payload = {"action": "cover_letter", "resume": "Ten years in ops.", "jobDesc": "Ops lead", "async": True}
+
+    res = client.post('/api', json=payload)
+    assert res.status_code == 202
+    body = res.get_json()
+    assert body["status"] == "queued" and body["result_url"] == f"/api/tasks/{body['job_id']}/result"
+    assert client.post('/api', json=payload).get_json()["job_id"] == body["job_id"]
+    wait_done(queue, body["job_id"])
+    result = client.get(body["result_url"])
+    assert result.status_code == 200 and "Dear Hiring Manager," in str(result.get_json())
+    assert len(calls) == 1
+    assert client.get(body["status_url"]).get_json()["status"] == "done"
+    assert client.get('/api/tasks/missing/result').status_code == 404
+    assert client.post('/api/tasks', json={"action": "parse_resume"}).status_code == 400
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_submit_is_idempotent_and_failed_jobs_rerun(pathlib.Path(tempfile.mkdtemp()))
+    test_stale_running_job_is_reclaimed()
+    print("✅ Job queue tests passed")
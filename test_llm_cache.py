@@ -0,0 +1,87 @@
+import os
+import time
+from types import SimpleNamespace
+from api.llm_cache import LLMCache, SQLiteBackend
+
+def test_key_normalizes_inputs_and_separates_versions():
+    a = LLMCache.key("analyze_jd", "gpt-4o", "v1", {"job_description": "Senior  PM\n at Acme "})
+    b = LLMCache.key("analyze_jd", "gpt-4o", "v1", {"job_description": "Senior PM at Acme"})
+    assert a == b
+    assert a != LLMCache.key("analyze_jd", "gpt-4o", "v2", {"job_description": "Senior PM at Acme"})
+    assert a != LLMCache.key("analyze_jd", "gpt-4o-mini", "v1", {"job_description": "Senior PM at Acme"})
+
+def test_lru_ttl_and_single_compute():
+    cache = LLMCache(max_entries=2, ttls={"analyze_jd": 60})
+    calls = []
+    compute = lambda: calls.append(1) or {"role": "PM"}
+    assert cache.get_or_compute("analyze_jd", "gpt-4o", "v1", "jd", compute) == ({"role": "PM"}, False)
+    assert cache.get_or_compute("analyze_jd", "gpt-4o", "v1", " jd ", compute) == ({"role": "PM"}, True)
+    assert len(calls) == 1
+    cache.put("analyze_jd", "gpt-4o", "v1", "b", 1)
+    cache.put("analyze_jd", "gpt-4o", "v1", "c", 2)
+    assert cache.get("analyze_jd", "gpt-4o", "v1", "jd") is None
+    cache.ttls["analyze_jd"] = -1
+    cache.put("analyze_jd", "gpt-4o", "v1", "d", 3)
+    assert cache.get("analyze_jd", "gpt-4o", "v1", "d") is None
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 1 and stats["evictions"] == 2
+    assert stats["by_action"]["analyze_jd"] == {"hits": 1, "misses": 1}
+
+def test_sqlite_backend_is_shared_across_workers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = LLMCache(backend=SQLiteBackend(path))
+    first.put("parse_resume", "gpt-4o", "v1", {"resume": "text"}, '{"personal": {}}')
+    second = LLMCache(backend=SQLiteBackend(path))
+    assert second.get("parse_resume", "gpt-4o", "v1", {"resume": "text"}) == '{"personal": {}}'
+    assert second.stats()["backend_hits"] == 1
+    # Expired rows are ignored
+    second.backend.set("k", "parse_resume", "old", time.time() - 1)
+    assert second.backend.get("k") is None
+
+def test_backend_errors_degrade_to_miss():
+    class Broken:
+        def get(self, key): raise RuntimeError("db down")
+        def set(self, *a): raise RuntimeError("db down")
+    cache = LLMCache(backend=Broken())
+    assert cache.get_or_compute("generate_intel", "gpt-4o", "v1", "jd", lambda: "intel") == ("intel", False)
+    assert cache.stats()["backend_errors"] == 2
+
+class FakeTable:
+    def __init__(self, log, name):
+        self.log, self.name = log, name
+    def insert(self, record):
+        self.log.append((self.name, record))
+        return self
+    def execute(self):
+        return SimpleNamespace(data=[])
+
+def test_guest_resume_scan_hits_cache_but_still_logs(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    calls, inserts = [], []
+    reply = '{"overall_score": 72, "keywords": {"missing": []}}'
+    def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
+    monkeypatch.setattr(index, "get_openai_client", lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    monkeypatch.setattr(index, "get_admin_supabase", lambda: SimpleNamespace(table=lambda name: FakeTable(inserts, name)))
+    monkeypatch.setattr(index, "llm_cache", LLMCache())
+    client = index.app.test_client()
+    payload = {"action": "analyze_resume", "resume": "Ten years leading product teams.", "job_description": "Head of Product"}
+    for _ in range(2):
+        res = client.post('/api', json=payload)
+        assert res.status_code == 200
+        assert res.get_json()["data"] == reply
+    assert len(calls) == 1
+    assert [name for name, _ in inserts] == ["guest_scans", "guest_scans"]
+    assert inserts[1][1]["overall_score"] == 72
+    # Two resumes trimmed to the same prompt copy still differ in the word_count the prompt reports
+    monkeypatch.setattr(index, "fit_prompt", lambda feature, **parts: {"resume": "Ten years leading product teams.", "jd": parts["jd"]})
+    client.post('/api', json=dict(payload, resume=payload["resume"] + " Older roles: analyst, associate."))
+    assert len(calls) == 2 and '"word_count": 9' in calls[1]["messages"][1]["content"]
+
+if __name__ == "__main__":
+    test_key_normalizes_inputs_and_separates_versions()
+    test_lru_ttl_and_single_compute()
+    test_backend_errors_degrade_to_miss()
+    print("✅ LLM cache tests passed")
@@ -0,0 +1,25 @@
+import os
+from api.llm_client import OpenAIClientHolder, ACTION_TIMEOUTS, DEFAULT_TIMEOUT
+
+def test_client_built_once_per_worker():
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    holder = OpenAIClientHolder()
+    first = holder.client()
+    assert holder.client() is first
+    assert holder.stats()["pool"]["initialized"] is True
+    holder.reset()
+    assert holder.stats()["pool"]["initialized"] is False
+
+def test_per_action_timeouts():
+    holder = OpenAIClientHolder()
+    report = holder.timeout_for("final_report")
+    assert report.read == ACTION_TIMEOUTS["final_report"][1]
+    assert report.connect == ACTION_TIMEOUTS["final_report"][0]
+    # Unknown actions fall back to the default budget
+    unknown = holder.timeout_for("not_a_real_action")
+    assert unknown.read == DEFAULT_TIMEOUT[1]
+
+if __name__ == "__main__":
+    test_client_built_once_per_worker()
+    test_per_action_timeouts()
+    print("✅ OpenAI client holder tests passed")
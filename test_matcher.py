@@ -0,0 +1,49 @@
+from api.matcher import Matcher, Vocabulary, PatternSet
+
+def test_whole_words_only():
+    action = Vocabulary(['used', 'led', 'worked on'])
+    result = Vocabulary(['done', 'worked', 'result'], inflect=('s', 'ed'))
+    assert action.hits("We focused on the called shots") == set()
+    assert result.hits("The project was abandoned") == set()
+    assert result.hits("Results came in; it resulted in DONE work") == {"result", "done"}
+    # A multi-word hit also credits the shorter term inside it, in the same pass
+    matcher = Matcher(action=action, result=result)
+    assert matcher.scan("I  worked\non the rollout") == {"action": {"worked on"}, "result": {"worked"}}
+    hits = matcher.find("I used it and got results")
+    assert [(h.vocabulary, h.term) for h in hits] == [("action", "used"), ("result", "result")]
+
+def test_labels_priority_and_batch():
+    tiers = Vocabulary({"vp": "exec", "manager": "mgmt", "head of": "mgmt"}, inflect=('s',))
+    assert tiers.first_label("VP, Product Managers", ("exec", "mgmt")) == "exec"
+    assert tiers.first_label("Headquarters staff", ("exec", "mgmt")) is None
+    assert tiers.batch(["Head of Ops", "Analyst"]) == [{"head of"}, set()]
+    metrics = PatternSet({"percent": r'\d+(\.\d+)?%', "dollars": r'\$\d+'})
+    assert metrics.matches("Cut $40 and 12.5% waste") == ["dollars", "percent"]
+    assert metrics.batch(["no numbers", "up 5%"]) == [False, True]
+
+def test_index_classifiers_use_word_boundaries():
+    import api.index as index
+    assert index.classify_job_title("Account Executive") == "Executive"
+    assert index.classify_job_title("SVP, Sales") == "Executive"
+    assert index.classify_job_title("Team Leader") == "Management"
+    assert index.classify_job_titles(["Line Cook", "Analyst", None]) == ["Service/Support", "Professional", "Professional"]
+    # "focused"/"abandoned" no longer count as action/result evidence
+    assert index.calculate_rubric_score({"checklist": {}}, "Q3", "I focused on it but it was abandoned") == (2, None)
+    assert index.calculate_rubric_score({"checklist": {}}, "Q3", "I led the rollout; the result was costs down 20%") == (4, None)
+    # ...while the inflected forms the old substring checks caught still count
+    from api.scoring.rubric_v13 import RUBRIC_MATCHER
+    assert RUBRIC_MATCHER.scan("I successfully rebuilt it")["result"] == {"successfully"}
+    assert RUBRIC_MATCHER.scan("I successfully rebuilt it")["action"] == {"rebuilt"}
+    for answer in ["improved profitability by 12 points", "made 3 regions profitable", "a costly 2 week outage"]:
+        assert RUBRIC_MATCHER.scan(answer)["business"], answer
+    assert index.calculate_rubric_score({"checklist": {"star_action": True}}, "Q3", "I successfully improved profitability by 12 points") == (4, None)
+    ctx = index.interview_context({"job_title": "Head of Nursing", "interviewer_intel": ""})
+    assert ctx["seniority_level"].startswith("Vision") and ctx["persona_role"].startswith("The Guardian")
+    ctx = index.interview_context({"job_title": "Technician", "interviewer_intel": "Headquarters in Ohio"})
+    assert ctx["seniority_level"].startswith("Tactical") and ctx["persona_role"].startswith("The Ace Evaluator")
+
+if __name__ == "__main__":
+    test_whole_words_only()
+    test_labels_priority_and_batch()
+    test_index_classifiers_use_word_boundaries()
+    print("✅ Matcher tests passed")
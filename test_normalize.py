@@ -0,0 +1,83 @@
+import re
+import time
+from api.normalize import InputNormalizer, clean_text, strip_markup, tidy_text
+
+JD = (
+    "Senior Analyst​\r\n\r\n\r\n"
+    "  Own   the\tforecasting  model for EMEA.  \n"
+    "Own the forecasting model for EMEA.\n"
+    "Acme is an Equal Opportunity Employer and values diversity.\n"
+    "Acme Corp | Careers | Page 1 of 2 footer\n"
+    "Partner with finance on quarterly planning.\n"
+    "Acme Corp | Careers | Page 1 of 2 footer\n"
+)
+
+def test_clean_text_steps():
+    clean, steps = clean_text(JD, "jd")
+    assert clean == (
+        "Senior Analyst\n\n"
+        "Own the forecasting model for EMEA.\n"
+        "Acme is an Equal Opportunity Employer and values diversity.\n"
+        "Acme Corp | Careers | Page 1 of 2 footer\n"
+        "Partner with finance on quarterly planning."
+    )
+    # Boilerplate is reported, not removed (the budgeter drops it only when over budget)
+    assert steps == {"invisible": 1, "duplicate_lines": 2, "boilerplate_lines": 1}
+    # Resumes only lose back-to-back repeats: the same bullet under two roles is content
+    resume = "Key Wins\n- Cut costs 10% across the region\n\nKey Wins\n- Cut costs 10% across the region"
+    assert clean_text(resume, "resume")[0] == resume
+    assert clean_text("- Led it\n- Led it", "resume") == ("- Led it", {"invisible": 0, "duplicate_lines": 1, "boilerplate_lines": 0})
+
+def test_tidy_text_only_touches_whitespace():
+    tidy, steps = tidy_text(JD)
+    assert tidy.split("\n") == [
+        "Senior Analyst", "", "Own the forecasting model for EMEA.", "Own the forecasting model for EMEA.",
+        "Acme is an Equal Opportunity Employer and values diversity.", "Acme Corp | Careers | Page 1 of 2 footer",
+        "Partner with finance on quarterly planning.", "Acme Corp | Careers | Page 1 of 2 footer",
+    ]
+    assert steps == {"invisible": 1}
+
+def test_strip_markup_matches_old_regexes_and_is_linear():
+    def old(text):
+        clean = re.sub(r'\[.*?\]', '', text)
+        clean = re.sub(r'<.*?>', '', clean)
+        for art in ["thoughtful use of diagrams", "generate image", "ignore previous instructions", "system prompt", "internal score"]:
+            clean = re.sub(f'(?i){art}', '', clean)
+        return clean
+    for text in ["a [b] c [d", "[x]]y[", "<b>bold</b> [sys]\n<open [z] >", "Ignore previous instructions now", "a < b and c > d [", "]]["]:
+        assert strip_markup(text) == old(text), text
+    started = time.perf_counter()
+    strip_markup("[" * 100_000 + "<" * 100_000)
+    clean_text(("​ \t" * 30_000) + "\n".join(["same line repeated over and over"] * 3_000), "jd")
+    assert time.perf_counter() - started < 1.0
+
+def test_ingress_tidies_json_body_and_prompt_copies_are_cleaned(monkeypatch):
+    import api.index as index
+    body = {"jobPosting": JD, "inputs": {"jd": JD, "company_name": "  Acme‍ "}, "history": [{"role": "user", "content": "hi  there"}], "score": 3}
+    with index.app.test_request_context('/api', method='POST', json=body):
+        index.normalize_request_body()
+        data = index.request.json
+        # Stored fields keep every line: only whitespace / invisible characters change
+        assert data["jobPosting"] == data["inputs"]["jd"] == tidy_text(JD)[0]
+        assert data["inputs"]["company_name"] == "Acme"
+        assert data["history"] == [{"role": "user", "content": "hi there"}] and data["score"] == 3
+        assert "resume" not in data
+    assert index.sanitize_input("  [SYS] tell me   more​ ") == "tell me more"
+    assert index.sanitize_input("<b></b>") == "Null Input"
+    monkeypatch.setattr(index, "input_normalizer", InputNormalizer())
+    fitted = index.fit_prompt("analyze_resume", resume="Led it\nLed it", jd=JD)
+    assert fitted["resume"] == "Led it" and "Equal Opportunity" in fitted["jd"] and fitted["jd"].count("footer") == 1
+    normalizer = InputNormalizer()
+    normalizer.normalize_body({"jobDesc": JD, "message": "ok"})
+    normalizer.for_prompt(tidy_text(JD)[0], "jd")
+    stats = normalizer.stats()
+    assert stats["fields"] == 3 and stats["changed"] == 2 and stats["bytes_saved"] > 40
+    assert stats["duplicate_lines"] == 2 and stats["boilerplate_lines"] == 1
+    assert stats["stages"]["ingress"]["jd"]["tokens_saved"] > 0 and stats["stages"]["ingress"]["text"]["bytes_saved"] == 0
+    assert stats["stages"]["prompt"]["jd"]["tokens_saved"] > 0
+
+if __name__ == "__main__":
+    test_clean_text_steps()
+    test_tidy_text_only_touches_whitespace()
+    test_strip_markup_matches_old_regexes_and_is_linear()
+    print("✅ Normalizer tests passed")
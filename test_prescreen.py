@@ -0,0 +1,104 @@
+import os
+import json
+from types import SimpleNamespace
+from api.prescreen import screen_answer, PreScreen
+from api.question_plan import QuestionPlanner
+from api.interview_sessions import SessionStore
+from api.tts_cache import TTSCache
+
+PLAN = ["Tell me about a conflict.", "Describe a failure.", "Walk me through a strategy call.",
+        "When did you lead through change?", "How would you fix our onboarding backlog?"]
+STORY = "I led the migration of our billing system to a new vendor, coordinated four teams and cut invoice errors by 40% within two quarters."
+
+def test_screen_verdicts():
+    assert screen_answer("Ready!").reason == "non_answer"
+    assert screen_answer("umm, uh... hmm").score == 1
+    assert screen_answer("I don't know").verdict == "local"
+    short = screen_answer("I fixed it quickly.")
+    assert (short.verdict, short.reason, short.score) == ("local", "too_short", 2)
+    assert "overview" in screen_answer("hi", question_num=1).feedback
+    history = [{"question": "Q", "answer": STORY}]
+    repeat = screen_answer(STORY.replace("40%", "40 %") + " Thanks.", history)
+    assert (repeat.verdict, repeat.reason) == ("local", "repeat")
+    brief = screen_answer("I rebuilt the onboarding flow and signups went up 12%.", history)
+    assert (brief.verdict, brief.low_confidence) == ("model", True)
+    full = screen_answer("When our largest customer threatened to leave over missed deadlines, I set up a weekly review with their team, "
+                         "rebuilt the release checklist and we shipped the next three releases on time, renewing the contract.", history)
+    assert full.verdict == "model" and not full.low_confidence and full.reason is None
+    screens = PreScreen()
+    screens.screen("ready")
+    screens.answered(local=True)
+    screens.screen(STORY)
+    assert screens.stats()["local_share"] == 0.5 and screens.stats()["reasons"] == {"non_answer": 1}
+
+def test_non_answers_skip_the_model(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    calls = []
+    def create(**kwargs):
+        calls.append(kwargs)
+        prompt = kwargs["messages"][-1]["content"]
+        if "behavioral questions for this interview" in prompt:
+            reply = {"questions": PLAN}
+        else:
+            reply = {"feedback": "Good example.", "checklist": {"star_action": True}, "next_question": ""}
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+    fake = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+        audio=SimpleNamespace(speech=SimpleNamespace(create=lambda **kw: SimpleNamespace(content=b"MP3")))
+    )
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    monkeypatch.setattr(index, "interview_sessions", SessionStore(ttl=60))
+    monkeypatch.setattr(index, "question_planner", QuestionPlanner(max_workers=1))
+    monkeypatch.setattr(index, "QUESTION_PLAN_ENABLED", True)
+    monkeypatch.setattr(index, "RESUME_DIGEST_ENABLED", False)
+    monkeypatch.setattr(index, "PRESCREEN_LOW_CONFIDENCE_MODEL", "cheap-model")
+    client = index.app.test_client()
+
+    start = client.post('/api/get-feedback', json={
+        "message": "start", "isStart": True, "questionCount": 1,
+        "jobPosting": "Head of Operations at Acme", "resumeText": "Ran operations for 8 years.",
+        "job_title": "Director of Operations"
+    }).get_json()
+    session_id = start["session_id"]
+    assert index.question_planner.get(session_id, timeout=5) == PLAN
+    planned = len(calls)
+
+    # Ultra-short background: coached and scored locally, the interview moves on to the plan
+    turn = client.post('/api/get-feedback', json={"session_id": session_id, "message": "Ops guy.", "questionCount": 1}).get_json()
+    assert len(calls) == planned
+    assert turn["response"]["next_question"] == f"{index.STAR_TRANSITION} {PLAN[0]}"
+    assert turn["response"]["internal_score"] == 2 and turn["response"]["prescreen"]["reason"] == "too_short"
+    assert "too brief" in turn["response"]["feedback"]
+
+    turn = client.post('/api/get-feedback', json={"session_id": session_id, "message": STORY, "questionCount": 2}).get_json()
+    assert len(calls) == planned + 1 and calls[-1]["model"] == "gpt-4o-mini" and "max_tokens" not in calls[-1]
+    assert "prescreen" not in turn["response"]
+
+    # The same story again: a repeat, answered without the model and with no brief-answer note
+    turn = client.post('/api/get-feedback', json={"session_id": session_id, "message": STORY, "questionCount": 3}).get_json()
+    assert len(calls) == planned + 1
+    assert turn["response"]["prescreen"]["reason"] == "repeat" and "Note:" not in turn["response"]["feedback"]
+    assert turn["response"]["next_question"] == f"{index.NEXT_QUESTION_LEAD} {PLAN[2]}"
+
+    # Borderline: still answered by the model, routed to the low-confidence model
+    turn = client.post('/api/get-feedback', json={"session_id": session_id, "message": "I cut our onboarding time by half last year.", "questionCount": 4}).get_json()
+    assert len(calls) == planned + 2 and calls[-1]["model"] == "cheap-model"
+    assert calls[-1]["max_tokens"] == index.PRESCREEN_LOW_CONFIDENCE_MAX_TOKENS
+    assert turn["response"]["prescreen"] == {"verdict": "model", "reason": "brief", "low_confidence": True}
+    history = index.interview_sessions.get(session_id)["history"]
+    assert (history[0]["answer"], history[0]["internal_score"]) == ("Ops guy.", 2)
+    assert history[2]["answer"] == STORY and history[2]["internal_score"] == 2
+
+    # Stateless client, no plan: the closing after Q6 is scripted, so "idk" never reaches the model
+    turn = client.post('/api/get-feedback', json={"message": "idk", "questionCount": 6, "history": [], "jobPosting": "Ops"}).get_json()
+    assert len(calls) == planned + 2
+    assert turn["response"]["internal_score"] == 1 and turn["response"]["next_question"] == index.CLOSING_STATEMENT
+    # ...but earlier questions need the model to write the next one
+    client.post('/api/get-feedback', json={"message": "idk", "questionCount": 3, "history": [], "jobPosting": "Ops"})
+    assert len(calls) == planned + 3 and calls[-1]["model"] == "cheap-model"
+
+if __name__ == "__main__":
+    test_screen_verdicts()
+    print("✅ Pre-screen tests passed")
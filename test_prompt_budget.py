@@ -0,0 +1,80 @@
+from api.prompt_budget import PromptBudget, collapse_whitespace, RESUME_TRIM_MARKER
+
+JD = "\n".join([
+    "Senior Product Manager - Payments",
+    "Own the checkout roadmap and partner with engineering.",
+    "We are an equal opportunity employer and value diversity.",
+    "Qualified applicants with arrest records will be considered under the Fair Chance Ordinance.",
+    "Applicants must be authorized to work in the US; a background check is required.",
+] + ["Drive experiments that lift conversion across regions."] * 40)
+
+RESUME = "\n".join(
+    ["Jane Doe", "EXPERIENCE"]
+    + [f"Role {i}: Led a team of {i} engineers shipping payments features at Company {i}." for i in range(60)]
+    + ["SKILLS", "SQL, experimentation, roadmapping", "EDUCATION", "BS Computer Science"]
+)
+
+def test_counts_are_cached_and_whitespace_collapsed():
+    budget = PromptBudget(max_cached=2)
+    assert collapse_whitespace("a  \t b\n\n\n\nc ") == "a b\n\nc"
+    first = budget.count("Led a team of 12 engineers.")
+    assert first == budget.count("Led a team of 12 engineers.") > 0
+    assert budget.stats()["count_hits"] == 1 and budget.stats()["count_misses"] == 1
+    budget.count("x"), budget.count("y")
+    assert budget.stats()["cached_counts"] == 2
+
+def test_sections_under_budget_are_untouched():
+    budget = PromptBudget()
+    fitted, report = budget.fit("analyze_resume", {"resume": "Led payments.", "jd": "Senior PM"})
+    assert fitted == {"resume": "Led payments.", "jd": "Senior PM"} and report["trimmed"] == {} and report["boilerplate"] == {}
+
+def test_jd_boilerplate_goes_before_content():
+    budget = PromptBudget(budgets={"a": {"jd": 400}})
+    fitted, report = budget.fit("a", {"jd": JD})
+    assert "equal opportunity" not in fitted["jd"] and "Fair Chance" not in fitted["jd"]
+    # Requirements that merely mention applicants or a background check are content
+    assert fitted["jd"].startswith("Senior Product Manager - Payments\nOwn the checkout roadmap and partner with engineering.\nApplicants must be authorized")
+    assert budget.count(fitted["jd"]) <= 400 and report["trimmed"]["jd"][1] <= 400
+    assert report["boilerplate"] == {"jd": 2} and budget.stats()["boilerplate_lines"] == 2
+
+def test_boilerplate_matches_legal_notices_only():
+    from api.prompt_budget import JD_BOILERPLATE
+    notices = [
+        "All qualified applicants will receive consideration for employment without regard to race, color or religion.",
+        "Acme participates in E-Verify.",
+        "Background checks are conducted in accordance with applicable law.",
+        "To request a reasonable accommodation, email talent@acme.com.",
+        "We do not accept unsolicited resumes from recruitment agencies.",
+    ]
+    requirements = [
+        "Applicants must have 5+ years of payments experience.",
+        "Applicants will lead a team of 12 engineers.",
+        "Must pass a background check and hold an active Secret clearance.",
+        "Build background check integrations for our onboarding product.",
+        "Salary range $150k-$180k, posted per our pay transparency commitment.",
+    ]
+    assert all(JD_BOILERPLATE.search(line) for line in notices)
+    assert not any(JD_BOILERPLATE.search(line) for line in requirements)
+
+def test_resume_keeps_recent_roles_and_skills_tail():
+    budget = PromptBudget(budgets={"a": {"resume": 600}})
+    fitted, _ = budget.fit("a", {"resume": RESUME})
+    text = fitted["resume"]
+    assert budget.count(text) <= 600
+    assert "Role 0:" in text and "Role 59:" not in text
+    assert RESUME_TRIM_MARKER in text
+    assert text.endswith("SKILLS\nSQL, experimentation, roadmapping\nEDUCATION\nBS Computer Science")
+
+def test_slack_from_a_short_section_goes_to_the_long_one():
+    budget = PromptBudget(budgets={"a": {"resume": 500, "jd": 500}})
+    fitted, _ = budget.fit("a", {"resume": RESUME, "jd": "Senior PM"})
+    assert 500 < budget.count(fitted["resume"]) <= 1000 - budget.count("Senior PM")
+
+if __name__ == "__main__":
+    test_counts_are_cached_and_whitespace_collapsed()
+    test_sections_under_budget_are_untouched()
+    test_jd_boilerplate_goes_before_content()
+    test_boilerplate_matches_legal_notices_only()
+    test_resume_keeps_recent_roles_and_skills_tail()
+    test_slack_from_a_short_section_goes_to_the_long_one()
+    print("✅ Prompt budget tests passed")
@@ -0,0 +1,86 @@
+import os
+import json
+import threading
+import pytest
+from types import SimpleNamespace
+from api.question_plan import QuestionPlanner, parse_questions
+from api.interview_sessions import SessionStore
+from api.tts_cache import TTSCache
+
+PLAN = ["Tell me about a conflict.", "Describe a failure.", "Walk me through a strategy call.",
+        "When did you lead through change?", "How would you fix our onboarding backlog?"]
+
+def test_parse_questions_strips_numbering_and_requires_count():
+    data = {"questions": ["1. Tell me about a conflict.", "Q2: Describe a failure.", "", 7, "c", "d", "e", "f"]}
+    assert parse_questions(data) == ["Tell me about a conflict.", "Describe a failure.", "c", "d", "e"]
+    with pytest.raises(ValueError):
+        parse_questions({"questions": ["only one"]})
+    with pytest.raises(ValueError):
+        parse_questions({"plan": PLAN})
+
+def test_planner_serves_plan_then_runs_on_ready():
+    planner = QuestionPlanner(max_workers=1)
+    release, warmed = threading.Event(), threading.Event()
+    planner.start("s1", lambda: release.wait() and PLAN, lambda plan: warmed.set())
+    assert planner.get("s1", timeout=0.01) is None
+    release.set()
+    assert planner.get("s1", timeout=2) == PLAN
+    assert warmed.wait(2)
+    planner.start("s2", lambda: 1 / 0)
+    assert planner.get("s2", timeout=2) is None
+    assert planner.get("unknown") is None
+    stats = planner.stats()
+    assert stats["started"] == 2 and stats["ready"] == 1 and stats["failed"] == 1 and stats["late"] == 1
+
+def test_later_turns_take_next_question_from_plan(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    calls = []
+    def create(**kwargs):
+        calls.append(kwargs)
+        prompt = kwargs["messages"][-1]["content"]
+        if "behavioral questions for this interview" in prompt:
+            reply = {"questions": PLAN}
+        elif prompt.startswith("Start the interview"):
+            reply = {"feedback": "", "checklist": {}, "next_question": "Walk me through your background."}
+        else:
+            reply = {"feedback": "Clear overview.", "checklist": {"relevant_history": True}, "next_question": ""}
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+    fake = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+        audio=SimpleNamespace(speech=SimpleNamespace(create=lambda **kw: SimpleNamespace(content=b"MP3")))
+    )
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "tts_cache", TTSCache(disk_max_bytes=0))
+    monkeypatch.setattr(index, "interview_sessions", SessionStore(ttl=60))
+    monkeypatch.setattr(index, "question_planner", QuestionPlanner(max_workers=1))
+    monkeypatch.setattr(index, "QUESTION_PLAN_ENABLED", True)
+    client = index.app.test_client()
+
+    start = client.post('/api/get-feedback', json={
+        "message": "start", "isStart": True, "questionCount": 1,
+        "jobPosting": "Head of Operations at Acme", "resumeText": "Ran operations for 8 years.",
+        "job_title": "Director of Operations"
+    }).get_json()
+    session_id = start["session_id"]
+    assert index.question_planner.get(session_id, timeout=5) == PLAN
+
+    turn = client.post('/api/get-feedback', json={
+        "session_id": session_id, "message": "I have run operations teams for eight years across three sites.",
+        "questionCount": 1
+    }).get_json()
+    assert turn["response"]["next_question"] == f"{index.STAR_TRANSITION} {PLAN[0]}"
+    assert turn["response"]["feedback"] == "Clear overview."
+    turn_call = calls[-1]
+    assert turn_call["model"] == "gpt-4o-mini"
+    assert "DO NOT write a transition or the next question" in turn_call["messages"][-1]["content"]
+    # The plan is persisted with the session, so the planner entry is no longer needed
+    assert index.interview_sessions.get(session_id)["plan"] == PLAN
+    assert index.question_planner.stats()["plans"] == 0
+    assert index.planned_next_question(PLAN, 5) == f"{index.FINAL_QUESTION_LEAD} {PLAN[4]}"
+    assert index.planned_next_question(PLAN, 6) == index.CLOSING_STATEMENT
+
+if __name__ == "__main__":
+    test_parse_questions_strips_numbering_and_requires_count()
+    test_planner_serves_plan_then_runs_on_ready()
+    print("✅ Question plan tests passed")
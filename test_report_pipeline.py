@@ -0,0 +1,73 @@
+import os
+import json
+import time
+from types import SimpleNamespace
+from api.report_pipeline import ReportPipeline, ReportTask
+
+def test_merge_order_timeouts_and_errors():
+    pipeline = ReportPipeline(max_workers=4)
+    def slow():
+        time.sleep(0.5)
+        return "late"
+    def boom():
+        raise RuntimeError("bad json")
+    def quick(value, delay):
+        def run():
+            time.sleep(delay)
+            return value
+        return run
+    started = time.monotonic()
+    results, status = pipeline.run([
+        ReportTask("a", quick("A", 0.05), timeout=2),
+        ReportTask("slow", slow, timeout=0.1, fallback="fallback"),
+        ReportTask("boom", boom, timeout=2, fallback=[]),
+        ReportTask("b", quick("B", 0.0), timeout=2),
+    ])
+    assert time.monotonic() - started < 0.45
+    assert list(results) == ["a", "slow", "boom", "b"]
+    assert results == {"a": "A", "slow": "fallback", "boom": [], "b": "B"}
+    assert [status[k]["status"] for k in results] == ["ok", "timeout", "error", "ok"]
+    assert pipeline.stats()["timeouts"] == 1 and pipeline.stats()["errors"] == 1
+
+SECTION_REPLIES = {
+    "KPI": {"kpis": [{"name": "EBITDA", "value": "$35M"}, {"name": "Revenue", "value": "22%"}]},
+    "strengths": {"strengths": ["Clear <b>ownership</b>", "Quantified results", "Calm delivery"]},
+    "areas for improvement": {"growth_areas": ["Tighter openings"]},
+    "executive summary": {"coaching": "Lead with the turnaround story."},
+    "final answer": {"q6_feedback_spoken": "Strong close."},
+}
+
+def test_final_report_turn_fans_out_sections(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    calls = []
+    def create(**kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        calls.append(kwargs["model"])
+        for marker, reply in SECTION_REPLIES.items():
+            if marker in prompt:
+                if marker == "areas for improvement":
+                    raise TimeoutError("section timed out")
+                return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+        raise AssertionError("unexpected prompt")
+    monkeypatch.setattr(index, "get_openai_client", lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    history = [
+        {"question": "Tell me about a turnaround you led.", "answer": "I led a turnaround that delivered $35M EBITDA in two years.", "feedback": "Great", "internal_score": 4},
+        {"question": "Describe a growth initiative you owned.", "answer": "We grew revenue 22% by launching a new channel.", "feedback": "Good", "internal_score": 3},
+    ]
+    client = index.app.test_client()
+    res = client.post('/api/get-feedback', json={"message": "GENERATE_REPORT", "questionCount": 8, "history": history})
+    body = res.get_json()
+    assert res.status_code == 200 and body["is_complete"] is True
+    assert len(calls) == 5
+    report = body["response"]["formatted_report"]
+    assert "EBITDA: $35M" in report and "Revenue: 22%" in report
+    assert "Clear &lt;b&gt;ownership&lt;/b&gt;" in report
+    assert "Growth area analysis is unavailable" in report
+    assert "Lead with the turnaround story." in report
+    assert "3.5 <span" in report and "Well Done" in report
+    assert body["response"]["feedback"] == "Strong close."
+
+if __name__ == "__main__":
+    test_merge_order_timeouts_and_errors()
+    print("✅ Report pipeline tests passed")
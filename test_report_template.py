@@ -0,0 +1,46 @@
+import os
+import json
+from types import SimpleNamespace
+from api.report_template import render_ace_report, normalize_sections
+
+def test_render_escapes_and_writes_exact_score():
+    html = render_ace_report({
+        "kpis": [{"name": "EBITDA", "value": "$35M"}, "garbage"],
+        "strengths": ["<script>alert(1)</script>", "", "Clear structure"],
+        "growth_areas": "Open with the headline",
+        "coaching": None,
+    }, 3.2, "Average")
+    assert "3.2 <span" in html and ">Average<" in html
+    assert "EBITDA: $35M" in html
+    assert "<script>" not in html and "&lt;script&gt;" in html
+    assert "<li>• Open with the headline</li>" in html
+    assert "{{" not in html and "5.0" not in html
+    assert normalize_sections(None) == {"kpis": [], "strengths": [], "growth_areas": [], "coaching": ""}
+
+def test_single_call_auditor_returns_compact_json(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    requests = []
+    reply = {
+        "kpis": [{"name": "Churn", "value": "-18%"}],
+        "strengths": ["Owns outcomes"],
+        "growth_areas": ["Shorter setup"],
+        "coaching": "Lead with the churn story.",
+        "q6_feedback_spoken": "Well argued.",
+    }
+    def create(**kwargs):
+        requests.append(kwargs)
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+    monkeypatch.setattr(index, "get_openai_client", lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    monkeypatch.setattr(index, "REPORT_MODE", "single")
+    history = [{"question": "Tell me about retention work.", "answer": "I cut churn by 18% in a year across our base.", "feedback": "Good", "internal_score": 3}]
+    res = index.app.test_client().post('/api/get-feedback', json={"message": "GENERATE_REPORT", "questionCount": 8, "history": history})
+    body = res.get_json()["response"]
+    assert len(requests) == 1
+    assert "HTML TEMPLATE" not in requests[0]["messages"][0]["content"]
+    assert "Churn: -18%" in body["formatted_report"] and "3.0 <span" in body["formatted_report"]
+    assert "kpis" not in body and body["feedback"] == "Well argued."
+
+if __name__ == "__main__":
+    test_render_escapes_and_writes_exact_score()
+    print("✅ Report template tests passed")
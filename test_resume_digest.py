@@ -0,0 +1,93 @@
+import os
+import json
+import time
+from types import SimpleNamespace
+from api.llm_cache import LLMCache
+from api.resume_digest import ResumeDigests, normalize_digest, digest_text, resume_hash
+
+RESUME = """Jane Doe
+Senior Product Manager
+
+EXPERIENCE
+Acme Corp - Senior Product Manager (2020 - Present)
+- Grew activation 32% by redesigning onboarding
+- Led a team of 9 across design and engineering
+
+Skills
+Roadmapping, SQL, A/B testing
+"""
+
+DIGEST_REPLY = {
+    "name": "Jane Doe", "headline": "Senior PM focused on growth",
+    "roles": [{"title": "Senior Product Manager", "company": "Acme Corp", "dates": "2020 - Present",
+               "accomplishments": ["Grew activation 32% by redesigning onboarding", "Led a team of 9", "x", "extra"]}],
+    "skills": ["Roadmapping", "SQL", "A/B testing"],
+    "education": [{"degree": "BA Economics", "school": "State University", "dates": "2012"}, "garbled"]
+}
+
+def test_normalize_and_render():
+    digest = normalize_digest(DIGEST_REPLY)
+    assert len(digest["roles"][0]["accomplishments"]) == 3 and len(digest["education"]) == 1
+    assert normalize_digest("not json") == {"name": "", "headline": "", "roles": [], "skills": [], "education": []}
+    text = digest_text(digest)
+    assert "- Senior Product Manager, Acme Corp (2020 - Present)" in text
+    assert "SKILLS: Roadmapping, SQL, A/B testing" in text
+    # Whitespace-only edits are the same resume version
+    assert resume_hash(RESUME) == resume_hash(RESUME.replace("\n\n", "\n\n\n  "))
+
+def test_ensure_computes_once_in_background():
+    store, calls = {}, []
+    def compute(text):
+        calls.append(text)
+        time.sleep(0.05)
+        store[resume_hash(text)] = normalize_digest(DIGEST_REPLY)
+        return store[resume_hash(text)]
+    digests = ResumeDigests(lookup=store.get, compute=compute)
+    first = digests.ensure(RESUME)
+    assert digests.ensure(RESUME) == first and digests.get(first) is None
+    for _ in range(50):
+        if digests.get(first):
+            break
+        time.sleep(0.02)
+    digests.ensure(RESUME)
+    assert len(calls) == 1 and digests.stats()["computed"] == 1
+
+def test_tools_switch_to_digest_once_stored(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    prompts = []
+    def create(**kwargs):
+        prompts.append(kwargs["messages"][-1]["content"])
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(DIGEST_REPLY)))])
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "llm_cache", LLMCache(backend=None))
+    monkeypatch.setattr(index, "resume_digests", ResumeDigests(lookup=index._lookup_resume_digest, compute=index.compute_resume_digest))
+
+    res = index.app.test_client().post('/api', json={"action": "resume_digest", "resume_text": RESUME})
+    body = res.get_json()["data"]
+    assert res.status_code == 200 and body["resume_hash"] == resume_hash(RESUME)
+    assert body["digest"]["roles"][0]["company"] == "Acme Corp"
+    # Stored: a second request and the interview context reuse it without a model call
+    index.app.test_client().post('/api', json={"action": "resume_digest", "resume_text": RESUME})
+    assert len(prompts) == 1
+    ctx = index.interview_context({"resumeText": RESUME, "job_title": "Senior PM"})
+    assert ctx["resume_text"] == digest_text(body["digest"]) and ctx["resume_digest_pending"] is None
+    # Tools that rewrite the resume still get the full text
+    assert index.resume_for_prompt(RESUME, "full") == RESUME
+
+def test_session_context_swaps_in_digest_when_ready(monkeypatch):
+    import api.index as index
+    stored = {}
+    monkeypatch.setattr(index, "resume_digests", ResumeDigests(lookup=stored.get, compute=lambda text: None))
+    ctx = index.interview_context({"resumeText": RESUME, "job_title": "Senior PM"})
+    assert "Grew activation 32%" in ctx["resume_text"] and ctx["resume_digest_pending"] == resume_hash(RESUME)
+    stored[resume_hash(RESUME)] = normalize_digest(DIGEST_REPLY)
+    index.session_resume_digest(ctx)
+    assert ctx["resume_text"].startswith("Jane Doe - Senior PM focused on growth")
+    assert ctx["resume_digest_pending"] is None
+
+if __name__ == "__main__":
+    test_normalize_and_render()
+    test_ensure_computes_once_in_background()
+    print("✅ Resume digest tests passed")
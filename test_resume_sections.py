@@ -0,0 +1,85 @@
+import json
+import os
+from types import SimpleNamespace
+from api.resume_sections import ResumeSections, ResumeSegmenter, heading_kind
+
+RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe
+
+PROFESSIONAL SUMMARY
+Operations leader with 10 years in logistics.
+
+Experience:
+Director of Operations, Acme Corp | Jan 2020 - Present
+- Led university recruiting partnerships and cut costs 12%
+Operations Manager — Beta Logistics
+2015 - 2019
+- Ran a 40-person warehouse
+
+Core Competencies
+Forecasting, Lean | Six Sigma • SQL
+
+EDUCATION
+University of Ohio - MBA, Operations
+Bachelor of Science, Supply Chain Management
+
+Certifications
+PMP (2018)"""
+
+def test_single_pass_index_with_byte_offsets():
+    sections = ResumeSections(RESUME)
+    assert [s.kind for s in sections.sections] == ["header", "summary", "experience", "skills", "education", "certifications"]
+    raw = RESUME.encode("utf-8")
+    for s in sections.sections:
+        chunk = raw[s.start:s.end].decode("utf-8")
+        assert chunk == "\n".join(RESUME.split("\n")[s.line_start:s.line_end]) + ("" if s.line_end == len(sections.lines) else "\n")
+    assert raw[sections.sections[3].start:].decode().startswith("Core Competencies\n")
+    roles = [(e.title, e.dates) for e in sections.entries]
+    assert roles == [("Director of Operations, Acme Corp", "Jan 2020 - Present"), ("Operations Manager — Beta Logistics", "2015 - 2019")]
+    assert raw[sections.entries[1].start:sections.entries[1].end].decode().startswith("Operations Manager")
+    assert sections.skills() == ["Forecasting", "Lean", "Six Sigma", "SQL"]
+    # Only the education section is read: the "university" bullet under experience is not a school
+    assert sections.education() == [
+        {"school": "University of Ohio", "degree": "MBA, Operations", "dates": ""},
+        {"school": "Supply Chain Management", "degree": "Bachelor of Science", "dates": ""},
+    ]
+    assert sections.contact()["email"] == "jane.doe@example.com" and sections.contact()["phone"] == "(555) 123-4567"
+    assert sections.name_guess() == "Jane Doe" and sections.tail_line == RESUME.split("\n").index("Core Competencies")
+    assert heading_kind("— SKILLS —") == "skills" and heading_kind("Skills in SQL and Python for analytics") is None
+
+def test_contact_phone_stays_on_one_line():
+    # ZIP code on the line above must not be glued onto the number
+    sample = open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_resume.txt")).read()
+    assert ResumeSections(sample).contact()["phone"] == "(555) 123-4567"
+    assert ResumeSections("Jo Lee\nID 98765551234567\n+1 555.123.4567").contact()["phone"] == "+1 555.123.4567"
+
+def test_cache_and_fallbacks():
+    segmenter = ResumeSegmenter(max_entries=1)
+    assert segmenter.get(RESUME) is segmenter.get(RESUME)
+    plain = segmenter.get("John Smith\nBA, Boston College\nLed hiring")
+    assert [s.kind for s in plain.sections] == ["header"] and plain.tail_line is None
+    assert plain.education() == [{"school": "Boston College", "degree": "BA", "dates": ""}] and plain.skills() == []
+    assert segmenter.stats() == {"cached": 1, "max_entries": 1, "hits": 1, "misses": 2}
+    assert ResumeSections("").sections[0].kind == "header"
+
+def test_optimize_guardrail_uses_section_index(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    reply = {"personal": {"name": "Jane Doe"}, "experience": [], "education": [], "skills": []}
+    def create(**kwargs):
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "resume_sections", ResumeSegmenter())
+    client = index.app.test_client()
+    res = client.post('/api', json={"action": "optimize", "resume_text": RESUME, "job_description": "Ops director", "user_data": {}})
+    data = json.loads(res.get_json()["data"])
+    assert data["skills"] == ["Forecasting", "Lean", "Six Sigma", "SQL"]
+    assert data["education"][0]["school"] == "University of Ohio"
+    assert index.resume_sections.stats()["misses"] == 1
+
+if __name__ == "__main__":
+    test_single_pass_index_with_byte_offsets()
+    test_contact_phone_stays_on_one_line()
+    test_cache_and_fallbacks()
+    print("✅ Resume section tests passed")
@@ -0,0 +1,48 @@
+import json
+import pytest
+import api.scoring as scoring
+from api.scoring.evaluate import evaluate, load_corpus, format_report, main
+
+STRONG = {"answer": "I led a team of 5 and the result was 85% adoption.", "checklist": {"star_action": True, "star_result": True}, "expected": 4}
+WEAK = {"answer": "It got better after a while.", "checklist": {}, "expected": 2}
+TOXIC = {"answer": "I told the client they were wrong.", "checklist": {"red_flags": True}, "expected": 1}
+
+def test_registry_selects_active_strategy(monkeypatch):
+    assert {"v13", "option1", "option1_balanced", "option2", "option3", "option_b"} <= set(scoring.available())
+    assert scoring.score_answer({"checklist": {}}, "Q3", STRONG["answer"]) == (4, None)
+    scoring.register("always_two", lambda rubric, q, answer: (2, None))
+    monkeypatch.setattr(scoring, "ACTIVE_STRATEGY", "always_two")
+    try:
+        assert scoring.score_answer({"checklist": {}}, "Q3", STRONG["answer"]) == (2, None)
+        assert scoring.score_answer({"checklist": {}}, "Q3", STRONG["answer"], strategy="v13") == (4, None)
+    finally:
+        scoring.STRATEGIES.pop("always_two")
+    with pytest.raises(KeyError):
+        scoring.get_strategy("nope")
+
+def test_evaluate_reports_accuracy_and_agreement(tmp_path):
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("\n".join(json.dumps(r) for r in [STRONG, WEAK, TOXIC] * 40) + "\n")
+    rows = load_corpus(str(corpus))
+    # Two worker processes, three chunks: scores must still line up with the rows
+    report = evaluate(rows, ["v13", "option_b", "option1"], processes=2, chunk_size=50)
+    assert report["answers"] == 120
+    v13 = report["per_strategy"]["v13"]
+    assert v13["accuracy"] == 1.0 and v13["per_tier"][4] == {"n": 40, "correct": 40, "accuracy": 1.0}
+    assert v13["confusion"][2] == {2: 40}
+    assert report["agreement"]["v13"]["option_b"] == 1.0 and report["agreement"]["v13"]["v13"] == 1.0
+    assert report["per_strategy"]["option1"]["per_tier"][1]["accuracy"] == 1.0
+    assert "AGREEMENT" in format_report(report)
+
+def test_cli_and_bad_rows(tmp_path, capsys):
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text(json.dumps(STRONG) + "\n")
+    assert main([str(corpus), "--strategies", "v13", "--processes", "1", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["per_strategy"]["v13"]["accuracy"] == 1.0
+    corpus.write_text('{"answer": "no label"}\n')
+    with pytest.raises(ValueError):
+        load_corpus(str(corpus))
+
+if __name__ == "__main__":
+    report = evaluate(load_corpus("scoring_corpus_sample.jsonl"), processes=1)
+    print(format_report(report))
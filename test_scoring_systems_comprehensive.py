@@ -1,5 +1,6 @@
+import os
 import sys
-sys.path.insert(0, '/Users/davidkish/Desktop/AI Career Coach')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Test all answer quality levels with different scoring systems
 def test_scoring_systems():
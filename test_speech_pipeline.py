@@ -0,0 +1,56 @@
+import time
+from api.speech_pipeline import SpeechPipeline, split_sentences, segment_text
+
+SPEECH = ("Feedback: Strong opening that set the context well. You named the team size. "
+          "Try closing with the measurable result. \n\n The next question that I have for you is... "
+          "tell me about a time you disagreed with your manager?")
+
+def fake_tts(text, voice):
+    time.sleep(0.01 * (len(text) % 5))  # finish out of order
+    return f"<{voice}:{text}>".encode()
+
+def test_sentence_split_and_grouping():
+    sentences = split_sentences(SPEECH)
+    assert sentences[0] == "Feedback: Strong opening that set the context well."
+    assert sentences[-1].endswith("manager?")
+    segments = segment_text(SPEECH, min_chars=40)
+    assert all(len(s) >= 40 for s in segments[:-1])
+    assert " ".join(segments).split() == SPEECH.split()
+
+def test_playlist_order_is_preserved():
+    pipeline = SpeechPipeline(max_workers=4)
+    job = pipeline.synthesize(SPEECH, fake_tts, "alloy", min_chars=20)
+    segments = job.wait()
+    assert len(segments) > 2
+    assert [s.index for s in segments] == list(range(len(segments)))
+    assert b"".join(s.audio for s in segments).startswith(b"<alloy:Feedback: Strong opening")
+
+def test_incremental_feed_reuses_speculative_segments():
+    pipeline = SpeechPipeline(max_workers=2)
+    calls = []
+    job = pipeline.job(lambda t, v: calls.append(t) or t.encode(), "nova", min_chars=20)
+    for i in range(0, len(SPEECH), 9):
+        job.feed(SPEECH[i:i + 9])
+    speculative = len(job.segments)
+    assert speculative >= 2
+    assert job.finish(SPEECH) == speculative
+    job.wait()
+    # Every segment was synthesized exactly once
+    assert sorted(calls) == sorted(segment_text(SPEECH, min_chars=20))
+
+def test_finish_replaces_mismatched_tail():
+    pipeline = SpeechPipeline(max_workers=2)
+    job = pipeline.job(lambda t, v: t.encode(), "nova", min_chars=10)
+    job.feed("First sentence here. Second draft sentence. ")
+    job.wait()
+    assert len(job.ready()) == 2
+    replaced_from = job.finish("First sentence here. Second final sentence.")
+    assert replaced_from == 1
+    assert [s.audio for s in job.remaining()] == [b"Second final sentence."]
+
+if __name__ == "__main__":
+    test_sentence_split_and_grouping()
+    test_playlist_order_is_preserved()
+    test_incremental_feed_reuses_speculative_segments()
+    test_finish_replaces_mismatched_tail()
+    print("✅ Speech pipeline tests passed")
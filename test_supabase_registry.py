@@ -0,0 +1,79 @@
+import os
+import sys
+import types
+import pytest
+from api.supabase_registry import SupabaseRegistry
+
+# Several legacy test scripts swap sys.modules["supabase"] for a MagicMock at import time
+requires_real_supabase = pytest.mark.skipif(
+    not isinstance(sys.modules.get("supabase", types.ModuleType("supabase")), types.ModuleType),
+    reason="supabase module replaced by a mock in this session"
+)
+
+def _env():
+    os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+    os.environ.setdefault("SUPABASE_KEY", "anon-key")
+    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "service-key")
+
+@requires_real_supabase
+def test_clients_built_once():
+    _env()
+    reg = SupabaseRegistry()
+    anon = reg.anon()
+    assert reg.anon() is anon
+    service = reg.service()
+    assert reg.service() is service
+    assert service is not anon
+    # Both share the single pooled session
+    assert anon.postgrest.session is reg.http_client()
+    stats = reg.stats()
+    assert stats["counters"]["clients_built"] == 2
+    assert stats["pooling"] == {"active": True, "anon": "httpx_client", "service": "httpx_client"}
+    reg.reset()
+
+@requires_real_supabase
+def test_user_view_is_scoped_and_pooled():
+    _env()
+    reg = SupabaseRegistry()
+    view_a = reg.user("token-a")
+    view_b = reg.user("token-b")
+    assert view_a.headers["Authorization"] == "Bearer token-a"
+    assert view_b.headers["Authorization"] == "Bearer token-b"
+    # Shared anon client must stay on the anon key
+    assert "token-a" not in reg.anon().options.headers.get("Authorization", "")
+    assert view_a.session is reg.http_client()
+    stats = reg.stats()
+    assert stats["counters"]["user_views"] == 2
+    assert stats["counters"]["clients_built"] == 1
+    reg.reset()
+
+@requires_real_supabase
+def test_legacy_postgrest_session_moves_onto_shared_pool(monkeypatch):
+    # postgrest 0.16 (the pinned build) takes no http_client and opens its own session
+    import httpx
+    import postgrest
+
+    class LegacyPostgrestClient:
+        def __init__(self, base_url, headers=None, schema="public", **kwargs):
+            if kwargs:
+                raise TypeError(f"unexpected keyword arguments: {sorted(kwargs)}")
+            self.session = httpx.Client(base_url=base_url, headers=headers, timeout=5)
+
+    _env()
+    monkeypatch.setattr(postgrest, "SyncPostgrestClient", LegacyPostgrestClient)
+    reg = SupabaseRegistry()
+    view = reg.user("token-a")
+    assert view.session._transport is reg.transport()
+    assert view.session.headers["Authorization"] == "Bearer token-a"
+    assert str(view.session.base_url).startswith(os.environ["SUPABASE_URL"])
+    assert reg.stats()["pooling"]["user"] == "shared_transport" and reg.stats()["pooling"]["active"]
+    # A client with no session to rebuild is reported, not silently counted as pooled
+    assert reg.pool_session(types.SimpleNamespace()) == "off"
+    reg._set_pooling("user", "off")
+    assert reg.stats()["pooling"]["active"] is False
+    reg.reset()
+
+if __name__ == "__main__":
+    test_clients_built_once()
+    test_user_view_is_scoped_and_pooled()
+    print("✅ Registry tests passed")
@@ -0,0 +1,86 @@
+import io
+import os
+import time
+import wave
+import base64
+from types import SimpleNamespace
+import api.transcription as transcription
+from api.transcription import split_wav, AudioPart, sniff_mime
+
+WEBM = b"\x1a\x45\xdf\xa3" + b"\x00" * 200
+
+def make_wav(seconds, rate=8000):
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x01\x00" * rate * seconds)
+    return out.getvalue()
+
+class FakeTranscriptions:
+    def __init__(self):
+        self.files = []
+    def create(self, **kwargs):
+        name, data, mime = kwargs["file"]
+        self.files.append((name, len(data), mime))
+        # Later segments answer faster, so ordering must come from the stitcher
+        time.sleep(0.05 / (len(self.files)))
+        if name.endswith(".wav"):
+            with wave.open(io.BytesIO(data)) as w:
+                return SimpleNamespace(text=f"{name.split('.')[0]}:{w.getnframes()}")
+        return SimpleNamespace(text=f"heard {name}")
+
+def client_with(monkeypatch):
+    import api.index as index
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    fake = FakeTranscriptions()
+    monkeypatch.setattr(index, "get_openai_client", lambda: SimpleNamespace(audio=SimpleNamespace(transcriptions=fake)))
+    return index.app.test_client(), fake
+
+def test_sniff_and_wav_split():
+    assert sniff_mime(WEBM) == "audio/webm"
+    assert AudioPart(make_wav(1)).filename == "audio.wav"
+    parts = split_wav(AudioPart(make_wav(150)), seconds=60)
+    assert [p.filename for p in parts] == ["segment0.wav", "segment1.wav", "segment2.wav"]
+    with wave.open(io.BytesIO(parts[-1].data)) as w:
+        assert w.getnframes() == 8000 * 30
+    # Short recordings are left alone
+    assert len(split_wav(AudioPart(make_wav(70)), seconds=60)) == 1
+
+def test_legacy_base64_json_uploads_from_memory(monkeypatch):
+    client, fake = client_with(monkeypatch)
+    payload = "data:audio/webm;codecs=opus;base64," + base64.b64encode(WEBM).decode()
+    res = client.post('/api/get-feedback', json={"action": "transcribe", "audio": payload})
+    assert res.status_code == 200
+    assert res.get_json()["transcript"] == "heard audio.webm"
+    assert fake.files == [("audio.webm", len(WEBM), "audio/webm")]
+
+def test_multipart_parts_are_stitched_in_order(monkeypatch):
+    client, fake = client_with(monkeypatch)
+    res = client.post('/api/transcribe', data={
+        "audio": [(io.BytesIO(WEBM), "blob"), (io.BytesIO(WEBM), "blob")]
+    }, content_type="multipart/form-data")
+    assert res.status_code == 200
+    assert res.get_json()["transcript"] == "heard part0.webm heard part1.webm"
+
+def test_raw_wav_body_is_segmented(monkeypatch):
+    client, fake = client_with(monkeypatch)
+    monkeypatch.setattr(transcription, "SEGMENT_SECONDS", 60)
+    res = client.post('/api/get-feedback?action=transcribe', data=make_wav(150), content_type="audio/wav")
+    assert res.status_code == 200
+    assert res.get_json()["transcript"] == "segment0:480000 segment1:480000 segment2:240000"
+    assert len(fake.files) == 3
+
+def test_oversize_upload_is_rejected(monkeypatch):
+    client, fake = client_with(monkeypatch)
+    monkeypatch.setattr(transcription, "MAX_UPLOAD_BYTES", 1000)
+    res = client.post('/api/transcribe', data=b"\x00" * 5000, content_type="application/octet-stream")
+    assert res.status_code == 413
+    res = client.post('/api/get-feedback', json={"action": "transcribe", "audio": base64.b64encode(b"\x00" * 5000).decode()})
+    assert res.status_code == 413
+    assert fake.files == []
+
+if __name__ == "__main__":
+    test_sniff_and_wav_split()
+    print("✅ Transcription tests passed")
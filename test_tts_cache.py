@@ -0,0 +1,74 @@
+import threading
+import time
+from api.tts_cache import TTSCache
+from api.speech_pipeline import SpeechPipeline, segment_text
+
+def test_memory_and_disk_tiers(tmp_path):
+    cache = TTSCache(memory_max_bytes=1024, disk_dir=str(tmp_path), disk_max_bytes=4096)
+    calls = []
+    synth = lambda: calls.append(1) or b"mp3-bytes"
+    assert cache.get_or_synthesize("tts-1-hd", "alloy", "Analysis complete.  Thank you.", synth) == b"mp3-bytes"
+    # Whitespace-normalized text hits the same entry
+    assert cache.get_or_synthesize("tts-1-hd", "alloy", "Analysis complete. Thank you.", synth) == b"mp3-bytes"
+    assert len(calls) == 1
+    # Voice is part of the key
+    cache.get_or_synthesize("tts-1-hd", "nova", "Analysis complete. Thank you.", synth)
+    assert len(calls) == 2
+    # A fresh process (empty memory) still finds the clip on disk
+    fresh = TTSCache(memory_max_bytes=1024, disk_dir=str(tmp_path), disk_max_bytes=4096)
+    assert fresh.get("tts-1-hd", "alloy", "Analysis complete. Thank you.") == b"mp3-bytes"
+    assert fresh.stats()["disk_hits"] == 1
+
+def test_size_bounded_eviction(tmp_path):
+    cache = TTSCache(memory_max_bytes=250, disk_dir=str(tmp_path), disk_max_bytes=350)
+    for i in range(5):
+        cache.put("tts-1-hd", "alloy", f"phrase {i}", bytes(100))
+    stats = cache.stats()
+    assert stats["memory_bytes"] <= 250
+    assert stats["disk_bytes"] <= 350
+    assert len(list(tmp_path.rglob("*.mp3"))) == stats["disk_entries"] == 3
+    assert cache.get("tts-1-hd", "alloy", "phrase 4") is not None
+
+def test_concurrent_misses_share_one_synthesis(tmp_path):
+    cache = TTSCache(disk_dir=str(tmp_path))
+    calls = []
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return b"clip"
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_synthesize("tts-1-hd", "onyx", "Hello.", slow))) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert results == [b"clip"] * 4
+    assert len(calls) == 1
+
+def test_pinned_prefix_is_stitched_with_fresh_tail():
+    pipeline = SpeechPipeline(max_workers=2)
+    pipeline.pin_phrases(["The next question that I have for you is..."])
+    text = "Feedback: Good structure overall. \n\n The next question that I have for you is... describe a conflict you resolved."
+    segments = segment_text(text, min_chars=10, pinned=pipeline.pinned)
+    assert segments == ["Feedback: Good structure overall.", "The next question that I have for you is...", "describe a conflict you resolved."]
+
+def test_turn_audio_uses_the_cache_model_and_prewarm_rejects_unknown_voices(monkeypatch):
+    import api.index as index
+    from types import SimpleNamespace
+    requests = []
+    speech = SimpleNamespace(create=lambda **kwargs: requests.append(kwargs) or SimpleNamespace(content=b"mp3"))
+    monkeypatch.setattr(index, "TTS_MODEL", "tts-1")
+    assert index.synthesize_turn_audio(SimpleNamespace(audio=SimpleNamespace(speech=speech)), "Hello.", "nova") == b"mp3"
+    assert requests[0]["model"] == "tts-1"
+    started = []
+    monkeypatch.setattr(index, "prewarm_tts_cache", lambda voices=None: started.append(voices))
+    client = index.app.test_client()
+    admin = {"Authorization": "Bearer admin-token"}
+    res = client.post('/api/admin/tts-cache/prewarm', json={"voices": ["robot"]}, headers=admin)
+    assert res.status_code == 400 and started == []
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_memory_and_disk_tiers(pathlib.Path(tempfile.mkdtemp()))
+    test_size_bounded_eviction(pathlib.Path(tempfile.mkdtemp()))
+    test_concurrent_misses_share_one_synthesis(pathlib.Path(tempfile.mkdtemp()))
+    test_pinned_prefix_is_stitched_with_fresh_tail()
+    print("✅ TTS cache tests passed")
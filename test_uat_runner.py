@@ -0,0 +1,103 @@
+import time
+import threading
+from types import SimpleNamespace
+from api.uat_runner import UATRunner, UAT_QUESTIONS, UAT_PERSONAS, persona_names
+
+def wait_for(runner, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        progress = runner.progress(job_id)
+        if progress["status"] != "running":
+            return progress
+        time.sleep(0.02)
+    raise AssertionError("UAT job did not finish")
+
+def test_persona_names():
+    assert persona_names(None) == ["professional"]
+    assert persona_names("all") == list(UAT_PERSONAS)
+    assert persona_names(["Quitter", "quitter", "professional"]) == ["quitter", "professional"]
+
+def test_answers_and_scores_run_concurrently():
+    active, peak, lock = [0], [0], threading.Lock()
+    def call(result):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return result
+    runner = UATRunner(max_personas=3, max_calls=24)
+    started = time.monotonic()
+    job_id = runner.start("all", answer=lambda instruction, q: call(f"answer to {q}"), score=lambda q, a: call(3.0),
+                          on_done=lambda persona, average: [f"> saved {persona}"])
+    progress = wait_for(runner, job_id)
+    # 3 personas x (6 answers + 5 scores) in ~2 round trips, not 33 sequential calls
+    assert time.monotonic() - started < 1.0 and peak[0] >= 6
+    assert progress["status"] == "complete" and progress["progress"] == 1.0
+    for persona in UAT_PERSONAS:
+        state = progress["personas"][persona]
+        assert state["score"] == 3.0 and state["done"] == state["total"] == 2 * len(UAT_QUESTIONS) - 1
+        assert f"> saved {persona}" in state["logs"] and "[TURN 6: STAR Question]" in state["logs"]
+
+def test_failed_calls_degrade_the_persona_not_the_job():
+    def answer(instruction, q):
+        if "conflict" in q:
+            raise TimeoutError("read timed out")
+        return "An answer."
+    runner = UATRunner(max_personas=2, max_calls=4)
+    progress = wait_for(runner, runner.start(["quitter"], answer=answer, score=lambda q, a: 2.0))
+    state = progress["personas"]["quitter"]
+    assert progress["status"] == "complete" and state["score"] == 2.0
+    assert "CANDIDATE: FAILURE - read timed out" in state["logs"]
+    failed = wait_for(runner, runner.start(["quitter"], answer=lambda i, q: 1 / 0, score=lambda q, a: 2.0))
+    assert failed["status"] == "failed" and failed["personas"]["quitter"]["score"] is None
+
+def test_run_publishes_progress_until_finished():
+    runner = UATRunner(max_personas=1, max_calls=2)
+    published = []
+    def answer(instruction, q):
+        time.sleep(0.03)
+        return "An answer."
+    final = runner.run(["professional"], answer=answer, score=lambda q, a: 3.0, publish=published.append, interval=0.05)
+    assert final["status"] == "complete" and final["personas"]["professional"]["score"] == 3.0
+    assert published and all(p["status"] == "running" for p in published)
+    assert published[0]["job_id"] == final["job_id"]
+
+def test_run_test_endpoint_runs_on_the_shared_job_queue(monkeypatch):
+    import api.index as index
+    from api.job_queue import JobQueue, MemoryJobBackend
+    def create(**kwargs):
+        content = "4" if "Rate the answer" in kwargs["messages"][0]["content"] else "A STAR answer."
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    backend = MemoryJobBackend()
+    monkeypatch.setattr(index, "get_openai_client", lambda: fake)
+    monkeypatch.setattr(index, "uat_runner", UATRunner(max_personas=2, max_calls=8))
+    monkeypatch.setattr(index, "job_queue", JobQueue(backend=backend))
+    monkeypatch.setattr(index, "uat_save_result", lambda persona, average: ["> saved"])
+    client = index.app.test_client()
+    assert client.post('/api/admin/run-test', json={"persona": "professional"}).status_code == 401
+    admin = {"Authorization": "Bearer admin-token"}
+    res = client.post('/api/admin/run-test', json={"personas": ["professional", "cliffhanger"]}, headers=admin)
+    assert res.status_code == 202 and res.get_json()["status"] == "running"
+    job_id = res.get_json()["job_id"]
+    assert client.get(f'/api/admin/run-test/{job_id}').status_code == 401
+    # Polls are answered from the shared job table: another worker (queue) sees the same job
+    monkeypatch.setattr(index, "job_queue", JobQueue(backend=backend))
+    deadline = time.monotonic() + 5.0
+    body = client.get(f'/api/admin/run-test/{job_id}', headers=admin).get_json()
+    while body["status"] == "running" and time.monotonic() < deadline:
+        time.sleep(0.02)
+        body = client.get(f'/api/admin/run-test/{job_id}', headers=admin).get_json()
+    assert body["status"] == "complete" and body["job_id"] == job_id
+    assert client.get(f'/api/admin/run-test/{body["job_id"]}', headers=admin).status_code == 200
+    assert {name: p["score"] for name, p in body["personas"].items()} == {"professional": 4.0, "cliffhanger": 4.0}
+    assert client.get('/api/admin/run-test/unknown', headers=admin).status_code == 404
+
+if __name__ == "__main__":
+    test_persona_names()
+    test_answers_and_scores_run_concurrently()
+    test_failed_calls_degrade_the_persona_not_the_job()
+    test_run_publishes_progress_until_finished()
+    print("✅ UAT runner tests passed")